@@ -3,12 +3,22 @@ from flask_injector import FlaskInjector, singleton
 from injector import Binder, Module
 
 from app.src.controllers.job_objects_controller import JobObjectsController
+from app.src.controllers.job_runs_controller import JobRunsController
+from app.src.controllers.metrics_controller import MetricsController
+from app.src.controllers.profiles_controller import ProfilesController
 from app.src.factories.connector_factory import ConnectorFactory
 from app.src.models import db
 
 from app.src.config.config import Config
 from app.src.controllers.sync_job_scheduler_controller import SyncJobSchedulerController
+from app.src.controllers.job_events_controller import JobEventsController
+from app.src.controllers.rate_limits_controller import RateLimitsController
+from app.src.services.event_sync_service import EventSyncService
 from app.src.services.job_objects_service import JobObjectsService
+from app.src.services.job_runs_service import JobRunsService
+from app.src.services.metrics import MetricsRegistry, metrics
+from app.src.services.profiler import RunProfiler, run_profiler
+from app.src.services.rate_limiter import RateLimiters, rate_limiters
 from app.src.services.scheduler import Scheduler
 from app.src.services.sync_job_scheduler_service import SyncJobSchedulerService
 
@@ -54,6 +64,11 @@ def create_app():
                 SyncJobSchedulerService, to=SyncJobSchedulerService, scope=singleton
             )
             binder.bind(JobObjectsService, to=JobObjectsService, scope=singleton)
+            binder.bind(JobRunsService, to=JobRunsService, scope=singleton)
+            binder.bind(EventSyncService, to=EventSyncService, scope=singleton)
+            binder.bind(MetricsRegistry, to=metrics, scope=singleton)
+            binder.bind(RunProfiler, to=run_profiler, scope=singleton)
+            binder.bind(RateLimiters, to=rate_limiters, scope=singleton)
 
             binder.bind(
                 SyncJobSchedulerController,
@@ -65,6 +80,11 @@ def create_app():
                 to=JobObjectsController,
                 scope=singleton,
             )
+            binder.bind(JobRunsController, to=JobRunsController, scope=singleton)
+            binder.bind(JobEventsController, to=JobEventsController, scope=singleton)
+            binder.bind(MetricsController, to=MetricsController, scope=singleton)
+            binder.bind(ProfilesController, to=ProfilesController, scope=singleton)
+            binder.bind(RateLimitsController, to=RateLimitsController, scope=singleton)
 
     def configure_routes(injector: FlaskInjector):
         """
@@ -79,6 +99,21 @@ def create_app():
         job_objects_controller = injector.injector.get(JobObjectsController)
         job_objects_controller.register_routes(app)
 
+        job_runs_controller = injector.injector.get(JobRunsController)
+        job_runs_controller.register_routes(app)
+
+        job_events_controller = injector.injector.get(JobEventsController)
+        job_events_controller.register_routes(app)
+
+        metrics_controller = injector.injector.get(MetricsController)
+        metrics_controller.register_routes(app)
+
+        profiles_controller = injector.injector.get(ProfilesController)
+        profiles_controller.register_routes(app)
+
+        rate_limits_controller = injector.injector.get(RateLimitsController)
+        rate_limits_controller.register_routes(app)
+
     flask_injector = FlaskInjector(app=app, modules=[AppModule])
     configure_routes(flask_injector)
     return app
@@ -12,3 +12,50 @@ class Config:
     RETRY_DELAY = os.getenv('RETRY_DELAY')
     RETRY_BACKOFF = os.getenv('RETRY_BACKOFF')
     S3_CHUNK_SIZE = os.getenv('S3_CHUNK_SIZE')
+    PROFILE_SAMPLE_INTERVAL = os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005')
+    PROFILE_TRACEMALLOC = os.getenv('PROFILE_TRACEMALLOC', 'false')
+    PROFILE_TRACEMALLOC_FRAMES = os.getenv('PROFILE_TRACEMALLOC_FRAMES', '10')
+    PROFILE_TOP_ALLOCATIONS = os.getenv('PROFILE_TOP_ALLOCATIONS', '25')
+    TRACE_SAMPLE_RATE = os.getenv('TRACE_SAMPLE_RATE', '0')
+    TRACE_EXPORT_FILE = os.getenv('TRACE_EXPORT_FILE')
+    TRACE_QUEUE_SIZE = os.getenv('TRACE_QUEUE_SIZE', '10000')
+    LOG_QUEUE_SIZE = os.getenv('LOG_QUEUE_SIZE', '10000')
+    LOG_SAMPLE_EVERY = os.getenv('LOG_SAMPLE_EVERY', '1000')
+    LOG_PROGRESS_INTERVAL = os.getenv('LOG_PROGRESS_INTERVAL', '30')
+    LIST_SHARDS = os.getenv('LIST_SHARDS', '16')
+    LIST_MAX_WORKERS = os.getenv('LIST_MAX_WORKERS', '8')
+    INVENTORY_PAGE_SIZE = os.getenv('INVENTORY_PAGE_SIZE', '10000')
+    APPEND_VERIFY_BYTES = os.getenv('APPEND_VERIFY_BYTES', '65536')
+    MAX_IN_FLIGHT_BYTES = os.getenv('MAX_IN_FLIGHT_BYTES', '256 * 1024 * 1024')
+    DISK_RESERVE_BYTES = os.getenv('DISK_RESERVE_BYTES', '1024 * 1024 * 1024')
+    AIMD_INITIAL_CONCURRENCY = os.getenv('AIMD_INITIAL_CONCURRENCY', '8')
+    AIMD_MIN_CONCURRENCY = os.getenv('AIMD_MIN_CONCURRENCY', '1')
+    AIMD_MAX_CONCURRENCY = os.getenv('AIMD_MAX_CONCURRENCY', '64')
+    AIMD_DECREASE_FACTOR = os.getenv('AIMD_DECREASE_FACTOR', '0.5')
+    AIMD_LATENCY_SPIKE_FACTOR = os.getenv('AIMD_LATENCY_SPIKE_FACTOR', '4')
+    AIMD_DECREASE_COOLDOWN = os.getenv('AIMD_DECREASE_COOLDOWN', '1')
+    MAX_BYTES_PER_SECOND = os.getenv('MAX_BYTES_PER_SECOND', '0')
+    MAX_REQUESTS_PER_SECOND = os.getenv('MAX_REQUESTS_PER_SECOND', '0')
+    LISTING_CACHE_TTL = os.getenv('LISTING_CACHE_TTL', '60')
+    LISTING_CACHE_MAX_OBJECTS = os.getenv('LISTING_CACHE_MAX_OBJECTS', '1000000')
+    CONTENT_STORE_FOLDER = os.getenv('CONTENT_STORE_FOLDER')
+    SNAPSHOT_ROOT_FOLDER = os.getenv('SNAPSHOT_ROOT_FOLDER')
+    SNAPSHOT_RETENTION = os.getenv('SNAPSHOT_RETENTION', '7')
+    DOWNLOAD_DURABILITY = os.getenv('DOWNLOAD_DURABILITY', 'batch')
+    DOWNLOAD_COMMIT_BATCH_SIZE = os.getenv('DOWNLOAD_COMMIT_BATCH_SIZE', '256')
+    DOWNLOAD_WRITE_BUFFER_SIZE = os.getenv('DOWNLOAD_WRITE_BUFFER_SIZE', '8 * 1024 * 1024')
+    DOWNLOAD_DROP_CACHE = os.getenv('DOWNLOAD_DROP_CACHE', 'false')
+    VERIFY_INTEGRITY = os.getenv('VERIFY_INTEGRITY', 'true')
+    INTEGRITY_RETRIES = os.getenv('INTEGRITY_RETRIES', '1')
+    CHECKSUM_WORKERS = os.getenv('CHECKSUM_WORKERS', '4')
+    RECONCILE_WORKERS = os.getenv('RECONCILE_WORKERS', '8')
+    SINK_PART_SIZE = os.getenv('SINK_PART_SIZE', '8 * 1024 * 1024')
+    ARCHIVE_SEGMENT_SIZE = os.getenv('ARCHIVE_SEGMENT_SIZE', '1024 * 1024 * 1024')
+    DOWNLOAD_COMPRESSION = os.getenv('DOWNLOAD_COMPRESSION', 'none')
+    COMPRESSION_LEVEL = os.getenv('COMPRESSION_LEVEL', '3')
+    FILESYSTEM_PAGE_SIZE = os.getenv('FILESYSTEM_PAGE_SIZE', '1000')
+    FILESYSTEM_ALLOWED_ROOTS = os.getenv('FILESYSTEM_ALLOWED_ROOTS', '')
+    HTTP_PAGE_SIZE = os.getenv('HTTP_PAGE_SIZE', '1000')
+    HTTP_POOL_SIZE = os.getenv('HTTP_POOL_SIZE', '10')
+    HTTP_TIMEOUT = os.getenv('HTTP_TIMEOUT', '60')
+    HTTP_VALIDATOR_CACHE_SIZE = os.getenv('HTTP_VALIDATOR_CACHE_SIZE', '100000')
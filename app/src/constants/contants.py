@@ -1,5 +1,5 @@
 class Constants:
-    VALID_CONNECTOR_TYPES = ["S3"]
+    VALID_CONNECTOR_TYPES = ["S3", "FILESYSTEM", "HTTP"]
     ALLOWED_SCHEDULES = [
         "quinqueminutely",
         "decaminutely",
@@ -11,5 +11,11 @@ class Constants:
     ]
     SYNC_JOB_SCHEDULER_API = "/api/v1/scheduler"
     JOBS_API = "/api/v1/jobs"
+    METRICS_API = "/metrics"
+    RATE_LIMITS_API = "/api/v1/rate_limits"
+    METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
     ALLOWED_JOB_STATUS = ["SCHEDULED", "FAILED", "PENDING", "CANCELLED", "SKIPPED"]
     MAX_JSON_SIZE = "10 * 1024 * 1024"
+    RUN_SUMMARY_DEFAULT_RUNS = 100
+    S3_CREATED_EVENT_PREFIX = "ObjectCreated:"
+    S3_REMOVED_EVENT_PREFIX = "ObjectRemoved:"
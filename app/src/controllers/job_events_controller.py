@@ -0,0 +1,47 @@
+import uuid
+from flask import Blueprint, Flask, jsonify, request
+import logging
+from injector import inject
+from app.src.constants.contants import Constants
+from app.src.services.event_sync_service import EventSyncService
+
+
+class JobEventsController:
+    @inject
+    def __init__(self, event_sync_service: EventSyncService):
+        self.__event_sync_service = event_sync_service
+        self.__blueprint = Blueprint("job_events_controller", __name__)
+
+    def register_routes(self, app: Flask):
+        """
+        Registers the routes for the event notifications of sync jobs.
+
+        Args:
+            app (Flask): The Flask application object.
+        """
+        self.__blueprint.add_url_rule(
+            "/<job_id>/events", methods=["POST"], view_func=self.post_events
+        )
+        app.register_blueprint(self.__blueprint, url_prefix=Constants.JOBS_API)
+
+    def post_events(self, job_id):
+        try:
+            job_id = job_id.strip()
+
+            try:
+                uuid.UUID(job_id)
+            except ValueError:
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            payload = request.get_json(silent=True, force=True)
+            if not isinstance(payload, dict):
+                return jsonify({"error": "Invalid event notification"}), 400
+
+            accepted, err = self.__event_sync_service.enqueue_events(job_id, payload)
+            if err:
+                return jsonify({"message": err}), 404
+
+            return jsonify({"message": "Events accepted", "accepted": accepted}), 202
+        except Exception as e:
+            logging.error(f"Error accepting events: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
@@ -22,6 +22,9 @@ class JobObjectsController:
         self.__blueprint.add_url_rule(
             "/<job_id>/objects", methods=["GET"], view_func=self.get_objects
         )
+        self.__blueprint.add_url_rule(
+            "/<job_id>/objects/lookup", methods=["GET"], view_func=self.lookup_object
+        )
         app.register_blueprint(self.__blueprint, url_prefix=Constants.JOBS_API)
 
     def get_objects(self, job_id):
@@ -45,3 +48,33 @@ class JobObjectsController:
         except Exception as e:
             logging.error(f"Error getting objects: {e}")
             return jsonify({"message": "Internal Server Error"}), 500
+
+    def lookup_object(self, job_id):
+        """
+        Looks up an object of a job by its ``key`` or by its local ``path``.
+
+        Returns:
+            Response: The object, including its key and local path.
+        """
+        try:
+            job_id = job_id.strip()
+
+            try:
+                uuid.UUID(job_id)
+            except ValueError:
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            object_key = request.args.get("key")
+            local_path = request.args.get("path")
+            if (object_key is None) == (local_path is None):
+                return jsonify({"error": "Exactly one of key or path is required"}), 400
+
+            object = self.__job_objects_service.find_object(
+                job_id, object_key=object_key, local_path=local_path
+            )
+            if object is None:
+                return jsonify({"message": "Object not found"}), 404
+            return jsonify(object), 200
+        except Exception as e:
+            logging.error(f"Error looking up object: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
@@ -0,0 +1,70 @@
+import uuid
+from flask import Blueprint, Flask, jsonify, request
+import logging
+from injector import inject
+from app.src.constants.contants import Constants
+from app.src.services.job_runs_service import JobRunsService
+
+
+class JobRunsController:
+    @inject
+    def __init__(self, job_runs_service: JobRunsService):
+        self.__job_runs_service = job_runs_service
+        self.__blueprint = Blueprint("job_runs_controller", __name__)
+
+    def register_routes(self, app: Flask):
+        """
+        Registers the routes for the run history of sync jobs.
+
+        Args:
+            app (Flask): The Flask application object.
+        """
+        self.__blueprint.add_url_rule(
+            "/<job_id>/runs", methods=["GET"], view_func=self.get_runs
+        )
+        self.__blueprint.add_url_rule(
+            "/<job_id>/runs/summary", methods=["GET"], view_func=self.get_summary
+        )
+        app.register_blueprint(self.__blueprint, url_prefix=Constants.JOBS_API)
+
+    def get_runs(self, job_id):
+        try:
+            job_id = job_id.strip()
+
+            try:
+                uuid.UUID(job_id)
+            except ValueError:
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            limit = request.args.get("limit", default=10, type=int)
+            offset = request.args.get("offset", default=0, type=int)
+
+            if limit < 0 or offset < 0:
+                return jsonify({"error": "Invalid limit or offset"}), 400
+
+            return jsonify(
+                self.__job_runs_service.get_runs(job_id, limit, offset)
+            ), 200
+        except Exception as e:
+            logging.error(f"Error getting runs: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
+
+    def get_summary(self, job_id):
+        try:
+            job_id = job_id.strip()
+
+            try:
+                uuid.UUID(job_id)
+            except ValueError:
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            last = request.args.get(
+                "last", default=Constants.RUN_SUMMARY_DEFAULT_RUNS, type=int
+            )
+            if last <= 0:
+                return jsonify({"error": "Invalid last"}), 400
+
+            return jsonify(self.__job_runs_service.get_summary(job_id, last)), 200
+        except Exception as e:
+            logging.error(f"Error getting run summary: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
@@ -0,0 +1,48 @@
+import logging
+from flask import Blueprint, Flask, Response, jsonify
+from injector import inject
+from app.src.constants.contants import Constants
+from app.src.services.metrics import MetricsRegistry
+
+
+class MetricsController:
+    """
+    Controller class for exposing the process metrics.
+    """
+
+    @inject
+    def __init__(self, metrics_registry: MetricsRegistry):
+        """
+        Initializes the MetricsController.
+
+        Args:
+            metrics_registry (MetricsRegistry): The registry holding the process metrics.
+        """
+        self.__metrics_registry = metrics_registry
+        self.__blueprint = Blueprint("metrics_controller", __name__)
+
+    def register_routes(self, app: Flask):
+        """
+        Registers the routes for the metrics endpoint.
+
+        Args:
+            app (Flask): The Flask application object.
+        """
+        self.__blueprint.add_url_rule("", methods=["GET"], view_func=self.get_metrics)
+        app.register_blueprint(self.__blueprint, url_prefix=Constants.METRICS_API)
+
+    def get_metrics(self):
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Returns:
+            Response: The rendered metrics.
+        """
+        try:
+            return Response(
+                self.__metrics_registry.render(),
+                mimetype=Constants.METRICS_CONTENT_TYPE,
+            )
+        except Exception as e:
+            logging.error(f"Error rendering metrics: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
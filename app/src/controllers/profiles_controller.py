@@ -0,0 +1,111 @@
+import logging
+import uuid
+from flask import Blueprint, Flask, jsonify, send_file
+from injector import inject
+from app.src.constants.contants import Constants
+from app.src.services.profiler import RunProfiler
+
+
+class ProfilesController:
+    """
+    Controller class for requesting and downloading profiles of sync runs.
+    """
+
+    @inject
+    def __init__(self, run_profiler: RunProfiler):
+        """
+        Initializes the ProfilesController.
+
+        Args:
+            run_profiler (RunProfiler): The profiler of the sync runs.
+        """
+        self.__run_profiler = run_profiler
+        self.__blueprint = Blueprint("profiles_controller", __name__)
+
+    def register_routes(self, app: Flask):
+        """
+        Registers the routes for run profiling.
+
+        Args:
+            app (Flask): The Flask application object.
+        """
+        self.__blueprint.add_url_rule(
+            "/<job_id>/profile", methods=["POST"], view_func=self.request_profile
+        )
+        self.__blueprint.add_url_rule(
+            "/<job_id>/profiles", methods=["GET"], view_func=self.list_profiles
+        )
+        self.__blueprint.add_url_rule(
+            "/<job_id>/profiles/<profile_id>/<file_name>",
+            methods=["GET"],
+            view_func=self.download_profile_file,
+        )
+        app.register_blueprint(self.__blueprint, url_prefix=Constants.JOBS_API)
+
+    def __is_valid_job_id(self, job_id):
+        try:
+            uuid.UUID(job_id)
+            return True
+        except ValueError:
+            return False
+
+    def request_profile(self, job_id):
+        """
+        Marks the next run of a job for profiling.
+
+        Returns:
+            Response: The HTTP response of successfull request or failure.
+        """
+        try:
+            job_id = job_id.strip()
+            if not self.__is_valid_job_id(job_id):
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            self.__run_profiler.request_profile(job_id)
+            return jsonify({"message": "Next run of the job will be profiled"}), 200
+        except Exception as e:
+            logging.error(f"Error requesting profile: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
+
+    def list_profiles(self, job_id):
+        """
+        Lists the stored profiles of a job.
+
+        Returns:
+            Response: The list of profile summaries.
+        """
+        try:
+            job_id = job_id.strip()
+            if not self.__is_valid_job_id(job_id):
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            return jsonify(
+                {
+                    "profile_requested": self.__run_profiler.is_requested(job_id),
+                    "profiles": self.__run_profiler.list_profiles(job_id),
+                }
+            ), 200
+        except Exception as e:
+            logging.error(f"Error listing profiles: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
+
+    def download_profile_file(self, job_id, profile_id, file_name):
+        """
+        Downloads a stored profile file.
+
+        Returns:
+            Response: The profile file as an attachment.
+        """
+        try:
+            job_id = job_id.strip()
+            if not self.__is_valid_job_id(job_id):
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            path = self.__run_profiler.get_profile_file(job_id, profile_id, file_name)
+            if not path:
+                return jsonify({"message": "Profile not found"}), 404
+
+            return send_file(path, as_attachment=True, download_name=file_name)
+        except Exception as e:
+            logging.error(f"Error downloading profile: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
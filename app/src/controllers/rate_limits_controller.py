@@ -0,0 +1,148 @@
+import logging
+import uuid
+from flask import Blueprint, Flask, jsonify, request
+from injector import inject
+from app.src.constants.contants import Constants
+from app.src.services.rate_limiter import RateLimiters, validate_rate_limits
+from app.src.services.sync_job_scheduler_service import SyncJobSchedulerService
+
+
+class RateLimitsController:
+    """
+    Controller class for reading and adjusting the bandwidth and request rate limits.
+    """
+
+    @inject
+    def __init__(
+        self,
+        sync_job_scheduler_service: SyncJobSchedulerService,
+        rate_limiters: RateLimiters,
+    ):
+        """
+        Initializes the RateLimitsController.
+
+        Args:
+            sync_job_scheduler_service (SyncJobSchedulerService): The service the limits of jobs are stored by.
+            rate_limiters (RateLimiters): The rate limiters of the process.
+        """
+        self.__sync_job_scheduler_service = sync_job_scheduler_service
+        self.__rate_limiters = rate_limiters
+        self.__jobs_blueprint = Blueprint("job_rate_limits_controller", __name__)
+        self.__blueprint = Blueprint("rate_limits_controller", __name__)
+
+    def register_routes(self, app: Flask):
+        """
+        Registers the routes for the rate limits of jobs and of the process.
+
+        Args:
+            app (Flask): The Flask application object.
+        """
+        self.__jobs_blueprint.add_url_rule(
+            "/<job_id>/rate_limits",
+            methods=["GET"],
+            view_func=self.get_job_rate_limits,
+        )
+        self.__jobs_blueprint.add_url_rule(
+            "/<job_id>/rate_limits",
+            methods=["PUT"],
+            view_func=self.update_job_rate_limits,
+        )
+        self.__blueprint.add_url_rule(
+            "", methods=["GET"], view_func=self.get_global_rate_limits
+        )
+        self.__blueprint.add_url_rule(
+            "", methods=["PUT"], view_func=self.update_global_rate_limits
+        )
+        app.register_blueprint(self.__jobs_blueprint, url_prefix=Constants.JOBS_API)
+        app.register_blueprint(self.__blueprint, url_prefix=Constants.RATE_LIMITS_API)
+
+    def __is_valid_job_id(self, job_id):
+        try:
+            uuid.UUID(job_id)
+            return True
+        except ValueError:
+            return False
+
+    def get_job_rate_limits(self, job_id):
+        """
+        Returns the rate limits of a job.
+
+        Returns:
+            Response: The limits of the job, 0 meaning no limit.
+        """
+        try:
+            job_id = job_id.strip()
+            if not self.__is_valid_job_id(job_id):
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            limiter = self.__rate_limiters.get_job_limiter(job_id)
+            if limiter is None:
+                return jsonify({"message": "Job not found"}), 404
+
+            return jsonify({"job_id": job_id, **limiter.get_limits()}), 200
+        except Exception as e:
+            logging.error(f"Error retrieving rate limits: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
+
+    def update_job_rate_limits(self, job_id):
+        """
+        Changes the rate limits of a job, including its running transfers.
+
+        Returns:
+            Response: The updated limits of the job.
+        """
+        try:
+            job_id = job_id.strip()
+            if not self.__is_valid_job_id(job_id):
+                return jsonify({"error": "job_id must be a valid UUID string"}), 400
+
+            rate_limits = request.get_json(silent=True)
+            is_valid, msg = validate_rate_limits(rate_limits)
+            if not is_valid:
+                return jsonify({"message": msg}), 400
+
+            limits, err = self.__sync_job_scheduler_service.update_rate_limits(
+                job_id, rate_limits
+            )
+            if err:
+                return jsonify({"message": err}), 404
+
+            logging.info(f"Rate limits of job {job_id} changed to {limits}")
+            return jsonify({"job_id": job_id, **limits}), 200
+        except Exception as e:
+            logging.error(f"Error updating rate limits: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
+
+    def get_global_rate_limits(self):
+        """
+        Returns the rate limits shared by all jobs of the process.
+
+        Returns:
+            Response: The global limits, 0 meaning no limit.
+        """
+        try:
+            return jsonify(self.__rate_limiters.global_limiter.get_limits()), 200
+        except Exception as e:
+            logging.error(f"Error retrieving rate limits: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
+
+    def update_global_rate_limits(self):
+        """
+        Changes the rate limits shared by all jobs of the process until it restarts.
+
+        Returns:
+            Response: The updated global limits.
+        """
+        try:
+            rate_limits = request.get_json(silent=True)
+            is_valid, msg = validate_rate_limits(rate_limits)
+            if not is_valid:
+                return jsonify({"message": msg}), 400
+
+            global_limiter = self.__rate_limiters.global_limiter
+            global_limiter.set_limits(rate_limits)
+            logging.info(f"Global rate limits changed to {global_limiter.get_limits()}")
+            return jsonify(global_limiter.get_limits()), 200
+        except Exception as e:
+            logging.error(f"Error updating rate limits: {e}")
+            return jsonify({"message": "Internal Server Error"}), 500
@@ -6,6 +6,7 @@ from app.src.constants.contants import Constants
 from app.src.services.sync_job_scheduler_service import SyncJobSchedulerService
 
 from app.src.utils.validator_util import (
+    validate_connector_config,
     validate_job_id,
     validate_scheduler_creation_api_request,
 )
@@ -67,6 +68,10 @@ class SyncJobSchedulerController:
             connector_type = scheduler_request_body.get("connector_type").strip()
             schedule = scheduler_request_body.get("schedule").strip()
             connector_config = scheduler_request_body.get("connector_config")
+            is_valid, msg = validate_connector_config(connector_config, connector_type)
+            if not is_valid:
+                return jsonify({"message": msg}), 400
+
             job_id, err = self.__sync_job_scheduler_service.schedule_sync_job(
                 job_name, connector_type, schedule, connector_config
             )
@@ -1,3 +1,5 @@
+from app.src.services.connectors.filesystem_connector import FilesystemConnector
+from app.src.services.connectors.http_connector import HttpConnector
 from app.src.services.connectors.s3_connector import S3Connector
 
 
@@ -8,6 +10,8 @@ class ConnectorFactory:
 
     def __init__(self):
         self.__s3connector = S3Connector()
+        self.__filesystem_connector = FilesystemConnector()
+        self.__http_connector = HttpConnector()
 
     def get_connector(self, connector_type):
         """
@@ -24,5 +28,9 @@ class ConnectorFactory:
         """
         if connector_type.upper() == "S3":
             return self.__s3connector, None
+        if connector_type.upper() == "FILESYSTEM":
+            return self.__filesystem_connector, None
+        if connector_type.upper() == "HTTP":
+            return self.__http_connector, None
 
         return None, f"Invalid connector type: {connector_type}"
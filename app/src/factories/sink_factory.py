@@ -0,0 +1,107 @@
+import logging
+
+from app.src.config.config import Config
+from app.src.services.sinks.archive_sink import ArchiveSink
+from app.src.services.sinks.s3_sink import S3Sink
+from app.src.utils.compression_util import validate_compression
+
+
+SINK_LOCAL = "local"
+SINK_S3 = "s3"
+SINK_ARCHIVE = "archive"
+SINK_TYPES = (SINK_LOCAL, SINK_S3, SINK_ARCHIVE)
+# Connector config options that work on the files of the download folder.
+LOCAL_SINK_OPTIONS = (
+    "content_addressed",
+    "snapshots",
+    "reconcile",
+    "reconcile_from",
+    "mirror_deletes",
+    "layout",
+)
+
+
+class SinkFactory:
+    """
+    Factory class for creating the sinks jobs write to, other than the local one,
+    based on the sink config of the job.
+    """
+
+    def get_sink(self, sink_config, job_id):
+        """
+        Returns the sink for a sink config.
+
+        Args:
+            sink_config (dict): The ``sink`` of the connector config, with its ``type``.
+            job_id (str): The ID of the job.
+
+        Returns:
+            tuple: A tuple containing the sink object and an error message.
+                The sink object is returned as the first element of the tuple.
+                If the sink can not be created, the error message is returned as
+                the second element of the tuple.
+        """
+        sink_type = sink_config.get("type", "").lower()
+        try:
+            if sink_type == SINK_S3:
+                return S3Sink(sink_config), None
+            if sink_type == SINK_ARCHIVE:
+                return ArchiveSink(
+                    sink_config.get("folder")
+                    or f"{Config.DOWNLOAD_ROOT_FOLDER}/{job_id}",
+                    int(
+                        sink_config.get("segment_size")
+                        or eval(Config.ARCHIVE_SEGMENT_SIZE)
+                    ),
+                    int(eval(Config.DOWNLOAD_WRITE_BUFFER_SIZE)),
+                    compression=sink_config.get("compression", "none"),
+                    compression_level=int(sink_config.get("compression_level", 3)),
+                    drop_cache=Config.DOWNLOAD_DROP_CACHE.lower() == "true",
+                ), None
+        except Exception as e:
+            error_msg = f"Error creating {sink_type} sink: {e}"
+            logging.error(error_msg)
+            return None, error_msg
+
+        return None, f"Invalid sink type: {sink_type}"
+
+
+def validate_sink_config(connector_config):
+    """
+    Validates the sink of a connector config, if any.
+
+    Args:
+        connector_config (dict): The configuration for the connector.
+
+    Returns:
+        tuple: A tuple containing a boolean value indicating whether the validation
+            passed or not, and an error message if the validation failed.
+    """
+    sink_config = connector_config.get("sink")
+    if sink_config is None:
+        return True, None
+    if not isinstance(sink_config, dict):
+        return False, "sink must be a dictionary"
+    sink_type = sink_config.get("type")
+    if sink_type not in SINK_TYPES:
+        return False, f"sink type must be one of {SINK_TYPES}"
+    if sink_type == SINK_LOCAL:
+        return True, None
+    local_options = [key for key in LOCAL_SINK_OPTIONS if connector_config.get(key)]
+    if local_options:
+        return False, f"{local_options} are only supported with the local sink"
+    if sink_type == SINK_S3 and not str(sink_config.get("bucket_name", "")).strip():
+        return False, "bucket_name is required for the s3 sink"
+    if sink_type == SINK_ARCHIVE:
+        is_valid, msg = validate_compression(
+            sink_config.get("compression", "none"),
+            sink_config.get("compression_level", 3),
+        )
+        if not is_valid:
+            return False, msg
+        try:
+            if int(sink_config.get("segment_size", 1)) <= 0:
+                return False, "segment_size must be a positive integer"
+        except (TypeError, ValueError):
+            return False, "segment_size must be a positive integer"
+    return True, None
@@ -15,6 +15,12 @@ class BlobObject(db.Model):
         status (str): The status of the blob object.
         local_full_path (str): The local full path of the blob object.
         job_id (int): The foreign key referencing the associated job.
+        generation (int): The run that last saw the object in a complete listing.
+        etag (str): The ETag of the object as listed, if the connector reports one.
+        checksum (str): The verified checksum of the local file, as ``<algorithm>:<value>``.
+        compression (str): The compression the object is stored with, if any.
+        stored_size (int): The number of bytes the object takes where it is stored.
+        compression_ratio (float): The size of the object divided by its stored size.
         created_at (datetime): The timestamp when the blob object was created.
         updated_at (datetime): The timestamp when the blob object was last updated.
 
@@ -25,6 +31,13 @@ class BlobObject(db.Model):
     def utcnow(self):
         return datetime.now(pytz.utc)
 
+    __table_args__ = (
+        db.Index("ix_blob_object_job_id_object_key", "job_id", "object_key"),
+        db.Index("ix_blob_object_job_id_generation", "job_id", "generation"),
+        # Objects are looked up by path, e.g. for layouts whose paths are not keys.
+        db.Index("ix_blob_object_job_id_local_full_path", "job_id", "local_full_path"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     object_key = db.Column(db.String(50), nullable=False)
     object_size = db.Column(db.String(50), nullable=False)
@@ -32,11 +45,24 @@ class BlobObject(db.Model):
     status = db.Column(db.String(50), nullable=False)
     local_full_path = db.Column(db.String(255), nullable=True)
     job_id = db.Column(db.Integer, db.ForeignKey("job.job_id"), nullable=False)
+    generation = db.Column(db.Integer, nullable=True)
+    etag = db.Column(db.String(128), nullable=True)
+    checksum = db.Column(db.String(128), nullable=True)
+    compression = db.Column(db.String(16), nullable=True)
+    stored_size = db.Column(db.BigInteger, nullable=True)
+    compression_ratio = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=utcnow)
     updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow)
 
     def __init__(
-        self, object_key, object_size, last_position, status, job_id, local_full_path
+        self,
+        object_key,
+        object_size,
+        last_position,
+        status,
+        job_id,
+        local_full_path,
+        etag=None,
     ):
         """
         Initializes a new instance of the BlobObject class.
@@ -48,6 +74,7 @@ class BlobObject(db.Model):
             status (str): The status of the blob object.
             job_id (int): The foreign key referencing the associated job.
             local_full_path (str): The local full path of the blob object.
+            etag (str, optional): The ETag of the blob object.
         """
         self.object_key = object_key
         self.object_size = object_size
@@ -55,6 +82,7 @@ class BlobObject(db.Model):
         self.status = status
         self.job_id = job_id
         self.local_full_path = local_full_path
+        self.etag = etag
 
     def __json__(self):
         """
@@ -71,6 +99,12 @@ class BlobObject(db.Model):
             "status": self.status,
             "local_full_path": self.local_full_path,
             "job_id": self.job_id,
+            "generation": self.generation,
+            "etag": self.etag,
+            "checksum": self.checksum,
+            "compression": self.compression,
+            "stored_size": self.stored_size,
+            "compression_ratio": self.compression_ratio,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
@@ -0,0 +1,101 @@
+import pytz
+from app.src.models import db
+from datetime import datetime
+
+
+class JobRun(db.Model):
+    """
+    Represents a single run of a sync job.
+
+    Attributes:
+        id (int): The unique identifier of the run.
+        job_id (str): The foreign key referencing the associated job.
+        status (str): The status of the run.
+        started_at (datetime): The timestamp when the run started.
+        ended_at (datetime): The timestamp when the run ended.
+        objects_transferred (int): Number of objects downloaded completely.
+        bytes_transferred (int): Number of bytes fetched from the connector.
+        list_requests (int): Number of LIST requests issued.
+        get_requests (int): Number of GET-class requests issued.
+        retry_requests (int): Number of requests retried after an error.
+        failed_objects (int): Number of objects that failed to sync.
+
+    Methods:
+        __init__: Initializes a new instance of the JobRun class.
+        __json__: Returns a dictionary representation of the JobRun object.
+    """
+
+    def utcnow(self):
+        return datetime.now(pytz.utc)
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(
+        db.String(36), db.ForeignKey("job.job_id"), nullable=False, index=True
+    )
+    status = db.Column(db.String(50), nullable=False)
+    started_at = db.Column(db.DateTime, default=utcnow)
+    ended_at = db.Column(db.DateTime, nullable=True)
+    objects_transferred = db.Column(db.Integer, nullable=False, default=0)
+    bytes_transferred = db.Column(db.BigInteger, nullable=False, default=0)
+    list_requests = db.Column(db.Integer, nullable=False, default=0)
+    get_requests = db.Column(db.Integer, nullable=False, default=0)
+    retry_requests = db.Column(db.Integer, nullable=False, default=0)
+    failed_objects = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, job_id, status="RUNNING", started_at=None):
+        """
+        Initializes a new instance of the JobRun class.
+
+        Args:
+            job_id (str): The foreign key referencing the associated job.
+            status (str, optional): The status of the run. Defaults to "RUNNING".
+            started_at (datetime, optional): The timestamp when the run started.
+        """
+        self.job_id = job_id
+        self.status = status
+        self.started_at = started_at
+        self.objects_transferred = 0
+        self.bytes_transferred = 0
+        self.list_requests = 0
+        self.get_requests = 0
+        self.retry_requests = 0
+        self.failed_objects = 0
+
+    @property
+    def duration_seconds(self):
+        if not self.started_at or not self.ended_at:
+            return None
+        # SQLite drops the timezone on reload, so compare both as naive UTC.
+        started_at = self.started_at.replace(tzinfo=None)
+        ended_at = self.ended_at.replace(tzinfo=None)
+        return (ended_at - started_at).total_seconds()
+
+    @property
+    def bytes_per_second(self):
+        duration = self.duration_seconds
+        if not duration:
+            return None
+        return self.bytes_transferred / duration
+
+    def __json__(self):
+        """
+        Returns a dictionary representation of the JobRun object.
+
+        Returns:
+            dict: A dictionary representation of the JobRun object.
+        """
+        return {
+            "id": self.id,
+            "job_id": self.job_id,
+            "status": self.status,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "duration_seconds": self.duration_seconds,
+            "bytes_per_second": self.bytes_per_second,
+            "objects_transferred": self.objects_transferred,
+            "bytes_transferred": self.bytes_transferred,
+            "list_requests": self.list_requests,
+            "get_requests": self.get_requests,
+            "retry_requests": self.retry_requests,
+            "failed_objects": self.failed_objects,
+        }
@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from app.src.config.config import Config
+from app.src.services.metrics import CONCURRENCY_DECREASES, CONCURRENCY_LIMIT
+
+
+# Latency spikes are only detected once the baseline is based on enough requests.
+MIN_LATENCY_SAMPLES = 20
+LATENCY_EWMA_WEIGHT = 0.1
+
+
+class ThrottledError(Exception):
+    """
+    Raised for a request the remote service rejected because it was sent too fast.
+    """
+
+
+class AimdConcurrencyController:
+    """
+    Limits the number of concurrent requests to a single target with AIMD.
+
+    Every successful request raises the limit additively, by one per limit's worth
+    of successful requests. A throttled request, or a request whose latency is well
+    above the moving average, cuts the limit multiplicatively, at most once per
+    cooldown, so that a burst of throttled requests counts as a single signal.
+    Downloads fetch as many chunks of an object concurrently as the limit allows,
+    see Connector.get_fetch_concurrency, so that an increase widens them.
+
+    Args:
+        target (str): The name of the target, used as the metric label.
+        initial_limit (int): The limit to start with.
+        min_limit (int): The lowest limit.
+        max_limit (int): The highest limit.
+        decrease_factor (float): The factor the limit is multiplied by on a decrease.
+        latency_spike_factor (float): How many times the average latency a request
+            may take before it counts as a latency spike.
+        cooldown_seconds (float): The minimum time between two decreases.
+    """
+
+    def __init__(
+        self,
+        target,
+        initial_limit,
+        min_limit,
+        max_limit,
+        decrease_factor,
+        latency_spike_factor,
+        cooldown_seconds,
+    ):
+        self.target = target
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.__limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.__in_flight = 0
+        self.__latency_average = None
+        self.__latency_samples = 0
+        self.__last_decrease_at = None
+        self.__condition = threading.Condition()
+        CONCURRENCY_LIMIT.set(self.limit, target=target)
+
+    @property
+    def limit(self):
+        return int(self.__limit)
+
+    @property
+    def in_flight(self):
+        return self.__in_flight
+
+    @contextmanager
+    def slot(self):
+        """
+        Holds one of the concurrent request slots for the duration of a request.
+
+        Blocks while the limit is reached. The outcome of the wrapped request adjusts
+        the limit: ThrottledError decreases it, success increases it unless the
+        request was a latency spike. Other errors leave it unchanged.
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__in_flight < self.limit)
+            self.__in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            yield
+        except ThrottledError:
+            with self.__condition:
+                self.__decrease("throttled")
+            raise
+        else:
+            with self.__condition:
+                self.__on_success(time.perf_counter() - started_at)
+        finally:
+            with self.__condition:
+                self.__in_flight -= 1
+                self.__condition.notify_all()
+
+    def __on_success(self, latency):
+        is_spike = (
+            self.__latency_samples >= MIN_LATENCY_SAMPLES
+            and latency > self.latency_spike_factor * self.__latency_average
+        )
+        if self.__latency_average is None:
+            self.__latency_average = latency
+        else:
+            self.__latency_average += LATENCY_EWMA_WEIGHT * (
+                latency - self.__latency_average
+            )
+        self.__latency_samples += 1
+
+        if is_spike:
+            self.__decrease("latency")
+        else:
+            self.__set_limit(self.__limit + 1 / self.__limit)
+
+    def __decrease(self, reason):
+        now = time.monotonic()
+        if (
+            self.__last_decrease_at is not None
+            and now - self.__last_decrease_at < self.cooldown_seconds
+        ):
+            return
+        self.__last_decrease_at = now
+        self.__set_limit(self.__limit * self.decrease_factor)
+        CONCURRENCY_DECREASES.inc(target=self.target, reason=reason)
+        logging.info(
+            f"Concurrency limit of {self.target} decreased to {self.limit} ({reason})"
+        )
+
+    def __set_limit(self, limit):
+        self.__limit = min(max(limit, float(self.min_limit)), float(self.max_limit))
+        CONCURRENCY_LIMIT.set(self.limit, target=self.target)
+        self.__condition.notify_all()
+
+
+class ConcurrencyControllers:
+    """
+    Holds the process-wide concurrency controllers, one per request target, so that
+    all jobs sending requests to the same target share its limit.
+    """
+
+    def __init__(self):
+        self.__controllers = dict()
+        self.__lock = threading.Lock()
+
+    def get(self, target):
+        """
+        Returns the concurrency controller of a target, creating it if needed.
+
+        Args:
+            target (str): The name of the target, e.g. a bucket and prefix.
+
+        Returns:
+            AimdConcurrencyController: The controller of the target.
+        """
+        with self.__lock:
+            controller = self.__controllers.get(target)
+            if controller is None:
+                controller = AimdConcurrencyController(
+                    target,
+                    int(Config.AIMD_INITIAL_CONCURRENCY),
+                    int(Config.AIMD_MIN_CONCURRENCY),
+                    int(Config.AIMD_MAX_CONCURRENCY),
+                    float(Config.AIMD_DECREASE_FACTOR),
+                    float(Config.AIMD_LATENCY_SPIKE_FACTOR),
+                    float(Config.AIMD_DECREASE_COOLDOWN),
+                )
+                self.__controllers[target] = controller
+            return controller
+
+
+concurrency_controllers = ConcurrencyControllers()
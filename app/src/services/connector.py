@@ -1,4 +1,37 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class ObjectPage(dict):
+    """
+    A page of listed objects, mapping object keys to their sizes.
+
+    Connectors that know the ETags of the objects record them in ``etags``, and
+    their last modification times, as POSIX timestamps, in ``last_modified``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.etags = dict()
+        self.last_modified = dict()
+
+    def add(self, object_key, object_size, etag=None, last_modified=None):
+        self[object_key] = object_size
+        if etag:
+            self.etags[object_key] = etag.strip('"')
+        if last_modified:
+            self.last_modified[object_key] = to_timestamp(last_modified)
+
+
+def to_timestamp(value):
+    """
+    Converts a datetime, an ISO 8601 string or a number of seconds to a POSIX timestamp.
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    return float(value)
 
 
 class Connector(ABC):
@@ -12,8 +45,12 @@ class Connector(ABC):
 
     Methods:
         list_objects: Retrieves a list of objects from the external system.
+        iter_object_pages: Iterates over all pages of objects in the external system.
         get_object_size: Retrieves the size of a specific object from the external system.
         fetch_object_in_chunks: Retrieves a specific object from the external system in chunks.
+        get_fetch_concurrency: Retrieves how many chunks may be fetched concurrently.
+        get_object_checksum: Retrieves the checksum a downloaded object is verified against.
+        get_local_path: Retrieves the local file of an object, for connectors reading local files.
 
     """
 
@@ -21,6 +58,41 @@ class Connector(ABC):
     def list_objects(self, config, pagination_token=None):
         pass
 
+    def iter_object_pages(self, config):
+        """
+        Iterates over all pages of objects in the external system.
+
+        The default implementation follows the pagination tokens of list_objects;
+        connectors that can list faster, e.g. in parallel, override it.
+
+        Args:
+            config (dict): The configuration for the connector.
+
+        Yields:
+            dict: A dictionary mapping object keys to their sizes, one per page.
+        """
+        pagination_token = None
+        while True:
+            page, pagination_token = self.list_objects(config, pagination_token)
+            yield page
+            if not pagination_token:
+                break
+
+    def listing_cache_key(self, config):
+        """
+        Returns the key under which the listing for the config may be cached.
+
+        Listings are only shared between configs with equal keys, so the key has to
+        cover everything the listing depends on, including the credentials.
+
+        Args:
+            config (dict): The configuration for the connector.
+
+        Returns:
+            tuple: The cache key, or None if listings must not be cached.
+        """
+        return None
+
     @abstractmethod
     def get_object_size(self, config, object_key):
         pass
@@ -28,3 +100,47 @@ class Connector(ABC):
     @abstractmethod
     def fetch_object_in_chunks(self, config, object_key, start_position, object_size):
         pass
+
+    def get_fetch_concurrency(self, config):
+        """
+        Returns how many chunks may be fetched concurrently.
+
+        Connectors whose requests share an adaptive concurrency limit return its
+        current value, so that downloads widen and narrow with it.
+
+        Args:
+            config (dict): The configuration for the connector.
+
+        Returns:
+            int: The number of concurrent fetches, 1 by default.
+        """
+        return 1
+
+    def get_object_checksum(self, config, object_key, object_size):
+        """
+        Returns the checksum a downloaded object is verified against.
+
+        Args:
+            config (dict): The configuration for the connector.
+            object_key (str): The key of the object.
+            object_size (int): The size of the object.
+
+        Returns:
+            dict: The ``algorithm`` and ``value`` of the checksum, see
+                ChecksumCalculator, or None if the object can not be verified.
+        """
+        return None
+
+    def get_local_path(self, config, object_key):
+        """
+        Returns the local file of an object, which sinks copy from without reading it
+        into memory.
+
+        Args:
+            config (dict): The configuration for the connector.
+            object_key (str): The key of the object.
+
+        Returns:
+            str: The path of the file, or None if objects are not local files.
+        """
+        return None
@@ -0,0 +1,295 @@
+import itertools
+import logging
+import os
+import time
+
+from app.src.config.config import Config
+from app.src.services.connector import Connector, ObjectPage
+from app.src.services.metrics import (
+    FETCH_BYTES,
+    FETCH_SECONDS,
+    LIST_OBJECTS,
+    LIST_PAGES,
+    LIST_SECONDS,
+)
+from app.src.services.run_stats import record_run_stat
+from app.src.services.tracing import tracer
+
+
+class FilesystemConnector(Connector):
+    """
+    A class representing a connector for a local folder, e.g. an NFS mount.
+
+    Objects are the regular files under ``root_path``, keyed by their path relative
+    to it with ``/`` separators. Folders are listed with ``os.scandir`` in key
+    order, so that a listing resumes after the last key of the page before. The
+    root path must be within one of ``FILESYSTEM_ALLOWED_ROOTS``, and symbolic links
+    are not followed, so that a job can only read the files it was allowed to.
+
+    Methods:
+        list_objects: Lists a page of the files under the root path.
+        iter_object_pages: Iterates over all pages of files in a single walk.
+        get_object_size: Retrieves the size of a file.
+        fetch_object_in_chunks: Reads a file in chunks.
+        get_local_path: Retrieves the path of a file, which sinks copy in the kernel.
+    """
+
+    def list_objects(self, config, pagination_token=None):
+        """
+        Lists the files under the root path.
+
+        Args:
+            config (dict): The configuration with the ``root_path`` and an optional
+                key ``prefix``.
+            pagination_token (str, optional): The last key of the page before.
+
+        Returns:
+            tuple: A tuple containing a dictionary mapping object keys to their sizes and the next pagination token.
+
+        Raises:
+            Exception: If listing fails, so that an incomplete listing is never taken for a complete one.
+        """
+        try:
+            files = self.__iter_files(config, pagination_token)
+            page = self.__list_page(config, files)
+            next_token = None
+            # The page is only the last one if no file follows it.
+            if next(files, None) is not None:
+                next_token = next(reversed(page))
+            return page, next_token
+        except Exception as e:
+            error_msg = f"Error listing objects: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg) from e
+
+    def iter_object_pages(self, config):
+        """
+        Iterates over all pages of files under the root path, walking the folders
+        once instead of once per page.
+
+        Args:
+            config (dict): The configuration for the connector.
+
+        Yields:
+            dict: A dictionary mapping object keys to their sizes, one per page.
+        """
+        try:
+            files = self.__iter_files(config)
+            while True:
+                page = self.__list_page(config, files)
+                yield page
+                if len(page) < int(Config.FILESYSTEM_PAGE_SIZE):
+                    break
+        except Exception as e:
+            error_msg = f"Error listing objects: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg) from e
+
+    def get_object_size(self, config, object_key):
+        """
+        Retrieves the size of a file.
+
+        Args:
+            config (dict): The configuration for the connector.
+            object_key (str): The key of the file.
+
+        Returns:
+            int: The size of the file in bytes.
+        """
+        try:
+            return os.stat(self.get_local_path(config, object_key)).st_size
+        except Exception as e:
+            error_msg = f"Error getting object size: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg) from e
+
+    def fetch_object_in_chunks(self, config, object_key, start_position, object_size):
+        """
+        Reads a chunk of a file with a single ``pread``.
+
+        Args:
+            config (dict): The configuration for the connector.
+            object_key (str): The key of the file.
+            start_position (int): The starting position of the chunk.
+            object_size (int): The size of the file in bytes.
+
+        Returns:
+            tuple: A tuple containing the data of the chunk and the end position of the chunk.
+        """
+        try:
+            path = self.get_local_path(config, object_key)
+            chunk_size = min(
+                int(eval(Config.S3_CHUNK_SIZE)), object_size - start_position
+            )
+            with (
+                tracer.span("filesystem.read", key=object_key, offset=start_position),
+                FETCH_SECONDS.time(connector="filesystem"),
+            ):
+                record_run_stat("get_requests")
+                fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+                try:
+                    data = os.pread(fd, chunk_size, start_position)
+                finally:
+                    os.close(fd)
+            if len(data) < chunk_size:
+                raise EOFError(f"{path} is shorter than {object_size} bytes")
+            FETCH_BYTES.inc(len(data), connector="filesystem")
+            return data, start_position + len(data)
+        except Exception as e:
+            error_msg = f"Error fetching object in chunks: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg) from e
+
+    def get_local_path(self, config, object_key):
+        """
+        Returns the path of a file by its key, with symbolic links resolved.
+
+        Raises:
+            ValueError: If the root_path in the config is invalid, or the key points
+                outside of it.
+        """
+        root_path = self.__get_root_path(config)
+        path = os.path.realpath(os.path.join(root_path, object_key))
+        if os.path.commonpath([root_path, path]) != root_path or path == root_path:
+            raise ValueError(f"Invalid object key: {object_key}")
+        return path
+
+    def __get_root_path(self, config):
+        """
+        Returns the root path of the configuration, with symbolic links resolved.
+
+        Raises:
+            ValueError: If the root_path is missing in the config, or not allowed.
+        """
+        is_valid, msg = validate_root_path(config.get("root_path"))
+        if not is_valid:
+            raise ValueError(msg)
+        return os.path.realpath(config["root_path"].strip())
+
+    def __list_page(self, config, files):
+        """
+        Takes the next page of files from a walk.
+        """
+        page_start = time.perf_counter()
+        root_path = self.__get_root_path(config)
+        with tracer.span("filesystem.list", root_path=root_path) as span:
+            page = ObjectPage()
+            for object_key, stat in itertools.islice(
+                files, int(Config.FILESYSTEM_PAGE_SIZE)
+            ):
+                page.add(object_key, stat.st_size, last_modified=stat.st_mtime)
+            span.set_attribute("keys", len(page))
+        LIST_SECONDS.observe(time.perf_counter() - page_start, connector="filesystem")
+        LIST_PAGES.inc(connector="filesystem")
+        LIST_OBJECTS.inc(len(page), connector="filesystem")
+        record_run_stat("list_requests")
+        return page
+
+    def __iter_files(self, config, start_after=None):
+        """
+        Walks the files under the root path in key order.
+
+        Args:
+            config (dict): The configuration for the connector.
+            start_after (str, optional): The key the walk starts after.
+
+        Yields:
+            tuple: The key and the ``os.stat_result`` of every file.
+        """
+        root_path = self.__get_root_path(config)
+        if not os.path.isdir(root_path):
+            raise NotADirectoryError(f"root_path {root_path} is not a folder")
+        yield from _walk(
+            root_path, "", config.get("prefix", "").strip(), start_after or ""
+        )
+
+
+def _walk(folder, key_prefix, prefix, start_after):
+    """
+    Yields the files of a folder and its subfolders in key order.
+
+    Siblings are sorted by their name, with a ``/`` appended to folders, which
+    orders them like the keys under them, so that a depth-first walk yields the
+    keys in order. Folders whose keys all sort before ``start_after`` or do not
+    match ``prefix`` are skipped without being listed. Symbolic links are not
+    followed, so that no file outside of the root path is listed.
+
+    Args:
+        folder (str): The folder to walk.
+        key_prefix (str): The key prefix of the folder, ending with ``/``.
+        prefix (str): The prefix of the keys to yield.
+        start_after (str): The key the walk starts after.
+
+    Yields:
+        tuple: The key and the ``os.stat_result`` of every file.
+    """
+    entries = []
+    with os.scandir(folder) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                entries.append((f"{key_prefix}{entry.name}/", entry))
+            elif entry.is_file(follow_symlinks=False):
+                entries.append((f"{key_prefix}{entry.name}", entry))
+    entries.sort(key=lambda item: item[0])
+
+    for key, entry in entries:
+        if not (key.startswith(prefix) or prefix.startswith(key)):
+            continue
+        if key.endswith("/"):
+            # Every key under the folder sorts after the key of the folder itself.
+            if key < start_after and not start_after.startswith(key):
+                continue
+            yield from _walk(entry.path, key, prefix, start_after)
+        elif key > start_after and key.startswith(prefix):
+            try:
+                yield key, entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                # Removed while listing.
+                continue
+
+
+def validate_root_path(root_path):
+    """
+    Validates the root path of a filesystem connector config.
+
+    The root path must be within one of the folders of ``FILESYSTEM_ALLOWED_ROOTS``,
+    separated by ``os.pathsep``, so that jobs can not mirror arbitrary files of the
+    host, and must not overlap the folders the application writes to. Symbolic
+    links are resolved before the paths are compared.
+
+    Args:
+        root_path (str): The root path to be validated.
+
+    Returns:
+        tuple: A tuple containing a boolean value indicating whether the validation
+            passed or not, and an error message if the validation failed.
+    """
+    if not isinstance(root_path, str) or not root_path.strip():
+        return False, "root_path is required for the filesystem connector"
+    path = os.path.realpath(root_path.strip())
+    allowed_roots = [
+        os.path.realpath(allowed_root.strip())
+        for allowed_root in Config.FILESYSTEM_ALLOWED_ROOTS.split(os.pathsep)
+        if allowed_root.strip()
+    ]
+    if not any(_is_within(path, allowed_root) for allowed_root in allowed_roots):
+        return False, (
+            f"root_path {path} is not within the FILESYSTEM_ALLOWED_ROOTS "
+            f"{allowed_roots}"
+        )
+    for folder in (
+        Config.DOWNLOAD_ROOT_FOLDER,
+        Config.JSON_ROOT_FOLDER,
+        Config.SNAPSHOT_ROOT_FOLDER,
+        Config.CONTENT_STORE_FOLDER,
+    ):
+        if not folder:
+            continue
+        folder = os.path.realpath(folder)
+        if _is_within(path, folder) or _is_within(folder, path):
+            return False, f"root_path {path} overlaps the folder {folder}"
+    return True, None
+
+
+def _is_within(path, folder):
+    return os.path.commonpath([path, folder]) == folder
@@ -0,0 +1,565 @@
+import bisect
+import contextvars
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from urllib.parse import quote, unquote, urljoin, urlsplit
+
+import retry
+import urllib3
+
+from app.src.config.config import Config
+from app.src.services.concurrency_controller import (
+    ThrottledError,
+    concurrency_controllers,
+)
+from app.src.services.connector import Connector, ObjectPage
+from app.src.services.metrics import (
+    CONDITIONAL_REQUESTS,
+    FETCH_BYTES,
+    FETCH_RETRIES,
+    FETCH_SECONDS,
+    LIST_OBJECTS,
+    LIST_PAGES,
+    LIST_SECONDS,
+)
+from app.src.services.run_stats import record_run_stat
+from app.src.services.tracing import tracer
+
+
+class ServerError(Exception):
+    """
+    Raised for a 5xx response or a truncated body, which are retried.
+    """
+
+
+RETRYABLE_ERRORS = (urllib3.exceptions.HTTPError, ServerError, ThrottledError)
+THROTTLING_STATUSES = {429, 503}
+
+# The validators of a response and what was taken from it, reused when a
+# conditional request for the same URL is answered with 304 Not Modified.
+CachedResponse = namedtuple("CachedResponse", ["etag", "last_modified", "value"])
+HttpObject = namedtuple("HttpObject", ["key", "size", "etag", "last_modified"])
+
+
+class HttpConnector(Connector):
+    """
+    A class representing a connector for plain HTTP(S) file servers and CDNs.
+
+    Objects are the files under ``base_url``, keyed by their URL path relative to
+    it. They are enumerated from a JSON or line-based manifest at
+    ``manifest_url``, or by crawling the directory index pages under
+    ``base_url``, with a HEAD request for the size of every file the manifest
+    does not list one for. Files are fetched with ``Range`` requests.
+
+    All requests go through a single pool of keep-alive connections per host. The
+    ETag and Last-Modified of every index page, manifest and file are kept, and
+    sent with the next request for it as ``If-None-Match`` and
+    ``If-Modified-Since``, so that an unchanged one costs a 304 response without a
+    body. Range requests carry them as ``If-Range``, so that a file that changed
+    since it was listed is not stitched together from two versions. The connector
+    is shared by all jobs, so the least recently used responses are evicted once
+    more than ``HTTP_VALIDATOR_CACHE_SIZE`` are kept.
+
+    Methods:
+        list_objects: Lists a page of the files under the base URL.
+        iter_object_pages: Iterates over all pages of files, enumerating them once.
+        get_object_size: Retrieves the size of a file.
+        fetch_object_in_chunks: Fetches a file in chunks with range requests.
+        get_fetch_concurrency: Retrieves the concurrency limit of the host.
+    """
+
+    def __init__(self):
+        self.__pool = urllib3.PoolManager(
+            maxsize=int(Config.HTTP_POOL_SIZE),
+            retries=False,
+            timeout=urllib3.Timeout(total=float(Config.HTTP_TIMEOUT)),
+        )
+        self.__responses = OrderedDict()
+        self.__max_responses = int(Config.HTTP_VALIDATOR_CACHE_SIZE)
+        self.__lock = threading.Lock()
+
+    def list_objects(self, config, pagination_token=None):
+        """
+        Lists the files under the base URL.
+
+        Args:
+            config (dict): The configuration with the ``base_url`` and optional
+                ``manifest_url``, ``prefix`` and request ``headers``.
+            pagination_token (str, optional): The last key of the page before.
+
+        Returns:
+            tuple: A tuple containing a dictionary mapping object keys to their sizes and the next pagination token.
+
+        Raises:
+            Exception: If listing fails, so that an incomplete listing is never taken for a complete one.
+        """
+        try:
+            objects = self.__list(config)
+            start = bisect.bisect_right(
+                [o.key for o in objects], pagination_token or ""
+            )
+            page_size = int(Config.HTTP_PAGE_SIZE)
+            page = to_page(objects[start : start + page_size])
+            next_token = None
+            if start + page_size < len(objects):
+                next_token = next(reversed(page))
+            return page, next_token
+        except Exception as e:
+            error_msg = f"Error listing objects: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg) from e
+
+    def iter_object_pages(self, config):
+        """
+        Iterates over all pages of files under the base URL, enumerating them once
+        instead of once per page.
+
+        Args:
+            config (dict): The configuration for the connector.
+
+        Yields:
+            dict: A dictionary mapping object keys to their sizes, one per page.
+        """
+        try:
+            objects = iter(self.__list(config))
+            while True:
+                page = to_page(itertools.islice(objects, int(Config.HTTP_PAGE_SIZE)))
+                yield page
+                if len(page) < int(Config.HTTP_PAGE_SIZE):
+                    break
+        except Exception as e:
+            error_msg = f"Error listing objects: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg) from e
+
+    def get_object_size(self, config, object_key):
+        """
+        Retrieves the size of a file with a conditional HEAD request.
+
+        Args:
+            config (dict): The configuration for the connector.
+            object_key (str): The key of the file.
+
+        Returns:
+            int: The size of the file in bytes.
+        """
+        try:
+            return self.__head(config, object_key).size
+        except Exception as e:
+            error_msg = f"Error getting object size: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg) from e
+
+    def get_fetch_concurrency(self, config):
+        """
+        Returns the current concurrency limit of the host, which bounds how many
+        chunks are fetched concurrently.
+
+        Args:
+            config (dict): The configuration for the connector.
+
+        Returns:
+            int: The number of concurrent fetches.
+        """
+        return concurrency_controllers.get(urlsplit(get_base_url(config)).netloc).limit
+
+    def fetch_object_in_chunks(self, config, object_key, start_position, object_size):
+        """
+        Fetches a chunk of a file with a range request.
+
+        Args:
+            config (dict): The configuration for the connector.
+            object_key (str): The key of the file.
+            start_position (int): The starting position of the chunk.
+            object_size (int): The size of the file in bytes.
+
+        Returns:
+            tuple: A tuple containing the data of the chunk and the end position of the chunk.
+        """
+        try:
+            url = get_object_url(config, object_key)
+            chunk_size = int(eval(Config.S3_CHUNK_SIZE))
+            end_position = min(start_position + chunk_size - 1, object_size - 1)
+            range_header = f"bytes={start_position}-{end_position}"
+            headers = {"Range": range_header}
+            cached = self.__get_cached(url)
+            if cached is not None:
+                # Weak ETags must not be used to combine ranges.
+                validator = (
+                    cached.etag
+                    if cached.etag and not cached.etag.startswith("W/")
+                    else cached.last_modified
+                )
+                if validator:
+                    headers["If-Range"] = validator
+            # A full response is only what was asked for if that is the whole file.
+            is_whole_file = start_position == 0 and end_position == object_size - 1
+            attempts = 0
+
+            def read_range(response):
+                if response.status == 206 or (response.status == 200 and is_whole_file):
+                    return response.read()
+                return None
+
+            @retry.retry(
+                RETRYABLE_ERRORS,
+                tries=int(Config.RETRY_COUNT),
+                delay=int(Config.RETRY_DELAY),
+                backoff=int(Config.RETRY_BACKOFF),
+            )
+            def get_with_retry():
+                nonlocal attempts
+                attempts += 1
+                record_run_stat("get_requests")
+                if attempts > 1:
+                    FETCH_RETRIES.inc(connector="http")
+                    record_run_stat("retry_requests")
+                with tracer.span("http.get.attempt", attempt=attempts):
+                    status, _, data = self.__request(
+                        config, "GET", url, headers, read_range
+                    )
+                if data is not None and len(data) != end_position - start_position + 1:
+                    raise ServerError(f"Truncated response for {url}")
+                return status, data
+
+            with (
+                tracer.span("http.get", url=url, range=range_header) as span,
+                FETCH_SECONDS.time(connector="http"),
+            ):
+                status, data = get_with_retry()
+                if data is None:
+                    raise ValueError(
+                        f"{url} changed since it was listed, or the server does not "
+                        f"support range requests (HTTP {status})"
+                    )
+                span.set_attribute("bytes", len(data))
+                span.set_attribute("attempts", attempts)
+            FETCH_BYTES.inc(len(data), connector="http")
+            return data, end_position + 1
+        except Exception as e:
+            error_msg = f"Error fetching object in chunks: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg) from e
+
+    def __list(self, config):
+        """
+        Enumerates the files under the base URL, sorted by key.
+
+        Returns:
+            list: The HttpObject of every file.
+        """
+        base_url = get_base_url(config)
+        prefix = config.get("prefix", "").strip()
+        page_start = time.perf_counter()
+        with tracer.span("http.list", base_url=base_url, prefix=prefix) as span:
+            if config.get("manifest_url"):
+                objects = self.__read_manifest(config, base_url)
+            else:
+                objects = self.__crawl(config, base_url, prefix)
+            objects = [o for o in objects if o.key.startswith(prefix)]
+            unsized_keys = [o.key for o in objects if o.size is None]
+            if unsized_keys:
+                heads = dict(zip(unsized_keys, self.__head_all(config, unsized_keys)))
+                objects = [heads.get(o.key, o) for o in objects]
+            objects.sort(key=lambda o: o.key)
+            span.set_attribute("keys", len(objects))
+        LIST_SECONDS.observe(time.perf_counter() - page_start, connector="http")
+        LIST_OBJECTS.inc(len(objects), connector="http")
+        return objects
+
+    def __read_manifest(self, config, base_url):
+        """
+        Reads the files listed in the manifest.
+
+        The manifest is either a JSON list, or a JSON object with an ``objects``
+        list, of keys or of objects with a ``key`` and optionally a ``size``,
+        ``etag`` and ``last_modified``; or a text file with a key per line.
+        """
+
+        def parse(data, url):
+            try:
+                entries = json.loads(data)
+            except ValueError:
+                entries = data.decode("utf-8").splitlines()
+            if isinstance(entries, dict):
+                entries = entries.get("objects", [])
+            objects = list()
+            for entry in entries:
+                if isinstance(entry, str):
+                    entry = {"key": entry}
+                key = str(entry.get("key", "")).strip().lstrip("/")
+                if not key or key.startswith("#"):
+                    continue
+                size = entry.get("size")
+                objects.append(
+                    HttpObject(
+                        key,
+                        int(size) if size is not None else None,
+                        entry.get("etag"),
+                        entry.get("last_modified"),
+                    )
+                )
+            return objects
+
+        return self.__get_page(config, config["manifest_url"].strip(), parse)
+
+    def __crawl(self, config, base_url, prefix):
+        """
+        Crawls the directory index pages under the base URL for files.
+
+        Only links under the base URL are followed, and folders that can not hold
+        keys with the prefix are skipped.
+        """
+        objects = list()
+        folders = [base_url]
+        seen = {base_url}
+        while folders:
+            for url in self.__get_page(config, folders.pop(), parse_index):
+                key = unquote(url[len(base_url) :])
+                if url in seen or not url.startswith(base_url) or not key:
+                    continue
+                seen.add(url)
+                if not (key.startswith(prefix) or prefix.startswith(key)):
+                    continue
+                if url.endswith("/"):
+                    folders.append(url)
+                else:
+                    objects.append(HttpObject(key, None, None, None))
+        return objects
+
+    def __head_all(self, config, object_keys):
+        """
+        Sends the HEAD requests of files concurrently over the connection pool.
+        """
+        with ThreadPoolExecutor(
+            max_workers=int(Config.HTTP_POOL_SIZE), thread_name_prefix="http-head"
+        ) as executor:
+            # Every request runs in a copy of the current context, so that it is
+            # counted towards the current run and traced under it.
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, self.__head, config, object_key
+                )
+                for object_key in object_keys
+            ]
+            return [future.result() for future in futures]
+
+    def __head(self, config, object_key):
+        """
+        Returns the size and validators of a file, from a conditional HEAD request.
+        """
+        url = get_object_url(config, object_key)
+
+        @retry.retry(
+            RETRYABLE_ERRORS,
+            tries=int(Config.RETRY_COUNT),
+            delay=int(Config.RETRY_DELAY),
+            backoff=int(Config.RETRY_BACKOFF),
+        )
+        def head_with_retry():
+            record_run_stat("get_requests")
+            return self.__conditional_request(
+                config, "HEAD", url, lambda response: get_content_length(response, url)
+            )
+
+        size, etag, last_modified = head_with_retry()
+        return HttpObject(object_key, size, etag, last_modified)
+
+    def __get_page(self, config, url, parse):
+        """
+        Returns the parsed body of an index page or manifest, from a conditional
+        GET request.
+        """
+
+        @retry.retry(
+            RETRYABLE_ERRORS,
+            tries=int(Config.RETRY_COUNT),
+            delay=int(Config.RETRY_DELAY),
+            backoff=int(Config.RETRY_BACKOFF),
+        )
+        def get_with_retry():
+            record_run_stat("list_requests")
+            LIST_PAGES.inc(connector="http")
+            return self.__conditional_request(
+                config,
+                "GET",
+                url,
+                lambda response: parse(response.read(), url),
+            )
+
+        return get_with_retry()[0]
+
+    def __conditional_request(self, config, method, url, read):
+        """
+        Sends a request with the validators of the last response for the URL, and
+        reuses what was read from that response if it was not modified.
+
+        Returns:
+            tuple: The value read from the response, its ETag and Last-Modified.
+        """
+        cached = self.__get_cached(url)
+        headers = dict()
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        status, response_headers, value = self.__request(
+            config,
+            method,
+            url,
+            headers,
+            lambda response: read(response) if response.status == 200 else None,
+        )
+        if status == 304 and cached is not None:
+            CONDITIONAL_REQUESTS.inc(connector="http", result="not_modified")
+            return cached.value, cached.etag, cached.last_modified
+        if status != 200:
+            raise ValueError(f"Unexpected HTTP {status} for {method} {url}")
+        if cached is not None:
+            CONDITIONAL_REQUESTS.inc(connector="http", result="modified")
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if etag or last_modified:
+            with self.__lock:
+                self.__responses[url] = CachedResponse(etag, last_modified, value)
+                self.__responses.move_to_end(url)
+                while len(self.__responses) > self.__max_responses:
+                    self.__responses.popitem(last=False)
+        return value, etag, last_modified
+
+    def __get_cached(self, url):
+        with self.__lock:
+            cached = self.__responses.get(url)
+            if cached is not None:
+                self.__responses.move_to_end(url)
+            return cached
+
+    def __request(self, config, method, url, headers, read):
+        """
+        Sends a single request over the connection pool, within the adaptive
+        concurrency limit of its host.
+
+        Throttling responses are raised as ThrottledError and server errors as
+        ServerError, both of which are retried.
+
+        Args:
+            config (dict): The configuration, whose ``headers`` are added to the
+                request, e.g. for authorization.
+            method (str): The HTTP method.
+            url (str): The URL.
+            headers (dict): The headers of the request.
+            read (callable): Reads the value of the response, e.g. its body.
+
+        Returns:
+            tuple: The status, the headers and the value read from the response.
+        """
+        with concurrency_controllers.get(urlsplit(url).netloc).slot():
+            response = self.__pool.request(
+                method,
+                url,
+                headers={**config.get("headers", {}), **headers},
+                preload_content=False,
+            )
+            value = None
+            try:
+                if response.status in THROTTLING_STATUSES:
+                    raise ThrottledError(f"HTTP {response.status} for {url}")
+                if response.status >= 500:
+                    raise ServerError(f"HTTP {response.status} for {url}")
+                value = read(response)
+                return response.status, response.headers, value
+            finally:
+                if value is None and method != "HEAD" and response.status != 304:
+                    # Unwanted bodies, e.g. of a whole file, are dropped with their
+                    # connection instead of being read to reuse it.
+                    response.close()
+                else:
+                    response.drain_conn()
+                response.release_conn()
+
+
+class IndexParser(HTMLParser):
+    """
+    Collects the targets of the links of a directory index page.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.links = list()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+
+
+def parse_index(data, url):
+    """
+    Returns the absolute URLs an index page links to, without queries or fragments,
+    e.g. the sort links of Apache and nginx indexes.
+    """
+    parser = IndexParser()
+    parser.feed(data.decode("utf-8", errors="replace"))
+    links = list()
+    for href in parser.links:
+        link = urlsplit(urljoin(url, href))
+        if link.query:
+            continue
+        links.append(link._replace(fragment="").geturl())
+    return links
+
+
+def get_base_url(config):
+    """
+    Returns the base URL of the configuration, ending with ``/``.
+
+    Raises:
+        ValueError: If neither a base_url nor a manifest_url is configured.
+    """
+    base_url = str(config.get("base_url", "")).strip()
+    if not base_url and config.get("manifest_url"):
+        # Keys are relative to the folder of the manifest.
+        base_url = urljoin(config["manifest_url"].strip(), ".")
+    if not base_url:
+        raise ValueError("Missing base_url in config")
+    return base_url if base_url.endswith("/") else base_url + "/"
+
+
+def get_object_url(config, object_key):
+    """
+    Returns the URL of a file by its key.
+    """
+    return get_base_url(config) + quote(object_key)
+
+
+def get_content_length(response, url):
+    content_length = response.headers.get("Content-Length")
+    if content_length is None:
+        raise ValueError(f"No Content-Length for {url}")
+    return int(content_length)
+
+
+def to_page(objects):
+    """
+    Returns the ObjectPage of files, with their Last-Modified times.
+
+    ETags are not reported, as HTTP servers derive them from e.g. the modification
+    time and size instead of the content, so they can not identify the content of
+    objects in the content store.
+    """
+    page = ObjectPage()
+    for object in objects:
+        last_modified = object.last_modified
+        if isinstance(last_modified, str) and not last_modified[:1].isdigit():
+            last_modified = parsedate_to_datetime(last_modified)
+        page.add(object.key, object.size, last_modified=last_modified)
+    return page
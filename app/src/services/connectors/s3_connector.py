@@ -1,12 +1,44 @@
 import boto3
 import botocore
-from botocore.exceptions import BotoCoreError
+from botocore.exceptions import BotoCoreError, ClientError
+import contextvars
+import hashlib
 import os
 import logging
+import queue
+import threading
 import retry
+from concurrent.futures import ThreadPoolExecutor
 
 from app.src.config.config import Config
-from app.src.services.connector import Connector
+from app.src.services.concurrency_controller import (
+    ThrottledError,
+    concurrency_controllers,
+)
+from app.src.services.connector import Connector, ObjectPage
+from app.src.services.connectors.s3_inventory import S3InventoryReader
+from app.src.services.metrics import (
+    FETCH_BYTES,
+    FETCH_RETRIES,
+    FETCH_SECONDS,
+    LIST_OBJECTS,
+    LIST_PAGES,
+    LIST_SECONDS,
+)
+from app.src.services.run_stats import record_run_stat
+from app.src.services.tracing import tracer
+
+
+# Throttling ClientErrors are raised as ThrottledError, so that they are retried too.
+RETRYABLE_ERRORS = (BotoCoreError, ThrottledError)
+THROTTLING_ERROR_CODES = {
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "ServiceUnavailable",
+}
 
 
 class S3Connector(Connector):
@@ -21,14 +53,21 @@ class S3Connector(Connector):
 
     Methods:
         list_objects: Lists objects in an S3 bucket.
+        iter_object_pages: Iterates over all pages of objects, listing shards in parallel if configured.
         get_object_size: Retrieves the size of an object in an S3 bucket.
         fetch_object_in_chunks: Fetches an object from an S3 bucket in chunks.
+        get_fetch_concurrency: Retrieves the concurrency limit of the bucket and prefix.
+        get_object_checksum: Retrieves the checksum of an object in an S3 bucket.
     """
 
     def __init__(self):
         session = boto3.Session()
         credentials = session.get_credentials()
         region = os.environ.get("AWS_REGION", "us-west-2")
+        # Identifies the credentials in listing cache keys without holding the key id.
+        self.__credentials_id = hashlib.sha256(
+            f"{credentials.access_key}:{region}".encode()
+        ).hexdigest()[:16]
         self.s3_client = session.client(
             "s3",
             region_name=region,
@@ -48,47 +87,320 @@ class S3Connector(Connector):
 
         Returns:
             tuple: A tuple containing a dictionary mapping object keys to their sizes and the next pagination token.
+
+        Raises:
+            Exception: If listing fails, so that an incomplete listing is never taken for a complete one.
         """
         try:
             self.__validate_bucket_name(config)
             bucket_name = config["bucket_name"].strip()
             logging.info(f"Listing objects in bucket: {bucket_name}")
             prefix = config.get("prefix", "").strip()
+            params = {"Bucket": bucket_name, "Prefix": prefix}
+            if pagination_token:
+                # A retried page is requested again from the same continuation token.
+                params["ContinuationToken"] = pagination_token
 
-            @retry.retry(
-                BotoCoreError,
-                tries=int(Config.RETRY_COUNT),
-                delay=int(Config.RETRY_DELAY),
-                backoff=int(Config.RETRY_BACKOFF),
-            )
-            def pagination_with_retry():
-                return self.s3_client.get_paginator("list_objects_v2")
-
-            paginator = pagination_with_retry()
-            response_iterator = paginator.paginate(
-                Bucket=bucket_name,
-                Prefix=prefix,
-                PaginationConfig={"StartingToken": pagination_token},
+            with tracer.span(
+                "s3.list_objects_v2", bucket=bucket_name, prefix=prefix
+            ) as span:
+                response = self.__list_page(params, _target(bucket_name, prefix))
+                bucket_object_key_size_map = ObjectPage()
+                for obj in response.get("Contents", []):
+                    bucket_object_key_size_map.add(
+                        obj["Key"],
+                        obj["Size"],
+                        obj.get("ETag"),
+                        obj.get("LastModified"),
+                    )
+                span.set_attribute("keys", len(bucket_object_key_size_map))
+            return bucket_object_key_size_map, response.get("NextContinuationToken")
+
+        except Exception as e:
+            error_msg = f"Error listing objects: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg)
+
+    def iter_object_pages(self, config):
+        """
+        Iterates over all pages of objects in an S3 bucket.
+
+        If ``inventory_manifest`` is set in the config, the objects are read from that
+        S3 Inventory report instead of being listed. If ``parallel_listing`` is set in
+        the config, the key space is split into shards which are listed concurrently
+        and whose pages are yielded as they arrive. Shards are the common prefixes
+        under the configured prefix (``delimiter``, defaults to "/"); if there are
+        fewer than two, the key space is split into key ranges listed with
+        ``StartAfter``. Otherwise the bucket is listed sequentially.
+
+        Args:
+            config (dict): The configuration for the S3 bucket.
+
+        Yields:
+            dict: A dictionary mapping object keys to their sizes, one per page.
+
+        Raises:
+            Exception: If listing any of the shards fails.
+        """
+        if config.get("inventory_manifest"):
+            yield from S3InventoryReader(self.__read_object).iter_pages(config)
+            return
+        if not config.get("parallel_listing"):
+            yield from super().iter_object_pages(config)
+            return
+
+        self.__validate_bucket_name(config)
+        bucket_name = config["bucket_name"].strip()
+        prefix = config.get("prefix", "").strip()
+        delimiter = config.get("delimiter", "/")
+        with tracer.span(
+            "s3.discover_shards", bucket=bucket_name, prefix=prefix
+        ) as span:
+            shards, top_level_page = self.__discover_shards(
+                bucket_name, prefix, delimiter, int(Config.LIST_SHARDS)
             )
+            span.set_attribute("shards", len(shards))
+        logging.info(
+            f"Listing bucket {bucket_name} in {len(shards)} shards under prefix '{prefix}'"
+        )
+        if top_level_page:
+            yield top_level_page
+        yield from self.__iter_shards_in_parallel(
+            bucket_name, shards, _target(bucket_name, prefix)
+        )
 
-            bucket_object_key_size_map = dict()
-            next_start_token = None
-            for response in response_iterator:
-                if "Contents" in response:
-                    bucket_objects = response["Contents"]
-                    bucket_object_key_size_map.update(
-                        {obj["Key"]: obj["Size"] for obj in bucket_objects}
-                    )
-                if "NextContinuationToken" in response:
-                    next_start_token = response["NextContinuationToken"]
-                    break
-                elif "IsTruncated" in response and not response["IsTruncated"]:
+    def listing_cache_key(self, config):
+        """
+        Returns the key under which the listing for the config may be cached.
+
+        Args:
+            config (dict): The configuration for the S3 bucket.
+
+        Returns:
+            tuple: The credentials, bucket, prefix and inventory manifest of the listing.
+        """
+        return (
+            "S3",
+            self.__credentials_id,
+            config.get("bucket_name", "").strip(),
+            config.get("prefix", "").strip(),
+            config.get("inventory_manifest", "").strip(),
+        )
+
+    def __discover_shards(self, bucket_name, prefix, delimiter, shard_count):
+        """
+        Splits the key space under a prefix into shards that can be listed independently.
+
+        A single delimited LIST request discovers the common prefixes; if it returns all
+        of them and there are at least two, every common prefix becomes a shard and the
+        objects directly under the prefix are returned as a page of their own. Otherwise
+        the key space is split into key ranges.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            prefix (str): The prefix to be listed.
+            delimiter (str): The delimiter used to discover the common prefixes.
+            shard_count (int): The number of key ranges to split into.
+
+        Returns:
+            tuple: A list of (prefix, start_after, end_key) shards and the page of
+                objects not covered by any shard.
+        """
+        response = self.__list_page(
+            {"Bucket": bucket_name, "Prefix": prefix, "Delimiter": delimiter},
+            _target(bucket_name, prefix),
+        )
+        common_prefixes = [
+            common_prefix["Prefix"]
+            for common_prefix in response.get("CommonPrefixes", [])
+        ]
+        if len(common_prefixes) >= 2 and not response.get("IsTruncated"):
+            top_level_page = ObjectPage()
+            for obj in response.get("Contents", []):
+                top_level_page.add(
+                    obj["Key"], obj["Size"], obj.get("ETag"), obj.get("LastModified")
+                )
+            return [
+                (common_prefix, None, None) for common_prefix in common_prefixes
+            ], top_level_page
+        return split_key_range(prefix, shard_count), ObjectPage()
+
+    def __iter_shards_in_parallel(self, bucket_name, shards, target):
+        """
+        Lists shards concurrently and yields their pages as they arrive.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            shards (list): The (prefix, start_after, end_key) shards to be listed.
+            target (str): The bucket and prefix whose concurrency limit the requests share.
+
+        Yields:
+            dict: A dictionary mapping object keys to their sizes, one per page.
+        """
+        max_workers = min(int(Config.LIST_MAX_WORKERS), len(shards))
+        # Bounded, so that listing cannot run arbitrarily far ahead of the downloads.
+        pages = queue.Queue(maxsize=max_workers * 2)
+        stop_event = threading.Event()
+        shard_done = object()
+
+        def put(item):
+            while not stop_event.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def list_shard(shard):
+            try:
+                for page in self.__iter_shard_pages(bucket_name, shard, target):
+                    if not put(page):
+                        return
+                put(shard_done)
+            except Exception as e:
+                put(e)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="s3-lister"
+        )
+        try:
+            for shard in shards:
+                # Every shard runs in a copy of the current context, so that its
+                # requests are counted towards the current run and traced under it.
+                executor.submit(contextvars.copy_context().run, list_shard, shard)
+            pending_shards = len(shards)
+            while pending_shards:
+                item = pages.get()
+                if item is shard_done:
+                    pending_shards -= 1
+                elif isinstance(item, Exception):
+                    raise Exception(f"Error listing objects: {item}")
+                else:
+                    yield item
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __iter_shard_pages(self, bucket_name, shard, target):
+        """
+        Lists a single shard page by page.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            shard (tuple): The prefix, the key to start after and the last key of the shard.
+            target (str): The bucket and prefix whose concurrency limit the requests share.
+
+        Yields:
+            dict: A dictionary mapping object keys to their sizes, one per page.
+        """
+        prefix, start_after, end_key = shard
+        params = {"Bucket": bucket_name, "Prefix": prefix}
+        if start_after:
+            params["StartAfter"] = start_after
+        while True:
+            response = self.__list_page(params, target)
+            page = ObjectPage()
+            reached_end = False
+            for obj in response.get("Contents", []):
+                if end_key is not None and obj["Key"] > end_key:
+                    reached_end = True
                     break
-            return bucket_object_key_size_map, next_start_token
+                page.add(
+                    obj["Key"], obj["Size"], obj.get("ETag"), obj.get("LastModified")
+                )
+            if page:
+                yield page
+            if reached_end or not response.get("IsTruncated"):
+                return
+            params["ContinuationToken"] = response["NextContinuationToken"]
 
-        except Exception as e:
-            logging.error(f"Error listing objects: {e}")
-            return [], None
+    def __list_page(self, params, target):
+        """
+        Issues a single list_objects_v2 request with retries.
+
+        Args:
+            params (dict): The parameters of the request.
+            target (str): The bucket and prefix whose concurrency limit the request shares.
+
+        Returns:
+            dict: The list_objects_v2 response.
+        """
+
+        @retry.retry(
+            RETRYABLE_ERRORS,
+            tries=int(Config.RETRY_COUNT),
+            delay=int(Config.RETRY_DELAY),
+            backoff=int(Config.RETRY_BACKOFF),
+        )
+        def list_objects_with_retry():
+            record_run_stat("list_requests")
+            return self.__request(target, self.s3_client.list_objects_v2, **params)
+
+        with LIST_SECONDS.time(connector="s3"):
+            response = list_objects_with_retry()
+        LIST_PAGES.inc(connector="s3")
+        LIST_OBJECTS.inc(len(response.get("Contents", [])), connector="s3")
+        return response
+
+    def __read_object(self, bucket_name, object_key, read):
+        """
+        Reads an object with retries, e.g. a file of an inventory report.
+
+        The body is read within the concurrency slot of the request and within the
+        retries, so that errors while streaming it are retried too.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            object_key (str): The key of the object.
+            read (callable): Reads the value from the streaming body of the object.
+
+        Returns:
+            The value read from the body.
+        """
+
+        @retry.retry(
+            RETRYABLE_ERRORS,
+            tries=int(Config.RETRY_COUNT),
+            delay=int(Config.RETRY_DELAY),
+            backoff=int(Config.RETRY_BACKOFF),
+        )
+        def read_object_with_retry():
+            record_run_stat("get_requests")
+            return self.__request(
+                _target(bucket_name, ""),
+                lambda: read(
+                    self.s3_client.get_object(Bucket=bucket_name, Key=object_key)[
+                        "Body"
+                    ]
+                ),
+            )
+
+        return read_object_with_retry()
+
+    def __request(self, target, operation, *args, **kwargs):
+        """
+        Sends a single request within the adaptive concurrency limit of its target.
+
+        Throttling responses are raised as ThrottledError, which lowers the limit and
+        is retried like other transient errors.
+
+        Args:
+            target (str): The bucket and prefix whose concurrency limit the request shares.
+            operation (callable): The function sending the request.
+            *args: The positional arguments of the operation.
+            **kwargs: The keyword arguments of the operation.
+
+        Returns:
+            The response of the operation.
+        """
+        with concurrency_controllers.get(target).slot():
+            try:
+                return operation(*args, **kwargs)
+            except ClientError as e:
+                if is_throttling_error(e):
+                    raise ThrottledError(str(e)) from e
+                raise
 
     def __validate_bucket_name(self, config):
         """
@@ -119,13 +431,19 @@ class S3Connector(Connector):
             bucket_name = config["bucket_name"]
 
             @retry.retry(
-                BotoCoreError,
+                RETRYABLE_ERRORS,
                 tries=int(Config.RETRY_COUNT),
                 delay=int(Config.RETRY_DELAY),
                 backoff=int(Config.RETRY_BACKOFF),
             )
             def head_object_with_retry(bucket_name, object_key):
-                return self.s3_client.head_object(Bucket=bucket_name, Key=object_key)
+                record_run_stat("get_requests")
+                return self.__request(
+                    _target(bucket_name, config.get("prefix", "").strip()),
+                    self.s3_client.head_object,
+                    Bucket=bucket_name,
+                    Key=object_key,
+                )
 
             response = head_object_with_retry(bucket_name, object_key)
             return response["ContentLength"]
@@ -134,6 +452,70 @@ class S3Connector(Connector):
             logging.error(error_msg)
             raise Exception(error_msg)
 
+    def get_object_checksum(self, config, object_key, object_size):
+        """
+        Retrieves the checksum of an object in an S3 bucket.
+
+        The first part of the object is requested with HEAD, which returns the
+        additional checksum of single part objects, and the number and size of the
+        parts of multipart uploads, from which their ETag can be recomputed. ETags
+        are not the MD5 of the content for objects encrypted with SSE-KMS or SSE-C,
+        and multipart ETags can only be recomputed if all parts but the last one
+        have the same size, so those objects are not verified.
+
+        Args:
+            config (dict): The configuration for the S3 bucket.
+            object_key (str): The key of the object in the S3 bucket.
+            object_size (int): The size of the object in bytes.
+
+        Returns:
+            dict: The algorithm, value and part size of the checksum, or None.
+        """
+        try:
+            self.__validate_bucket_name(config)
+            bucket_name = config["bucket_name"].strip()
+
+            @retry.retry(
+                RETRYABLE_ERRORS,
+                tries=int(Config.RETRY_COUNT),
+                delay=int(Config.RETRY_DELAY),
+                backoff=int(Config.RETRY_BACKOFF),
+            )
+            def head_object_with_retry(bucket_name, object_key):
+                record_run_stat("get_requests")
+                return self.__request(
+                    _target(bucket_name, config.get("prefix", "").strip()),
+                    self.s3_client.head_object,
+                    Bucket=bucket_name,
+                    Key=object_key,
+                    PartNumber=1,
+                    ChecksumMode="ENABLED",
+                )
+
+            response = head_object_with_retry(bucket_name, object_key)
+            return get_checksum_from_head(response, object_size)
+        except Exception as e:
+            error_msg = f"Error getting object checksum: {e}"
+            logging.error(error_msg)
+            raise Exception(error_msg)
+
+    def get_fetch_concurrency(self, config):
+        """
+        Returns the current concurrency limit of the bucket and prefix, which bounds
+        how many chunks are fetched concurrently.
+
+        Args:
+            config (dict): The configuration for the S3 bucket.
+
+        Returns:
+            int: The number of concurrent fetches.
+        """
+        return concurrency_controllers.get(
+            _target(
+                config.get("bucket_name", "").strip(), config.get("prefix", "").strip()
+            )
+        ).limit
+
     def fetch_object_in_chunks(self, config, object_key, start_position, object_size):
         """
         Fetches an object from an S3 bucket in chunks.
@@ -152,26 +534,124 @@ class S3Connector(Connector):
             bucket_name = config["bucket_name"].strip()
             chunk_size = int(eval(Config.S3_CHUNK_SIZE))
             end_position = min(start_position + chunk_size - 1, object_size - 1)
-            logging.info(
-                f"Fetching data for {object_key} from {start_position} to {end_position}"
+            logging.debug(
+                "Fetching data for %s from %s to %s",
+                object_key,
+                start_position,
+                end_position,
             )
             range_header = f"bytes={start_position}-{end_position}"
+            attempts = 0
 
             @retry.retry(
-                BotoCoreError,
+                RETRYABLE_ERRORS,
                 tries=int(Config.RETRY_COUNT),
                 delay=int(Config.RETRY_DELAY),
                 backoff=int(Config.RETRY_BACKOFF),
             )
             def get_object_with_retry(bucket_name, object_key, range_header):
-                return self.s3_client.get_object(
-                    Bucket=bucket_name, Key=object_key, Range=range_header
-                )
+                nonlocal attempts
+                attempts += 1
+                record_run_stat("get_requests")
+                if attempts > 1:
+                    FETCH_RETRIES.inc(connector="s3")
+                    record_run_stat("retry_requests")
+                with tracer.span("s3.get_object.attempt", attempt=attempts):
+                    # The body is read within the slot, so that the concurrency
+                    # limit and the latency cover the whole transfer, and errors
+                    # while streaming it are retried.
+                    return self.__request(
+                        _target(bucket_name, config.get("prefix", "").strip()),
+                        lambda: self.s3_client.get_object(
+                            Bucket=bucket_name, Key=object_key, Range=range_header
+                        )["Body"].read(),
+                    )
 
-            response = get_object_with_retry(bucket_name, object_key, range_header)
-            data = response["Body"].read()
+            with (
+                tracer.span(
+                    "s3.get_object", key=object_key, range=range_header
+                ) as span,
+                FETCH_SECONDS.time(connector="s3"),
+            ):
+                data = get_object_with_retry(bucket_name, object_key, range_header)
+                span.set_attribute("bytes", len(data))
+                span.set_attribute("attempts", attempts)
+            FETCH_BYTES.inc(len(data), connector="s3")
             return data, end_position + 1
         except Exception as e:
             error_msg = f"Error fetching object in chunks: {e}"
             logging.error(error_msg)
             raise Exception(error_msg)
+
+
+def split_key_range(prefix, shard_count):
+    """
+    Splits the keys under a prefix into contiguous key ranges.
+
+    The ranges are split on the first character after the prefix, spread evenly
+    over the printable ASCII range. The first range starts at the beginning of the
+    prefix and the last one is unbounded, so that every key falls in exactly one range.
+
+    Args:
+        prefix (str): The prefix to be split.
+        shard_count (int): The number of ranges to split into.
+
+    Returns:
+        list: The (prefix, start_after, end_key) ranges, where a range holds the keys
+            greater than start_after and not greater than end_key.
+    """
+    first_char, last_char = ord("!"), ord("~")
+    step = (last_char - first_char + 1) / max(shard_count, 1)
+    boundaries = sorted(
+        {
+            prefix + chr(first_char + int(step * i))
+            for i in range(1, max(shard_count, 1))
+        }
+    )
+    starts = [None] + boundaries
+    ends = boundaries + [None]
+    return [(prefix, start, end) for start, end in zip(starts, ends)]
+
+
+def get_checksum_from_head(response, object_size):
+    """
+    Returns the checksum to verify an object against from the response of a HEAD
+    request for its first part, see S3Connector.get_object_checksum.
+    """
+    parts_count = response.get("PartsCount")
+    if not parts_count:
+        # Requested by part, multipart objects return the checksum of the part.
+        for algorithm in ("sha256", "sha1", "crc32"):
+            value = response.get(f"Checksum{algorithm.upper()}")
+            if value:
+                return {"algorithm": algorithm, "value": value}
+
+    if (
+        response.get("SSECustomerAlgorithm")
+        or response.get("ServerSideEncryption") == "aws:kms"
+    ):
+        return None
+    etag = response.get("ETag", "").strip('"')
+    if not etag:
+        return None
+    if not parts_count:
+        return None if "-" in etag else {"algorithm": "md5", "value": etag}
+
+    part_size = int(response["ContentLength"])
+    if part_size <= 0 or -(-int(object_size) // part_size) != parts_count:
+        return None
+    return {"algorithm": "md5-multipart", "value": etag, "part_size": part_size}
+
+
+def is_throttling_error(error):
+    """
+    Returns whether a ClientError is S3 asking to slow down.
+    """
+    response = getattr(error, "response", None) or {}
+    code = response.get("Error", {}).get("Code")
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in THROTTLING_ERROR_CODES or status in (429, 503)
+
+
+def _target(bucket_name, prefix):
+    return f"{bucket_name}/{prefix}"
@@ -0,0 +1,239 @@
+import codecs
+import csv
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+from urllib.parse import unquote_plus
+
+from app.src.config.config import Config
+from app.src.services.connector import ObjectPage
+from app.src.services.metrics import LIST_OBJECTS
+from app.src.services.tracing import tracer
+
+
+CSV_FORMAT = "CSV"
+ORC_FORMAT = "ORC"
+PARQUET_FORMAT = "PARQUET"
+
+
+class S3InventoryReader:
+    """
+    Enumerates a bucket from an S3 Inventory report instead of LIST requests.
+
+    An inventory report consists of a ``manifest.json`` and the data files it
+    references, which hold one row per object. The manifest is read either from an
+    ``s3://bucket/key`` URI, in which case the data files are read from the
+    destination bucket of the report, or from a local path, in which case the data
+    files are looked up relative to the folder of the manifest.
+
+    CSV (optionally gzipped) data files are read natively, ORC and Parquet require
+    the ``pyarrow`` package.
+
+    Args:
+        read_object (callable): Reads a report stored in S3, called with its bucket,
+            its key and a function reading the value from its streaming body.
+    """
+
+    def __init__(self, read_object):
+        self.__read_object = read_object
+
+    def iter_pages(self, config):
+        """
+        Iterates over the objects listed in the inventory report, in pages.
+
+        Objects outside the configured prefix, delete markers and non-current versions
+        are left out.
+
+        Args:
+            config (dict): The configuration for the S3 bucket, ``inventory_manifest``
+                is the location of the manifest.
+
+        Yields:
+            dict: A dictionary mapping object keys to their sizes, one per page.
+
+        Raises:
+            ValueError: If the report is of another bucket than ``bucket_name``.
+        """
+        manifest_location = config["inventory_manifest"].strip()
+        prefix = config.get("prefix", "").strip()
+        page_size = int(Config.INVENTORY_PAGE_SIZE)
+
+        with tracer.span("s3.read_inventory_manifest", manifest=manifest_location):
+            manifest = json.loads(self.__read_manifest(manifest_location))
+        source_bucket = manifest.get("sourceBucket")
+        bucket_name = config.get("bucket_name", "").strip()
+        if source_bucket and bucket_name and source_bucket != bucket_name:
+            raise ValueError(
+                f"Inventory {manifest_location} is of bucket {source_bucket}, "
+                f"not {bucket_name}"
+            )
+        file_format = manifest.get("fileFormat", CSV_FORMAT).upper()
+        columns = [normalize_column(name) for name in manifest["fileSchema"].split(",")]
+        data_files = manifest.get("files", [])
+        logging.info(
+            f"Reading {len(data_files)} {file_format} inventory files from {manifest_location}"
+        )
+
+        page = ObjectPage()
+        for data_file in data_files:
+            with tracer.span(
+                "s3.read_inventory_file", key=data_file["key"], format=file_format
+            ) as span:
+                rows = 0
+                for object_key, object_size, etag, last_modified in self.__iter_objects(
+                    manifest_location, manifest, data_file, file_format, columns
+                ):
+                    rows += 1
+                    if not object_key.startswith(prefix):
+                        continue
+                    page.add(object_key, object_size, etag, last_modified)
+                    if len(page) >= page_size:
+                        LIST_OBJECTS.inc(len(page), connector="s3_inventory")
+                        yield page
+                        page = ObjectPage()
+                span.set_attribute("rows", rows)
+        if page:
+            LIST_OBJECTS.inc(len(page), connector="s3_inventory")
+            yield page
+
+    def __iter_objects(
+        self, manifest_location, manifest, data_file, file_format, columns
+    ):
+        with self.__open_data_file(manifest_location, manifest, data_file) as f:
+            if file_format == CSV_FORMAT:
+                rows = iter_csv_rows(f, data_file["key"], columns)
+            elif file_format in (ORC_FORMAT, PARQUET_FORMAT):
+                rows = iter_columnar_rows(f, file_format)
+            else:
+                raise ValueError(f"Unsupported inventory format: {file_format}")
+            for row in rows:
+                if str(row.get("isdeletemarker", "false")).lower() == "true":
+                    continue
+                if str(row.get("islatest", "true")).lower() != "true":
+                    continue
+                yield (
+                    row["key"],
+                    int(row.get("size") or 0),
+                    row.get("etag"),
+                    row.get("lastmodifieddate"),
+                )
+
+    def __read_manifest(self, manifest_location):
+        if manifest_location.startswith("s3://"):
+            bucket_name, key = parse_s3_uri(manifest_location)
+            return self.__read_object(bucket_name, key, lambda body: body.read())
+        with open(manifest_location, "rb") as f:
+            return f.read()
+
+    def __open_data_file(self, manifest_location, manifest, data_file):
+        """
+        Opens a data file of the report as a seekable binary file.
+
+        Files stored in S3 are streamed to a temporary file first, which is removed
+        once it is closed. An interrupted stream starts over in a new file.
+        """
+        if not manifest_location.startswith("s3://"):
+            return open(self.__get_local_path(manifest_location, data_file), "rb")
+
+        bucket_name = manifest.get("destinationBucket", "").split(":::")[-1]
+        if not bucket_name:
+            bucket_name, _ = parse_s3_uri(manifest_location)
+        return self.__read_object(bucket_name, data_file["key"], copy_to_temporary_file)
+
+    def __get_local_path(self, manifest_location, data_file):
+        key = data_file["key"]
+        if os.path.isabs(key):
+            return key
+        root = os.path.dirname(os.path.abspath(manifest_location))
+        candidate = os.path.join(root, key)
+        if os.path.exists(candidate):
+            return candidate
+        # Reports copied out of S3 usually keep only the data folder next to the
+        # manifest, without the destination prefix of the keys.
+        return os.path.join(root, "data", os.path.basename(key))
+
+
+def copy_to_temporary_file(body):
+    """
+    Copies a streaming body into a temporary file, which is removed once it is
+    closed, and returns the file positioned at its start.
+    """
+    f = tempfile.TemporaryFile()
+    try:
+        shutil.copyfileobj(body, f, int(eval(Config.S3_CHUNK_SIZE)))
+        f.seek(0)
+        return f
+    except BaseException:
+        f.close()
+        raise
+
+
+def normalize_column(name):
+    """
+    Normalizes an inventory column name, so that the CSV schema names (e.g. ``IsLatest``)
+    match the ORC and Parquet ones (e.g. ``is_latest``).
+    """
+    return name.strip().replace("_", "").lower()
+
+
+def parse_s3_uri(uri):
+    bucket_name, _, key = uri[len("s3://") :].partition("/")
+    return bucket_name, key
+
+
+def iter_csv_rows(f, file_name, columns):
+    """
+    Iterates over the rows of a CSV inventory file, gunzipping it if needed.
+
+    Object keys in CSV inventories are URL-encoded and are decoded here.
+
+    Args:
+        f (file): The binary data file.
+        file_name (str): The name of the data file.
+        columns (list): The normalized column names of the rows.
+
+    Yields:
+        dict: The row, keyed by normalized column name.
+    """
+    if file_name.endswith(".gz"):
+        f = gzip.GzipFile(fileobj=f)
+    for values in csv.reader(codecs.getreader("utf-8")(f)):
+        row = dict(zip(columns, values))
+        row["key"] = unquote_plus(row["key"])
+        yield row
+
+
+def iter_columnar_rows(f, file_format):
+    """
+    Iterates over the rows of an ORC or Parquet inventory file.
+
+    Args:
+        f (file): The seekable binary data file.
+        file_format (str): ORC_FORMAT or PARQUET_FORMAT.
+
+    Yields:
+        dict: The row, keyed by normalized column name.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        if file_format == ORC_FORMAT:
+            from pyarrow import orc
+
+            orc_file = orc.ORCFile(f)
+            batches = (orc_file.read_stripe(i) for i in range(orc_file.nstripes))
+        else:
+            from pyarrow import parquet
+
+            batches = parquet.ParquetFile(f).iter_batches()
+    except ImportError:
+        raise ImportError(f"pyarrow is required to read {file_format} inventories")
+
+    for batch in batches:
+        columns = [normalize_column(name) for name in batch.schema.names]
+        for values in zip(*(column.to_pylist() for column in batch.columns)):
+            yield dict(zip(columns, values))
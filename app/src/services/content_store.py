@@ -0,0 +1,139 @@
+import errno
+import hashlib
+import logging
+import os
+import re
+
+from app.src.services.metrics import CONTENT_STORE_BYTES_SAVED, CONTENT_STORE_HITS
+from app.src.utils.file_util import copy_file, link_file
+
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class ContentStore:
+    """
+    Stores downloaded objects once per content and hard links them into job folders.
+
+    Objects with an ETag are stored under their ETag and size, so that an object
+    already stored by any job is linked instead of being fetched again. Objects
+    without an ETag are stored under the SHA-256 of their content once they were
+    downloaded, which deduplicates the disk space but not the transfer.
+
+    Files in the store are shared by all the job folders linking them and must not
+    be modified in place, see ``detach_shared_file``. The
+    store has to be on the same file system as the job folders, otherwise objects
+    are copied out of the store instead of being linked.
+
+    Args:
+        root (str): The folder of the store.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def link(self, etag, object_size, path):
+        """
+        Materializes a stored object at a path, replacing whatever file is there.
+
+        Args:
+            etag (str): The ETag of the object, if known.
+            object_size (int): The size of the object.
+            path (str): The path the object is materialized at.
+
+        Returns:
+            bool: True if the object was in the store, False if it has to be fetched.
+        """
+        if not etag:
+            return False
+        store_path = self.__get_store_path(etag_content_id(etag, object_size))
+        if not os.path.exists(store_path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            link_file(store_path, path)
+        except FileNotFoundError:
+            # Collected as garbage in the meantime.
+            return False
+        CONTENT_STORE_HITS.inc()
+        CONTENT_STORE_BYTES_SAVED.inc(object_size)
+        return True
+
+    def add(self, path, etag, object_size):
+        """
+        Adds a downloaded object to the store.
+
+        If the content is already stored, e.g. because another job downloaded the
+        same object, or an object without ETag has the content of a stored one, the
+        downloaded file is replaced with a link to the stored one.
+
+        Args:
+            path (str): The path of the downloaded object.
+            etag (str): The ETag of the object, if known.
+            object_size (int): The size of the object.
+        """
+        if etag:
+            content_id = etag_content_id(etag, object_size)
+        else:
+            content_id = f"sha256-{hash_file(path)}"
+        store_path = self.__get_store_path(content_id)
+        os.makedirs(os.path.dirname(store_path), exist_ok=True)
+        try:
+            os.link(path, store_path)
+            return
+        except FileExistsError:
+            pass
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            logging.warning(f"Unable to link {path} into the store, copying it: {e}")
+            copy_file(path, store_path)
+            return
+
+        if not os.path.samefile(path, store_path):
+            link_file(store_path, path)
+            CONTENT_STORE_HITS.inc()
+            CONTENT_STORE_BYTES_SAVED.inc(object_size)
+
+    def collect_garbage(self):
+        """
+        Removes the stored objects that are no longer linked from any job folder.
+
+        Returns:
+            int: The number of removed objects.
+        """
+        removed = 0
+        for dir_entry in os.scandir(self.root):
+            if not dir_entry.is_dir():
+                continue
+            for entry in os.scandir(dir_entry.path):
+                if entry.name.endswith(".tmp") or not entry.is_file():
+                    continue
+                if entry.stat().st_nlink == 1:
+                    os.remove(entry.path)
+                    removed += 1
+        return removed
+
+    def __get_store_path(self, content_id):
+        # Spread over subfolders by the first characters of the ETag or hash.
+        return os.path.join(self.root, content_id.split("-", 1)[1][:2], content_id)
+
+
+def etag_content_id(etag, object_size):
+    """
+    Returns the store name of an object with an ETag, e.g. ``etag-<etag>-<size>``.
+
+    The size guards against ETags that are equal for different content, and
+    characters that are not safe in file names are replaced.
+    """
+    etag = re.sub(r"[^A-Za-z0-9-]", "_", etag.strip('"'))
+    return f"etag-{etag}-{object_size}"
+
+
+def hash_file(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
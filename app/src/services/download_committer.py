@@ -0,0 +1,126 @@
+import logging
+import os
+
+from app.src.services.metrics import DOWNLOAD_COMMIT_FSYNCS
+from app.src.utils.file_util import fsync_path
+
+
+DURABILITY_NONE = "none"
+DURABILITY_BATCH = "batch"
+DURABILITY_FILE = "file"
+DURABILITY_MODES = (DURABILITY_NONE, DURABILITY_BATCH, DURABILITY_FILE)
+
+
+class DownloadCommitter:
+    """
+    Moves completed downloads from their temporary files into place.
+
+    Objects are downloaded to a temporary file next to their final path, which is
+    only replaced once the download is complete, so readers never see a partially
+    written object. How the replacement is made durable depends on the durability:
+
+    - ``none``: the file is renamed right away and never synced, a crash may lose
+      the data the OS did not write yet.
+    - ``batch``: completed files are collected and group-committed: the data of
+      the whole batch is written out with a single ``sync()``, instead of one
+      fsync round trip per file, then the files are renamed and their folders
+      synced once per batch. Objects become visible when their batch is
+      committed, at the latest when the sync job commits its progress to the
+      database.
+    - ``file``: every file is synced, renamed and its folder synced on completion.
+
+    The status of an object must only be recorded once its file was committed,
+    so ``commit`` takes a callback that is called with the outcome.
+
+    Args:
+        durability (str): One of ``none``, ``batch`` or ``file``.
+        batch_size (int): The number of files a batch is committed at in batch mode.
+    """
+
+    def __init__(self, durability, batch_size):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"Unknown durability {durability}, supported ones: {DURABILITY_MODES}"
+            )
+        self.durability = durability
+        self.batch_size = batch_size
+        self.__pending = list()
+
+    def commit(self, temp_path, path, on_commit):
+        """
+        Commits a completed download, or queues it for the next batch.
+
+        Args:
+            temp_path (str): The temporary file the object was downloaded to, or None
+                if the object was written at its final path, e.g. appended to.
+            path (str): The final path of the object.
+            on_commit (callable): Called with True once the file is in place, or
+                with False if it could not be committed.
+        """
+        if self.durability == DURABILITY_BATCH:
+            self.__pending.append((temp_path, path, on_commit))
+            if len(self.__pending) >= self.batch_size:
+                self.flush()
+            return
+        self.__commit([(temp_path, path, on_commit)], self.durability)
+
+    def flush(self):
+        """
+        Commits the pending batch, if any.
+
+        Returns:
+            int: The number of files committed.
+        """
+        pending, self.__pending = self.__pending, list()
+        if not pending:
+            return 0
+        return self.__commit(pending, DURABILITY_BATCH)
+
+    def discard(self):
+        """
+        Drops the pending batch, e.g. when the changes of a run are rolled back.
+
+        The temporary files are kept, so that the downloads are resumed on the next
+        attempt.
+        """
+        self.__pending = list()
+
+    def __commit(self, entries, durability):
+        committed = list()
+        sync = durability != DURABILITY_NONE
+        if durability == DURABILITY_BATCH and hasattr(os, "sync"):
+            # Writes out the data of the whole batch at once. sync() flushes every
+            # file system of the host, which costs less than a round trip per file
+            # for batches of small files, but reports no errors of single files.
+            os.sync()
+            DOWNLOAD_COMMIT_FSYNCS.inc(kind="file")
+        for temp_path, path, on_commit in entries:
+            try:
+                if durability == DURABILITY_FILE or (
+                    durability == DURABILITY_BATCH and not hasattr(os, "sync")
+                ):
+                    fsync_path(temp_path or path)
+                    DOWNLOAD_COMMIT_FSYNCS.inc(kind="file")
+                if temp_path is not None:
+                    os.replace(temp_path, path)
+                committed.append((path, on_commit))
+            except OSError as e:
+                logging.error(f"Unable to commit {path}: {e}")
+                on_commit(False)
+
+        if sync:
+            # Once per folder, which is what group-committing many small files saves.
+            failed_dirs = set()
+            for directory in {os.path.dirname(path) for path, _ in committed}:
+                try:
+                    fsync_path(directory)
+                    DOWNLOAD_COMMIT_FSYNCS.inc(kind="dir")
+                except OSError as e:
+                    logging.error(f"Unable to sync folder {directory}: {e}")
+                    failed_dirs.add(directory)
+            for path, on_commit in committed:
+                on_commit(os.path.dirname(path) not in failed_dirs)
+        else:
+            for _, on_commit in committed:
+                on_commit(True)
+        return len(committed)
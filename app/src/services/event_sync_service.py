@@ -0,0 +1,176 @@
+import json
+import logging
+import threading
+from urllib.parse import unquote_plus
+
+from injector import inject
+
+from app.src.constants.contants import Constants
+from app.src.services.connector import ObjectPage
+from app.src.services.listing_cache import listing_cache
+from app.src.services.scheduler import Scheduler
+from app.src.services.sync_job_scheduler_service import SyncJobSchedulerService
+
+
+CREATED = "created"
+REMOVED = "removed"
+
+
+class EventSyncService:
+    """
+    Service class for syncing objects reported by S3 event notifications.
+
+    Accepted events are buffered per job and synced by a one-off scheduler job, so
+    that a burst of events results in a single targeted sync. Only the latest event
+    of every key is kept, as ordered by the S3 ``sequencer``.
+    """
+
+    @inject
+    def __init__(
+        self,
+        sync_job_scheduler_service: SyncJobSchedulerService,
+        scheduler: Scheduler,
+    ) -> None:
+        """
+        Initializes the EventSyncService.
+
+        Args:
+            sync_job_scheduler_service (SyncJobSchedulerService): The service the sync jobs are looked up from.
+            scheduler (Scheduler): The scheduler the targeted syncs are run by.
+        """
+        self.__sync_job_scheduler_service = sync_job_scheduler_service
+        self.__scheduler = scheduler
+        self.__pending_events = dict()
+        self.__lock = threading.Lock()
+
+    def enqueue_events(self, job_id, payload):
+        """
+        Enqueues a targeted sync of the objects reported by an S3 event notification.
+
+        Events of other buckets or outside the prefix of the job are ignored.
+
+        Args:
+            job_id (str): The ID of the job.
+            payload (dict): The S3 event notification, optionally wrapped in an SNS message.
+
+        Returns:
+            tuple: The number of accepted events and any error message.
+        """
+        job = self.__sync_job_scheduler_service.get_job(job_id)
+        if (
+            job is None
+            or self.__sync_job_scheduler_service.get_sync_job(job_id) is None
+        ):
+            return None, "Job not found"
+
+        connector_config = job["connector_config"]
+        bucket_name = connector_config.get("bucket_name", "").strip()
+        prefix = connector_config.get("prefix", "").strip()
+        events = [
+            event
+            for event in parse_s3_events(payload)
+            if event["bucket"] == bucket_name and event["key"].startswith(prefix)
+        ]
+        if not events:
+            return 0, None
+
+        for event in events:
+            listing_cache.invalidate(bucket_name, event["key"])
+        with self.__lock:
+            schedule_sync = job_id not in self.__pending_events
+            pending_events = self.__pending_events.setdefault(job_id, dict())
+            for event in events:
+                pending_event = pending_events.get(event["key"])
+                if pending_event is None or not is_older_sequencer(
+                    event["sequencer"], pending_event["sequencer"]
+                ):
+                    pending_events[event["key"]] = event
+
+        if schedule_sync:
+            self.__scheduler.run_once(
+                self.sync_pending_events, f"events {job_id}", job_id
+            )
+        logging.info(f"Accepted {len(events)} events for job {job_id}")
+        return len(events), None
+
+    def sync_pending_events(self, job_id):
+        """
+        Syncs the objects of the events buffered for a job.
+
+        Args:
+            job_id (str): The ID of the job.
+        """
+        with self.__lock:
+            pending_events = self.__pending_events.pop(job_id, dict())
+
+        sync_job = self.__sync_job_scheduler_service.get_sync_job(job_id)
+        if sync_job is None or not pending_events:
+            return
+
+        changed_objects = ObjectPage()
+        for key, event in pending_events.items():
+            if event["type"] == CREATED:
+                changed_objects.add(key, event["size"], event["etag"])
+        removed_object_keys = [
+            key for key, event in pending_events.items() if event["type"] == REMOVED
+        ]
+        sync_job.sync_objects(changed_objects, removed_object_keys)
+
+
+def parse_s3_events(payload):
+    """
+    Parses the records of an S3 event notification.
+
+    Args:
+        payload (dict): The S3 event notification, optionally wrapped in an SNS message.
+
+    Returns:
+        list: The ObjectCreated and ObjectRemoved events, as dictionaries with the
+            bucket, decoded key, type, size, sequencer and ETag of the object.
+    """
+    if payload.get("Type") == "Notification" and "Message" in payload:
+        payload = json.loads(payload["Message"])
+
+    events = list()
+    for record in payload.get("Records", []):
+        event_name = record.get("eventName", "")
+        if event_name.startswith(Constants.S3_CREATED_EVENT_PREFIX):
+            event_type = CREATED
+        elif event_name.startswith(Constants.S3_REMOVED_EVENT_PREFIX):
+            event_type = REMOVED
+        else:
+            continue
+
+        s3 = record.get("s3", {})
+        s3_object = s3.get("object", {})
+        if "key" not in s3_object:
+            continue
+        events.append(
+            {
+                "bucket": s3.get("bucket", {}).get("name", ""),
+                "key": unquote_plus(s3_object["key"]),
+                "type": event_type,
+                "size": int(s3_object.get("size", 0)),
+                "sequencer": (s3_object.get("sequencer") or "").upper(),
+                "etag": s3_object.get("eTag"),
+            }
+        )
+    return events
+
+
+def is_older_sequencer(sequencer, other):
+    """
+    Returns whether an S3 event sequencer orders before another one.
+
+    Sequencers are hexadecimal strings of varying length, which are only
+    comparable once the shorter one is right-padded with zeros.
+
+    Args:
+        sequencer (str): The sequencer of an event.
+        other (str): The sequencer of another event of the same key.
+
+    Returns:
+        bool: True if the event happened before the other one.
+    """
+    width = max(len(sequencer), len(other))
+    return sequencer.ljust(width, "0") < other.ljust(width, "0")
@@ -0,0 +1,172 @@
+import base64
+import hashlib
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.src.config.config import Config
+
+
+# Chunks queued for hashing per object, before the download waits for the worker.
+MAX_PENDING_CHUNKS = 4
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+class ChecksumCalculator:
+    """
+    Computes a checksum of an object incrementally, in the format S3 reports it.
+
+    Supported algorithms are:
+
+    - ``md5``: the hex MD5 of the object, i.e. the ETag of a single part upload.
+    - ``md5-multipart``: the ETag of a multipart upload, i.e. the hex MD5 of the
+      concatenated MD5s of the parts followed by ``-<number of parts>``. Requires
+      the ``part_size``.
+    - ``sha256``, ``sha1`` and ``crc32``: the base64 of the digest, like the S3
+      additional checksums.
+
+    Args:
+        algorithm (str): One of the algorithms above.
+        part_size (int, optional): The size of the parts of a multipart upload.
+    """
+
+    ALGORITHMS = ("md5", "md5-multipart", "sha256", "sha1", "crc32")
+
+    def __init__(self, algorithm, part_size=None):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unsupported checksum algorithm {algorithm}")
+        if algorithm == "md5-multipart" and not part_size:
+            raise ValueError("The part size is required for multipart checksums")
+        self.algorithm = algorithm
+        self.part_size = part_size
+        self.__crc32 = 0
+        self.__hash = None if algorithm == "crc32" else self.__new_hash()
+        self.__part_digests = list()
+        self.__part_remaining = part_size
+
+    def update(self, data):
+        if self.algorithm == "crc32":
+            self.__crc32 = zlib.crc32(data, self.__crc32)
+            return
+        if self.algorithm != "md5-multipart":
+            self.__hash.update(data)
+            return
+
+        view = memoryview(data)
+        while view:
+            block = view[: self.__part_remaining]
+            self.__hash.update(block)
+            self.__part_remaining -= len(block)
+            view = view[len(block) :]
+            if self.__part_remaining == 0:
+                self.__part_digests.append(self.__hash.digest())
+                self.__hash = self.__new_hash()
+                self.__part_remaining = self.part_size
+
+    def value(self):
+        """
+        Returns the checksum of the data seen so far.
+        """
+        if self.algorithm == "crc32":
+            return base64.b64encode(self.__crc32.to_bytes(4, "big")).decode()
+        if self.algorithm == "md5":
+            return self.__hash.hexdigest()
+        if self.algorithm != "md5-multipart":
+            return base64.b64encode(self.__hash.digest()).decode()
+
+        part_digests = list(self.__part_digests)
+        if self.__part_remaining < self.part_size:
+            part_digests.append(self.__hash.digest())
+        digest = hashlib.md5(b"".join(part_digests)).hexdigest()
+        return f"{digest}-{len(part_digests)}"
+
+    def __new_hash(self):
+        name = "md5" if self.algorithm.startswith("md5") else self.algorithm
+        return hashlib.new(name)
+
+
+class StreamingChecksum:
+    """
+    Computes the checksum of an object while it is downloaded, off the write path.
+
+    Chunks are hashed in order on the shared checksum executor, while the download
+    fetches and writes the next ones. At most ``MAX_PENDING_CHUNKS`` chunks are
+    queued per object, so that a slow worker holds back the download instead of
+    buffering it. ``hashlib`` releases the GIL for large buffers, so hashing runs
+    in parallel with the transfer.
+
+    Args:
+        expected (dict): The expected checksum, with the ``algorithm``, the
+            ``value`` and for multipart checksums the ``part_size``.
+        executor (Executor): The executor the chunks are hashed on.
+    """
+
+    def __init__(self, expected, executor):
+        self.expected = expected
+        self.__calculator = ChecksumCalculator(
+            expected["algorithm"], expected.get("part_size")
+        )
+        self.__executor = executor
+        self.__pending = deque()
+
+    def update(self, data):
+        """
+        Queues a chunk to be hashed after the previous ones.
+        """
+        self.__submit(self.__calculator.update, data)
+
+    def update_from_file(self, path, size):
+        """
+        Queues the first bytes of a file to be hashed, e.g. those synced before a
+        download was resumed.
+
+        Args:
+            path (str): The path of the file.
+            size (int): The number of bytes to hash.
+        """
+        self.__submit(self.__hash_file, path, size)
+
+    def verify(self):
+        """
+        Waits for the queued chunks to be hashed and compares the checksum.
+
+        Returns:
+            tuple: Whether the checksum matches the expected one, and the checksum
+                as ``<algorithm>:<value>``.
+        """
+        previous = self.__pending[-1] if self.__pending else None
+        if previous is not None:
+            previous.result()
+        self.__pending.clear()
+        value = self.__calculator.value()
+        return value == self.expected["value"], f"{self.expected['algorithm']}:{value}"
+
+    def __submit(self, function, *args):
+        previous = self.__pending[-1] if self.__pending else None
+        self.__pending.append(
+            self.__executor.submit(self.__run_after, previous, function, *args)
+        )
+        if len(self.__pending) > MAX_PENDING_CHUNKS:
+            self.__pending.popleft().result()
+
+    @staticmethod
+    def __run_after(previous, function, *args):
+        # Tasks are started in submission order, so the previous one of an object
+        # is already running or done once its successor is started.
+        if previous is not None:
+            previous.result()
+        function(*args)
+
+    def __hash_file(self, path, size):
+        with open(path, "rb") as f:
+            while size > 0:
+                block = f.read(min(READ_BLOCK_SIZE, size))
+                if not block:
+                    raise ValueError(f"{path} is shorter than the synced bytes")
+                self.__calculator.update(block)
+                size -= len(block)
+
+
+checksum_executor = ThreadPoolExecutor(
+    max_workers=int(Config.CHECKSUM_WORKERS), thread_name_prefix="checksum"
+)
@@ -1,3 +1,5 @@
+import os
+
 from app.src.models.blob_object import BlobObject
 
 
@@ -29,3 +31,24 @@ class JobObjectsService:
             "offset": offset,
             "objects": objects,
         }
+
+    def find_object(self, job_id: str, object_key=None, local_path=None):
+        """
+        Looks up an object of a job by its key or by its local path, e.g. to map
+        between the two for jobs with the hashed layout.
+
+        Args:
+            job_id (str): The ID of the job.
+            object_key (str, optional): The key of the object.
+            local_path (str, optional): The local path of the object.
+
+        Returns:
+            dict: The object, or None if the job has no such object.
+        """
+        query = BlobObject.query.filter_by(job_id=job_id)
+        if object_key is not None:
+            query = query.filter_by(object_key=object_key)
+        else:
+            query = query.filter_by(local_full_path=os.path.abspath(local_path))
+        object = query.first()
+        return object.__json__() if object is not None else None
@@ -0,0 +1,110 @@
+import math
+
+from app.src.models.job_run import JobRun
+
+
+SUMMARY_FIELDS = (
+    "duration_seconds",
+    "bytes_per_second",
+    "objects_transferred",
+    "bytes_transferred",
+    "list_requests",
+    "get_requests",
+    "retry_requests",
+    "failed_objects",
+)
+SUMMARY_PERCENTILES = (50, 90, 99)
+
+
+def percentile(values, percent):
+    """
+    Computes a percentile of the given values with linear interpolation.
+
+    Args:
+        values (list): The values, in any order.
+        percent (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        float: The percentile, or None if there are no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percent / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class JobRunsService:
+    def get_runs(self, job_id: str, limit: int, offset: int):
+        """
+        Retrieves the runs of a specific job, most recent first.
+
+        Args:
+            job_id (str): The ID of the job.
+            limit (int): The maximum number of runs to retrieve.
+            offset (int): The starting index of the runs to retrieve.
+
+        Returns:
+            dict: A dictionary containing the following keys:
+                - "total_runs" (int): The total number of runs of the job.
+                - "limit" (int): The maximum number of runs to retrieve.
+                - "offset" (int): The starting index of the retrieved runs.
+                - "runs" (list): The list of runs retrieved.
+        """
+        runs = (
+            JobRun.query.filter_by(job_id=job_id)
+            .order_by(JobRun.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        total_runs = JobRun.query.filter_by(job_id=job_id).count()
+        return {
+            "total_runs": total_runs,
+            "limit": limit,
+            "offset": offset,
+            "runs": [run.__json__() for run in runs],
+        }
+
+    def get_summary(self, job_id: str, last: int):
+        """
+        Computes percentile summaries over the most recent finished runs of a job.
+
+        Args:
+            job_id (str): The ID of the job.
+            last (int): The number of most recent finished runs to summarize.
+
+        Returns:
+            dict: A dictionary containing the number of summarized runs and, for every
+                summarized field, its p50, p90, p99, min and max.
+        """
+        runs = (
+            JobRun.query.filter_by(job_id=job_id)
+            .filter(JobRun.ended_at.isnot(None))
+            .order_by(JobRun.id.desc())
+            .limit(last)
+            .all()
+        )
+        summary = dict()
+        for field in SUMMARY_FIELDS:
+            values = [
+                getattr(run, field) for run in runs if getattr(run, field) is not None
+            ]
+            field_summary = {
+                f"p{percent}": percentile(values, percent)
+                for percent in SUMMARY_PERCENTILES
+            }
+            field_summary["min"] = min(values) if values else None
+            field_summary["max"] = max(values) if values else None
+            summary[field] = field_summary
+
+        return {
+            "job_id": job_id,
+            "runs": len(runs),
+            "failed_runs": len([run for run in runs if run.status == "FAILED"]),
+            "summary": summary,
+        }
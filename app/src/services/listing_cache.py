@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from app.src.config.config import Config
+from app.src.services.metrics import LISTING_CACHE_OBJECTS, LISTING_CACHE_REQUESTS
+
+
+class ListingCache:
+    """
+    Shares recent complete listings between the jobs listing the same objects.
+
+    Listings are cached under the key the connector derives from the config, i.e.
+    the bucket, prefix and credentials, so jobs on the same bucket and prefix reuse
+    a listing for up to the TTL instead of repeating the same LIST requests. Only
+    listings that were consumed to the end are cached, together with the sizes and
+    ETags of their objects. Entries are invalidated when objects below their prefix
+    are reported changed, and the oldest entries are evicted once the cached
+    listings hold more than ``max_objects`` objects in total.
+
+    The cached pages are shared by all readers and must not be modified.
+
+    Args:
+        ttl_seconds (float): How long a listing is reused, 0 disables the cache.
+        max_objects (int): The maximum number of objects held by all listings.
+    """
+
+    def __init__(self, ttl_seconds, max_objects):
+        self.ttl_seconds = ttl_seconds
+        self.max_objects = max_objects
+        self.__entries = OrderedDict()
+        self.__num_objects = 0
+        self.__invalidations = 0
+        self.__lock = threading.Lock()
+
+    def iter_pages(self, connector, config):
+        """
+        Iterates over the pages of objects for a config, from the cache if possible.
+
+        Args:
+            connector (Connector): The connector listing the objects on a cache miss.
+            config (dict): The configuration for the connector.
+
+        Yields:
+            dict: A dictionary mapping object keys to their sizes, one per page.
+        """
+        key = connector.listing_cache_key(config)
+        if key is None or self.ttl_seconds <= 0:
+            yield from connector.iter_object_pages(config)
+            return
+
+        pages = self.__get(key)
+        if pages is not None:
+            LISTING_CACHE_REQUESTS.inc(result="hit")
+            logging.info(
+                f"Reusing cached listing of {config.get('bucket_name')}/{config.get('prefix', '')}"
+            )
+            yield from pages
+            return
+
+        LISTING_CACHE_REQUESTS.inc(result="miss")
+        # The listing reflects the objects as of its start, so it expires from then.
+        listed_at = time.monotonic()
+        with self.__lock:
+            invalidations = self.__invalidations
+        pages = list()
+        num_objects = 0
+        for page in connector.iter_object_pages(config):
+            if pages is not None:
+                num_objects += len(page)
+                if num_objects <= self.max_objects:
+                    pages.append(page)
+                else:
+                    pages = None
+            yield page
+        if pages is not None:
+            self.__put(key, config, listed_at, invalidations, pages, num_objects)
+
+    def invalidate(self, bucket_name, object_key=None):
+        """
+        Drops the cached listings of a bucket that cover an object.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            object_key (str, optional): The key of the changed object, all listings
+                of the bucket are dropped if omitted.
+        """
+        with self.__lock:
+            self.__invalidations += 1
+            for key, entry in list(self.__entries.items()):
+                if entry["bucket_name"] == bucket_name and (
+                    object_key is None or object_key.startswith(entry["prefix"])
+                ):
+                    self.__remove(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__invalidations += 1
+            self.__entries.clear()
+            self.__num_objects = 0
+            LISTING_CACHE_OBJECTS.set(0)
+
+    def __get(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry["listed_at"] > self.ttl_seconds:
+                self.__remove(key)
+                return None
+            return entry["pages"]
+
+    def __put(self, key, config, listed_at, invalidations, pages, num_objects):
+        with self.__lock:
+            # Objects may have changed while listing, the listing is stale then.
+            if invalidations != self.__invalidations:
+                return
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = {
+                "bucket_name": config.get("bucket_name", "").strip(),
+                "prefix": config.get("prefix", "").strip(),
+                "listed_at": listed_at,
+                "pages": pages,
+                "num_objects": num_objects,
+            }
+            self.__num_objects += num_objects
+            while self.__num_objects > self.max_objects:
+                self.__remove(next(iter(self.__entries)))
+            LISTING_CACHE_OBJECTS.set(self.__num_objects)
+
+    def __remove(self, key):
+        entry = self.__entries.pop(key)
+        self.__num_objects -= entry["num_objects"]
+        LISTING_CACHE_OBJECTS.set(self.__num_objects)
+
+
+listing_cache = ListingCache(
+    float(Config.LISTING_CACHE_TTL), int(Config.LISTING_CACHE_MAX_OBJECTS)
+)
@@ -0,0 +1,421 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+DEFAULT_SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    rendered = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return "{" + rendered + "}"
+
+
+class Counter:
+    """
+    A monotonically increasing counter, optionally partitioned by labels.
+
+    Args:
+        name (str): The metric name.
+        documentation (str): The help text rendered in the exposition format.
+        labelnames (tuple): The label names the counter is partitioned by.
+    """
+
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.__values = dict()
+        self.__lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """
+        Increments the counter.
+
+        Args:
+            amount (float): The amount to add, defaults to 1.
+            **labels: The label values, keyed by label name.
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.__lock:
+            self.__values[key] = self.__values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """
+        Returns the current value of the counter for the given labels.
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.__lock:
+            return self.__values.get(key, 0)
+
+    def collect(self):
+        with self.__lock:
+            values = dict(self.__values)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Gauge:
+    """
+    A value that can go up and down, optionally partitioned by labels.
+
+    Args:
+        name (str): The metric name.
+        documentation (str): The help text rendered in the exposition format.
+        labelnames (tuple): The label names the gauge is partitioned by.
+    """
+
+    metric_type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.__values = dict()
+        self.__lock = threading.Lock()
+
+    def set(self, value, **labels):
+        """
+        Sets the gauge to the given value.
+
+        Args:
+            value (float): The new value.
+            **labels: The label values, keyed by label name.
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.__lock:
+            self.__values[key] = value
+
+    def value(self, **labels):
+        """
+        Returns the current value of the gauge for the given labels.
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.__lock:
+            return self.__values.get(key, 0)
+
+    def collect(self):
+        with self.__lock:
+            values = dict(self.__values)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram:
+    """
+    A histogram with fixed, cumulative buckets, optionally partitioned by labels.
+
+    Args:
+        name (str): The metric name.
+        documentation (str): The help text rendered in the exposition format.
+        labelnames (tuple): The label names the histogram is partitioned by.
+        buckets (tuple): The sorted upper bounds of the buckets.
+    """
+
+    metric_type = "histogram"
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.__series = dict()
+        self.__lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """
+        Records a single observation.
+
+        Args:
+            value (float): The observed value.
+            **labels: The label values, keyed by label name.
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__series.get(key)
+            if series is None:
+                # Per-bucket counts plus the +Inf bucket, then sum and count.
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self.__series[key] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observes the wall-clock duration of the wrapped block in seconds.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        """
+        Returns the number of observations recorded for the given labels.
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.__lock:
+            series = self.__series.get(key)
+            return series[2] if series else 0
+
+    def collect(self):
+        with self.__lock:
+            snapshot = {
+                key: (list(series[0]), series[1], series[2])
+                for key, series in self.__series.items()
+            }
+
+        lines = []
+        for key, (bucket_counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ("le", bound))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds the process-wide metrics and renders them in the Prometheus text format.
+
+    Methods:
+        counter: Creates or returns a registered counter.
+        gauge: Creates or returns a registered gauge.
+        histogram: Creates or returns a registered histogram.
+        render: Renders all registered metrics.
+    """
+
+    def __init__(self):
+        self.__metrics = dict()
+        self.__lock = threading.Lock()
+
+    def __register(self, metric_class, name, *args, **kwargs):
+        with self.__lock:
+            metric = self.__metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, *args, **kwargs)
+                self.__metrics[name] = metric
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.__register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.__register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS
+    ):
+        return self.__register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self):
+        """
+        Renders all registered metrics.
+
+        Returns:
+            str: The metrics in the Prometheus text exposition format.
+        """
+        with self.__lock:
+            registered = list(self.__metrics.values())
+
+        lines = []
+        for metric in registered:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+LIST_PAGES = metrics.counter(
+    "connector_list_pages_total",
+    "Number of listing pages fetched from a connector.",
+    ("connector",),
+)
+LIST_OBJECTS = metrics.counter(
+    "connector_list_objects_total",
+    "Number of object keys returned by connector listings.",
+    ("connector",),
+)
+LIST_SECONDS = metrics.histogram(
+    "connector_list_page_seconds",
+    "Latency of a single connector listing page.",
+    ("connector",),
+)
+FETCH_BYTES = metrics.counter(
+    "connector_fetch_bytes_total",
+    "Number of bytes fetched from a connector.",
+    ("connector",),
+)
+FETCH_SECONDS = metrics.histogram(
+    "connector_fetch_chunk_seconds",
+    "Latency of a single chunk fetch, including retries.",
+    ("connector",),
+)
+FETCH_RETRIES = metrics.counter(
+    "connector_fetch_retries_total",
+    "Number of retried chunk fetch attempts.",
+    ("connector",),
+)
+DB_COMMIT_SECONDS = metrics.histogram(
+    "db_commit_seconds",
+    "Latency of database commits.",
+    ("site",),
+)
+DB_COMMIT_ROWS = metrics.counter(
+    "db_commit_rows_total",
+    "Number of new or modified rows flushed by database commits.",
+    ("site",),
+)
+MANIFEST_WRITES = metrics.counter(
+    "manifest_writes_total",
+    "Number of JSON manifest files written.",
+)
+MANIFEST_ENTRIES = metrics.counter(
+    "manifest_entries_total",
+    "Number of chunk entries written to JSON manifest files.",
+)
+MANIFEST_WRITE_SECONDS = metrics.histogram(
+    "manifest_write_seconds",
+    "Latency of writing a JSON manifest file.",
+)
+SCHEDULER_QUEUE_WAIT = metrics.histogram(
+    "scheduler_queue_wait_seconds",
+    "Delay between a job's scheduled fire time and the start of its run.",
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+BUFFER_WAIT_SECONDS = metrics.histogram(
+    "resource_governor_buffer_wait_seconds",
+    "Time transfers waited for the in-flight memory budget.",
+)
+RATE_LIMIT_WAIT_SECONDS = metrics.histogram(
+    "rate_limiter_wait_seconds",
+    "Time transfers waited for the bandwidth and request rate limits.",
+)
+DISK_ADMISSION_REJECTIONS = metrics.counter(
+    "resource_governor_disk_rejections_total",
+    "Number of downloads rejected for lack of free disk space.",
+)
+CONCURRENCY_LIMIT = metrics.gauge(
+    "connector_concurrency_limit",
+    "Current adaptive limit of concurrent requests to a bucket and prefix.",
+    ("target",),
+)
+CONCURRENCY_DECREASES = metrics.counter(
+    "connector_concurrency_decreases_total",
+    "Number of multiplicative decreases of the adaptive concurrency limit.",
+    ("target", "reason"),
+)
+LISTING_CACHE_REQUESTS = metrics.counter(
+    "listing_cache_requests_total",
+    "Number of listings served from the listing cache (hit) or listed (miss).",
+    ("result",),
+)
+LISTING_CACHE_OBJECTS = metrics.gauge(
+    "listing_cache_objects",
+    "Number of objects held by the cached listings.",
+)
+CONTENT_STORE_HITS = metrics.counter(
+    "content_store_hits_total",
+    "Number of objects linked from the content store instead of being stored again.",
+)
+CONTENT_STORE_BYTES_SAVED = metrics.counter(
+    "content_store_bytes_saved_total",
+    "Bytes linked from the content store instead of being stored again.",
+)
+DOWNLOAD_COMMIT_FSYNCS = metrics.counter(
+    "download_commit_fsyncs_total",
+    "Number of fsyncs issued to commit downloads, per file or folder.",
+    ("kind",),
+)
+INTEGRITY_CHECKS = metrics.counter(
+    "integrity_checks_total",
+    "Number of downloads verified against their checksum, by result.",
+    ("result",),
+)
+RECONCILED_OBJECTS = metrics.counter(
+    "reconciled_objects_total",
+    "Number of objects found on disk and recorded without downloading them.",
+)
+SINK_BYTES = metrics.counter(
+    "sink_bytes_total",
+    "Bytes written to sinks other than the download folder.",
+    ("sink",),
+)
+SINK_REQUESTS = metrics.counter(
+    "sink_requests_total",
+    "Number of requests sent to sinks, by operation.",
+    ("sink", "operation"),
+)
+COMPRESSED_OBJECTS = metrics.counter(
+    "compressed_objects_total",
+    "Number of downloads compressed at rest, or skipped as compressed already.",
+    ("result",),
+)
+COMPRESSION_BYTES = metrics.counter(
+    "compression_bytes_total",
+    "Bytes of compressed downloads, before and after compression.",
+    ("kind",),
+)
+CONDITIONAL_REQUESTS = metrics.counter(
+    "connector_conditional_requests_total",
+    "Number of conditional requests, by whether the resource was modified.",
+    ("connector", "result"),
+)
+TRACE_SPANS_DROPPED = metrics.counter(
+    "trace_spans_dropped_total",
+    "Number of trace spans dropped because the span exporter fell behind.",
+)
+LOG_RECORDS_DROPPED = metrics.counter(
+    "log_records_dropped_total",
+    "Number of log records dropped because the log queue was full.",
+)
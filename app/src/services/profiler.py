@@ -0,0 +1,282 @@
+import collections
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from app.src.config.config import Config
+
+
+STACKS_FILE_NAME = "stacks.folded"
+ALLOCATIONS_FILE_NAME = "allocations.txt"
+SUMMARY_FILE_NAME = "summary.json"
+PROFILE_FILE_NAMES = [STACKS_FILE_NAME, ALLOCATIONS_FILE_NAME, SUMMARY_FILE_NAME]
+
+
+class StackSampler:
+    """
+    Periodically samples the call stack of a single thread.
+
+    The samples are aggregated in the folded format understood by flame graph
+    tools, i.e. one ``frame;frame;frame count`` line per distinct stack.
+
+    Args:
+        thread_id (int): The identifier of the thread to be sampled.
+        interval (float): The sampling interval in seconds.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.__thread_id = thread_id
+        self.__interval = interval
+        self.__stacks = collections.Counter()
+        self.__samples = 0
+        self.__stop_event = threading.Event()
+        self.__thread = threading.Thread(
+            target=self.__sample, name="stack-sampler", daemon=True
+        )
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop_event.set()
+        self.__thread.join()
+
+    @property
+    def samples(self):
+        return self.__samples
+
+    def __sample(self):
+        while not self.__stop_event.wait(self.__interval):
+            frame = sys._current_frames().get(self.__thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+            self.__stacks[";".join(reversed(stack))] += 1
+            self.__samples += 1
+
+    def folded(self):
+        """
+        Returns the collected samples in the folded stack format.
+
+        Returns:
+            str: One line per distinct stack, followed by its sample count.
+        """
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.__stacks.most_common()
+        )
+
+
+class RunProfiler:
+    """
+    Profiles individual sync runs on demand.
+
+    A job is marked for profiling through ``request_profile``; its next run is then
+    executed through ``profile``, which samples the call stack of the running thread.
+    With ``PROFILE_TRACEMALLOC`` enabled, ``tracemalloc`` snapshots are taken as
+    well. Tracing allocations is process-wide, so every other job running at the
+    same time pays its overhead too, which is why it is off by default. Runs that
+    were not marked only pay for a set lookup.
+
+    Methods:
+        request_profile: Marks the next run of a job for profiling.
+        consume: Returns whether the next run of a job should be profiled.
+        profile: Runs a callable under the profiler and stores the results.
+        list_profiles: Lists the stored profiles of a job.
+        get_profile_file: Returns the path of a stored profile file.
+    """
+
+    def __init__(self):
+        self.__requested_job_ids = set()
+        self.__lock = threading.Lock()
+        self.__tracemalloc_users = 0
+
+    def request_profile(self, job_id):
+        """
+        Marks the next run of a job for profiling.
+
+        Args:
+            job_id (str): The unique identifier for the job.
+        """
+        with self.__lock:
+            self.__requested_job_ids.add(job_id)
+
+    def is_requested(self, job_id):
+        return job_id in self.__requested_job_ids
+
+    def consume(self, job_id):
+        """
+        Returns whether the next run of a job was marked for profiling and clears the mark.
+
+        Args:
+            job_id (str): The unique identifier for the job.
+
+        Returns:
+            bool: True if the run should be profiled.
+        """
+        if job_id not in self.__requested_job_ids:
+            return False
+        with self.__lock:
+            if job_id not in self.__requested_job_ids:
+                return False
+            self.__requested_job_ids.discard(job_id)
+            return True
+
+    def profile(self, job_id, func):
+        """
+        Runs a callable under the profiler and stores the results under the job's folder.
+
+        Args:
+            job_id (str): The unique identifier for the job.
+            func (callable): The callable to be profiled.
+
+        Returns:
+            The return value of the callable.
+        """
+        sampler = StackSampler(
+            threading.get_ident(), float(Config.PROFILE_SAMPLE_INTERVAL)
+        )
+        trace_allocations = Config.PROFILE_TRACEMALLOC.lower() == "true"
+        start_snapshot = end_snapshot = peak_memory = None
+        if trace_allocations:
+            self.__start_tracemalloc()
+            start_snapshot = tracemalloc.take_snapshot()
+        started_at = time.time()
+        sampler.start()
+        try:
+            return func()
+        finally:
+            sampler.stop()
+            duration = time.time() - started_at
+            if trace_allocations:
+                end_snapshot = tracemalloc.take_snapshot()
+                _, peak_memory = tracemalloc.get_traced_memory()
+                self.__stop_tracemalloc()
+            try:
+                self.__store_profile(
+                    job_id,
+                    started_at,
+                    duration,
+                    sampler,
+                    start_snapshot,
+                    end_snapshot,
+                    peak_memory,
+                )
+            except Exception as e:
+                logging.error(f"Error storing profile for job {job_id}: {e}")
+
+    def __start_tracemalloc(self):
+        with self.__lock:
+            if self.__tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(int(Config.PROFILE_TRACEMALLOC_FRAMES))
+            self.__tracemalloc_users += 1
+
+    def __stop_tracemalloc(self):
+        with self.__lock:
+            self.__tracemalloc_users -= 1
+            if self.__tracemalloc_users == 0 and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def __get_profiles_dir(self, job_id):
+        return os.path.join(Config.JSON_ROOT_FOLDER, job_id, "profiles")
+
+    def __store_profile(
+        self,
+        job_id,
+        started_at,
+        duration,
+        sampler,
+        start_snapshot,
+        end_snapshot,
+        peak_memory,
+    ):
+        profile_id = str(int(started_at * 1000))
+        profile_dir = os.path.join(self.__get_profiles_dir(job_id), profile_id)
+        os.makedirs(profile_dir, exist_ok=True)
+
+        with open(os.path.join(profile_dir, STACKS_FILE_NAME), "w") as f:
+            f.write(sampler.folded())
+
+        if end_snapshot is not None:
+            top_limit = int(Config.PROFILE_TOP_ALLOCATIONS)
+            allocation_diff = end_snapshot.compare_to(start_snapshot, "traceback")
+            with open(os.path.join(profile_dir, ALLOCATIONS_FILE_NAME), "w") as f:
+                for stat in allocation_diff[:top_limit]:
+                    f.write(
+                        f"{stat.size_diff} B ({stat.count_diff} blocks) retained, "
+                        f"{stat.size} B total\n"
+                    )
+                    for line in stat.traceback.format():
+                        f.write(f"    {line}\n")
+
+        summary = {
+            "profile_id": profile_id,
+            "job_id": job_id,
+            "started_at": started_at,
+            "duration_seconds": duration,
+            "stack_samples": sampler.samples,
+            "peak_traced_memory_bytes": peak_memory,
+        }
+        with open(os.path.join(profile_dir, SUMMARY_FILE_NAME), "w") as f:
+            json.dump(summary, f, indent=4)
+        logging.info(f"Stored profile {profile_id} for job {job_id}")
+
+    def list_profiles(self, job_id):
+        """
+        Lists the stored profiles of a job.
+
+        Args:
+            job_id (str): The unique identifier for the job.
+
+        Returns:
+            list: The summaries of the stored profiles, most recent first.
+        """
+        profiles_dir = self.__get_profiles_dir(job_id)
+        if not os.path.isdir(profiles_dir):
+            return []
+
+        profiles = []
+        for entry in sorted(os.scandir(profiles_dir), key=lambda e: e.name, reverse=True):
+            summary_path = os.path.join(entry.path, SUMMARY_FILE_NAME)
+            if not entry.is_dir() or not os.path.exists(summary_path):
+                continue
+            with open(summary_path) as f:
+                summary = json.load(f)
+            summary["files"] = [
+                name
+                for name in PROFILE_FILE_NAMES
+                if os.path.exists(os.path.join(entry.path, name))
+            ]
+            profiles.append(summary)
+        return profiles
+
+    def get_profile_file(self, job_id, profile_id, file_name):
+        """
+        Returns the path of a stored profile file.
+
+        Args:
+            job_id (str): The unique identifier for the job.
+            profile_id (str): The identifier of the profile.
+            file_name (str): The name of the profile file.
+
+        Returns:
+            str: The absolute path of the file, or None if it does not exist.
+        """
+        if not profile_id.isdigit() or file_name not in PROFILE_FILE_NAMES:
+            return None
+        path = os.path.join(self.__get_profiles_dir(job_id), profile_id, file_name)
+        if not os.path.isfile(path):
+            return None
+        return os.path.abspath(path)
+
+
+run_profiler = RunProfiler()
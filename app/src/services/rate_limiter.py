@@ -0,0 +1,201 @@
+import threading
+import time
+
+from app.src.config.config import Config
+from app.src.services.metrics import RATE_LIMIT_WAIT_SECONDS
+
+
+BYTES_PER_SECOND = "max_bytes_per_second"
+REQUESTS_PER_SECOND = "max_requests_per_second"
+RATE_LIMIT_KEYS = (BYTES_PER_SECOND, REQUESTS_PER_SECOND)
+
+
+class TokenBucket:
+    """
+    Limits the rate at which a resource is consumed to a number of units per second.
+
+    The bucket holds up to one second's worth of tokens, so short bursts are allowed
+    after idle periods. An acquisition larger than the tokens available goes into
+    debt and waits until the debt is paid off, so that amounts larger than the whole
+    bucket (e.g. a chunk larger than the bytes per second) still make progress.
+
+    Args:
+        rate (float): The units per second, 0 or None for no limit.
+    """
+
+    def __init__(self, rate):
+        self.__lock = threading.Lock()
+        self.__rate = float(rate or 0)
+        self.__tokens = self.__rate
+        self.__updated_at = time.monotonic()
+
+    @property
+    def rate(self):
+        return self.__rate
+
+    def set_rate(self, rate):
+        """
+        Changes the rate of the bucket, effective for the next acquisitions.
+
+        Args:
+            rate (float): The units per second, 0 or None for no limit.
+        """
+        with self.__lock:
+            self.__refill()
+            # A bucket that was not limited before starts out full.
+            tokens = self.__tokens if self.__rate > 0 else float("inf")
+            self.__rate = float(rate or 0)
+            self.__tokens = min(tokens, self.__rate)
+
+    def acquire(self, amount):
+        """
+        Takes tokens from the bucket, waiting until they are available.
+
+        Args:
+            amount (float): The number of tokens to take.
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        with self.__lock:
+            if self.__rate <= 0:
+                return 0
+            self.__refill()
+            self.__tokens -= amount
+            wait_seconds = max(-self.__tokens / self.__rate, 0)
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    def __refill(self):
+        now = time.monotonic()
+        if self.__rate > 0:
+            self.__tokens = min(
+                self.__tokens + (now - self.__updated_at) * self.__rate, self.__rate
+            )
+        self.__updated_at = now
+
+
+class RateLimiter:
+    """
+    Limits the bytes and the requests per second of a transfer.
+
+    Args:
+        max_bytes_per_second (float): The bytes per second, 0 or None for no limit.
+        max_requests_per_second (float): The requests per second, 0 or None for no limit.
+    """
+
+    def __init__(self, max_bytes_per_second=None, max_requests_per_second=None):
+        self.__buckets = {
+            BYTES_PER_SECOND: TokenBucket(max_bytes_per_second),
+            REQUESTS_PER_SECOND: TokenBucket(max_requests_per_second),
+        }
+
+    def get_limits(self):
+        return {key: bucket.rate for key, bucket in self.__buckets.items()}
+
+    def set_limits(self, limits):
+        """
+        Changes the given limits, leaving the others as they are.
+
+        Args:
+            limits (dict): The new ``max_bytes_per_second`` and/or
+                ``max_requests_per_second``, 0 or None for no limit.
+        """
+        for key, rate in limits.items():
+            self.__buckets[key].set_rate(rate)
+
+    def acquire(self, num_bytes):
+        """
+        Waits until a request for the given number of bytes fits both limits.
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        return self.__buckets[REQUESTS_PER_SECOND].acquire(1) + self.__buckets[
+            BYTES_PER_SECOND
+        ].acquire(num_bytes)
+
+
+class RateLimiters:
+    """
+    Holds the global rate limiter of the process and one rate limiter per job.
+
+    Every request of a job has to fit both the limits of the job and the global
+    limits, so that a single job can be capped without starving the others, and
+    all jobs together stay within the bandwidth of the host.
+    """
+
+    def __init__(self):
+        self.__global = RateLimiter(
+            float(eval(Config.MAX_BYTES_PER_SECOND)),
+            float(Config.MAX_REQUESTS_PER_SECOND),
+        )
+        self.__jobs = dict()
+        self.__lock = threading.Lock()
+
+    @property
+    def global_limiter(self):
+        return self.__global
+
+    def configure_job(self, job_id, limits):
+        """
+        Sets the limits of a job, creating its rate limiter if needed.
+
+        Args:
+            job_id (str): The ID of the job.
+            limits (dict): The limits of the job, missing ones are not limited.
+        """
+        with self.__lock:
+            limiter = self.__jobs.setdefault(job_id, RateLimiter())
+        limiter.set_limits({key: limits.get(key) for key in RATE_LIMIT_KEYS})
+
+    def get_job_limiter(self, job_id):
+        with self.__lock:
+            return self.__jobs.get(job_id)
+
+    def remove_job(self, job_id):
+        with self.__lock:
+            self.__jobs.pop(job_id, None)
+
+    def acquire(self, job_id, num_bytes):
+        """
+        Waits until a request of a job for the given number of bytes fits both the
+        limits of the job and the global limits.
+
+        Args:
+            job_id (str): The ID of the job.
+            num_bytes (int): The number of bytes requested.
+        """
+        wait_seconds = 0
+        limiter = self.get_job_limiter(job_id)
+        if limiter is not None:
+            wait_seconds += limiter.acquire(num_bytes)
+        wait_seconds += self.__global.acquire(num_bytes)
+        if wait_seconds > 0:
+            RATE_LIMIT_WAIT_SECONDS.observe(wait_seconds)
+
+
+def validate_rate_limits(limits):
+    """
+    Validates rate limits given through the API or the connector config.
+
+    Args:
+        limits (dict): The limits to be validated.
+
+    Returns:
+        tuple: A boolean indicating whether the validation passed and an error message.
+    """
+    if not isinstance(limits, dict) or not limits:
+        return False, f"Rate limits must be a non-empty dictionary of {RATE_LIMIT_KEYS}"
+    for key, rate in limits.items():
+        if key not in RATE_LIMIT_KEYS:
+            return False, f"Unknown rate limit {key}, supported ones: {RATE_LIMIT_KEYS}"
+        if rate is not None and (
+            isinstance(rate, bool) or not isinstance(rate, (int, float)) or rate < 0
+        ):
+            return False, f"{key} must be a non-negative number or null"
+    return True, None
+
+
+rate_limiters = RateLimiters()
@@ -0,0 +1,214 @@
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.src.services.integrity import ChecksumCalculator, checksum_executor
+from app.src.services.metrics import RECONCILED_OBJECTS
+from app.src.utils.file_util import (
+    LAYOUT_MIRROR,
+    TEMP_DOWNLOAD_SUFFIX,
+    get_local_path,
+    link_file,
+)
+from app.src.utils.sync_job_util import get_existing_object_keys, insert_objects
+
+
+# Listings report the modification time in whole seconds.
+MTIME_TOLERANCE_SECONDS = 1
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+class LocalReconciler:
+    """
+    Rebuilds the state of a job from the files already on disk, instead of
+    downloading them again, e.g. after the database was lost or a job recreated.
+
+    The source folder is scanned once, with a pool of threads walking its folders
+    with ``os.scandir`` in parallel. Every listed object without a row, whose file
+    in the source folder has the listed size and was modified no earlier than the
+    object, is then inserted in bulk as processed. With ``verify_checksums``, the
+    files are additionally hashed and compared with the checksum the connector
+    reports, see Connector.get_object_checksum.
+
+    Files of a source folder other than the download folder of the job, e.g. the
+    one of a deleted job, are hard linked into the download folder.
+
+    Args:
+        job_id (str): The ID of the job.
+        download_dir (str): The download folder of the job.
+        source_dir (str): The folder holding the existing files.
+        connector (Connector): The connector of the job.
+        connector_config (dict): The configuration for the connector.
+        verify_checksums (bool): Whether files are also matched by their checksum.
+        max_workers (int): The number of threads scanning the source folder.
+        layout (str): The layout of both the source and the download folder.
+    """
+
+    def __init__(
+        self,
+        job_id,
+        download_dir,
+        source_dir,
+        connector,
+        connector_config,
+        verify_checksums=False,
+        max_workers=8,
+        layout=LAYOUT_MIRROR,
+    ):
+        self.job_id = job_id
+        self.download_dir = download_dir
+        self.source_dir = source_dir
+        self.verify_checksums = verify_checksums
+        self.max_workers = max_workers
+        self.layout = layout
+        self.__connector = connector
+        self.__connector_config = connector_config
+        self.__files = dict()
+
+    def scan(self):
+        """
+        Scans the source folder for existing files.
+
+        Returns:
+            int: The number of files found.
+        """
+        self.__files = scan_files(self.source_dir, self.max_workers)
+        logging.info(
+            f"Found {len(self.__files)} files to reconcile in {self.source_dir}"
+        )
+        return len(self.__files)
+
+    def reconcile_page(self, page):
+        """
+        Inserts the objects of a listing page that are already on disk as processed.
+
+        Args:
+            page (dict): A dictionary mapping object keys to their sizes.
+
+        Returns:
+            int: The number of objects reconciled.
+        """
+        last_modified = getattr(page, "last_modified", dict())
+        candidates = dict()
+        for object_key, object_size in page.items():
+            source_path = get_local_path(self.source_dir, object_key, self.layout)
+            local_file = self.__files.get(source_path)
+            if not local_file or int(object_size) <= 0:
+                continue
+            size, mtime = local_file
+            if size != int(object_size):
+                continue
+            if mtime + MTIME_TOLERANCE_SECONDS < last_modified.get(object_key, 0):
+                continue
+            candidates[object_key] = source_path
+        if not candidates:
+            return 0
+
+        for object_key in get_existing_object_keys(candidates.keys(), self.job_id):
+            del candidates[object_key]
+
+        checksums = dict()
+        if self.verify_checksums:
+            results = checksum_executor.map(
+                lambda item: self.__verify(page, *item), candidates.items()
+            )
+            for object_key, (is_valid, checksum) in zip(list(candidates), results):
+                if not is_valid:
+                    del candidates[object_key]
+                elif checksum:
+                    checksums[object_key] = checksum
+
+        rows = list()
+        etags = getattr(page, "etags", dict())
+        for object_key, source_path in candidates.items():
+            download_file_path = get_local_path(
+                self.download_dir, object_key, self.layout
+            )
+            if source_path != download_file_path:
+                os.makedirs(os.path.dirname(download_file_path), exist_ok=True)
+                link_file(source_path, download_file_path)
+            rows.append(
+                {
+                    "object_key": object_key,
+                    "object_size": page[object_key],
+                    "last_position": str(page[object_key]),
+                    "status": "PROCESSED",
+                    "job_id": self.job_id,
+                    "local_full_path": download_file_path,
+                    "etag": etags.get(object_key),
+                    "checksum": checksums.get(object_key),
+                }
+            )
+        insert_objects(rows)
+        RECONCILED_OBJECTS.inc(len(rows))
+        return len(rows)
+
+    def __verify(self, page, object_key, source_path):
+        """
+        Compares the checksum of an existing file with the one of its object.
+
+        Returns:
+            tuple: Whether the file matches, and its checksum if it was verified.
+        """
+        try:
+            expected = self.__connector.get_object_checksum(
+                self.__connector_config, object_key, int(page[object_key])
+            )
+            if expected is None:
+                return True, None
+            calculator = ChecksumCalculator(
+                expected["algorithm"], expected.get("part_size")
+            )
+            with open(source_path, "rb") as f:
+                for block in iter(lambda: f.read(READ_BLOCK_SIZE), b""):
+                    calculator.update(block)
+            value = calculator.value()
+            return value == expected["value"], f"{expected['algorithm']}:{value}"
+        except Exception as e:
+            logging.error(f"Error verifying local file of {object_key}: {e}")
+            return False, None
+
+
+def scan_files(root, max_workers):
+    """
+    Scans a folder tree in parallel, one ``os.scandir`` per folder.
+
+    Temporary files, e.g. of interrupted downloads, are skipped.
+
+    Args:
+        root (str): The folder to be scanned.
+        max_workers (int): The number of threads scanning folders.
+
+    Returns:
+        dict: The absolute paths of the files, mapped to their size and mtime.
+    """
+    files = dict()
+    if not os.path.isdir(root):
+        return files
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="scan"
+    ) as executor:
+        pending = {executor.submit(_scan_folder, os.path.abspath(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder_files, folders = future.result()
+                files.update(folder_files)
+                pending.update(executor.submit(_scan_folder, path) for path in folders)
+    return files
+
+
+def _scan_folder(path):
+    files, folders = dict(), list()
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                folders.append(entry.path)
+            elif (
+                entry.is_file(follow_symlinks=False)
+                and not entry.name.endswith(TEMP_DOWNLOAD_SUFFIX)
+                and not entry.name.endswith(".tmp")
+            ):
+                stat = entry.stat(follow_symlinks=False)
+                files[entry.path] = (stat.st_size, stat.st_mtime)
+    return files, folders
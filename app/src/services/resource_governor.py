@@ -0,0 +1,114 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+from app.src.config.config import Config
+from app.src.services.metrics import BUFFER_WAIT_SECONDS, DISK_ADMISSION_REJECTIONS
+
+
+class ResourceGovernor:
+    """
+    Bounds the memory and disk space used by all transfers of the process.
+
+    Transfers reserve the memory they hold, i.e. a chunk and the buffer of their
+    writer, for as long as they run, and block while the reservations of all
+    transfers would exceed the in-flight budget. Before an
+    object is downloaded, its remaining size is admitted against the free space of
+    the download folder, less a reserve and the space already promised to
+    downloads in progress.
+
+    Args:
+        max_in_flight_bytes (int): The budget for the chunks held in memory.
+        disk_reserve_bytes (int): The free space to be left on the download disk.
+    """
+
+    def __init__(self, max_in_flight_bytes, disk_reserve_bytes):
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.disk_reserve_bytes = disk_reserve_bytes
+        self.__in_flight_bytes = 0
+        self.__pending_disk_bytes = 0
+        self.__condition = threading.Condition()
+        self.__disk_lock = threading.Lock()
+
+    @property
+    def in_flight_bytes(self):
+        return self.__in_flight_bytes
+
+    @contextmanager
+    def buffer(self, num_bytes):
+        """
+        Reserves memory for as long as the context is active.
+
+        Blocks until the reservation fits the budget. A reservation larger than the
+        whole budget is admitted once no other one is active, so that a single
+        transfer can always make progress. Transfers take a single reservation, so
+        that none of them waits while holding one.
+
+        Args:
+            num_bytes (int): The number of bytes to be reserved.
+        """
+        started_at = time.perf_counter()
+        with self.__condition:
+            self.__condition.wait_for(
+                lambda: (
+                    self.__in_flight_bytes == 0
+                    or self.__in_flight_bytes + num_bytes <= self.max_in_flight_bytes
+                )
+            )
+            self.__in_flight_bytes += num_bytes
+        BUFFER_WAIT_SECONDS.observe(time.perf_counter() - started_at)
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__in_flight_bytes -= num_bytes
+                self.__condition.notify_all()
+
+    @contextmanager
+    def disk_space(self, path, num_bytes):
+        """
+        Admits a download of the given size to the disk of the given path.
+
+        The space stays promised to the download for as long as the context is active.
+
+        Args:
+            path (str): A path on the disk the download is written to.
+            num_bytes (int): The number of bytes still to be written.
+
+        Raises:
+            Exception: If the disk does not have enough free space.
+        """
+        with self.__disk_lock:
+            free_bytes = shutil.disk_usage(_existing_parent(path)).free
+            available_bytes = (
+                free_bytes - self.__pending_disk_bytes - self.disk_reserve_bytes
+            )
+            if num_bytes > available_bytes:
+                DISK_ADMISSION_REJECTIONS.inc()
+                error_msg = (
+                    f"Insufficient disk space for {num_bytes} bytes, "
+                    f"{max(available_bytes, 0)} bytes available"
+                )
+                logging.warning(error_msg)
+                raise Exception(error_msg)
+            self.__pending_disk_bytes += num_bytes
+        try:
+            yield
+        finally:
+            with self.__disk_lock:
+                self.__pending_disk_bytes -= num_bytes
+
+
+def _existing_parent(path):
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        path = os.path.dirname(path)
+    return path
+
+
+resource_governor = ResourceGovernor(
+    int(eval(Config.MAX_IN_FLIGHT_BYTES)), int(eval(Config.DISK_RESERVE_BYTES))
+)
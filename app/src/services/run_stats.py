@@ -0,0 +1,61 @@
+import contextvars
+import threading
+
+
+class RunStats:
+    """
+    Accumulates the counters of a single sync run.
+
+    Attributes:
+        objects_transferred (int): Number of objects downloaded completely.
+        bytes_transferred (int): Number of bytes fetched from the connector.
+        list_requests (int): Number of LIST requests issued.
+        get_requests (int): Number of GET-class requests (GET and HEAD) issued.
+        retry_requests (int): Number of requests retried after an error.
+        failed_objects (int): Number of objects that failed to sync.
+    """
+
+    FIELDS = (
+        "objects_transferred",
+        "bytes_transferred",
+        "list_requests",
+        "get_requests",
+        "retry_requests",
+        "failed_objects",
+    )
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+
+    def incr(self, field, amount=1):
+        """
+        Increments a counter of the run.
+
+        Args:
+            field (str): The name of the counter, one of ``RunStats.FIELDS``.
+            amount (int): The amount to add, defaults to 1.
+        """
+        with self.__lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def as_dict(self):
+        with self.__lock:
+            return {field: getattr(self, field) for field in self.FIELDS}
+
+
+current_run_stats = contextvars.ContextVar("current_run_stats", default=None)
+
+
+def record_run_stat(field, amount=1):
+    """
+    Increments a counter of the sync run executing in the current context, if any.
+
+    Args:
+        field (str): The name of the counter, one of ``RunStats.FIELDS``.
+        amount (int): The amount to add, defaults to 1.
+    """
+    stats = current_run_stats.get()
+    if stats is not None:
+        stats.incr(field, amount)
@@ -1,6 +1,15 @@
+import functools
 import logging
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from apscheduler.events import EVENT_JOB_SUBMITTED
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.executors.pool import ThreadPoolExecutor
+import pytz
+
+from app.src.services.metrics import SCHEDULER_QUEUE_WAIT
 
 
 interval_mapping = {
@@ -28,6 +37,7 @@ class Scheduler:
     Methods:
         __init__(): Initializes the Scheduler object and starts the scheduler.
         add_job(): Adds a new job to the scheduler.
+        run_once(): Runs a job once, as soon as a worker thread is free.
         remove_job(): Removes a job from the scheduler.
     """
 
@@ -36,6 +46,12 @@ class Scheduler:
         Initializes the Scheduler object and starts the scheduler.
         """
         self.scheduler = BackgroundScheduler(executors=executors)
+        # Scheduled run times of submitted jobs, and start times of jobs whose
+        # submission event was not dispatched yet, by job ID.
+        self.__run_times = {}
+        self.__start_times = {}
+        self.__run_times_lock = threading.Lock()
+        self.scheduler.add_listener(self.__on_job_submitted, EVENT_JOB_SUBMITTED)
         self.scheduler.start()
         logging.info("Scheduler started")
 
@@ -69,7 +85,7 @@ class Scheduler:
             replace_existing = False
 
         job = self.scheduler.add_job(
-            job,
+            self.__with_queue_wait(job, job_id),
             "interval",
             seconds=schedule_seconds,
             name=job_name,
@@ -81,6 +97,78 @@ class Scheduler:
         logging.info(f"Job {job_name}, {job_id} scheduled successfully")
         return job, None
 
+    def run_once(self, job, job_name, *args):
+        """
+        Runs a job once, as soon as a worker thread is free.
+
+        Args:
+            job (callable): The job function to be run.
+            job_name (str): The name of the job.
+            *args: Additional positional arguments to be passed to the job function.
+
+        Returns:
+            job (Job): The scheduled job object.
+        """
+        job_id = uuid.uuid4().hex
+        return self.scheduler.add_job(
+            self.__with_queue_wait(job, job_id),
+            "date",
+            name=job_name,
+            id=job_id,
+            args=args,
+            misfire_grace_time=None,
+        )
+
+    def __with_queue_wait(self, job, job_id):
+        """
+        Wraps a job function so that the delay between its scheduled run time and
+        the moment a worker thread actually starts it is recorded.
+
+        The scheduled run times are the ones APScheduler submits the job with, so
+        that cron triggers, misfires and coalesced runs are measured as they ran.
+        A job may start before its submission event is dispatched, in which case
+        the delay is recorded once the event arrives.
+
+        Args:
+            job (callable): The job function to be wrapped.
+            job_id (str): The unique identifier for the job.
+
+        Returns:
+            callable: The wrapped job function.
+        """
+
+        @functools.wraps(job)
+        def timed_job(*args, **kwargs):
+            start_time = datetime.now(pytz.utc)
+            with self.__run_times_lock:
+                run_times = self.__run_times.get(job_id)
+                if run_times:
+                    _observe_queue_wait(run_times.popleft(), start_time)
+                    if not run_times:
+                        del self.__run_times[job_id]
+                else:
+                    self.__start_times.setdefault(job_id, deque()).append(start_time)
+            return job(*args, **kwargs)
+
+        return timed_job
+
+    def __on_job_submitted(self, event):
+        """
+        Pairs the scheduled run times of a submitted job with the start times of
+        its runs.
+
+        Args:
+            event (JobSubmissionEvent): The event of the submission.
+        """
+        with self.__run_times_lock:
+            run_times = self.__run_times.setdefault(event.job_id, deque())
+            run_times.extend(event.scheduled_run_times)
+            start_times = self.__start_times.pop(event.job_id, deque())
+            while run_times and start_times:
+                _observe_queue_wait(run_times.popleft(), start_times.popleft())
+            if not run_times:
+                del self.__run_times[event.job_id]
+
     def remove_job(self, job_id):
         """
         Removes a job from the scheduler.
@@ -95,4 +183,14 @@ class Scheduler:
             None
         """
         self.scheduler.remove_job(job_id)
+        with self.__run_times_lock:
+            self.__run_times.pop(job_id, None)
+            self.__start_times.pop(job_id, None)
         logging.info(f"Job {job_id} removed successfully")
+
+
+def _observe_queue_wait(run_time, start_time):
+    """
+    Records the delay between the scheduled run time of a job and its start.
+    """
+    SCHEDULER_QUEUE_WAIT.observe(max((start_time - run_time).total_seconds(), 0.0))
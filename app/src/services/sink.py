@@ -0,0 +1,149 @@
+import logging
+from abc import ABC, abstractmethod
+
+
+class SinkWriter(ABC):
+    """
+    Receives the chunks of one object, in order, as they are fetched.
+
+    A writer is closed once the transfer stopped, whether the object was written
+    completely or not. A complete object only becomes visible once it is committed
+    through its sink; a writer that is discarded instead drops what it wrote.
+
+    Attributes:
+        location (str): Where the object ends up, recorded as its local_full_path.
+        path (str): The local file holding the bytes written so far, for sinks that
+            resume interrupted transfers, otherwise None.
+        compression (str): The compression the object is stored with, if any.
+        zero_copy (bool): Whether the writer copies local files, with a
+            ``copy_from(source_fd, offset, count)`` method only such writers have.
+    """
+
+    location = None
+    path = None
+    compression = None
+    zero_copy = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if exc_type is not None and self.path is None:
+            # Nothing to resume from, so what was written is only garbage.
+            self.discard()
+
+    @property
+    @abstractmethod
+    def position(self):
+        """The offset up to which the object was written."""
+
+    @property
+    def stored_size(self):
+        """The number of bytes the object takes where it is stored."""
+        return self.position
+
+    @abstractmethod
+    def write(self, data):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    @abstractmethod
+    def discard(self):
+        pass
+
+    def commit(self):
+        """
+        Makes the written object visible at its location. Writers whose objects are
+        visible once written do nothing.
+        """
+        pass
+
+
+class Sink(ABC):
+    """
+    Abstract base class for sinks, i.e. the targets synced objects are written to.
+
+    The sync job streams every object from its connector into a writer of the sink,
+    chunk by chunk, so that each byte is read and written once, without a copy on
+    the local disk.
+
+    Methods:
+        open: Opens a writer for an object.
+        get_buffer_size: Returns the memory a writer of an object holds.
+        locate: Returns where an object is written to, if known before it is.
+        commit: Commits a completely written object.
+        flush: Commits the pending objects, before the progress is recorded.
+        close: Completes the pending objects at the end of a run.
+        discard: Drops the pending objects when the changes of a run are rolled back.
+    """
+
+    @abstractmethod
+    def open(self, object, start_position):
+        """
+        Opens a writer for an object.
+
+        Args:
+            object (Object): The object to be written.
+            start_position (int): The offset the object was synced up to before.
+
+        Returns:
+            SinkWriter: The writer, whose position is where the transfer resumes,
+                0 if the sink can not resume it.
+        """
+
+    def get_buffer_size(self, object):
+        """
+        Returns the number of bytes a writer of an object holds in memory until it
+        is committed, on top of the chunk being written, so that transfers reserve
+        them with the resource governor.
+
+        Args:
+            object (Object): The object to be written.
+
+        Returns:
+            int: The number of bytes, 0 for writers without a buffer.
+        """
+        return 0
+
+    def locate(self, object_key):
+        return None
+
+    def commit(self, writer, on_commit):
+        """
+        Commits a completely written object.
+
+        Args:
+            writer (SinkWriter): The closed writer of the object.
+            on_commit (callable): Called with True once the object is in place, or
+                with False if it could not be committed.
+        """
+        try:
+            writer.commit()
+        except Exception as e:
+            logging.error(f"Unable to commit {writer.location}: {e}")
+            writer.discard()
+            on_commit(False)
+            return
+        on_commit(True)
+
+    def flush(self):
+        """
+        Commits the pending objects. Sinks that commit objects right away do nothing.
+        """
+        pass
+
+    def close(self):
+        """
+        Completes the pending objects. Sinks without pending objects do nothing.
+        """
+        pass
+
+    def discard(self):
+        """
+        Drops the pending objects. Sinks without pending objects do nothing.
+        """
+        pass
@@ -0,0 +1,238 @@
+import logging
+import os
+import tarfile
+import time
+import uuid
+from contextlib import ExitStack
+
+from app.src.services.metrics import SINK_BYTES
+from app.src.services.resource_governor import resource_governor
+from app.src.services.sink import Sink, SinkWriter
+from app.src.utils.compression_util import (
+    COMPRESSED_SUFFIX,
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    COMPRESSIONS,
+    get_zstd_compressor,
+)
+from app.src.utils.download_writer import DownloadWriter
+from app.src.utils.file_util import fsync_path, get_temp_download_path, remove_file
+
+
+class ArchiveSink(Sink):
+    """
+    Packs objects into tar archive segments, optionally compressed with zstd.
+
+    Objects are appended to the open segment as tar members while they are fetched,
+    with the member header written up front, as the size of the object is known. A
+    segment is sealed once it reached the segment size, and at the end of a run: the
+    end of archive marker is appended, and the segment is synced and renamed from
+    its temporary name. Objects are only recorded as processed once their segment
+    is sealed, so the objects of a segment that was never sealed are synced again.
+
+    With zstd, every member is compressed as a frame of its own. Concatenated frames
+    decompress to the concatenated members, so a segment is a regular ``.tar.zst``
+    archive, while a member that failed can still be cut off the end of the segment.
+
+    Args:
+        folder (str): The folder the segments are written to.
+        segment_size (int): The size a segment is sealed at.
+        buffer_size (int): The size writes are aligned to, see DownloadWriter.
+        compression (str): ``none`` or ``zstd``.
+        compression_level (int): The zstd compression level.
+        drop_cache (bool): Whether written pages are dropped from the page cache.
+
+    Raises:
+        ImportError: If zstd compression is requested and zstandard is not installed.
+    """
+
+    def __init__(
+        self,
+        folder,
+        segment_size,
+        buffer_size,
+        compression=COMPRESSION_NONE,
+        compression_level=3,
+        drop_cache=False,
+    ):
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression {compression}, supported ones: {COMPRESSIONS}"
+            )
+        self.folder = folder
+        self.segment_size = segment_size
+        self.buffer_size = buffer_size
+        self.drop_cache = drop_cache
+        self.__compressor = None
+        if compression == COMPRESSION_ZSTD:
+            self.__compressor = get_zstd_compressor(compression_level)
+        self.__extension = (
+            f".tar{COMPRESSED_SUFFIX}" if self.__compressor is not None else ".tar"
+        )
+        self.__segment = None
+        self.__pending = list()
+        os.makedirs(self.folder, exist_ok=True)
+
+    def get_buffer_size(self, object):
+        return min(self.buffer_size, int(object.object_size))
+
+    def open(self, object, start_position):
+        if self.__segment is None:
+            name = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+            self.__segment = ArchiveSegment(
+                os.path.join(self.folder, f"{name}{self.__extension}")
+            )
+        return ArchiveSinkWriter(
+            self.__segment,
+            object.object_key,
+            int(object.object_size),
+            self.buffer_size,
+            self.__compressor.compressobj() if self.__compressor is not None else None,
+            self.drop_cache,
+        )
+
+    def commit(self, writer, on_commit):
+        self.__pending.append(on_commit)
+        if self.__segment.size >= self.segment_size:
+            self.__seal()
+
+    def close(self):
+        if self.__segment is not None:
+            self.__seal()
+
+    def discard(self):
+        self.__pending = list()
+        if self.__segment is not None:
+            remove_file(self.__segment.temp_path)
+            self.__segment = None
+
+    def __seal(self):
+        segment, self.__segment = self.__segment, None
+        pending, self.__pending = self.__pending, list()
+        if not pending:
+            remove_file(segment.temp_path)
+            return
+        end_of_archive = b"\0" * (tarfile.BLOCKSIZE * 2)
+        if self.__compressor is not None:
+            end_of_archive = self.__compressor.compress(end_of_archive)
+        try:
+            with open(segment.temp_path, "ab") as f:
+                f.write(end_of_archive)
+            fsync_path(segment.temp_path)
+            os.replace(segment.temp_path, segment.path)
+            fsync_path(self.folder)
+        except OSError as e:
+            logging.error(f"Unable to seal archive segment {segment.path}: {e}")
+            remove_file(segment.temp_path)
+            for on_commit in pending:
+                on_commit(False)
+            return
+        logging.info(f"Sealed archive segment {segment.path}, {len(pending)} objects")
+        for on_commit in pending:
+            on_commit(True)
+
+
+class ArchiveSegment:
+    """
+    An archive segment that is being written, under its temporary name.
+
+    Args:
+        path (str): The path of the segment once sealed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.temp_path = get_temp_download_path(path)
+        self.size = 0
+
+
+class ArchiveSinkWriter(SinkWriter):
+    """
+    Appends an object to an archive segment as a tar member.
+
+    Args:
+        segment (ArchiveSegment): The segment the object is appended to.
+        object_key (str): The key of the object, used as the member name.
+        object_size (int): The size of the object.
+        buffer_size (int): The size writes are aligned to.
+        compressor (ZstdCompressionObj): Compresses the member as a frame, if set.
+        drop_cache (bool): Whether written pages are dropped from the page cache.
+    """
+
+    def __init__(
+        self, segment, object_key, object_size, buffer_size, compressor, drop_cache
+    ):
+        self.location = segment.path
+        self.object_size = object_size
+        self.__segment = segment
+        self.__start = segment.size
+        self.__compressor = compressor
+        self.compression = COMPRESSION_ZSTD if compressor is not None else None
+        self.__position = 0
+        self.__resources = ExitStack()
+        member = tarfile.TarInfo(object_key)
+        member.size = object_size
+        member.mtime = int(time.time())
+        header = member.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+        try:
+            # An upper bound with compression.
+            self.__resources.enter_context(
+                resource_governor.disk_space(
+                    segment.temp_path, len(header) + object_size + tarfile.BLOCKSIZE
+                )
+            )
+            self.__writer = self.__resources.enter_context(
+                DownloadWriter(
+                    segment.temp_path,
+                    self.__start,
+                    self.__start,
+                    buffer_size,
+                    drop_cache=drop_cache,
+                )
+            )
+            self.__write(header)
+        except BaseException:
+            self.__resources.close()
+            raise
+
+    @property
+    def position(self):
+        return self.__position
+
+    @property
+    def stored_size(self):
+        # The member with its header and padding, as written to the segment.
+        return self.__writer.position - self.__start
+
+    def write(self, data):
+        self.__write(data)
+        self.__position += len(data)
+
+    def close(self):
+        """
+        Completes the member of a complete object, or cuts off an incomplete one.
+        """
+        if self.__resources is None:
+            return
+        try:
+            if self.__position >= self.object_size:
+                self.__write(b"\0" * (-self.object_size % tarfile.BLOCKSIZE))
+                if self.__compressor is not None:
+                    self.__writer.write(self.__compressor.flush())
+        finally:
+            self.__resources.close()
+            self.__resources = None
+        if self.__position < self.object_size:
+            self.discard()
+            return
+        self.__segment.size = self.__writer.position
+        SINK_BYTES.inc(self.__segment.size - self.__start, sink="archive")
+
+    def discard(self):
+        os.truncate(self.__segment.temp_path, self.__start)
+        self.__segment.size = self.__start
+
+    def __write(self, data):
+        if self.__compressor is not None:
+            data = self.__compressor.compress(data)
+        self.__writer.write(data)
@@ -0,0 +1,388 @@
+import functools
+import logging
+import os
+from contextlib import ExitStack
+
+from app.src.services.metrics import COMPRESSED_OBJECTS, COMPRESSION_BYTES
+from app.src.services.resource_governor import resource_governor
+from app.src.services.sink import Sink, SinkWriter
+from app.src.services.tracing import tracer
+from app.src.utils.compression_util import (
+    COMPRESSED_SUFFIX,
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    get_zstd_compressor,
+    is_compressed_data,
+    is_compressed_name,
+)
+from app.src.utils.download_writer import DownloadWriter
+from app.src.utils.file_util import (
+    LAYOUT_MIRROR,
+    detach_shared_file,
+    get_local_path,
+    get_temp_download_path,
+    remove_file,
+)
+
+
+class LocalSink(Sink):
+    """
+    Writes objects to files under the download folder of a job.
+
+    Objects are written to a temporary file next to their path, which is moved into
+    place by the download committer once complete, and interrupted transfers are
+    resumed from it. Objects that grew in append mode are appended to at their path
+    instead, after verifying that the bytes synced so far did not change.
+
+    With zstd compression, objects are compressed as they are written and stored
+    at their path with a ``.zst`` suffix, unless they are compressed already.
+
+    Args:
+        download_dir (str): The download folder of the job.
+        committer (DownloadCommitter): Moves the completed files into place.
+        connector (Connector): The connector the synced bytes are verified against.
+        connector_config (dict): The configuration for the connector.
+        buffer_size (int): The size writes are aligned to, see DownloadWriter.
+        drop_cache (bool): Whether written pages are dropped from the page cache.
+        verify_bytes (int): The number of synced bytes verified before appending.
+        layout (str): The layout of the download folder.
+        compression (str): ``none`` or ``zstd``.
+        compression_level (int): The zstd compression level.
+    """
+
+    def __init__(
+        self,
+        download_dir,
+        committer,
+        connector,
+        connector_config,
+        buffer_size,
+        drop_cache=False,
+        verify_bytes=65536,
+        layout=LAYOUT_MIRROR,
+        compression=COMPRESSION_NONE,
+        compression_level=3,
+    ):
+        self.download_dir = download_dir
+        self.buffer_size = buffer_size
+        self.drop_cache = drop_cache
+        self.verify_bytes = verify_bytes
+        self.layout = layout
+        self.__committer = committer
+        self.__connector = connector
+        self.__connector_config = connector_config
+        self.__compressor = (
+            get_zstd_compressor(compression_level)
+            if compression == COMPRESSION_ZSTD
+            else None
+        )
+
+    def get_buffer_size(self, object):
+        return min(self.buffer_size, int(object.object_size))
+
+    def locate(self, object_key):
+        return get_local_path(self.download_dir, object_key, self.layout)
+
+    def open(self, object, start_position):
+        replaced_path = object.local_full_path
+        download_file_path = replaced_path or self.locate(object.object_key)
+        if object.compression is not None:
+            download_file_path = download_file_path[: -len(COMPRESSED_SUFFIX)]
+        temp_path = get_temp_download_path(download_file_path)
+        if (
+            self.__compressor is not None
+            and not is_compressed_name(object.object_key)
+            # Transfers that were written uncompressed are resumed as they are.
+            and not (start_position > 0 and os.path.exists(temp_path))
+        ):
+            os.makedirs(os.path.dirname(download_file_path), exist_ok=True)
+            return CompressingSinkWriter(
+                download_file_path,
+                int(object.object_size),
+                self.buffer_size,
+                self.drop_cache,
+                # The size in the frame header lets readers allocate it at once.
+                self.__compressor.compressobj(size=int(object.object_size)),
+                replaced_path=replaced_path,
+            )
+        if (
+            start_position > 0
+            and self.__connector_config.get("append_mode")
+            and not os.path.exists(temp_path)
+        ):
+            write_path = download_file_path
+            # Files linked from the content store or a snapshot must not be written to.
+            detach_shared_file(download_file_path, keep_content=True)
+            if not self.__verify_synced_tail(
+                object.object_key, download_file_path, start_position
+            ):
+                logging.info(
+                    f"Synced bytes of {object.object_key} changed, downloading it again"
+                )
+                write_path = temp_path
+                start_position = 0
+        else:
+            write_path = temp_path
+            if start_position > 0 and (
+                not os.path.exists(temp_path)
+                or os.path.getsize(temp_path) < start_position
+            ):
+                start_position = 0
+
+        os.makedirs(os.path.dirname(download_file_path), exist_ok=True)
+        return LocalSinkWriter(
+            write_path,
+            download_file_path,
+            start_position,
+            int(object.object_size),
+            self.buffer_size,
+            self.drop_cache,
+            replaced_path=replaced_path,
+        )
+
+    def commit(self, writer, on_commit):
+        self.__committer.commit(
+            writer.temp_path,
+            writer.location,
+            functools.partial(self.__on_committed, writer, on_commit),
+        )
+
+    @staticmethod
+    def __on_committed(writer, on_commit, is_committed):
+        if is_committed and writer.replaced_path not in (None, writer.location):
+            # E.g. the uncompressed file of an object that is compressed now.
+            remove_file(writer.replaced_path)
+        on_commit(is_committed)
+
+    def flush(self):
+        self.__committer.flush()
+
+    def discard(self):
+        self.__committer.discard()
+
+    def __verify_synced_tail(self, object_key, download_file_path, synced_size):
+        """
+        Verifies that the bytes synced so far still match the object, by comparing the
+        last bytes of the local file with the same range of the object.
+
+        Args:
+            object_key (str): The key of the object to be resumed.
+            download_file_path (str): The local path the object is written to.
+            synced_size (int): The number of bytes synced so far.
+
+        Returns:
+            bool: True if only the rest of the object needs to be fetched.
+        """
+        if (
+            not os.path.exists(download_file_path)
+            or os.path.getsize(download_file_path) < synced_size
+        ):
+            return False
+
+        verify_bytes = min(self.verify_bytes, synced_size)
+        with tracer.span("verify_synced_tail", key=object_key, bytes=verify_bytes):
+            with open(download_file_path, "rb") as f:
+                f.seek(synced_size - verify_bytes)
+                local_tail = f.read(verify_bytes)
+
+            remote_tail = b""
+            position = synced_size - verify_bytes
+            while position < synced_size:
+                chunk_data, position = self.__connector.fetch_object_in_chunks(
+                    self.__connector_config, object_key, position, synced_size
+                )
+                remote_tail += chunk_data
+        return remote_tail == local_tail
+
+
+class LocalSinkWriter(SinkWriter):
+    """
+    Writes an object to a local file, reserving the disk space it still needs.
+
+    Args:
+        path (str): The file the object is written to.
+        location (str): The final path of the object.
+        start_position (int): The offset the writes start at.
+        object_size (int): The size of the object.
+        buffer_size (int): The size writes are aligned to.
+        drop_cache (bool): Whether written pages are dropped from the page cache.
+        replaced_path (str): The file the object was stored at before, if any.
+        preallocate (bool): Whether the file is preallocated to the object size,
+            by default only temporary files are.
+    """
+
+    def __init__(
+        self,
+        path,
+        location,
+        start_position,
+        object_size,
+        buffer_size,
+        drop_cache,
+        replaced_path=None,
+        preallocate=None,
+    ):
+        self.path = path
+        self.location = location
+        self.replaced_path = replaced_path
+        self.zero_copy = True
+        # Objects appended to at their final path need no move into place.
+        self.temp_path = None if path == location else path
+        if preallocate is None:
+            # Readers only see the temporary file once it is complete, so only that
+            # one is preallocated.
+            preallocate = self.temp_path is not None
+        self.__resources = ExitStack()
+        try:
+            self.__resources.enter_context(
+                resource_governor.disk_space(path, object_size - start_position)
+            )
+            self.__writer = self.__resources.enter_context(
+                DownloadWriter(
+                    path,
+                    start_position,
+                    object_size,
+                    buffer_size,
+                    preallocate=preallocate,
+                    drop_cache=drop_cache,
+                )
+            )
+        except BaseException:
+            self.__resources.close()
+            raise
+
+    @property
+    def position(self):
+        return self.__writer.position
+
+    def write(self, data):
+        self.__writer.write(data)
+
+    def copy_from(self, source_fd, offset, count):
+        """
+        Writes a range of a local file, without reading it into memory.
+
+        Args:
+            source_fd (int): The file descriptor of the file to copy from.
+            offset (int): The offset in the file the range starts at.
+            count (int): The size of the range.
+
+        Returns:
+            int: The number of bytes copied.
+        """
+        return self.__writer.copy_from(source_fd, offset, count)
+
+    def close(self):
+        self.__resources.close()
+
+    def discard(self):
+        if self.temp_path is not None:
+            remove_file(self.temp_path)
+
+
+class CompressingSinkWriter(SinkWriter):
+    """
+    Compresses an object with zstd as it is written to a local file, or writes it as
+    it is if its first bytes show that it is compressed already.
+
+    The file is only opened with the first chunk, once it is known which of the two
+    it is. Compressed transfers are not resumed, as the compressor state is lost
+    when they are interrupted.
+
+    Args:
+        path (str): The path of the object when stored uncompressed.
+        object_size (int): The size of the object.
+        buffer_size (int): The size writes are aligned to.
+        drop_cache (bool): Whether written pages are dropped from the page cache.
+        compressor (ZstdCompressionObj): Compresses the object as a frame.
+        replaced_path (str): The file the object was stored at before, if any.
+    """
+
+    def __init__(
+        self,
+        path,
+        object_size,
+        buffer_size,
+        drop_cache,
+        compressor,
+        replaced_path=None,
+    ):
+        self.location = path + COMPRESSED_SUFFIX
+        self.compression = COMPRESSION_ZSTD
+        self.object_size = object_size
+        self.replaced_path = replaced_path
+        self.buffer_size = buffer_size
+        self.drop_cache = drop_cache
+        self.__uncompressed_path = path
+        self.__compressor = compressor
+        self.__writer = None
+        self.__position = 0
+        self.__closed = False
+
+    @property
+    def path(self):
+        # Only uncompressed transfers can be resumed from their temporary file.
+        if self.__writer is None or self.compression is not None:
+            return None
+        return self.__writer.path
+
+    @property
+    def temp_path(self):
+        return self.__writer.temp_path
+
+    @property
+    def position(self):
+        return self.__position
+
+    @property
+    def stored_size(self):
+        return self.__writer.position if self.__writer is not None else 0
+
+    def write(self, data):
+        if self.__writer is None:
+            self.__open(data)
+        self.__position += len(data)
+        if self.compression is not None:
+            data = self.__compressor.compress(data)
+        self.__writer.write(data)
+
+    def close(self):
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.__writer is None:
+            self.__open(b"")
+        try:
+            if self.__position >= self.object_size and self.compression is not None:
+                self.__writer.write(self.__compressor.flush())
+        finally:
+            self.__writer.close()
+        if self.__position >= self.object_size and self.compression is not None:
+            COMPRESSION_BYTES.inc(self.object_size, kind="raw")
+            COMPRESSION_BYTES.inc(self.stored_size, kind="stored")
+
+    def discard(self):
+        if self.__writer is not None:
+            self.__writer.discard()
+
+    def __open(self, data):
+        """
+        Opens the file of the object, compressed unless its first bytes are those of
+        a compressed format. Empty objects are stored as they are.
+        """
+        if self.object_size == 0 or is_compressed_data(data):
+            self.compression = None
+            self.location = self.__uncompressed_path
+            COMPRESSED_OBJECTS.inc(result="skipped")
+        else:
+            COMPRESSED_OBJECTS.inc(result="compressed")
+        self.__writer = LocalSinkWriter(
+            get_temp_download_path(self.location),
+            self.location,
+            0,
+            self.object_size,
+            self.buffer_size,
+            self.drop_cache,
+            replaced_path=self.replaced_path,
+            preallocate=self.compression is None,
+        )
@@ -0,0 +1,190 @@
+import boto3
+import botocore
+from botocore.exceptions import BotoCoreError
+import logging
+import math
+import retry
+
+from app.src.config.config import Config
+from app.src.services.metrics import SINK_BYTES, SINK_REQUESTS
+from app.src.services.sink import Sink, SinkWriter
+
+
+# S3 rejects parts smaller than this, except for the last one.
+MIN_PART_SIZE = 5 * 1024 * 1024
+# S3 rejects uploads of more parts than this.
+MAX_PARTS = 10000
+
+
+class S3Sink(Sink):
+    """
+    Writes objects to a bucket of S3 or of an S3-compatible service.
+
+    Objects are streamed with multipart uploads: fetched chunks are collected until
+    they fill a part, which is uploaded before the next chunk is fetched, so that at
+    most a part of an object is held in memory and nothing is written to disk.
+    Parts of objects too large for ``MAX_PARTS`` parts of the configured size are
+    enlarged to fit. Objects smaller than a part are uploaded with a single
+    ``PutObject``. An object only appears in the
+    bucket once its upload is completed, and uploads that are not completed are
+    aborted, so that no parts are left behind.
+
+    The credentials are taken from the environment, or from the ``profile_name``
+    in the sink config.
+
+    Args:
+        sink_config (dict): The ``bucket_name`` and optionally the ``prefix``
+            objects are written under, the ``endpoint_url`` and ``region_name`` of
+            the service, the ``profile_name`` and the ``part_size``.
+    """
+
+    def __init__(self, sink_config):
+        self.bucket_name = sink_config["bucket_name"].strip()
+        self.prefix = sink_config.get("prefix", "")
+        self.part_size = max(
+            int(sink_config.get("part_size") or eval(Config.SINK_PART_SIZE)),
+            MIN_PART_SIZE,
+        )
+        session = boto3.Session(profile_name=sink_config.get("profile_name"))
+        self.s3_client = session.client(
+            "s3",
+            endpoint_url=sink_config.get("endpoint_url"),
+            region_name=sink_config.get("region_name")
+            or session.region_name
+            or "us-west-2",
+            config=botocore.client.Config(signature_version="s3v4"),
+        )
+
+    def get_part_size(self, object_size):
+        """
+        Returns the part size of an object, large enough for it to fit in MAX_PARTS.
+        """
+        return max(self.part_size, math.ceil(object_size / MAX_PARTS))
+
+    def get_buffer_size(self, object):
+        # Objects smaller than a part are held until they are committed.
+        object_size = int(object.object_size)
+        return min(self.get_part_size(object_size), object_size)
+
+    def locate(self, object_key):
+        return f"s3://{self.bucket_name}/{self.prefix}{object_key}"
+
+    def open(self, object, start_position):
+        return S3SinkWriter(
+            self.s3_client,
+            self.bucket_name,
+            f"{self.prefix}{object.object_key}",
+            int(object.object_size),
+            self.get_part_size(int(object.object_size)),
+        )
+
+
+class S3SinkWriter(SinkWriter):
+    """
+    Uploads an object part by part as it is written.
+
+    Args:
+        s3_client (boto3.client): The client of the target service.
+        bucket_name (str): The bucket the object is uploaded to.
+        key (str): The key the object is uploaded as.
+        object_size (int): The size of the object.
+        part_size (int): The size of the uploaded parts.
+    """
+
+    def __init__(self, s3_client, bucket_name, key, object_size, part_size):
+        self.location = f"s3://{bucket_name}/{key}"
+        self.bucket_name = bucket_name
+        self.key = key
+        self.object_size = object_size
+        self.part_size = part_size
+        self.__s3_client = s3_client
+        self.__buffer = bytearray()
+        self.__position = 0
+        self.__upload_id = None
+        self.__parts = list()
+
+    @property
+    def position(self):
+        return self.__position
+
+    def write(self, data):
+        self.__buffer += data
+        self.__position += len(data)
+        while len(self.__buffer) >= self.part_size:
+            self.__upload_part(self.part_size)
+
+    def close(self):
+        """
+        Uploads the last part of a complete object, or aborts an incomplete upload.
+        """
+        if self.__position < self.object_size:
+            self.discard()
+        elif self.__upload_id is not None and self.__buffer:
+            self.__upload_part(len(self.__buffer))
+
+    def discard(self):
+        self.__buffer = bytearray()
+        if self.__upload_id is None:
+            return
+        upload_id, self.__upload_id = self.__upload_id, None
+        try:
+            self.__request(
+                "abort_multipart_upload",
+                Bucket=self.bucket_name,
+                Key=self.key,
+                UploadId=upload_id,
+            )
+        except Exception as e:
+            # Left to the lifecycle rules of the bucket.
+            logging.warning(f"Unable to abort the upload of {self.location}: {e}")
+
+    def commit(self):
+        if self.__upload_id is None:
+            self.__request(
+                "put_object",
+                Bucket=self.bucket_name,
+                Key=self.key,
+                Body=bytes(self.__buffer),
+            )
+            SINK_BYTES.inc(len(self.__buffer), sink="s3")
+            self.__buffer = bytearray()
+            return
+        self.__request(
+            "complete_multipart_upload",
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self.__upload_id,
+            MultipartUpload={"Parts": self.__parts},
+        )
+        self.__upload_id = None
+
+    def __upload_part(self, size):
+        if self.__upload_id is None:
+            self.__upload_id = self.__request(
+                "create_multipart_upload", Bucket=self.bucket_name, Key=self.key
+            )["UploadId"]
+        part_number = len(self.__parts) + 1
+        response = self.__request(
+            "upload_part",
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self.__upload_id,
+            PartNumber=part_number,
+            Body=bytes(self.__buffer[:size]),
+        )
+        self.__parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        SINK_BYTES.inc(size, sink="s3")
+        del self.__buffer[:size]
+
+    def __request(self, operation, **kwargs):
+        @retry.retry(
+            BotoCoreError,
+            tries=int(Config.RETRY_COUNT),
+            delay=int(Config.RETRY_DELAY),
+            backoff=int(Config.RETRY_BACKOFF),
+        )
+        def request_with_retry():
+            return getattr(self.__s3_client, operation)(**kwargs)
+
+        SINK_REQUESTS.inc(sink="s3", operation=operation)
+        return request_with_retry()
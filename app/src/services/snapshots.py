@@ -0,0 +1,104 @@
+import errno
+import logging
+import os
+import shutil
+
+from app.src.utils.file_util import copy_file
+
+
+TEMP_SUFFIX = ".tmp"
+
+
+class SnapshotManager:
+    """
+    Keeps point-in-time versions of the download folder of a job as hard link trees.
+
+    Like rsync ``--link-dest``, every snapshot is a complete tree of the synced
+    objects, but its files are hard links to the downloaded ones. Objects that did
+    not change since the previous snapshot share the file of that snapshot, and
+    changed objects are detached from the snapshots before they are written again,
+    so N snapshots only take the space of the objects that changed between them.
+
+    Args:
+        root (str): The folder holding the snapshots of the job.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def create(self, snapshot_id, objects):
+        """
+        Creates a snapshot of the given objects.
+
+        The tree is built next to its final location and renamed once complete, so
+        that a snapshot is either complete or absent.
+
+        Args:
+            snapshot_id (str): The name of the snapshot, e.g. the ID of the run.
+            objects (iterable): The paths of the objects in the snapshot, relative to
+                it, and their local paths.
+
+        Returns:
+            int: The number of objects in the snapshot.
+        """
+        snapshot_path = os.path.join(self.root, snapshot_id)
+        temp_path = f"{snapshot_path}{TEMP_SUFFIX}"
+        shutil.rmtree(temp_path, ignore_errors=True)
+        os.makedirs(temp_path)
+
+        linked = 0
+        for relative_path, local_full_path in objects:
+            target_path = os.path.join(temp_path, relative_path)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            try:
+                os.link(local_full_path, target_path)
+            except FileNotFoundError:
+                logging.warning(f"Skipping missing file {local_full_path} in snapshot")
+                continue
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                    raise
+                copy_file(local_full_path, target_path)
+            linked += 1
+
+        shutil.rmtree(snapshot_path, ignore_errors=True)
+        os.rename(temp_path, snapshot_path)
+        logging.info(f"Created snapshot {snapshot_path} of {linked} objects")
+        return linked
+
+    def list_snapshots(self):
+        """
+        Lists the complete snapshots, oldest first.
+
+        Returns:
+            list: The names of the snapshots.
+        """
+        snapshots = [
+            entry.name
+            for entry in os.scandir(self.root)
+            if entry.is_dir() and not entry.name.endswith(TEMP_SUFFIX)
+        ]
+        return sorted(snapshots, key=lambda name: (len(name), name))
+
+    def prune(self, retention):
+        """
+        Removes all but the most recent snapshots, and unfinished ones.
+
+        Args:
+            retention (int): The number of snapshots to keep.
+
+        Returns:
+            int: The number of removed snapshots.
+        """
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and entry.name.endswith(TEMP_SUFFIX):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+        snapshots = self.list_snapshots()
+        expired = snapshots[: max(len(snapshots) - retention, 0)]
+        for snapshot in expired:
+            shutil.rmtree(os.path.join(self.root, snapshot))
+        if expired:
+            logging.info(f"Pruned {len(expired)} snapshots from {self.root}")
+        return len(expired)
@@ -1,13 +1,51 @@
+import collections
+import concurrent.futures
+import contextvars
+import functools
 import logging
 import os
+import threading
 
 from app.src.config.config import Config
+from app.src.factories.sink_factory import SINK_LOCAL, SinkFactory
 from app.src.models import db
+from app.src.services.content_store import ContentStore
+from app.src.services.download_committer import DownloadCommitter
+from app.src.services.integrity import StreamingChecksum, checksum_executor
+from app.src.services.listing_cache import listing_cache
+from app.src.services.metrics import INTEGRITY_CHECKS
+from app.src.services.profiler import run_profiler
+from app.src.services.rate_limiter import rate_limiters
+from app.src.services.reconciliation import LocalReconciler
+from app.src.services.resource_governor import resource_governor
+from app.src.services.run_stats import RunStats, current_run_stats, record_run_stat
+from app.src.services.sinks.local_sink import LocalSink
+from app.src.services.snapshots import SnapshotManager
+from app.src.services.tracing import tracer
+from app.src.utils.compression_util import COMPRESSED_SUFFIX, COMPRESSION_NONE
+from app.src.utils.file_util import LAYOUT_MIRROR, get_relative_path
+from app.src.utils.logging_util import ProgressReporter
 from app.src.utils.sync_job_util import (
+    ManifestBuffer,
+    commit_session,
+    finish_job_run,
+    get_changed_objects_to_be_processed,
     get_objects_to_be_processed,
+    has_objects,
+    iter_processed_objects,
+    remove_objects,
+    start_job_run,
+    stamp_generation,
+    sweep_unseen_objects,
     write_json_to_local_file,
 )
 
+# Fetches the chunks of all jobs ahead of the ones being written. How many chunks
+# of a target are in flight is bounded by its concurrency controller.
+fetch_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=int(Config.AIMD_MAX_CONCURRENCY), thread_name_prefix="chunk-fetcher"
+)
+
 
 class SyncJob:
     """
@@ -26,11 +64,16 @@ class SyncJob:
         __job_id (str): The unique identifier for the job.
         __json_dir (str): The directory path for storing JSON files.
         __download_dir (str): The directory path for storing downloaded files.
+        __sink (Sink): The sink the objects are written to.
 
     Methods:
         run(): Runs the synchronization job.
+        sync_objects(changed_objects, removed_object_keys): Syncs only the given objects.
         __sync_job(): Performs the synchronization process.
         __process_object(object, json_data): Processes an object during synchronization.
+        __transfer_object(object, json_data, span, fetch_window): Downloads and commits an object.
+        __download_object(object, json_data): Streams an object chunk by chunk into the sink.
+        __fetch_chunks(object, start_position, fetch_window): Fetches the chunks of an object in order.
 
     """
 
@@ -43,64 +86,306 @@ class SyncJob:
         self.__download_dir = f"{Config.DOWNLOAD_ROOT_FOLDER}/{self.__job_id}"
         os.makedirs(self.__json_dir, exist_ok=True)
         os.makedirs(self.__download_dir, exist_ok=True)
+        self.__layout = connector_config.get("layout", LAYOUT_MIRROR)
+        rate_limiters.configure_job(job_id, connector_config)
+        self.__content_store = (
+            ContentStore(
+                Config.CONTENT_STORE_FOLDER
+                or f"{Config.DOWNLOAD_ROOT_FOLDER}/.content_store"
+            )
+            if connector_config.get("content_addressed")
+            else None
+        )
+        self.__snapshots = (
+            SnapshotManager(
+                os.path.join(
+                    Config.SNAPSHOT_ROOT_FOLDER
+                    or f"{Config.DOWNLOAD_ROOT_FOLDER}/.snapshots",
+                    job_id,
+                )
+            )
+            if connector_config.get("snapshots")
+            else None
+        )
+        self.__committer = DownloadCommitter(
+            connector_config.get("durability", Config.DOWNLOAD_DURABILITY),
+            int(Config.DOWNLOAD_COMMIT_BATCH_SIZE),
+        )
+        self.__sink = self.__create_sink()
+        # Serializes full runs and targeted syncs, which write to the same files.
+        self.__lock = threading.Lock()
 
     def run(self):
         """
         Runs the synchronization job within the Flask application context.
+
+        Every run is recorded as a JobRun together with its transfer and request
+        counters. If the job was marked for profiling, the run is executed under the
+        run profiler.
         """
-        with self.__app.app_context():
-            self.__sync_job()
+        with self.__app.app_context(), self.__lock:
+            job_run = start_job_run(self.__job_id)
+            # Run ids only ever grow, so they double as the generation of a run.
+            self.__generation = job_run.id
+            run_stats = RunStats()
+            token = current_run_stats.set(run_stats)
+            status = "FAILED"
+            try:
+                with tracer.span("sync_job", job_id=self.__job_id):
+                    if run_profiler.consume(self.__job_id):
+                        run_profiler.profile(self.__job_id, self.__sync_job)
+                    else:
+                        self.__sync_job()
+                status = "COMPLETED"
+            except Exception:
+                db.session.rollback()
+                self.__sink.discard()
+                raise
+            finally:
+                current_run_stats.reset(token)
+                finish_job_run(job_run, run_stats, status)
 
     def __sync_job(self):
         """
         Performs the synchronization process by iterating through the objects to be processed.
         """
-        pagination_token = None
-        json_data = []
+        self.__progress = ProgressReporter(
+            f"Sync job {self.__job_id}", float(Config.LOG_PROGRESS_INTERVAL)
+        )
+        pages = iter(
+            listing_cache.iter_pages(self.__connector, self.__connector_config)
+        )
+        json_data = ManifestBuffer()
+        reconciler = self.__get_reconciler()
         while True:
-            bucket_object_key_size_map, pagination_token = (
-                self.__connector.list_objects(self.__connector_config, pagination_token)
-            )
+            with tracer.span("list_objects") as span:
+                bucket_object_key_size_map = next(pages, None)
+                if bucket_object_key_size_map is None:
+                    break
+                span.set_attribute("keys", len(bucket_object_key_size_map))
+            self.__progress.add(listed=len(bucket_object_key_size_map))
 
-            processable_objects = get_objects_to_be_processed(
-                bucket_object_key_size_map,
-                self.__job_id,
-            )
+            if reconciler is not None:
+                with tracer.span("reconcile_local_files") as span:
+                    reconciled = reconciler.reconcile_page(bucket_object_key_size_map)
+                    span.set_attribute("objects", reconciled)
+                self.__progress.add(reconciled=reconciled)
 
-            for object in processable_objects:
-                try:
-                    download_file_path = (
-                        object.local_full_path
-                        if object.local_full_path
-                        else os.path.abspath(
-                            f"{self.__download_dir}/{object.object_key}"
+            with tracer.span("get_objects_to_be_processed") as span:
+                processable_objects = get_objects_to_be_processed(
+                    bucket_object_key_size_map,
+                    self.__job_id,
+                    append_mode=bool(self.__connector_config.get("append_mode")),
+                )
+                span.set_attribute("objects", len(processable_objects))
+
+            json_data = self.__process_objects(processable_objects, json_data)
+
+            with tracer.span("db.commit"):
+                self.__sink.flush()
+                commit_session("sync_job")
+                stamp_generation(
+                    bucket_object_key_size_map.keys(), self.__job_id, self.__generation
+                )
+
+        with tracer.span("sink.close"):
+            self.__sink.close()
+            commit_session("sync_job")
+
+        # Only reached once the listing completed, so unseen objects were deleted.
+        # Inventory reports are up to a day old and miss the objects added since,
+        # e.g. the ones synced through events, so they are never swept by them.
+        if not self.__connector_config.get("inventory_manifest"):
+            with tracer.span("sweep_unseen_objects") as span:
+                removed = sweep_unseen_objects(
+                    self.__job_id,
+                    self.__generation,
+                    bool(self.__connector_config.get("mirror_deletes")),
+                )
+                span.set_attribute("objects", removed)
+            self.__progress.add(removed=removed)
+
+        if self.__snapshots is not None:
+            with tracer.span("snapshot", snapshot=self.__generation) as span:
+                span.set_attribute(
+                    "objects",
+                    self.__snapshots.create(
+                        str(self.__generation),
+                        (
+                            (
+                                get_relative_path(object_key, self.__layout)
+                                + (COMPRESSED_SUFFIX if compression else ""),
+                                path,
+                            )
+                            for object_key, path, compression in iter_processed_objects(
+                                self.__job_id
+                            )
+                        ),
+                    ),
+                )
+                self.__snapshots.prune(
+                    int(
+                        self.__connector_config.get(
+                            "snapshot_retention", Config.SNAPSHOT_RETENTION
                         )
                     )
-                    object.local_full_path = download_file_path
-                    json_data, msg = self.__process_object(
-                        object, json_data, download_file_path
+                )
+
+        if self.__content_store is not None:
+            with tracer.span("content_store.collect_garbage") as span:
+                span.set_attribute("objects", self.__content_store.collect_garbage())
+
+        write_json_to_local_file(json_data, self.__job_id, all_objects_processed=True)
+        self.__progress.finish()
+
+    def __create_sink(self):
+        """
+        Returns the sink configured for the job, the download folder by default.
+        """
+        sink_config = self.__connector_config.get("sink") or {"type": SINK_LOCAL}
+        if sink_config.get("type", SINK_LOCAL) == SINK_LOCAL:
+            return LocalSink(
+                self.__download_dir,
+                self.__committer,
+                self.__connector,
+                self.__connector_config,
+                int(eval(Config.DOWNLOAD_WRITE_BUFFER_SIZE)),
+                drop_cache=bool(
+                    self.__connector_config.get(
+                        "drop_cache", Config.DOWNLOAD_DROP_CACHE.lower() == "true"
                     )
-                    if msg:
-                        self.__update_db_status(object, "FAILED")
-                        continue
+                ),
+                verify_bytes=int(Config.APPEND_VERIFY_BYTES),
+                layout=self.__layout,
+                # Objects in the content store are shared uncompressed.
+                compression=(
+                    COMPRESSION_NONE
+                    if self.__content_store is not None
+                    else self.__connector_config.get(
+                        "compression", Config.DOWNLOAD_COMPRESSION
+                    )
+                ),
+                compression_level=int(
+                    self.__connector_config.get(
+                        "compression_level", Config.COMPRESSION_LEVEL
+                    )
+                ),
+            )
+        sink, err = SinkFactory().get_sink(sink_config, self.__job_id)
+        if err:
+            raise Exception(err)
+        return sink
 
-                    self.__update_db_status(object, "PROCESSED")
-                except Exception as e:
-                    logging.error(f"Error processing object: {object.object_key}, {e}")
-                    self.__update_db_status(object, "FAILED")
+    def __get_reconciler(self):
+        """
+        Returns the reconciler recording the files already on disk, if the job has
+        no objects recorded yet or ``reconcile`` is set, and there are files.
+        """
+        if not self.__connector_config.get("reconcile") and has_objects(self.__job_id):
+            return None
+        reconciler = LocalReconciler(
+            self.__job_id,
+            self.__download_dir,
+            self.__connector_config.get("reconcile_from") or self.__download_dir,
+            self.__connector,
+            self.__connector_config,
+            verify_checksums=bool(self.__connector_config.get("reconcile_checksums")),
+            layout=self.__layout,
+            max_workers=int(Config.RECONCILE_WORKERS),
+        )
+        with tracer.span("scan_local_files") as span:
+            num_files = reconciler.scan()
+            span.set_attribute("files", num_files)
+        return reconciler if num_files else None
 
-            db.session().commit()
+    def sync_objects(self, changed_objects, removed_object_keys):
+        """
+        Syncs only the given objects, e.g. the ones reported by event notifications,
+        without listing the connector.
 
-            if not pagination_token:
-                break
+        Changed objects are downloaded again even if they were synced before. Removed
+        objects are deleted locally if ``mirror_deletes`` is set in the connector
+        config, and ignored otherwise.
 
-        write_json_to_local_file(json_data, self.__job_id, all_objects_processed=True)
+        Args:
+            changed_objects (dict): A dictionary mapping the changed object keys to their sizes.
+            removed_object_keys (list): The keys of the removed objects.
+        """
+        with self.__app.app_context(), self.__lock:
+            try:
+                with tracer.span(
+                    "sync_objects",
+                    job_id=self.__job_id,
+                    changed=len(changed_objects),
+                    removed=len(removed_object_keys),
+                ):
+                    self.__progress = ProgressReporter(
+                        f"Targeted sync for job {self.__job_id}",
+                        float(Config.LOG_PROGRESS_INTERVAL),
+                    )
+                    if removed_object_keys and self.__connector_config.get(
+                        "mirror_deletes"
+                    ):
+                        removed = remove_objects(removed_object_keys, self.__job_id)
+                        self.__progress.add(removed=removed)
+
+                    processable_objects = get_changed_objects_to_be_processed(
+                        changed_objects, self.__job_id
+                    )
+                    json_data = self.__process_objects(
+                        processable_objects, ManifestBuffer()
+                    )
+                    self.__sink.flush()
+                    self.__sink.close()
+                    commit_session("sync_objects")
+                    if json_data:
+                        write_json_to_local_file(
+                            json_data, self.__job_id, all_objects_processed=True
+                        )
+                    self.__progress.finish()
+            except Exception:
+                db.session.rollback()
+                self.__sink.discard()
+                raise
+
+    def __process_objects(self, processable_objects, json_data):
+        """
+        Downloads the given objects and updates their status.
+
+        Objects are only marked processed once they were committed to the sink, e.g.
+        when the pending batch of files is flushed.
+
+        Args:
+            processable_objects (list): The objects to be processed.
+            json_data (list): The list to store JSON data.
+
+        Returns:
+            list: The JSON data still to be written.
+        """
+        for object in processable_objects:
+            try:
+                object.local_full_path = object.local_full_path or self.__sink.locate(
+                    object.object_key
+                )
+                json_data, msg = self.__process_object(object, json_data)
+                if msg:
+                    self.__update_db_status(object, "FAILED")
+            except Exception as e:
+                logging.error(f"Error processing object: {object.object_key}, {e}")
+                self.__update_db_status(object, "FAILED")
+        return json_data
 
     def __update_db_status(self, object, status):
+        if status == "PROCESSED":
+            record_run_stat("objects_transferred")
+            self.__progress.add(processed=1)
+        elif status == "FAILED":
+            record_run_stat("failed_objects")
+            self.__progress.add(failed=1)
         object.status = status
         db.session.add(object)
 
-    def __process_object(self, object, json_data, download_file_path):
+    def __process_object(self, object, json_data):
         """
         Processes an object during the synchronization process.
 
@@ -110,36 +395,314 @@ class SyncJob:
 
         """
         try:
-            start_position = int(object.last_position)
-            object_size = int(object.object_size)
-
-            object_dir = os.path.dirname(object.object_key)
-            os.makedirs(f"{self.__download_dir}/{object_dir}", exist_ok=True)
-            # total_size = 0
-            with open(f"{download_file_path}", "ab+") as f:
-                while start_position < object_size:
-                    chunk_data, start_position = (
-                        self.__connector.fetch_object_in_chunks(
-                            self.__connector_config,
-                            object.object_key,
-                            start_position,
-                            object_size,
-                        )
-                    )
-                    object.last_position = str(start_position)
-                    f.write(chunk_data)
-
-                    json_entry = {
-                        "job_id": self.__job_id,
-                        "object_key": object.object_key,
-                        "size": object_size,
-                        "last_position": start_position,
-                        "fetch_data": str(chunk_data),
-                    }
-                    json_data.append(json_entry)
-                    json_data = write_json_to_local_file(json_data, self.__job_id)
-            return json_data, None
+            with tracer.span(
+                "process_object",
+                key=object.object_key,
+                size=object.object_size,
+                start_position=object.last_position,
+            ) as span:
+                if self.__content_store is not None and self.__content_store.link(
+                    object.etag, int(object.object_size), object.local_full_path
+                ):
+                    object.last_position = str(object.object_size)
+                    span.set_attribute("deduplicated", True)
+                    self.__update_db_status(object, "PROCESSED")
+                    return json_data, None
+
+                # The buffer of the writer is held until the object is committed,
+                # on top of the chunks in flight.
+                object_size = int(object.object_size)
+                buffer_size = self.__sink.get_buffer_size(object)
+                chunk_size = min(int(eval(Config.S3_CHUNK_SIZE)), object_size)
+                fetch_window = self.__get_fetch_window(object, buffer_size)
+                span.set_attribute("fetch_window", fetch_window)
+                with resource_governor.buffer(buffer_size + fetch_window * chunk_size):
+                    return self.__transfer_object(object, json_data, span, fetch_window)
         except Exception as e:
             msg = f"Error processing object: {object.object_key}, {e}"
             logging.error(msg)
             return (json_data, msg)
+
+    def __get_fetch_window(self, object, buffer_size):
+        """
+        Returns how many chunks of an object are fetched concurrently: as many as the
+        concurrency limit of the connector allows, as far as they fit the in-flight
+        budget of the resource governor next to the buffer of the writer.
+        """
+        concurrency = self.__connector.get_fetch_concurrency(self.__connector_config)
+        if concurrency <= 1:
+            return 1
+        chunk_size = int(eval(Config.S3_CHUNK_SIZE))
+        chunks = -(-int(object.object_size) // chunk_size)
+        budget_chunks = (
+            resource_governor.max_in_flight_bytes - buffer_size
+        ) // chunk_size
+        return max(1, min(concurrency, chunks, budget_chunks))
+
+    def __transfer_object(self, object, json_data, span, fetch_window=1):
+        """
+        Downloads an object, verifying it if integrity checks apply, and commits it
+        to the sink.
+
+        Args:
+            object (Object): The object to be transferred.
+            json_data (list): The list to store JSON data.
+            span (Span): The span of the object transfer.
+            fetch_window (int): The number of chunks fetched concurrently.
+
+        Returns:
+            tuple: The JSON data still to be written and any error message.
+        """
+        object.checksum = None
+        expected_checksum = self.__get_expected_checksum(object)
+        for _ in range(int(Config.INTEGRITY_RETRIES) + 1):
+            checksum = (
+                StreamingChecksum(expected_checksum, checksum_executor)
+                if expected_checksum
+                else None
+            )
+            json_data, writer = self.__download_object(
+                object, json_data, span, checksum, fetch_window
+            )
+            if checksum is None:
+                break
+            is_valid, object_checksum = checksum.verify()
+            if is_valid:
+                INTEGRITY_CHECKS.inc(result="match")
+                object.checksum = object_checksum
+                break
+            INTEGRITY_CHECKS.inc(result="mismatch")
+            writer.discard()
+            logging.warning(
+                f"Checksum of {object.object_key} is {object_checksum} instead "
+                f"of {expected_checksum['value']}, downloading it again"
+            )
+            object.last_position = 0
+        else:
+            return json_data, f"Checksum mismatch for {object.object_key}"
+
+        self.__sink.commit(
+            writer,
+            functools.partial(self.__on_committed, object, writer),
+        )
+        return json_data, None
+
+    def __get_expected_checksum(self, object):
+        """
+        Returns the checksum an object is verified against, if integrity checks are
+        enabled for the job and the connector reports one.
+        """
+        if not self.__connector_config.get(
+            "verify_integrity", Config.VERIFY_INTEGRITY.lower() == "true"
+        ):
+            return None
+        expected_checksum = self.__connector.get_object_checksum(
+            self.__connector_config, object.object_key, int(object.object_size)
+        )
+        if expected_checksum is None:
+            INTEGRITY_CHECKS.inc(result="unverifiable")
+        return expected_checksum
+
+    def __on_committed(self, object, writer, is_committed):
+        """
+        Records the status of a downloaded object once it was committed to the sink,
+        together with where and how it is stored.
+
+        Args:
+            object (Object): The downloaded object.
+            writer (SinkWriter): The writer the object was written with.
+            is_committed (bool): Whether the object is in place.
+        """
+        if not is_committed:
+            self.__update_db_status(object, "FAILED")
+            return
+        object.local_full_path = writer.location
+        object.compression = writer.compression
+        object.stored_size = writer.stored_size
+        object.compression_ratio = (
+            int(object.object_size) / object.stored_size if object.stored_size else None
+        )
+        if self.__content_store is not None:
+            try:
+                self.__content_store.add(
+                    object.local_full_path, object.etag, int(object.object_size)
+                )
+            except Exception as e:
+                logging.error(f"Error storing object: {object.object_key}, {e}")
+                self.__update_db_status(object, "FAILED")
+                return
+        self.__update_db_status(object, "PROCESSED")
+
+    def __download_object(self, object, json_data, span, checksum=None, fetch_window=1):
+        """
+        Streams an object chunk by chunk from the connector into a writer of the sink.
+
+        Sinks that can resume an interrupted transfer, e.g. from a temporary file,
+        continue at the position of the writer, otherwise the object is transferred
+        from the start. Objects that are local files are copied into writers that
+        can copy files instead, unless they are verified while streaming.
+
+        Args:
+            object (Object): The object to be downloaded.
+            json_data (list): The list to store JSON data.
+            span (Span): The span of the object transfer.
+            checksum (StreamingChecksum, optional): The checksum the object, including
+                the bytes synced before, is fed to.
+            fetch_window (int): The number of chunks fetched concurrently.
+
+        Returns:
+            tuple: The JSON data still to be written and the closed writer.
+        """
+        writer = self.__sink.open(object, int(object.last_position))
+        start_position = writer.position
+        object.last_position = str(start_position)
+        if checksum is not None and start_position > 0:
+            checksum.update_from_file(writer.path, start_position)
+        object_size = int(object.object_size)
+
+        bytes_written = 0
+        local_path = (
+            self.__connector.get_local_path(self.__connector_config, object.object_key)
+            if writer.zero_copy and checksum is None
+            else None
+        )
+        with writer:
+            if local_path is not None:
+                json_data, bytes_written = self.__copy_object(
+                    object, writer, local_path, json_data
+                )
+                start_position = object_size
+            for chunk_data, start_position in self.__fetch_chunks(
+                object, start_position, fetch_window
+            ):
+                object.last_position = str(start_position)
+                record_run_stat("bytes_transferred", len(chunk_data))
+                self.__progress.add(bytes=len(chunk_data))
+                with tracer.span("write_chunk", bytes=len(chunk_data)):
+                    writer.write(chunk_data)
+                if checksum is not None:
+                    checksum.update(chunk_data)
+                bytes_written += len(chunk_data)
+
+                json_entry = {
+                    "job_id": self.__job_id,
+                    "object_key": object.object_key,
+                    "size": object_size,
+                    "last_position": start_position,
+                    "fetch_data": str(chunk_data),
+                }
+                json_data.append(json_entry)
+                json_data = write_json_to_local_file(json_data, self.__job_id)
+        span.set_attribute("bytes", bytes_written)
+        return json_data, writer
+
+    def __fetch_chunks(self, object, start_position, fetch_window):
+        """
+        Fetches the chunks of an object from the given position, in order.
+
+        Up to ``fetch_window`` chunks are fetched concurrently, ahead of the one
+        being written, in a copy of the current context, so that their requests are
+        counted towards the current run and traced under it.
+
+        Args:
+            object (Object): The object to be fetched.
+            start_position (int): The position of the first chunk.
+            fetch_window (int): The number of chunks fetched concurrently.
+
+        Yields:
+            tuple: The data of every chunk and the position after it.
+        """
+        object_size = int(object.object_size)
+        chunk_size = int(eval(Config.S3_CHUNK_SIZE))
+        if fetch_window <= 1:
+            while start_position < object_size:
+                rate_limiters.acquire(
+                    self.__job_id, min(chunk_size, object_size - start_position)
+                )
+                chunk_data, start_position = self.__connector.fetch_object_in_chunks(
+                    self.__connector_config,
+                    object.object_key,
+                    start_position,
+                    object_size,
+                )
+                yield chunk_data, start_position
+            return
+
+        fetches = collections.deque()
+        try:
+            while start_position < object_size or fetches:
+                while start_position < object_size and len(fetches) < fetch_window:
+                    fetch_size = min(chunk_size, object_size - start_position)
+                    rate_limiters.acquire(self.__job_id, fetch_size)
+                    start_position += fetch_size
+                    fetches.append(
+                        (
+                            fetch_executor.submit(
+                                contextvars.copy_context().run,
+                                self.__connector.fetch_object_in_chunks,
+                                self.__connector_config,
+                                object.object_key,
+                                start_position - fetch_size,
+                                object_size,
+                            ),
+                            start_position,
+                        )
+                    )
+                fetch, end_position = fetches.popleft()
+                chunk_data, position = fetch.result()
+                if position != end_position:
+                    raise EOFError(
+                        f"Chunk of {object.object_key} ends at {position} instead "
+                        f"of {end_position}"
+                    )
+                yield chunk_data, position
+        finally:
+            # Chunks still in flight are held until they arrive, so that they stay
+            # within the reservation of the transfer.
+            for fetch, _ in fetches:
+                fetch.cancel()
+            concurrent.futures.wait([fetch for fetch, _ in fetches])
+
+    def __copy_object(self, object, writer, local_path, json_data):
+        """
+        Copies an object from a local file into a writer chunk by chunk, without
+        reading it into memory. Chunks are recorded without their data.
+
+        Args:
+            object (Object): The object to be copied.
+            writer (SinkWriter): The writer the object is copied into.
+            local_path (str): The file of the object.
+            json_data (list): The list to store JSON data.
+
+        Returns:
+            tuple: The JSON data still to be written and the number of bytes copied.
+        """
+        start_position = writer.position
+        object_size = int(object.object_size)
+        chunk_size = int(eval(Config.S3_CHUNK_SIZE))
+        bytes_written = 0
+        with open(local_path, "rb", buffering=0) as source:
+            while start_position < object_size:
+                copy_size = min(chunk_size, object_size - start_position)
+                rate_limiters.acquire(self.__job_id, copy_size)
+                with tracer.span("copy_chunk", bytes=copy_size):
+                    copied = writer.copy_from(
+                        source.fileno(), start_position, copy_size
+                    )
+                if copied < copy_size:
+                    raise EOFError(f"{local_path} is shorter than {object_size} bytes")
+                start_position += copied
+                object.last_position = str(start_position)
+                record_run_stat("bytes_transferred", copied)
+                self.__progress.add(bytes=copied)
+                bytes_written += copied
+
+                json_entry = {
+                    "job_id": self.__job_id,
+                    "object_key": object.object_key,
+                    "size": object_size,
+                    "last_position": start_position,
+                }
+                json_data.append(json_entry)
+                json_data = write_json_to_local_file(json_data, self.__job_id)
+        return json_data, bytes_written
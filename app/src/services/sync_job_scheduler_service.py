@@ -8,6 +8,7 @@ from app.src.models.job import Job
 from app.src.models import db
 import uuid
 
+from app.src.services.rate_limiter import rate_limiters
 from app.src.services.scheduler import Scheduler
 from app.src.services.sync_job import SyncJob
 
@@ -32,6 +33,7 @@ class SyncJobSchedulerService:
         self.__connector_factory = connector_factory
         self.__scheduler = scheduler
         self.__app = app
+        self.__sync_jobs = dict()
 
     def schedule_sync_job(self, job_name, connector_type, schedule, connector_config):
         """
@@ -66,6 +68,7 @@ class SyncJobSchedulerService:
             job = Job(job_id, job_name, connector_type, schedule, connector_config)
             db.session.add(job)
             db.session.commit()
+            self.__sync_jobs[job_id] = sync_job
             return job_id, None
         except Exception as e:
             if scheduled_job:
@@ -105,6 +108,44 @@ class SyncJobSchedulerService:
             }
         return None
 
+    def get_sync_job(self, job_id):
+        """
+        Retrieves the sync job scheduled for a job ID.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            SyncJob: The sync job, or None if no job is scheduled for the ID.
+        """
+        return self.__sync_jobs.get(job_id)
+
+    def update_rate_limits(self, job_id, rate_limits):
+        """
+        Changes the rate limits of a job, effective for the running transfers too.
+
+        The limits are stored in the connector config of the job.
+
+        Args:
+            job_id (str): The ID of the job.
+            rate_limits (dict): The new ``max_bytes_per_second`` and/or
+                ``max_requests_per_second``, 0 or None for no limit.
+
+        Returns:
+            tuple: The rate limits of the job and any error message.
+        """
+        job = Job.query.filter_by(job_id=job_id).first()
+        if job is None or job_id not in self.__sync_jobs:
+            return None, "Job not found"
+
+        # A new dict, so that the change of the JSON column is detected.
+        connector_config = dict(job.connector_config)
+        connector_config.update(rate_limits)
+        job.connector_config = connector_config
+        db.session.commit()
+        rate_limiters.configure_job(job_id, connector_config)
+        return rate_limiters.get_job_limiter(job_id).get_limits(), None
+
     def delete_job(self, job_id):
         """
         Deletes a specific job by its ID.
@@ -118,6 +159,8 @@ class SyncJobSchedulerService:
         job = Job.query.filter_by(job_id=job_id).first()
         if job:
             self.__scheduler.remove_job(job_id)
+            self.__sync_jobs.pop(job_id, None)
+            rate_limiters.remove_job(job_id)
             db.session.delete(job)
             db.session.commit()
             return True
@@ -0,0 +1,232 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from app.src.config.config import Config
+from app.src.services.metrics import TRACE_SPANS_DROPPED
+
+
+class Span:
+    """
+    Represents a timed operation within a trace.
+
+    Attributes:
+        trace_id (str): The identifier of the trace the span belongs to.
+        span_id (str): The identifier of the span.
+        parent_span_id (str): The identifier of the parent span, None for a root span.
+        name (str): The name of the operation.
+        attributes (dict): The attributes describing the operation.
+    """
+
+    def __init__(self, trace_id, span_id, parent_span_id, name, attributes):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.attributes = attributes
+        self.status = "OK"
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_error(self, error):
+        self.status = "ERROR"
+        self.attributes["error"] = str(error)
+
+    def end(self):
+        self.end_time_ns = time.time_ns()
+
+    def __json__(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_time_ns,
+            "end_time_unix_nano": self.end_time_ns,
+            "duration_ms": (self.end_time_ns - self.start_time_ns) / 1e6,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class NonRecordingSpan:
+    """
+    Stands in for the spans of a trace that was not sampled, so that its children
+    are not sampled either.
+    """
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+
+NON_RECORDING_SPAN = NonRecordingSpan()
+
+
+class FileSpanExporter:
+    """
+    Writes finished spans as JSON lines to a local file.
+
+    Spans are handed to a background thread through a bounded queue, so that the
+    traced threads never block on file I/O. When the queue is full the span is
+    dropped and counted rather than waited for.
+
+    Args:
+        file_path (str): The path of the file the spans are appended to.
+        queue_size (int): The maximum number of spans waiting to be written.
+    """
+
+    def __init__(self, file_path, queue_size):
+        self.__file_path = file_path
+        self.__queue = queue.Queue(maxsize=queue_size)
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+    def export(self, span):
+        if self.__thread is None:
+            self.__start()
+        try:
+            self.__queue.put_nowait(span)
+        except queue.Full:
+            TRACE_SPANS_DROPPED.inc()
+
+    def __start(self):
+        with self.__lock:
+            if self.__thread is None:
+                directory = os.path.dirname(self.__file_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.__thread = threading.Thread(
+                    target=self.__write_spans, name="span-exporter", daemon=True
+                )
+                self.__thread.start()
+                atexit.register(self.shutdown)
+
+    def __write_spans(self):
+        while True:
+            spans = [self.__queue.get()]
+            # Drain whatever else is queued so that bursts are written in one go.
+            while True:
+                try:
+                    spans.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.__write([span for span in spans if span is not None])
+            if None in spans:
+                return
+
+    def __write(self, spans):
+        if not spans:
+            return
+        try:
+            with open(self.__file_path, "a") as f:
+                for span in spans:
+                    f.write(json.dumps(span.__json__(), default=str) + "\n")
+        except Exception as e:
+            logging.error(f"Error exporting spans: {e}")
+
+    def shutdown(self):
+        """
+        Flushes the queued spans and stops the background thread.
+        """
+        if self.__thread is not None:
+            self.__queue.put(None)
+            self.__thread.join()
+            self.__thread = None
+
+
+class Tracer:
+    """
+    Creates spans and decides which traces are sampled.
+
+    The sampling decision is made once per trace, when its root span is started;
+    child spans inherit it through the current context. Spans of traces that are
+    not sampled are never recorded or exported.
+
+    Args:
+        sample_rate (float): The fraction of traces to sample, between 0 and 1.
+        exporter (FileSpanExporter): The exporter the finished spans are handed to.
+    """
+
+    def __init__(self, sample_rate, exporter):
+        self.sample_rate = sample_rate
+        self.__exporter = exporter
+        self.__current_span = contextvars.ContextVar("current_span", default=None)
+
+    def current_span(self):
+        """
+        Returns the span active in the current context, if any.
+        """
+        return self.__current_span.get()
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Starts a span as a child of the current span, or a new trace if there is none.
+
+        Args:
+            name (str): The name of the operation.
+            **attributes: The attributes describing the operation.
+
+        Yields:
+            Span: The started span, or a non-recording span if the trace is not sampled.
+        """
+        parent = self.__current_span.get()
+        if parent is NON_RECORDING_SPAN or (
+            parent is None and not self.__should_sample()
+        ):
+            if parent is None:
+                token = self.__current_span.set(NON_RECORDING_SPAN)
+                try:
+                    yield NON_RECORDING_SPAN
+                finally:
+                    self.__current_span.reset(token)
+            else:
+                yield NON_RECORDING_SPAN
+            return
+
+        if parent is None:
+            span = Span(_new_id(16), _new_id(8), None, name, attributes)
+        else:
+            span = Span(parent.trace_id, _new_id(8), parent.span_id, name, attributes)
+        token = self.__current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            self.__current_span.reset(token)
+            span.end()
+            self.__exporter.export(span)
+
+    def __should_sample(self):
+        if self.sample_rate <= 0:
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+
+def _new_id(num_bytes):
+    return random.getrandbits(num_bytes * 8).to_bytes(num_bytes, "big").hex()
+
+
+tracer = Tracer(
+    float(Config.TRACE_SAMPLE_RATE),
+    FileSpanExporter(
+        Config.TRACE_EXPORT_FILE
+        or os.path.join(Config.JSON_ROOT_FOLDER or ".", "traces.jsonl"),
+        int(Config.TRACE_QUEUE_SIZE),
+    ),
+)
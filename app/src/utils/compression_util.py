@@ -0,0 +1,133 @@
+import mimetypes
+import os
+
+
+COMPRESSION_NONE = "none"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_ZSTD)
+COMPRESSED_SUFFIX = ".zst"
+MAX_COMPRESSION_LEVEL = 22
+
+# Formats that are compressed internally, without a compressed mimetype.
+COMPRESSED_EXTENSIONS = {
+    ".7z",
+    ".avro",
+    ".br",
+    ".bz2",
+    ".docx",
+    ".gz",
+    ".jar",
+    ".lz4",
+    ".orc",
+    ".parquet",
+    ".pdf",
+    ".rar",
+    ".tgz",
+    ".xlsx",
+    ".xz",
+    ".zip",
+    ".zst",
+}
+COMPRESSED_MIMETYPES = {
+    "application/gzip",
+    "application/java-archive",
+    "application/pdf",
+    "application/vnd.rar",
+    "application/x-7z-compressed",
+    "application/x-bzip2",
+    "application/x-rar-compressed",
+    "application/x-xz",
+    "application/zip",
+    "application/zstd",
+}
+# Media types whose formats are compressed, except the uncompressed ones below.
+COMPRESSED_MEDIA_TYPES = ("image/", "audio/", "video/")
+UNCOMPRESSED_MIMETYPES = {"image/bmp", "image/svg+xml", "image/tiff", "audio/x-wav"}
+MAGIC_NUMBERS = (
+    b"\x1f\x8b",  # gzip
+    b"\x28\xb5\x2f\xfd",  # zstd
+    b"PK\x03\x04",  # zip, jar, docx, ...
+    b"BZh",  # bzip2
+    b"\xfd7zXZ\x00",  # xz
+    b"\x04\x22\x4d\x18",  # lz4
+    b"7z\xbc\xaf\x27\x1c",  # 7z
+    b"Rar!",  # rar
+    b"%PDF",  # pdf
+    b"\x89PNG",  # png
+    b"\xff\xd8\xff",  # jpeg
+    b"GIF8",  # gif
+    b"PAR1",  # parquet
+    b"ORC",  # orc
+)
+
+
+def is_compressed_name(object_key):
+    """
+    Returns whether the name of an object indicates an already compressed format,
+    by its extension or the mimetype guessed from it.
+    """
+    if os.path.splitext(object_key)[1].lower() in COMPRESSED_EXTENSIONS:
+        return True
+    mimetype, encoding = mimetypes.guess_type(object_key, strict=False)
+    if encoding is not None or mimetype in COMPRESSED_MIMETYPES:
+        return True
+    return (
+        mimetype is not None
+        and mimetype.startswith(COMPRESSED_MEDIA_TYPES)
+        and mimetype not in UNCOMPRESSED_MIMETYPES
+    )
+
+
+def is_compressed_data(data):
+    """
+    Returns whether the first bytes of an object are those of a compressed format.
+    """
+    return bytes(data[:8]).startswith(MAGIC_NUMBERS)
+
+
+def get_zstd_compressor(level):
+    """
+    Returns a zstd compressor, whose ``compressobj()`` compresses a stream as a frame.
+
+    Args:
+        level (int): The compression level, from 1 to 22.
+
+    Raises:
+        ImportError: If zstandard is not installed.
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstandard is required for zstd compression")
+    return zstandard.ZstdCompressor(level=level)
+
+
+def validate_compression(compression, level):
+    """
+    Validates a compression and its level.
+
+    Args:
+        compression (str): One of ``none`` or ``zstd``.
+        level (int): The compression level.
+
+    Returns:
+        tuple: A tuple containing a boolean value indicating whether the validation
+            passed or not, and an error message if the validation failed.
+    """
+    if compression not in COMPRESSIONS:
+        return False, f"compression must be one of {COMPRESSIONS}"
+    if compression == COMPRESSION_NONE:
+        return True, None
+    try:
+        if not 1 <= int(level) <= MAX_COMPRESSION_LEVEL:
+            raise ValueError(level)
+    except (TypeError, ValueError):
+        return (
+            False,
+            f"compression_level must be between 1 and {MAX_COMPRESSION_LEVEL}",
+        )
+    try:
+        get_zstd_compressor(int(level))
+    except ImportError as e:
+        return False, str(e)
+    return True, None
@@ -0,0 +1,216 @@
+import errno
+import logging
+import os
+
+
+# Raised by copy_file_range and sendfile where they are not supported.
+COPY_FALLBACK_ERRNOS = (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP)
+
+
+class DownloadWriter:
+    """
+    Writes a downloaded object to a file with large aligned writes.
+
+    Chunks are collected in a buffer and written in multiples of ``buffer_size``
+    at offsets aligned to it, so that the file system sees few large sequential
+    writes instead of one write per fetched chunk. The file is truncated to the
+    start position when opened, which drops whatever an earlier attempt wrote
+    after it.
+
+    With ``preallocate``, the rest of the object is allocated up front with
+    ``posix_fallocate``, so that large files are not fragmented and a full disk is
+    reported before any byte is fetched. If the download does not complete, the
+    file is truncated back to the bytes written on close. Preallocation changes
+    the size of the file, so it must not be used for files readers may see.
+
+    With ``drop_cache``, written pages are dropped from the page cache with
+    ``posix_fadvise(POSIX_FADV_DONTNEED)``, so that large syncs do not evict the
+    cache of other workloads. Dirty pages can not be dropped until the OS wrote
+    them back, so every flush advises on the range of the flush before, and the
+    whole file is advised on close.
+
+    Both are skipped on platforms without ``posix_fallocate`` and ``posix_fadvise``.
+
+    Objects read from local files are copied with ``copy_from`` instead, in the
+    kernel with ``copy_file_range`` or ``sendfile``, without passing through the
+    buffer.
+
+    Args:
+        path (str): The path of the file.
+        start_position (int): The offset the writes start at.
+        object_size (int): The size of the complete object.
+        buffer_size (int): The size writes are aligned to.
+        preallocate (bool): Whether the rest of the object is allocated up front.
+        drop_cache (bool): Whether written pages are dropped from the page cache.
+    """
+
+    def __init__(
+        self,
+        path,
+        start_position,
+        object_size,
+        buffer_size,
+        preallocate=False,
+        drop_cache=False,
+    ):
+        self.path = path
+        self.object_size = object_size
+        self.buffer_size = buffer_size
+        self.drop_cache = drop_cache and hasattr(os, "posix_fadvise")
+        self.__position = start_position
+        self.__buffer = bytearray()
+        self.__written_range = None
+        self.__copy_method = (
+            "copy_file_range"
+            if hasattr(os, "copy_file_range")
+            else "sendfile"
+            if hasattr(os, "sendfile")
+            else "read"
+        )
+        self.__file = open(path, "r+b" if start_position > 0 else "wb", buffering=0)
+        try:
+            self.__file.truncate(start_position)
+            self.__file.seek(start_position)
+            self.__preallocated = preallocate and self.__preallocate(start_position)
+        except BaseException:
+            self.__file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def position(self):
+        """The offset up to which the object was written, including the buffer."""
+        return self.__position + len(self.__buffer)
+
+    def write(self, data):
+        """
+        Adds data to the buffer, writing the aligned part of it once it is full.
+
+        Args:
+            data (bytes): The data to be written.
+        """
+        self.__buffer += data
+        if len(self.__buffer) < self.buffer_size:
+            return
+        aligned_end = self.position - self.position % self.buffer_size
+        self.__write(aligned_end - self.__position)
+
+    def copy_from(self, source_fd, offset, count):
+        """
+        Copies a range of a local file to the end of the written data, after
+        writing the buffer.
+
+        ``copy_file_range`` copies within the kernel and lets file systems share
+        or offload the blocks, ``sendfile`` is used where it is not supported, e.g.
+        across file systems on older kernels, and a plain read and write loop where
+        neither is.
+
+        Args:
+            source_fd (int): The file descriptor of the file to copy from.
+            offset (int): The offset in the file the range starts at.
+            count (int): The size of the range.
+
+        Returns:
+            int: The number of bytes copied, less than count if the file ended
+                before the range.
+        """
+        self.__write(len(self.__buffer))
+        copied = 0
+        while copied < count:
+            size = self.__copy(source_fd, offset + copied, count - copied)
+            if size == 0:
+                break
+            copied += size
+        if copied:
+            if self.drop_cache:
+                os.posix_fadvise(
+                    self.__file.fileno(),
+                    self.__position,
+                    copied,
+                    os.POSIX_FADV_DONTNEED,
+                )
+            self.__position += copied
+        return copied
+
+    def close(self):
+        """
+        Writes the rest of the buffer and closes the file.
+
+        A preallocated file that was not written completely is truncated to the
+        bytes written.
+        """
+        if self.__file.closed:
+            return
+        try:
+            self.__write(len(self.__buffer))
+            if self.__preallocated and self.__position < self.object_size:
+                self.__file.truncate(self.__position)
+            if self.drop_cache:
+                os.posix_fadvise(self.__file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            self.__file.close()
+
+    def __write(self, size):
+        if size <= 0:
+            return
+        with memoryview(self.__buffer) as view:
+            written = 0
+            while written < size:
+                written += self.__file.write(view[written:size])
+        del self.__buffer[:size]
+        if self.drop_cache:
+            if self.__written_range is not None:
+                os.posix_fadvise(
+                    self.__file.fileno(), *self.__written_range, os.POSIX_FADV_DONTNEED
+                )
+            self.__written_range = (self.__position, size)
+        self.__position += size
+
+    def __copy(self, source_fd, offset, count):
+        fd = self.__file.fileno()
+        position = self.__position
+        # The file offset of the copy is passed explicitly, as the buffer is written
+        # at the offset of the file object.
+        if self.__copy_method == "copy_file_range":
+            try:
+                size = os.copy_file_range(source_fd, fd, count, offset, position)
+                self.__file.seek(position + size)
+                return size
+            except OSError as e:
+                if e.errno not in COPY_FALLBACK_ERRNOS:
+                    raise
+                self.__copy_method = "sendfile"
+        if self.__copy_method == "sendfile":
+            try:
+                size = os.sendfile(fd, source_fd, offset, count)
+                return size
+            except OSError as e:
+                if e.errno not in COPY_FALLBACK_ERRNOS:
+                    raise
+                self.__copy_method = "read"
+        data = os.pread(source_fd, min(count, self.buffer_size), offset)
+        with memoryview(data) as view:
+            written = 0
+            while written < len(data):
+                written += self.__file.write(view[written:])
+        return len(data)
+
+    def __preallocate(self, start_position):
+        if not hasattr(os, "posix_fallocate") or start_position >= self.object_size:
+            return False
+        try:
+            os.posix_fallocate(
+                self.__file.fileno(), start_position, self.object_size - start_position
+            )
+            return True
+        except OSError as e:
+            # E.g. file systems without support for it.
+            if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                raise
+            logging.debug(f"Unable to preallocate {self.path}: {e}")
+            return False
@@ -0,0 +1,144 @@
+import errno
+import hashlib
+import os
+import re
+import shutil
+import uuid
+
+
+TEMP_DOWNLOAD_SUFFIX = ".part"
+LAYOUT_MIRROR = "mirror"
+LAYOUT_HASHED = "hashed"
+LAYOUTS = (LAYOUT_MIRROR, LAYOUT_HASHED)
+
+
+def get_relative_path(object_key, layout=LAYOUT_MIRROR):
+    """
+    Returns the path of an object relative to the download folder of its job.
+
+    The ``mirror`` layout uses the object key as it is. The ``hashed`` layout fans
+    the objects out over 65536 folders by the SHA-256 of their key, e.g.
+    ``3f/a2/3fa2...9c.csv``, so that no folder holds more than a few hundred files
+    even if millions of objects share a prefix. The extension of the key is kept,
+    and the key of a file can be looked up through the API.
+
+    Args:
+        object_key (str): The key of the object.
+        layout (str): One of ``mirror`` or ``hashed``.
+
+    Returns:
+        str: The relative path of the object.
+    """
+    if layout == LAYOUT_MIRROR:
+        return object_key
+    if layout != LAYOUT_HASHED:
+        raise ValueError(f"Unknown layout {layout}, supported ones: {LAYOUTS}")
+    digest = hashlib.sha256(object_key.encode()).hexdigest()
+    extension = os.path.splitext(object_key)[1]
+    if not re.fullmatch(r"\.[A-Za-z0-9]{1,16}", extension):
+        extension = ""
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def get_local_path(download_dir, object_key, layout=LAYOUT_MIRROR):
+    """
+    Returns the absolute local path of an object, see get_relative_path.
+    """
+    return os.path.abspath(f"{download_dir}/{get_relative_path(object_key, layout)}")
+
+
+def copy_file(path, destination_path):
+    """
+    Copies a file, replacing the destination atomically.
+
+    Args:
+        path (str): The path of the file to be copied.
+        destination_path (str): The path of the copy.
+    """
+    temp_path = f"{destination_path}.{uuid.uuid4().hex}.tmp"
+    shutil.copyfile(path, temp_path)
+    os.replace(temp_path, destination_path)
+
+
+def link_file(path, destination_path):
+    """
+    Hard links a file to a path, replacing the destination atomically.
+
+    The file is copied instead if it can not be linked, e.g. because the
+    destination is on another file system.
+
+    Args:
+        path (str): The path of the file to be linked.
+        destination_path (str): The path of the link.
+    """
+    temp_path = f"{destination_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.link(path, temp_path)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        shutil.copyfile(path, temp_path)
+    os.replace(temp_path, destination_path)
+
+
+def detach_shared_file(path, keep_content=False):
+    """
+    Unshares a file hard linked from elsewhere, e.g. from the content store or a
+    snapshot, so that it can be written to without changing the other links.
+
+    Args:
+        path (str): The path of the file.
+        keep_content (bool): Whether the file is replaced with a private copy,
+            e.g. to be appended to, instead of being removed.
+
+    Returns:
+        bool: True if the file was shared.
+    """
+    try:
+        if os.stat(path).st_nlink == 1:
+            return False
+    except FileNotFoundError:
+        return False
+    if keep_content:
+        copy_file(path, path)
+    else:
+        os.remove(path)
+    return True
+
+
+def get_temp_download_path(path):
+    """
+    Returns the path an object is downloaded to before it is moved into place.
+
+    The name is stable, so that an interrupted download is resumed on the next
+    attempt.
+    """
+    return f"{path}{TEMP_DOWNLOAD_SUFFIX}"
+
+
+def remove_file(path):
+    """
+    Removes a file if it exists.
+
+    Returns:
+        bool: True if the file existed.
+    """
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def fsync_path(path):
+    """
+    Flushes a file, or the entries of a folder, to the disk.
+
+    Args:
+        path (str): The path of the file or folder.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
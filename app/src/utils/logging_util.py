@@ -0,0 +1,150 @@
+import atexit
+import itertools
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+from app.src.config.config import Config
+from app.src.services.metrics import LOG_RECORDS_DROPPED
+
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands log records to a bounded queue without ever blocking the caller.
+
+    Records are queued as they are, so message formatting happens on the listener
+    thread instead of the logging thread. When the queue is full the record is
+    dropped and counted, in ``log_records_dropped_total`` as well, rather than
+    waited for.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped_records = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+def configure_logging(level=logging.INFO, fmt=LOG_FORMAT):
+    """
+    Routes the root logger through a queue drained by a background listener thread.
+
+    Args:
+        level (int): The level of the root logger.
+        fmt (str): The format of the emitted log lines.
+
+    Returns:
+        QueueListener: The started listener, stopped automatically at exit.
+    """
+    log_queue = queue.Queue(maxsize=int(Config.LOG_QUEUE_SIZE))
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(fmt))
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(NonBlockingQueueHandler(log_queue))
+    root_logger.setLevel(level)
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+class SampledLogger:
+    """
+    Logs only one out of every ``every`` calls, for messages emitted per item.
+
+    Args:
+        logger (logging.Logger): The logger the sampled messages are emitted to.
+        every (int): The sampling period, 1 logs every call.
+    """
+
+    def __init__(self, logger, every):
+        self.__logger = logger
+        self.__every = max(int(every), 1)
+        self.__counter = itertools.count()
+
+    def info(self, msg, *args):
+        if next(self.__counter) % self.__every == 0 and self.__logger.isEnabledFor(
+            logging.INFO
+        ):
+            if self.__every > 1:
+                msg = f"{msg} (sampled 1/{self.__every})"
+            self.__logger.info(msg, *args)
+
+
+class ProgressReporter:
+    """
+    Aggregates per-item counters and periodically logs them as a single progress line.
+
+    Args:
+        name (str): The name the progress lines are prefixed with.
+        interval (float): The minimum number of seconds between two progress lines.
+    """
+
+    def __init__(self, name, interval):
+        self.__name = name
+        self.__interval = interval
+        self.__counters = dict()
+        self.__lock = threading.Lock()
+        self.__started_at = time.monotonic()
+        self.__last_reported_at = self.__started_at
+
+    def add(self, **counters):
+        """
+        Adds to the aggregated counters and logs a progress line if one is due.
+
+        Args:
+            **counters: The amounts to add, keyed by counter name.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            for name, amount in counters.items():
+                self.__counters[name] = self.__counters.get(name, 0) + amount
+            if now - self.__last_reported_at < self.__interval:
+                return
+            self.__last_reported_at = now
+            snapshot = dict(self.__counters)
+        self.__log("progress", snapshot, now)
+
+    def finish(self):
+        """
+        Logs the final aggregated counters.
+        """
+        with self.__lock:
+            snapshot = dict(self.__counters)
+        self.__log("finished", snapshot, time.monotonic())
+
+    def counters(self):
+        with self.__lock:
+            return dict(self.__counters)
+
+    def __log(self, stage, snapshot, now):
+        elapsed = max(now - self.__started_at, 1e-9)
+        rendered = ", ".join(f"{name}={value}" for name, value in snapshot.items())
+        rate = snapshot.get("bytes", 0) / elapsed
+        logging.info(
+            "%s %s after %.1fs: %s, %.0f bytes/s",
+            self.__name,
+            stage,
+            elapsed,
+            rendered,
+            rate,
+        )
@@ -1,11 +1,48 @@
 import json
 import logging
 import time
+from datetime import datetime
+
+import pytz
 
 from app.src.config.config import Config
 from app.src.constants.contants import Constants
 from app.src.models.blob_object import BlobObject
+from app.src.models.job_run import JobRun
 from app.src import db
+from app.src.services.metrics import (
+    DB_COMMIT_ROWS,
+    DB_COMMIT_SECONDS,
+    MANIFEST_ENTRIES,
+    MANIFEST_WRITE_SECONDS,
+    MANIFEST_WRITES,
+)
+from app.src.utils.file_util import get_temp_download_path, remove_file
+from app.src.utils.logging_util import SampledLogger
+
+
+sampled_logger = SampledLogger(logging.getLogger(__name__), Config.LOG_SAMPLE_EVERY)
+
+
+def commit_session(site):
+    """
+    Commits the current database session and records the commit latency and row count.
+
+    Args:
+        site (str): The name of the call site, used as the metric label.
+    """
+    session = db.session()
+    rows = len(session.new) + len(session.dirty) + len(session.deleted)
+    with DB_COMMIT_SECONDS.time(site=site):
+        session.commit()
+    DB_COMMIT_ROWS.inc(rows, site=site)
+
+
+def get_etag(bucket_object_key_size_map, object_key):
+    """
+    Returns the ETag of a listed object, if the connector reported one.
+    """
+    return getattr(bucket_object_key_size_map, "etags", {}).get(object_key)
 
 
 def __get_objects_to_be_processed(
@@ -29,6 +66,7 @@ def __get_objects_to_be_processed(
             try:
                 if object_key in failed_object_key_mapping:
                     object = failed_object_key_mapping[object_key]
+                    object.etag = get_etag(bucket_object_key_size_map, object_key)
                     object.status = "PROCESSING"
                     db.session.add(object)
                     to_download_objects.append(object)
@@ -36,10 +74,12 @@ def __get_objects_to_be_processed(
 
                 object_size = bucket_object_key_size_map.get(object_key, 0)
                 if object_size == 0:
-                    logging.info(f"skipping object: {object_key} as it has size 0")
+                    sampled_logger.info(
+                        "skipping object: %s as it has size 0", object_key
+                    )
                     status = "SKIPPED"
                 else:
-                    logging.info(f"processing object: {object_key}")
+                    sampled_logger.info("processing object: %s", object_key)
                     status = "PROCESSING"
 
                 object = BlobObject(
@@ -49,6 +89,7 @@ def __get_objects_to_be_processed(
                     status=status,
                     job_id=job_id,
                     local_full_path="",
+                    etag=get_etag(bucket_object_key_size_map, object_key),
                 )
 
                 if object_size > 0:
@@ -57,7 +98,7 @@ def __get_objects_to_be_processed(
             except Exception as e:
                 logging.error(f"Error getting object size: {object_key}, {e}")
 
-        db.session.commit()
+        commit_session("get_objects_to_be_processed")
         return to_download_objects
     except Exception as e:
         logging.error(f"Error in __get_object_mappings: {e}")
@@ -77,13 +118,15 @@ def __get_object_keys_to_be_processed(object_keys, processed_objects):
     return failed_object_key_mapping, to_download_object_keys
 
 
-def get_objects_to_be_processed(bucket_object_key_size_map, job_id):
+def get_objects_to_be_processed(bucket_object_key_size_map, job_id, append_mode=False):
     """
     Retrieves the objects that need to be processed for a given job.
 
     Args:
         bucket_object_key_size_map (dict): A dictionary mapping object keys to their sizes.
         job_id (int): The ID of the job.
+        append_mode (bool): Whether processed objects that grew are processed again,
+            resuming from their previously synced size.
 
     Returns:
         list: A list of objects that need to be processed.
@@ -96,6 +139,7 @@ def get_objects_to_be_processed(bucket_object_key_size_map, job_id):
     offset = 0
     object_keys = list(bucket_object_key_size_map.keys())
     all_failed_object_key_mapping = dict()
+    grown_objects = list()
     limit = int(Config.DB_ROWS_RETRIEVAL_LIMIT)
     while True:
         try:
@@ -112,6 +156,10 @@ def get_objects_to_be_processed(bucket_object_key_size_map, job_id):
                 object_keys, processed_objects
             )
             all_failed_object_key_mapping.update(failed_object_key_mapping)
+            if append_mode:
+                grown_objects.extend(
+                    __get_grown_objects(bucket_object_key_size_map, processed_objects)
+                )
             offset += limit
         except Exception as e:
             logging.error(f"Error getting objects to be processed: {e}")
@@ -123,20 +171,250 @@ def get_objects_to_be_processed(bucket_object_key_size_map, job_id):
         all_failed_object_key_mapping,
         job_id,
     )
-    return to_download_objects
+    return grown_objects + to_download_objects
+
+
+def __get_grown_objects(bucket_object_key_size_map, processed_objects):
+    """
+    Marks the processed objects whose size increased for processing again.
+
+    Their last position is left at the previously synced size, so that only the
+    new tail is fetched once the synced bytes were verified.
+    """
+    grown_objects = list()
+    for object in processed_objects:
+        object_size = bucket_object_key_size_map.get(object.object_key, 0)
+        if object.status != "PROCESSED" or object_size <= int(object.object_size):
+            continue
+        object.object_size = object_size
+        object.etag = get_etag(bucket_object_key_size_map, object.object_key)
+        object.status = "PROCESSING"
+        db.session.add(object)
+        grown_objects.append(object)
+    return grown_objects
+
+
+def get_changed_objects_to_be_processed(bucket_object_key_size_map, job_id):
+    """
+    Retrieves the objects that need to be processed after they were reported as changed.
+
+    Unlike get_objects_to_be_processed, objects that were already synced are
+    downloaded again: their rows are reset and their local files removed.
+
+    Args:
+        bucket_object_key_size_map (dict): A dictionary mapping object keys to their new sizes.
+        job_id (str): The ID of the job.
+
+    Returns:
+        list: A list of objects that need to be processed.
+    """
+    existing_objects = BlobObject.query.filter(
+        BlobObject.job_id == job_id,
+        BlobObject.object_key.in_(list(bucket_object_key_size_map.keys())),
+    ).all()
+
+    to_download_objects = list()
+    for object in existing_objects:
+        # The synced file stays readable until the new version replaces it.
+        if object.local_full_path:
+            remove_file(get_temp_download_path(object.local_full_path))
+        object.object_size = bucket_object_key_size_map[object.object_key]
+        object.etag = get_etag(bucket_object_key_size_map, object.object_key)
+        object.last_position = 0
+        # Not seen by a listing yet, so that a stale listing never sweeps it.
+        object.generation = None
+        object.status = "PROCESSING" if int(object.object_size) > 0 else "SKIPPED"
+        db.session.add(object)
+        if object.status == "PROCESSING":
+            to_download_objects.append(object)
+
+    existing_object_keys = {object.object_key for object in existing_objects}
+    new_object_keys = [
+        object_key
+        for object_key in bucket_object_key_size_map
+        if object_key not in existing_object_keys
+    ]
+    return to_download_objects + __get_objects_to_be_processed(
+        bucket_object_key_size_map, new_object_keys, dict(), job_id
+    )
+
+
+def remove_objects(object_keys, job_id):
+    """
+    Removes the rows and the local files of objects deleted from the connector.
+
+    Args:
+        object_keys (list): The keys of the deleted objects.
+        job_id (str): The ID of the job.
+
+    Returns:
+        int: The number of objects removed.
+    """
+    objects = BlobObject.query.filter(
+        BlobObject.job_id == job_id, BlobObject.object_key.in_(list(object_keys))
+    ).all()
+    for object in objects:
+        if object.local_full_path:
+            __remove_local_file(object.local_full_path)
+        db.session.delete(object)
+    commit_session("remove_objects")
+    return len(objects)
+
+
+def stamp_generation(object_keys, job_id, generation):
+    """
+    Marks the objects of a listing page as seen by the given run, in bulk.
+
+    Args:
+        object_keys (list): The keys listed by the connector.
+        job_id (str): The ID of the job.
+        generation (int): The generation of the current run.
+    """
+    object_keys = list(object_keys)
+    limit = int(Config.DB_ROWS_RETRIEVAL_LIMIT)
+    for start in range(0, len(object_keys), limit):
+        BlobObject.query.filter(
+            BlobObject.job_id == job_id,
+            BlobObject.object_key.in_(object_keys[start : start + limit]),
+        ).update({BlobObject.generation: generation}, synchronize_session=False)
+    commit_session("stamp_generation")
+
+
+def sweep_unseen_objects(job_id, generation, delete_files):
+    """
+    Removes the objects that a complete listing of the given run did not see.
+
+    Args:
+        job_id (str): The ID of the job.
+        generation (int): The generation of the current run.
+        delete_files (bool): Whether the local files of the objects are deleted too.
+
+    Returns:
+        int: The number of objects removed.
+    """
+    unseen_objects = BlobObject.query.filter(
+        BlobObject.job_id == job_id, BlobObject.generation < generation
+    )
+    if delete_files:
+        for (local_full_path,) in unseen_objects.with_entities(
+            BlobObject.local_full_path
+        ).yield_per(int(Config.DB_ROWS_RETRIEVAL_LIMIT)):
+            if local_full_path:
+                __remove_local_file(local_full_path)
+    removed = unseen_objects.delete(synchronize_session=False)
+    commit_session("sweep_unseen_objects")
+    if removed:
+        logging.info(f"Removed {removed} objects deleted from the connector")
+    return removed
+
+
+def has_objects(job_id):
+    """
+    Returns whether any object of a job is recorded.
+    """
+    return (
+        BlobObject.query.filter(BlobObject.job_id == job_id)
+        .with_entities(BlobObject.id)
+        .first()
+        is not None
+    )
+
+
+def get_existing_object_keys(object_keys, job_id):
+    """
+    Returns the keys of the given objects that have a row for the job.
+
+    Args:
+        object_keys (list): The keys to be looked up.
+        job_id (str): The ID of the job.
+
+    Returns:
+        set: The keys that have a row.
+    """
+    object_keys = list(object_keys)
+    existing_object_keys = set()
+    limit = int(Config.DB_ROWS_RETRIEVAL_LIMIT)
+    for start in range(0, len(object_keys), limit):
+        existing_object_keys.update(
+            object_key
+            for (object_key,) in BlobObject.query.filter(
+                BlobObject.job_id == job_id,
+                BlobObject.object_key.in_(object_keys[start : start + limit]),
+            ).with_entities(BlobObject.object_key)
+        )
+    return existing_object_keys
+
+
+def insert_objects(rows):
+    """
+    Inserts object rows in bulk and commits them.
+
+    Args:
+        rows (list): The columns of the objects, one dictionary per object.
+    """
+    if not rows:
+        return
+    db.session.bulk_insert_mappings(BlobObject, rows)
+    commit_session("insert_objects")
+
+
+def iter_processed_objects(job_id):
+    """
+    Iterates over the objects of a job that were synced completely.
+
+    Args:
+        job_id (str): The ID of the job.
+
+    Yields:
+        tuple: The object key, the local path and the compression of the object.
+    """
+    yield from (
+        BlobObject.query.filter(
+            BlobObject.job_id == job_id, BlobObject.status == "PROCESSED"
+        )
+        .with_entities(
+            BlobObject.object_key, BlobObject.local_full_path, BlobObject.compression
+        )
+        .yield_per(int(Config.DB_ROWS_RETRIEVAL_LIMIT))
+    )
+
+
+def __remove_local_file(local_full_path):
+    remove_file(local_full_path)
+    remove_file(get_temp_download_path(local_full_path))
+
+
+class ManifestBuffer(list):
+    """
+    A list of JSON manifest entries that keeps track of its serialized size, so that
+    the size does not need to be recomputed from all entries on every append.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.json_size = len("[]")
+
+    def append(self, entry):
+        self.json_size += len(json.dumps(entry)) + (len(", ") if self else 0)
+        super().append(entry)
 
 
 def write_json_to_local_file(json_data, job_id, all_objects_processed=False):
-    if (
-        len(json.dumps(json_data)) > eval(Constants.MAX_JSON_SIZE)
-        or all_objects_processed
-    ):
+    json_size = (
+        json_data.json_size
+        if isinstance(json_data, ManifestBuffer)
+        else len(json.dumps(json_data))
+    )
+    if json_size > eval(Constants.MAX_JSON_SIZE) or all_objects_processed:
         local_filepath = __get_local_filepath(Config.JSON_ROOT_FOLDER, job_id)
-        with open(local_filepath, "w") as json_file:
-            json.dump(json_data, json_file, indent=4)
+        with MANIFEST_WRITE_SECONDS.time():
+            with open(local_filepath, "w") as json_file:
+                json.dump(json_data, json_file, indent=4)
+        MANIFEST_WRITES.inc()
+        MANIFEST_ENTRIES.inc(len(json_data))
 
         # Reset the JSON data for the next file
-        json_data = []
+        json_data = ManifestBuffer()
     return json_data
 
 
@@ -144,3 +422,36 @@ def __get_local_filepath(json_dir, job_id):
     timestamp = int(time.time_ns())
     local_filepath = f"{json_dir}/{job_id}/{timestamp}.json"
     return local_filepath
+
+
+def start_job_run(job_id):
+    """
+    Records the start of a sync run.
+
+    Args:
+        job_id (str): The ID of the job.
+
+    Returns:
+        JobRun: The persisted run record.
+    """
+    job_run = JobRun(job_id=job_id, started_at=datetime.now(pytz.utc))
+    db.session.add(job_run)
+    commit_session("job_run")
+    return job_run
+
+
+def finish_job_run(job_run, run_stats, status):
+    """
+    Records the end of a sync run together with its counters.
+
+    Args:
+        job_run (JobRun): The run record created by start_job_run.
+        run_stats (RunStats): The counters accumulated during the run.
+        status (str): The final status of the run.
+    """
+    for field, value in run_stats.as_dict().items():
+        setattr(job_run, field, value)
+    job_run.status = status
+    job_run.ended_at = datetime.now(pytz.utc)
+    db.session.add(job_run)
+    commit_session("job_run")
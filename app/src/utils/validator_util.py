@@ -1,5 +1,11 @@
-from schema import Schema, And, SchemaError
+from schema import Schema, And, Optional, SchemaError
 from app.src.constants.contants import Constants
+from app.src.factories.sink_factory import validate_sink_config
+from app.src.services.connectors.filesystem_connector import validate_root_path
+from app.src.services.download_committer import DURABILITY_MODES
+from app.src.services.rate_limiter import RATE_LIMIT_KEYS, validate_rate_limits
+from app.src.utils.compression_util import COMPRESSION_NONE, validate_compression
+from app.src.utils.file_util import LAYOUTS
 import uuid
 
 scheduler_creation_api_schema = Schema(
@@ -31,6 +37,22 @@ scheduler_creation_api_schema = Schema(
     }
 )
 
+connector_config_schema = Schema(
+    {
+        Optional("durability"): And(
+            str,
+            lambda s: s in DURABILITY_MODES,
+            error=f"durability must be one of {DURABILITY_MODES}",
+        ),
+        Optional("layout"): And(
+            str,
+            lambda s: s in LAYOUTS,
+            error=f"layout must be one of {LAYOUTS}",
+        ),
+    },
+    ignore_extra_keys=True,
+)
+
 job_id_schema = Schema(
     {"job_id": And(str, lambda s: uuid.UUID(s.strip()), error="Invalid job ID")}
 )
@@ -54,6 +76,49 @@ def validate_scheduler_creation_api_request(data):
         return False, str(e)
 
 
+def validate_connector_config(connector_config, connector_type=None):
+    """
+    Validates the options of a connector config.
+
+    Args:
+        connector_config (dict): The connector config to be validated.
+        connector_type (str, optional): The type of the connector, to validate the
+            options specific to it.
+
+    Returns:
+        tuple: A tuple containing a boolean value indicating whether the validation passed or not,
+               and an error message if the validation failed.
+    """
+    try:
+        connector_config_schema.validate(connector_config)
+    except SchemaError as e:
+        return False, str(e)
+
+    rate_limits = {
+        key: connector_config[key] for key in RATE_LIMIT_KEYS if key in connector_config
+    }
+    if rate_limits:
+        is_valid, msg = validate_rate_limits(rate_limits)
+        if not is_valid:
+            return False, msg
+
+    is_valid, msg = validate_sink_config(connector_config)
+    if not is_valid:
+        return False, msg
+
+    compression = connector_config.get("compression", COMPRESSION_NONE)
+    is_valid, msg = validate_compression(
+        compression, connector_config.get("compression_level", 3)
+    )
+    if not is_valid:
+        return False, msg
+    if compression != COMPRESSION_NONE and connector_config.get("content_addressed"):
+        return False, "compression is not supported with content_addressed"
+    if (connector_type or "").strip().upper() == "FILESYSTEM":
+        return validate_root_path(connector_config.get("root_path"))
+    return True, None
+
+
 def validate_job_id(data):
     """
     Validates the given job ID against a predefined schema.
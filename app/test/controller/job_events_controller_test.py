@@ -0,0 +1,56 @@
+import json
+from unittest import mock
+import uuid
+import pytest
+from flask import Flask
+from app.src.constants.contants import Constants
+from app.src.controllers.job_events_controller import JobEventsController
+
+
+@pytest.fixture
+def mock_service():
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def client(mock_service):
+    app = Flask(__name__)
+    controller = JobEventsController(mock_service)
+    controller.register_routes(app)
+    return app.test_client()
+
+
+def test_post_events(client, mock_service):
+    mock_service.enqueue_events.return_value = (2, None)
+    payload = {"Records": []}
+
+    job_id = str(uuid.uuid4())
+    response = client.post(f"{Constants.JOBS_API}/{job_id}/events", json=payload)
+
+    assert response.status_code == 202
+    assert json.loads(response.data) == {"message": "Events accepted", "accepted": 2}
+    mock_service.enqueue_events.assert_called_once_with(job_id, payload)
+
+
+def test_post_events_unknown_job(client, mock_service):
+    mock_service.enqueue_events.return_value = (None, "Job not found")
+
+    job_id = str(uuid.uuid4())
+    response = client.post(f"{Constants.JOBS_API}/{job_id}/events", json={})
+
+    assert response.status_code == 404
+
+
+def test_post_events_invalid_payload(client):
+    job_id = str(uuid.uuid4())
+    response = client.post(f"{Constants.JOBS_API}/{job_id}/events", data="not json")
+
+    assert response.status_code == 400
+    assert json.loads(response.data) == {"error": "Invalid event notification"}
+
+
+def test_post_events_invalid_job_id(client):
+    response = client.post(f"{Constants.JOBS_API}/123/events", json={})
+
+    assert response.status_code == 400
+    assert json.loads(response.data) == {"error": "job_id must be a valid UUID string"}
@@ -78,3 +78,37 @@ def test_failure_scenario_internal_server_error(client, mock_service):
 
     assert response.status_code == 500
     assert json.loads(response.data) == {"message": "Internal Server Error"}
+
+
+def test_lookup_object_by_key(client, mock_service):
+    object = {"object_key": "a/b.csv", "local_full_path": "/download/3f/a2/3fa2.csv"}
+    mock_service.find_object.return_value = object
+    job_id = str(uuid.uuid4())
+
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/objects/lookup?key=a/b.csv")
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == object
+    mock_service.find_object.assert_called_once_with(
+        job_id, object_key="a/b.csv", local_path=None
+    )
+
+
+def test_lookup_object_not_found(client, mock_service):
+    mock_service.find_object.return_value = None
+    job_id = str(uuid.uuid4())
+
+    response = client.get(
+        f"{Constants.JOBS_API}/{job_id}/objects/lookup?path=/download/x"
+    )
+
+    assert response.status_code == 404
+
+
+def test_lookup_object_requires_key_or_path(client, mock_service):
+    job_id = str(uuid.uuid4())
+
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/objects/lookup")
+
+    assert response.status_code == 400
+    mock_service.find_object.assert_not_called()
@@ -0,0 +1,75 @@
+import json
+from unittest import mock
+import uuid
+import pytest
+from flask import Flask
+from app.src.constants.contants import Constants
+from app.src.controllers.job_runs_controller import JobRunsController
+
+
+@pytest.fixture
+def mock_service():
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def client(mock_service):
+    app = Flask(__name__)
+    controller = JobRunsController(mock_service)
+    controller.register_routes(app)
+    return app.test_client()
+
+
+def test_get_runs(client, mock_service):
+    return_json = {"total_runs": 1, "limit": 10, "offset": 0, "runs": [{"id": 1}]}
+    mock_service.get_runs.return_value = return_json
+
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/runs")
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == return_json
+    mock_service.get_runs.assert_called_once_with(job_id, 10, 0)
+
+
+def test_get_runs_invalid_job_id(client):
+    response = client.get(f"{Constants.JOBS_API}/123/runs")
+
+    assert response.status_code == 400
+    assert json.loads(response.data) == {"error": "job_id must be a valid UUID string"}
+
+
+def test_get_runs_invalid_limit(client):
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/runs?limit=-1")
+
+    assert response.status_code == 400
+    assert json.loads(response.data) == {"error": "Invalid limit or offset"}
+
+
+def test_get_summary(client, mock_service):
+    mock_service.get_summary.return_value = {"runs": 0, "summary": {}}
+
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/runs/summary?last=20")
+
+    assert response.status_code == 200
+    mock_service.get_summary.assert_called_once_with(job_id, 20)
+
+
+def test_get_summary_invalid_last(client):
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/runs/summary?last=0")
+
+    assert response.status_code == 400
+    assert json.loads(response.data) == {"error": "Invalid last"}
+
+
+def test_get_summary_internal_error(client, mock_service):
+    mock_service.get_summary.side_effect = Exception("An error occurred")
+
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/runs/summary")
+
+    assert response.status_code == 500
+    assert json.loads(response.data) == {"message": "Internal Server Error"}
@@ -0,0 +1,36 @@
+from unittest import mock
+import pytest
+from flask import Flask
+from app.src.constants.contants import Constants
+from app.src.controllers.metrics_controller import MetricsController
+
+
+@pytest.fixture
+def mock_registry():
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def client(mock_registry):
+    app = Flask(__name__)
+    controller = MetricsController(mock_registry)
+    controller.register_routes(app)
+    return app.test_client()
+
+
+def test_get_metrics(client, mock_registry):
+    mock_registry.render.return_value = "# TYPE test_total counter\ntest_total 1\n"
+
+    response = client.get(Constants.METRICS_API)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert response.data == b"# TYPE test_total counter\ntest_total 1\n"
+
+
+def test_get_metrics_internal_error(client, mock_registry):
+    mock_registry.render.side_effect = Exception("An error occurred")
+
+    response = client.get(Constants.METRICS_API)
+
+    assert response.status_code == 500
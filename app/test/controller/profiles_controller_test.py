@@ -0,0 +1,81 @@
+import json
+from unittest import mock
+import uuid
+import pytest
+from flask import Flask
+from app.src.constants.contants import Constants
+from app.src.controllers.profiles_controller import ProfilesController
+
+
+@pytest.fixture
+def mock_profiler():
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def client(mock_profiler):
+    app = Flask(__name__)
+    controller = ProfilesController(mock_profiler)
+    controller.register_routes(app)
+    return app.test_client()
+
+
+def test_request_profile(client, mock_profiler):
+    job_id = str(uuid.uuid4())
+    response = client.post(f"{Constants.JOBS_API}/{job_id}/profile")
+
+    assert response.status_code == 200
+    mock_profiler.request_profile.assert_called_once_with(job_id)
+
+
+def test_request_profile_invalid_job_id(client, mock_profiler):
+    response = client.post(f"{Constants.JOBS_API}/123/profile")
+
+    assert response.status_code == 400
+    assert json.loads(response.data) == {"error": "job_id must be a valid UUID string"}
+    mock_profiler.request_profile.assert_not_called()
+
+
+def test_list_profiles(client, mock_profiler):
+    mock_profiler.is_requested.return_value = False
+    mock_profiler.list_profiles.return_value = [{"profile_id": "1"}]
+
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/profiles")
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == {
+        "profile_requested": False,
+        "profiles": [{"profile_id": "1"}],
+    }
+
+
+def test_download_profile_file(client, mock_profiler, tmp_path):
+    path = tmp_path / "stacks.folded"
+    path.write_text("main;run 3\n")
+    mock_profiler.get_profile_file.return_value = str(path)
+
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/profiles/1/stacks.folded")
+
+    assert response.status_code == 200
+    assert response.data == b"main;run 3\n"
+
+
+def test_download_profile_file_not_found(client, mock_profiler):
+    mock_profiler.get_profile_file.return_value = None
+
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/profiles/1/stacks.folded")
+
+    assert response.status_code == 404
+    assert json.loads(response.data) == {"message": "Profile not found"}
+
+
+def test_list_profiles_internal_error(client, mock_profiler):
+    mock_profiler.list_profiles.side_effect = Exception("An error occurred")
+
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/profiles")
+
+    assert response.status_code == 500
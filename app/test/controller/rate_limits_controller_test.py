@@ -0,0 +1,98 @@
+import json
+from unittest import mock
+import uuid
+import pytest
+from flask import Flask
+from app.src.constants.contants import Constants
+from app.src.controllers.rate_limits_controller import RateLimitsController
+from app.src.services.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def mock_service():
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def mock_rate_limiters():
+    rate_limiters = mock.MagicMock()
+    rate_limiters.global_limiter = RateLimiter()
+    return rate_limiters
+
+
+@pytest.fixture
+def client(mock_service, mock_rate_limiters):
+    app = Flask(__name__)
+    controller = RateLimitsController(mock_service, mock_rate_limiters)
+    controller.register_routes(app)
+    return app.test_client()
+
+
+def test_update_job_rate_limits(client, mock_service):
+    limits = {"max_bytes_per_second": 1048576, "max_requests_per_second": 0}
+    mock_service.update_rate_limits.return_value = (limits, None)
+
+    job_id = str(uuid.uuid4())
+    response = client.put(
+        f"{Constants.JOBS_API}/{job_id}/rate_limits",
+        json={"max_bytes_per_second": 1048576},
+    )
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == {"job_id": job_id, **limits}
+    mock_service.update_rate_limits.assert_called_once_with(
+        job_id, {"max_bytes_per_second": 1048576}
+    )
+
+
+def test_update_job_rate_limits_unknown_job(client, mock_service):
+    mock_service.update_rate_limits.return_value = (None, "Job not found")
+
+    job_id = str(uuid.uuid4())
+    response = client.put(
+        f"{Constants.JOBS_API}/{job_id}/rate_limits",
+        json={"max_requests_per_second": 10},
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {"max_bytes_per_second": -1},
+        {"max_bytes_per_second": "fast"},
+        {"max_bandwidth": 10},
+    ],
+)
+def test_update_job_rate_limits_invalid(client, mock_service, payload):
+    job_id = str(uuid.uuid4())
+    response = client.put(f"{Constants.JOBS_API}/{job_id}/rate_limits", json=payload)
+
+    assert response.status_code == 400
+    mock_service.update_rate_limits.assert_not_called()
+
+
+def test_get_job_rate_limits_unknown_job(client, mock_rate_limiters):
+    mock_rate_limiters.get_job_limiter.return_value = None
+
+    job_id = str(uuid.uuid4())
+    response = client.get(f"{Constants.JOBS_API}/{job_id}/rate_limits")
+
+    assert response.status_code == 404
+
+
+def test_update_global_rate_limits(client):
+    response = client.put(
+        Constants.RATE_LIMITS_API, json={"max_requests_per_second": 100}
+    )
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == {
+        "max_bytes_per_second": 0,
+        "max_requests_per_second": 100,
+    }
+    assert json.loads(client.get(Constants.RATE_LIMITS_API).data) == json.loads(
+        response.data
+    )
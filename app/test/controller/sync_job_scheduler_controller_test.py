@@ -58,6 +58,105 @@ def test_schedule_sync_job_invalid_request(mock_validate_request, client):
     assert json.loads(response.data) == {"message": "Invalid request body"}
 
 
+@mock.patch(
+    "app.src.controllers.sync_job_scheduler_controller.validate_scheduler_creation_api_request"
+)
+def test_schedule_sync_job_invalid_durability(
+    mock_validate_request, client, mock_service
+):
+    mock_validate_request.return_value = True, None
+
+    response = client.post(
+        f"{Constants.SYNC_JOB_SCHEDULER_API}/create_job",
+        json={
+            "connector_type": "s3",
+            "job_name": "test_job",
+            "schedule": "daily",
+            "connector_config": {"bucket_name": "test_bucket", "durability": "always"},
+        },
+    )
+
+    assert response.status_code == 400
+    mock_service.schedule_sync_job.assert_not_called()
+
+
+@mock.patch(
+    "app.src.controllers.sync_job_scheduler_controller.validate_scheduler_creation_api_request"
+)
+def test_schedule_sync_job_invalid_layout(mock_validate_request, client, mock_service):
+    mock_validate_request.return_value = True, None
+
+    response = client.post(
+        f"{Constants.SYNC_JOB_SCHEDULER_API}/create_job",
+        json={
+            "connector_type": "s3",
+            "job_name": "test_job",
+            "schedule": "daily",
+            "connector_config": {"bucket_name": "test_bucket", "layout": "sharded"},
+        },
+    )
+
+    assert response.status_code == 400
+    mock_service.schedule_sync_job.assert_not_called()
+
+
+@mock.patch(
+    "app.src.controllers.sync_job_scheduler_controller.validate_scheduler_creation_api_request"
+)
+def test_schedule_sync_job_sink_with_local_options(
+    mock_validate_request, client, mock_service
+):
+    mock_validate_request.return_value = True, None
+
+    response = client.post(
+        f"{Constants.SYNC_JOB_SCHEDULER_API}/create_job",
+        json={
+            "connector_type": "s3",
+            "job_name": "test_job",
+            "schedule": "daily",
+            "connector_config": {
+                "bucket_name": "test_bucket",
+                "sink": {"type": "s3", "bucket_name": "replica"},
+                "snapshots": True,
+            },
+        },
+    )
+
+    assert response.status_code == 400
+    assert "local sink" in response.json["message"]
+    mock_service.schedule_sync_job.assert_not_called()
+
+
+@mock.patch(
+    "app.src.controllers.sync_job_scheduler_controller.validate_scheduler_creation_api_request"
+)
+def test_schedule_sync_job_compression_with_content_addressed(
+    mock_validate_request, client, mock_service
+):
+    mock_validate_request.return_value = True, None
+
+    with mock.patch(
+        "app.src.utils.compression_util.get_zstd_compressor", autospec=True
+    ):
+        response = client.post(
+            f"{Constants.SYNC_JOB_SCHEDULER_API}/create_job",
+            json={
+                "connector_type": "s3",
+                "job_name": "test_job",
+                "schedule": "daily",
+                "connector_config": {
+                    "bucket_name": "test_bucket",
+                    "compression": "zstd",
+                    "content_addressed": True,
+                },
+            },
+        )
+
+    assert response.status_code == 400
+    assert "content_addressed" in response.json["message"]
+    mock_service.schedule_sync_job.assert_not_called()
+
+
 @mock.patch(
     "app.src.controllers.sync_job_scheduler_controller.validate_scheduler_creation_api_request"
 )
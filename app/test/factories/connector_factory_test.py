@@ -3,6 +3,8 @@
 from unittest.mock import patch
 import pytest
 from app.src.factories.connector_factory import ConnectorFactory
+from app.src.services.connectors.filesystem_connector import FilesystemConnector
+from app.src.services.connectors.http_connector import HttpConnector
 
 
 @pytest.fixture(scope="module")
@@ -25,6 +27,18 @@ def test_get_s3_connector(factory, mock_s3connector):
     assert error is None
 
 
+def test_get_filesystem_connector(factory):
+    connector, error = factory.get_connector("filesystem")
+    assert isinstance(connector, FilesystemConnector)
+    assert error is None
+
+
+def test_get_http_connector(factory):
+    connector, error = factory.get_connector("http")
+    assert isinstance(connector, HttpConnector)
+    assert error is None
+
+
 def test_invalid_connector_type(factory):
     connector, error = factory.get_connector("INVALID")
     assert connector is None
@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.src.factories.sink_factory import SinkFactory, validate_sink_config
+
+
+@patch("app.src.factories.sink_factory.S3Sink", autospec=True)
+def test_get_s3_sink(mock_s3_sink):
+    sink_config = {"type": "s3", "bucket_name": "target"}
+
+    sink, error = SinkFactory().get_sink(sink_config, "job_id")
+
+    assert sink is mock_s3_sink.return_value
+    assert error is None
+    mock_s3_sink.assert_called_once_with(sink_config)
+
+
+@patch("app.src.factories.sink_factory.ArchiveSink", autospec=True)
+@patch("app.src.factories.sink_factory.Config")
+def test_get_archive_sink(mock_config, mock_archive_sink):
+    mock_config.DOWNLOAD_ROOT_FOLDER = "/downloads"
+    mock_config.ARCHIVE_SEGMENT_SIZE = "1024"
+    mock_config.DOWNLOAD_WRITE_BUFFER_SIZE = "8"
+    mock_config.DOWNLOAD_DROP_CACHE = "false"
+
+    sink, error = SinkFactory().get_sink({"type": "archive"}, "job_id")
+
+    assert sink is mock_archive_sink.return_value
+    assert error is None
+    mock_archive_sink.assert_called_once_with(
+        "/downloads/job_id",
+        1024,
+        8,
+        compression="none",
+        compression_level=3,
+        drop_cache=False,
+    )
+
+
+def test_invalid_sink_type():
+    sink, error = SinkFactory().get_sink({"type": "ftp"}, "job_id")
+
+    assert sink is None
+    assert error == "Invalid sink type: ftp"
+
+
+@pytest.mark.parametrize(
+    "connector_config, expected_error",
+    [
+        ({"bucket_name": "source"}, None),
+        ({"sink": {"type": "local"}, "snapshots": True}, None),
+        ({"sink": {"type": "s3", "bucket_name": "target"}}, None),
+        ({"sink": {"type": "archive", "segment_size": "1024"}}, None),
+        ({"sink": "s3"}, "sink must be a dictionary"),
+        ({"sink": {"type": "ftp"}}, "sink type must be one of"),
+        ({"sink": {"type": "s3"}}, "bucket_name is required"),
+        (
+            {"sink": {"type": "s3", "bucket_name": "target"}, "snapshots": True},
+            "['snapshots'] are only supported with the local sink",
+        ),
+        ({"sink": {"type": "archive", "compression": "gzip"}}, "compression"),
+        ({"sink": {"type": "archive", "segment_size": "0"}}, "segment_size"),
+    ],
+)
+def test_validate_sink_config(connector_config, expected_error):
+    is_valid, error = validate_sink_config(connector_config)
+
+    assert is_valid is (expected_error is None)
+    if expected_error:
+        assert expected_error in error
@@ -32,7 +32,25 @@ def test_blob_object_json(blob_object):
         "status": "active",
         "local_full_path": "/path/to/file",
         "job_id": 1,
+        "generation": None,
+        "etag": None,
+        "checksum": None,
+        "compression": None,
+        "stored_size": None,
+        "compression_ratio": None,
         "created_at": None,
         "updated_at": None,
     }
     assert blob_object.__json__() == expected_json
+
+
+def test_blob_object_is_indexed_by_local_path():
+    indexes = {
+        index.name: [column.name for column in index.columns]
+        for index in BlobObject.__table__.indexes
+    }
+
+    assert indexes["ix_blob_object_job_id_local_full_path"] == [
+        "job_id",
+        "local_full_path",
+    ]
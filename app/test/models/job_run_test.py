@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+import pytest
+import pytz
+from app.src.models.job_run import JobRun
+
+
+@pytest.fixture
+def job_run():
+    return JobRun(
+        job_id="12345", started_at=datetime(2024, 5, 21, 0, 0, 0, tzinfo=pytz.utc)
+    )
+
+
+def test_job_run_creation(job_run):
+    assert job_run.job_id == "12345"
+    assert job_run.status == "RUNNING"
+    assert job_run.bytes_transferred == 0
+    assert job_run.duration_seconds is None
+    assert job_run.bytes_per_second is None
+
+
+def test_job_run_throughput(job_run):
+    # Mixes an aware and a naive timestamp, as happens after a reload from SQLite.
+    job_run.ended_at = datetime(2024, 5, 21, 0, 0, 10)
+    job_run.bytes_transferred = 1000
+
+    assert job_run.duration_seconds == 10
+    assert job_run.bytes_per_second == 100
+
+
+def test_job_run_json(job_run):
+    job_run.ended_at = job_run.started_at + timedelta(seconds=4)
+    job_run.status = "COMPLETED"
+    job_run.list_requests = 2
+
+    result = job_run.__json__()
+
+    assert result["status"] == "COMPLETED"
+    assert result["duration_seconds"] == 4
+    assert result["list_requests"] == 2
+    assert result["get_requests"] == 0
@@ -0,0 +1,107 @@
+import threading
+from unittest.mock import patch
+import pytest
+from app.src.services.concurrency_controller import (
+    AimdConcurrencyController,
+    ThrottledError,
+)
+
+
+def create_controller(initial_limit=4, cooldown_seconds=0, latency_spike_factor=4):
+    return AimdConcurrencyController(
+        "test-bucket/data/",
+        initial_limit=initial_limit,
+        min_limit=1,
+        max_limit=8,
+        decrease_factor=0.5,
+        latency_spike_factor=latency_spike_factor,
+        cooldown_seconds=cooldown_seconds,
+    )
+
+
+def test_limit_increases_additively_on_success():
+    controller = create_controller()
+
+    for _ in range(4):
+        with controller.slot():
+            pass
+
+    assert controller.limit == 4
+    with controller.slot():
+        pass
+    assert controller.limit == 5
+
+
+def test_limit_decreases_on_throttling():
+    controller = create_controller()
+
+    with pytest.raises(ThrottledError):
+        with controller.slot():
+            raise ThrottledError("SlowDown")
+
+    assert controller.limit == 2
+    assert controller.in_flight == 0
+
+
+def test_limit_never_drops_below_minimum():
+    controller = create_controller(initial_limit=1)
+
+    with pytest.raises(ThrottledError):
+        with controller.slot():
+            raise ThrottledError("SlowDown")
+
+    assert controller.limit == 1
+
+
+def test_decreases_within_cooldown_count_once():
+    controller = create_controller(cooldown_seconds=60)
+
+    for _ in range(3):
+        with pytest.raises(ThrottledError):
+            with controller.slot():
+                raise ThrottledError("SlowDown")
+
+    assert controller.limit == 2
+
+
+def test_other_errors_leave_limit_unchanged():
+    controller = create_controller()
+
+    with pytest.raises(ValueError):
+        with controller.slot():
+            raise ValueError("error")
+
+    assert controller.limit == 4
+
+
+@patch("app.src.services.concurrency_controller.time.perf_counter")
+def test_limit_decreases_on_latency_spike(mock_perf_counter):
+    controller = create_controller(initial_limit=8)
+    # Twenty requests taking one second each, then one taking ten seconds.
+    mock_perf_counter.side_effect = [
+        value for i in range(20) for value in (i * 10, i * 10 + 1)
+    ] + [1000, 1010]
+
+    for _ in range(21):
+        with controller.slot():
+            pass
+
+    assert controller.limit == 4
+
+
+def test_slot_blocks_while_limit_is_reached():
+    controller = create_controller(initial_limit=1)
+    entered = threading.Event()
+
+    def request():
+        with controller.slot():
+            entered.set()
+
+    with controller.slot():
+        thread = threading.Thread(target=request)
+        thread.start()
+        assert not entered.wait(0.1)
+        assert controller.in_flight == 1
+
+    assert entered.wait(1)
+    thread.join()
@@ -0,0 +1,139 @@
+from unittest import mock
+
+import pytest
+
+from app.src.services.connectors.filesystem_connector import (
+    FilesystemConnector,
+    validate_root_path,
+)
+
+
+@pytest.fixture(autouse=True)
+def mock_config(tmp_path):
+    with mock.patch(
+        "app.src.services.connectors.filesystem_connector.Config", autospec=True
+    ) as config:
+        config.FILESYSTEM_PAGE_SIZE = "2"
+        config.S3_CHUNK_SIZE = "4"
+        config.FILESYSTEM_ALLOWED_ROOTS = str(tmp_path)
+        config.DOWNLOAD_ROOT_FOLDER = None
+        config.JSON_ROOT_FOLDER = None
+        config.SNAPSHOT_ROOT_FOLDER = None
+        config.CONTENT_STORE_FOLDER = None
+        yield config
+
+
+@pytest.fixture
+def root_path(tmp_path):
+    for key, data in {
+        "a.txt": b"a",
+        "a-b.txt": b"ab",
+        "a/b.txt": b"abc",
+        "a/c/d.txt": b"abcd",
+        "b.txt": b"hello world",
+    }.items():
+        (tmp_path / key).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / key).write_bytes(data)
+    (tmp_path / "empty").mkdir()
+    return tmp_path
+
+
+def test_list_objects_pages_in_key_order(root_path):
+    connector = FilesystemConnector()
+    config = {"root_path": str(root_path)}
+
+    pages = []
+    pagination_token = None
+    while True:
+        page, pagination_token = connector.list_objects(config, pagination_token)
+        pages.append(dict(page))
+        if not pagination_token:
+            break
+
+    assert pages == [
+        {"a-b.txt": 2, "a.txt": 1},
+        {"a/b.txt": 3, "a/c/d.txt": 4},
+        {"b.txt": 11},
+    ]
+    assert list(connector.iter_object_pages(config)) == pages
+
+
+def test_list_objects_with_prefix(root_path):
+    page, pagination_token = FilesystemConnector().list_objects(
+        {"root_path": str(root_path), "prefix": "a/"}
+    )
+
+    assert page == {"a/b.txt": 3, "a/c/d.txt": 4}
+    assert pagination_token is None
+    assert page.last_modified["a/b.txt"] == (root_path / "a/b.txt").stat().st_mtime
+
+
+def test_fetch_object_in_chunks(root_path):
+    connector = FilesystemConnector()
+    config = {"root_path": str(root_path)}
+
+    assert connector.get_object_size(config, "b.txt") == 11
+    assert connector.fetch_object_in_chunks(config, "b.txt", 0, 11) == (b"hell", 4)
+    assert connector.fetch_object_in_chunks(config, "b.txt", 8, 11) == (b"rld", 11)
+    with pytest.raises(Exception, match="shorter than 12 bytes"):
+        connector.fetch_object_in_chunks(config, "b.txt", 8, 12)
+
+
+@pytest.mark.parametrize(
+    "config, object_key",
+    [
+        (dict(), "b.txt"),
+        ({"root_path": "/data"}, "../etc/passwd"),
+        ({"root_path": "/data"}, "/etc/passwd"),
+    ],
+)
+def test_get_local_path_rejects_invalid_keys(config, object_key):
+    with pytest.raises(ValueError):
+        FilesystemConnector().get_local_path(config, object_key)
+
+
+def test_list_objects_skips_symlinks(root_path, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside")
+    (outside / "secret.txt").write_bytes(b"secret")
+    (root_path / "link.txt").symlink_to(outside / "secret.txt")
+    (root_path / "link").symlink_to(outside, target_is_directory=True)
+    connector = FilesystemConnector()
+    config = {"root_path": str(root_path)}
+
+    keys = [key for page in connector.iter_object_pages(config) for key in page]
+
+    assert "link.txt" not in keys
+    assert not any(key.startswith("link/") for key in keys)
+    with pytest.raises(ValueError):
+        connector.get_local_path(config, "link.txt")
+
+
+@pytest.mark.parametrize(
+    "relative_path, expected_error",
+    [
+        ("a", None),
+        ("a/c", None),
+        ("..", "is not within the FILESYSTEM_ALLOWED_ROOTS"),
+        ("", "overlaps the folder"),
+        ("downloads", "overlaps the folder"),
+        ("json/jobs", "overlaps the folder"),
+    ],
+)
+def test_validate_root_path(mock_config, root_path, relative_path, expected_error):
+    mock_config.DOWNLOAD_ROOT_FOLDER = str(root_path / "downloads")
+    mock_config.JSON_ROOT_FOLDER = str(root_path / "json")
+
+    is_valid, error = validate_root_path(str(root_path / relative_path))
+
+    assert is_valid is (expected_error is None)
+    if expected_error:
+        assert expected_error in error
+    else:
+        assert error is None
+
+
+def test_list_objects_rejects_root_path_outside_allowed_roots(mock_config, root_path):
+    mock_config.FILESYSTEM_ALLOWED_ROOTS = str(root_path / "a")
+
+    with pytest.raises(Exception, match="FILESYSTEM_ALLOWED_ROOTS"):
+        FilesystemConnector().list_objects({"root_path": str(root_path)}, None)
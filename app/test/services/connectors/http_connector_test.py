@@ -0,0 +1,202 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import quote, unquote, urlsplit
+
+import pytest
+
+from app.src.services.connectors.http_connector import HttpConnector
+
+LAST_MODIFIED = "Mon, 20 May 2024 01:00:00 GMT"
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    """
+    Serves the files of the server with index pages, ranges and validators.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def respond(self, send_body):
+        path = unquote(urlsplit(self.path).path)
+        if path.endswith("/"):
+            body = self.index(path)
+        elif path in self.server.files:
+            body = self.server.files[path]
+        else:
+            return self.send(404, b"", send_body)
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        headers = {"ETag": etag, "Last-Modified": LAST_MODIFIED}
+        if self.headers.get("If-None-Match") == etag:
+            return self.send(304, b"", False, headers)
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            start, end = map(int, range_header[len("bytes=") :].split("-"))
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            return self.send(206, body[start : end + 1], send_body, headers)
+        self.send(200, body, send_body, headers)
+
+    def send(self, status, body, send_body, headers=None):
+        self.server.requests.append((self.command, self.path, status))
+        self.server.ports.add(self.client_address[1])
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def index(self, folder):
+        names = {
+            path[len(folder) :].split("/")[0]
+            + ("/" if "/" in path[len(folder) :] else "")
+            for path in self.server.files
+            if path.startswith(folder)
+        }
+        links = ['<a href="../">../</a>', '<a href="?C=N;O=D">Name</a>'] + [
+            f'<a href="{quote(name)}">{name}</a>' for name in sorted(names)
+        ]
+        return f"<html><body>{'<br>'.join(links)}</body></html>".encode()
+
+
+@pytest.fixture(autouse=True)
+def mock_config():
+    with mock.patch(
+        "app.src.services.connectors.http_connector.Config", autospec=True
+    ) as config:
+        config.HTTP_PAGE_SIZE = "2"
+        config.HTTP_POOL_SIZE = "4"
+        config.HTTP_TIMEOUT = "5"
+        config.HTTP_VALIDATOR_CACHE_SIZE = "1000"
+        config.S3_CHUNK_SIZE = "4"
+        config.RETRY_COUNT = "1"
+        config.RETRY_DELAY = "0"
+        config.RETRY_BACKOFF = "1"
+        yield config
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+    server.files = {
+        "/files/a.txt": b"a",
+        "/files/dir/b.txt": b"hello world",
+        "/files/dir/sub/c d.txt": b"abc",
+        "/other.txt": b"outside of the base URL",
+    }
+    server.requests = []
+    server.ports = set()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_list_objects_from_index_pages(server):
+    connector = HttpConnector()
+    config = {"base_url": f"{server.url}/files"}
+
+    pages = []
+    pagination_token = None
+    while True:
+        page, pagination_token = connector.list_objects(config, pagination_token)
+        pages.append(page)
+        if not pagination_token:
+            break
+
+    assert pages == [{"a.txt": 1, "dir/b.txt": 11}, {"dir/sub/c d.txt": 3}]
+    assert pages[0].etags == {}
+    assert pages[0].last_modified["a.txt"] == 1716166800.0
+    assert list(connector.iter_object_pages(config)) == pages
+
+
+def test_unchanged_listing_costs_only_not_modified_responses(server):
+    connector = HttpConnector()
+    config = {"base_url": f"{server.url}/files/", "prefix": "dir/"}
+    first_pages = list(connector.iter_object_pages(config))
+    server.requests.clear()
+
+    assert list(connector.iter_object_pages(config)) == first_pages
+    assert first_pages == [{"dir/b.txt": 11, "dir/sub/c d.txt": 3}, {}]
+    assert {status for _, _, status in server.requests} == {304}
+
+    server.files["/files/dir/b.txt"] = b"hello world!"
+    assert list(connector.iter_object_pages(config))[0]["dir/b.txt"] == 12
+
+
+def test_list_objects_from_manifest(server):
+    server.files["/files/manifest.json"] = json.dumps(
+        {"objects": [{"key": "dir/b.txt", "size": 11}, "a.txt"]}
+    ).encode()
+    connector = HttpConnector()
+
+    page, pagination_token = connector.list_objects(
+        {"manifest_url": f"{server.url}/files/manifest.json"}
+    )
+
+    assert page == {"a.txt": 1, "dir/b.txt": 11}
+    assert pagination_token is None
+    # Only the files without a size in the manifest are requested.
+    assert [(method, path) for method, path, _ in server.requests] == [
+        ("GET", "/files/manifest.json"),
+        ("HEAD", "/files/a.txt"),
+    ]
+
+
+def test_fetch_object_in_chunks_over_one_connection(server):
+    connector = HttpConnector()
+    config = {"base_url": f"{server.url}/files/"}
+
+    chunks = []
+    position = 0
+    while position < 11:
+        chunk, position = connector.fetch_object_in_chunks(
+            config, "dir/b.txt", position, 11
+        )
+        chunks.append(chunk)
+
+    assert chunks == [b"hell", b"o wo", b"rld"]
+    assert {status for _, _, status in server.requests} == {206}
+    assert len(server.ports) == 1
+
+
+def test_fetch_object_changed_since_listing(server):
+    connector = HttpConnector()
+    config = {"base_url": f"{server.url}/files/"}
+    assert connector.get_object_size(config, "dir/b.txt") == 11
+    server.files["/files/dir/b.txt"] = b"HELLO WORLD"
+
+    with pytest.raises(Exception, match="changed since it was listed"):
+        connector.fetch_object_in_chunks(config, "dir/b.txt", 4, 11)
+
+
+def test_validators_of_least_recently_used_files_are_evicted(mock_config, server):
+    mock_config.HTTP_VALIDATOR_CACHE_SIZE = "2"
+    connector = HttpConnector()
+    config = {"base_url": f"{server.url}/files/"}
+    for object_key in ("a.txt", "dir/b.txt", "a.txt", "dir/sub/c d.txt"):
+        connector.get_object_size(config, object_key)
+    server.requests.clear()
+
+    for object_key in ("dir/sub/c d.txt", "a.txt", "dir/b.txt"):
+        connector.get_object_size(config, object_key)
+
+    # dir/b.txt was the least recently used one when c d.txt was added.
+    assert [status for _, _, status in server.requests] == [304, 304, 200]
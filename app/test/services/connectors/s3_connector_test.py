@@ -1,8 +1,16 @@
 from unittest import mock
+import io
+import json
 import pytest
 from unittest.mock import MagicMock
+from botocore.exceptions import ClientError, ResponseStreamingError
 
-from app.src.services.connectors.s3_connector import S3Connector
+from app.src.services.connectors.s3_connector import (
+    S3Connector,
+    get_checksum_from_head,
+    is_throttling_error,
+    split_key_range,
+)
 
 
 @pytest.fixture
@@ -16,15 +24,14 @@ def test_list_objects(mock_config, s3_connector):
     mock_config.RETRY_COUNT = "3"
     mock_config.RETRY_DELAY = "1"
     mock_config.RETRY_BACKOFF = "2"
-    s3_connector.s3_client.get_paginator.return_value.paginate.return_value = [
-        {
-            "Contents": [
-                {"Key": "file1.txt", "Size": 100},
-                {"Key": "file2.txt", "Size": 200},
-            ],
-            "NextContinuationToken": "token",
-        }
-    ]
+    s3_connector.s3_client.list_objects_v2.return_value = {
+        "Contents": [
+            {"Key": "file1.txt", "Size": 100},
+            {"Key": "file2.txt", "Size": 200},
+        ],
+        "IsTruncated": True,
+        "NextContinuationToken": "token",
+    }
 
     config = {"bucket_name": "test-bucket", "prefix": "data/"}
     result, next_token = s3_connector.list_objects(config)
@@ -39,15 +46,13 @@ def test_list_objects_without_token(mock_config, s3_connector):
     mock_config.RETRY_COUNT = "3"
     mock_config.RETRY_DELAY = "1"
     mock_config.RETRY_BACKOFF = "2"
-    s3_connector.s3_client.get_paginator.return_value.paginate.return_value = [
-        {
-            "Contents": [
-                {"Key": "file1.txt", "Size": 100},
-                {"Key": "file2.txt", "Size": 200},
-            ],
-            "NextContinuationToken": None,
-        }
-    ]
+    s3_connector.s3_client.list_objects_v2.return_value = {
+        "Contents": [
+            {"Key": "file1.txt", "Size": 100},
+            {"Key": "file2.txt", "Size": 200},
+        ],
+        "IsTruncated": False,
+    }
 
     config = {"bucket_name": "test-bucket", "prefix": "data/"}
     result, next_token = s3_connector.list_objects(config)
@@ -67,6 +72,53 @@ def test_get_object_size(s3_connector):
     assert result == 500
 
 
+def test_get_object_checksum(s3_connector):
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.head_object.return_value = {
+        "ContentLength": 500,
+        "ETag": '"9e107d9d372bb6826bd81d3542a419d6"',
+    }
+
+    result = s3_connector.get_object_checksum(
+        {"bucket_name": "test-bucket"}, "file.txt", 500
+    )
+
+    assert result == {"algorithm": "md5", "value": "9e107d9d372bb6826bd81d3542a419d6"}
+    s3_connector.s3_client.head_object.assert_called_once_with(
+        Bucket="test-bucket", Key="file.txt", PartNumber=1, ChecksumMode="ENABLED"
+    )
+
+
+@pytest.mark.parametrize(
+    "response, object_size, expected",
+    [
+        # Additional checksums are preferred over the ETag.
+        (
+            {"ContentLength": 10, "ETag": '"abc"', "ChecksumSHA256": "c2hh"},
+            10,
+            {"algorithm": "sha256", "value": "c2hh"},
+        ),
+        # Multipart ETags are recomputed from the size of the first part.
+        (
+            {"ContentLength": 8, "ETag": '"abc-3"', "PartsCount": 3},
+            20,
+            {"algorithm": "md5-multipart", "value": "abc-3", "part_size": 8},
+        ),
+        # Parts of different sizes, the ETag can not be recomputed.
+        ({"ContentLength": 8, "ETag": '"abc-2"', "PartsCount": 2}, 20, None),
+        # The ETag of SSE-KMS objects is not the MD5 of their content.
+        (
+            {"ContentLength": 10, "ETag": '"abc"', "ServerSideEncryption": "aws:kms"},
+            10,
+            None,
+        ),
+        ({"ContentLength": 10}, 10, None),
+    ],
+)
+def test_get_checksum_from_head(response, object_size, expected):
+    assert get_checksum_from_head(response, object_size) == expected
+
+
 @mock.patch("app.src.services.connectors.s3_connector.Config", autospec=True)
 def test_fetch_object_in_chunks_set_to_chunk_size(mock_config, s3_connector):
     s3_connector.s3_client = MagicMock()
@@ -112,3 +164,274 @@ def test_fetch_object_in_chunks_set_to_obj_size(mock_config, s3_connector):
 
     assert result == b"chunk_data"
     assert end_position == 100
+
+
+def fake_list_objects_v2(keys, page_size=2):
+    def list_objects_v2(Bucket, Prefix="", Delimiter=None, StartAfter=None, **kwargs):
+        matching = sorted(k for k in keys if k.startswith(Prefix))
+        if Delimiter:
+            contents, common_prefixes = [], []
+            for key in matching:
+                rest = key[len(Prefix) :]
+                if Delimiter in rest:
+                    common_prefix = Prefix + rest.split(Delimiter)[0] + Delimiter
+                    if common_prefix not in common_prefixes:
+                        common_prefixes.append(common_prefix)
+                else:
+                    contents.append(key)
+            return {
+                "Contents": [{"Key": k, "Size": 1} for k in contents],
+                "CommonPrefixes": [{"Prefix": p} for p in common_prefixes],
+                "IsTruncated": False,
+            }
+        if StartAfter:
+            matching = [k for k in matching if k > StartAfter]
+        start = int(kwargs.get("ContinuationToken", 0))
+        page = matching[start : start + page_size]
+        response = {
+            "Contents": [{"Key": k, "Size": len(k)} for k in page],
+            "IsTruncated": start + page_size < len(matching),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + page_size)
+        return response
+
+    return list_objects_v2
+
+
+def list_all_pages(s3_connector, config):
+    listed = dict()
+    pages = 0
+    for page in s3_connector.iter_object_pages(config):
+        assert not set(page) & set(listed)
+        listed.update(page)
+        pages += 1
+    return listed, pages
+
+
+def test_iter_object_pages_parallel_by_common_prefix(s3_connector):
+    keys = ["data/top.txt", "data/a/1", "data/a/2", "data/a/3", "data/b/1", "data/c/1"]
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.list_objects_v2.side_effect = fake_list_objects_v2(keys)
+
+    config = {"bucket_name": "test-bucket", "prefix": "data/", "parallel_listing": True}
+    listed, pages = list_all_pages(s3_connector, config)
+
+    assert listed == {"data/top.txt": 1, **{k: len(k) for k in keys[1:]}}
+    assert pages == 5
+    prefixes = {
+        call.kwargs["Prefix"]
+        for call in s3_connector.s3_client.list_objects_v2.call_args_list
+    }
+    assert prefixes == {"data/", "data/a/", "data/b/", "data/c/"}
+
+
+def test_iter_object_pages_parallel_by_key_range(s3_connector):
+    keys = ["0", "5", "A", "Az", "B", "m", "mm", "z", "~~", "é"]
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.list_objects_v2.side_effect = fake_list_objects_v2(keys)
+
+    config = {"bucket_name": "test-bucket", "parallel_listing": True}
+    listed, _ = list_all_pages(s3_connector, config)
+
+    assert listed == {k: len(k) for k in keys}
+
+
+def test_iter_object_pages_parallel_raises_on_error(s3_connector):
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.list_objects_v2.side_effect = [
+        {"CommonPrefixes": [{"Prefix": "a/"}, {"Prefix": "b/"}], "IsTruncated": False},
+        ValueError("access denied"),
+        ValueError("access denied"),
+    ]
+
+    config = {"bucket_name": "test-bucket", "parallel_listing": True}
+    with pytest.raises(Exception, match="access denied"):
+        list_all_pages(s3_connector, config)
+
+
+def test_split_key_range_covers_every_key():
+    shards = split_key_range("p/", 4)
+
+    assert len(shards) == 4
+    assert shards[0][1] is None and shards[-1][2] is None
+    for key in ["p/", "p/!", "p/0", "p/Z", "p/a", "p/~", "p/é"]:
+        matches = [
+            shard
+            for shard in shards
+            if (shard[1] is None or key > shard[1])
+            and (shard[2] is None or key <= shard[2])
+        ]
+        assert len(matches) == 1
+
+
+@mock.patch("app.src.services.connectors.s3_connector.S3InventoryReader")
+def test_iter_object_pages_from_inventory(mock_inventory_reader, s3_connector):
+    s3_connector.s3_client = MagicMock()
+    mock_inventory_reader.return_value.iter_pages.return_value = iter([{"a": 1}])
+
+    config = {"bucket_name": "test-bucket", "inventory_manifest": "/inv/manifest.json"}
+    assert list(s3_connector.iter_object_pages(config)) == [{"a": 1}]
+    s3_connector.s3_client.list_objects_v2.assert_not_called()
+
+
+@mock.patch("app.src.services.connectors.s3_inventory.Config", autospec=True)
+@mock.patch("app.src.services.connectors.s3_connector.Config", autospec=True)
+def test_iter_object_pages_from_inventory_retries_reads(
+    mock_config, mock_inventory_config, s3_connector
+):
+    mock_config.RETRY_COUNT = "3"
+    mock_config.RETRY_DELAY = "0"
+    mock_config.RETRY_BACKOFF = "1"
+    mock_inventory_config.INVENTORY_PAGE_SIZE = "100"
+    mock_inventory_config.S3_CHUNK_SIZE = "1024"
+    manifest = {
+        "sourceBucket": "test-bucket",
+        "fileSchema": "Bucket, Key, Size",
+        "files": [{"key": "inv/data/1.csv"}],
+    }
+    interrupted_body = MagicMock()
+    interrupted_body.read.side_effect = ResponseStreamingError(error="reset")
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.get_object.side_effect = [
+        throttling_error(),
+        {"Body": io.BytesIO(json.dumps(manifest).encode("utf-8"))},
+        {"Body": interrupted_body},
+        {"Body": io.BytesIO(b"test-bucket,a.txt,1\n")},
+    ]
+
+    config = {
+        "bucket_name": "test-bucket",
+        "inventory_manifest": "s3://inventory-bucket/inv/manifest.json",
+    }
+    assert list(s3_connector.iter_object_pages(config)) == [{"a.txt": 1}]
+    assert s3_connector.s3_client.get_object.call_count == 4
+
+
+def test_list_objects_raises_on_error(s3_connector):
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.list_objects_v2.side_effect = ValueError("access denied")
+
+    with pytest.raises(Exception, match="Error listing objects"):
+        s3_connector.list_objects({"bucket_name": "test-bucket"})
+
+
+def throttling_error(code="SlowDown", status=503):
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": "Please reduce your request rate."},
+            "ResponseMetadata": {"HTTPStatusCode": status},
+        },
+        "GetObject",
+    )
+
+
+@mock.patch("app.src.services.connectors.s3_connector.Config", autospec=True)
+def test_fetch_object_in_chunks_retries_throttled_requests(mock_config, s3_connector):
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.get_object.side_effect = [
+        throttling_error(),
+        {"Body": MagicMock(read=lambda: b"chunk_data")},
+    ]
+    mock_config.S3_CHUNK_SIZE = "80"
+    mock_config.RETRY_COUNT = "3"
+    mock_config.RETRY_DELAY = "0"
+    mock_config.RETRY_BACKOFF = "1"
+    config = {"bucket_name": "test-bucket"}
+
+    result, _ = s3_connector.fetch_object_in_chunks(config, "file.txt", 0, 100)
+
+    assert result == b"chunk_data"
+    assert s3_connector.s3_client.get_object.call_count == 2
+
+
+@mock.patch("app.src.services.connectors.s3_connector.Config", autospec=True)
+def test_list_objects_retries_throttled_pages(mock_config, s3_connector):
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.list_objects_v2.side_effect = [
+        throttling_error(),
+        {
+            "Contents": [{"Key": "file3.txt", "Size": 300}],
+            "IsTruncated": True,
+            "NextContinuationToken": "token2",
+        },
+    ]
+    mock_config.RETRY_COUNT = "3"
+    mock_config.RETRY_DELAY = "0"
+    mock_config.RETRY_BACKOFF = "1"
+    config = {"bucket_name": "test-bucket", "prefix": "data/"}
+
+    result, next_token = s3_connector.list_objects(config, "token1")
+
+    assert result == {"file3.txt": 300}
+    assert next_token == "token2"
+    # The throttled page is requested again from the same continuation token.
+    assert [
+        call.kwargs for call in s3_connector.s3_client.list_objects_v2.call_args_list
+    ] == [
+        {"Bucket": "test-bucket", "Prefix": "data/", "ContinuationToken": "token1"}
+    ] * 2
+
+
+@mock.patch("app.src.services.connectors.s3_connector.Config", autospec=True)
+def test_fetch_object_in_chunks_retries_interrupted_bodies(mock_config, s3_connector):
+    interrupted_body = MagicMock()
+    interrupted_body.read.side_effect = ResponseStreamingError(error="reset")
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.get_object.side_effect = [
+        {"Body": interrupted_body},
+        {"Body": MagicMock(read=lambda: b"chunk_data")},
+    ]
+    mock_config.S3_CHUNK_SIZE = "80"
+    mock_config.RETRY_COUNT = "3"
+    mock_config.RETRY_DELAY = "0"
+    mock_config.RETRY_BACKOFF = "1"
+
+    result, _ = s3_connector.fetch_object_in_chunks(
+        {"bucket_name": "test-bucket"}, "file.txt", 0, 100
+    )
+
+    assert result == b"chunk_data"
+    assert s3_connector.s3_client.get_object.call_count == 2
+
+
+def test_get_fetch_concurrency(s3_connector):
+    with mock.patch(
+        "app.src.services.connectors.s3_connector.concurrency_controllers"
+    ) as mock_controllers:
+        mock_controllers.get.return_value.limit = 5
+
+        assert (
+            s3_connector.get_fetch_concurrency({"bucket_name": "b", "prefix": "p/"})
+            == 5
+        )
+
+    mock_controllers.get.assert_called_once_with("b/p/")
+
+
+def test_is_throttling_error():
+    assert is_throttling_error(throttling_error())
+    assert is_throttling_error(throttling_error("TooManyRequestsException", 429))
+    assert not is_throttling_error(throttling_error("AccessDenied", 403))
+
+
+def test_list_objects_records_etags(s3_connector):
+    s3_connector.s3_client = MagicMock()
+    s3_connector.s3_client.list_objects_v2.return_value = {
+        "Contents": [{"Key": "file1.txt", "Size": 100, "ETag": '"abc"'}]
+    }
+
+    result, _ = s3_connector.list_objects({"bucket_name": "test-bucket"})
+
+    assert result.etags == {"file1.txt": "abc"}
+
+
+def test_listing_cache_key(s3_connector):
+    key = s3_connector.listing_cache_key({"bucket_name": "test-bucket", "prefix": "a/"})
+
+    assert key == s3_connector.listing_cache_key(
+        {"bucket_name": " test-bucket", "prefix": "a/ "}
+    )
+    assert key != s3_connector.listing_cache_key(
+        {"bucket_name": "test-bucket", "prefix": "b/"}
+    )
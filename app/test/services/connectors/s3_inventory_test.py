@@ -0,0 +1,105 @@
+import gzip
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.src.services.connectors.s3_inventory import S3InventoryReader
+
+
+SCHEMA = "Bucket, Key, Size, LastModifiedDate, ETag, IsLatest, IsDeleteMarker"
+ROWS = [
+    "src,data%2Fa+b.txt,10,2024-05-20T00:00:00.000Z,e1,true,false\n",
+    "src,data%2Fold.txt,20,2024-05-20T00:00:00.000Z,e2,false,false\n",
+    "src,data%2Fdeleted.txt,0,2024-05-20T00:00:00.000Z,,true,true\n",
+    "src,other%2Fc.txt,30,2024-05-20T00:00:00.000Z,e3,true,false\n",
+    "src,data%2Fd.txt,40,2024-05-20T00:00:00.000Z,e4,true,false\n",
+]
+
+
+def gzipped(rows):
+    return gzip.compress("".join(rows).encode("utf-8"))
+
+
+def manifest(files):
+    return {
+        "sourceBucket": "src",
+        "destinationBucket": "arn:aws:s3:::inventory-bucket",
+        "fileFormat": "CSV",
+        "fileSchema": SCHEMA,
+        "files": [{"key": key} for key in files],
+    }
+
+
+@patch("app.src.services.connectors.s3_inventory.Config")
+def test_iter_pages_from_local_manifest(mock_config, tmp_path):
+    mock_config.INVENTORY_PAGE_SIZE = "1"
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "1.csv.gz").write_bytes(gzipped(ROWS[:3]))
+    (tmp_path / "data" / "2.csv").write_text("".join(ROWS[3:]))
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(
+        json.dumps(manifest(["inventory/src/config/data/1.csv.gz", "data/2.csv"]))
+    )
+
+    reader = S3InventoryReader(MagicMock())
+    pages = list(
+        reader.iter_pages({"inventory_manifest": str(manifest_path), "prefix": "data/"})
+    )
+
+    assert pages == [{"data/a b.txt": 10}, {"data/d.txt": 40}]
+
+
+@patch("app.src.services.connectors.s3_inventory.Config")
+def test_iter_pages_from_s3_manifest(mock_config):
+    mock_config.INVENTORY_PAGE_SIZE = "100"
+    mock_config.S3_CHUNK_SIZE = "1024"
+    objects = {
+        ("inventory-bucket", "inv/manifest.json"): json.dumps(
+            manifest(["inv/data/1.csv.gz"])
+        ).encode("utf-8"),
+        ("inventory-bucket", "inv/data/1.csv.gz"): gzipped(ROWS),
+    }
+
+    reader = S3InventoryReader(
+        lambda bucket_name, key, read: read(io.BytesIO(objects[(bucket_name, key)]))
+    )
+    pages = list(
+        reader.iter_pages(
+            {
+                "bucket_name": "src",
+                "inventory_manifest": "s3://inventory-bucket/inv/manifest.json",
+            }
+        )
+    )
+
+    assert pages == [{"data/a b.txt": 10, "other/c.txt": 30, "data/d.txt": 40}]
+
+
+def test_iter_pages_rejects_inventory_of_another_bucket(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest(["data/1.csv"])))
+
+    with pytest.raises(ValueError, match="is of bucket src, not other"):
+        list(
+            S3InventoryReader(MagicMock()).iter_pages(
+                {"bucket_name": "other", "inventory_manifest": str(manifest_path)}
+            )
+        )
+
+
+def test_iter_pages_requires_pyarrow_for_parquet(tmp_path):
+    (tmp_path / "1.parquet").write_bytes(b"PAR1")
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(
+        json.dumps({**manifest(["1.parquet"]), "fileFormat": "Parquet"})
+    )
+
+    with patch.dict("sys.modules", {"pyarrow": None}):
+        with pytest.raises(ImportError, match="pyarrow"):
+            list(
+                S3InventoryReader(MagicMock()).iter_pages(
+                    {"inventory_manifest": str(manifest_path)}
+                )
+            )
@@ -0,0 +1,59 @@
+import os
+import pytest
+from app.src.services.content_store import ContentStore, etag_content_id
+
+
+@pytest.fixture
+def content_store(tmp_path):
+    return ContentStore(str(tmp_path / "store"))
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_link_misses_unknown_objects(content_store, tmp_path):
+    assert not content_store.link("abc", 5, str(tmp_path / "job_2" / "a.txt"))
+    assert not content_store.link(None, 5, str(tmp_path / "job_2" / "a.txt"))
+
+
+def test_link_materializes_stored_object(content_store, tmp_path):
+    downloaded = write(tmp_path / "job_1" / "a.txt", b"hello")
+    content_store.add(downloaded, '"abc"', 5)
+
+    linked = str(tmp_path / "job_2" / "b" / "a.txt")
+    assert content_store.link('"abc"', 5, linked)
+
+    assert os.path.samefile(downloaded, linked)
+    assert not content_store.link('"abc"', 6, linked)
+
+
+def test_add_deduplicates_objects_without_etag(content_store, tmp_path):
+    first = write(tmp_path / "job_1" / "a.txt", b"hello")
+    second = write(tmp_path / "job_2" / "a.txt", b"hello")
+    other = write(tmp_path / "job_2" / "b.txt", b"world")
+
+    for path in (first, second, other):
+        content_store.add(path, None, 5)
+
+    assert os.path.samefile(first, second)
+    assert not os.path.samefile(first, other)
+    assert open(second, "rb").read() == b"hello"
+
+
+def test_collect_garbage_removes_unlinked_objects(content_store, tmp_path):
+    kept = write(tmp_path / "job_1" / "a.txt", b"hello")
+    removed = write(tmp_path / "job_1" / "b.txt", b"world")
+    content_store.add(kept, "abc", 5)
+    content_store.add(removed, "def", 5)
+    os.remove(removed)
+
+    assert content_store.collect_garbage() == 1
+    assert content_store.link("abc", 5, str(tmp_path / "job_2" / "a.txt"))
+    assert not content_store.link("def", 5, str(tmp_path / "job_2" / "b.txt"))
+
+
+def test_etag_content_id_is_safe_file_name():
+    assert etag_content_id('"d41d8cd9/8f00-2"', 10) == "etag-d41d8cd9_8f00-2-10"
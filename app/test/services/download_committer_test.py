@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.src.services.download_committer import DownloadCommitter
+from app.src.services.metrics import DOWNLOAD_COMMIT_FSYNCS
+
+
+def write_download(tmp_path, name, data=b"hello"):
+    temp_path = tmp_path / f"{name}.part"
+    temp_path.write_bytes(data)
+    return str(temp_path), str(tmp_path / name)
+
+
+def test_unknown_durability_is_rejected():
+    with pytest.raises(ValueError):
+        DownloadCommitter("always", 10)
+
+
+@patch("app.src.services.download_committer.fsync_path")
+def test_commit_without_durability_renames_right_away(mock_fsync_path, tmp_path):
+    committer = DownloadCommitter("none", 10)
+    temp_path, path = write_download(tmp_path, "a.txt")
+    on_commit = MagicMock()
+
+    committer.commit(temp_path, path, on_commit)
+
+    on_commit.assert_called_once_with(True)
+    assert open(path, "rb").read() == b"hello"
+    mock_fsync_path.assert_not_called()
+
+
+@patch("app.src.services.download_committer.fsync_path")
+def test_commit_per_file_syncs_file_and_folder(mock_fsync_path, tmp_path):
+    committer = DownloadCommitter("file", 10)
+    temp_path, path = write_download(tmp_path, "a.txt")
+    on_commit = MagicMock()
+
+    committer.commit(temp_path, path, on_commit)
+
+    on_commit.assert_called_once_with(True)
+    assert [call.args[0] for call in mock_fsync_path.call_args_list] == [
+        temp_path,
+        str(tmp_path),
+    ]
+
+
+@patch("app.src.services.download_committer.os.sync")
+@patch("app.src.services.download_committer.fsync_path")
+def test_commit_batch_is_deferred_until_flush(mock_fsync_path, mock_sync, tmp_path):
+    committer = DownloadCommitter("batch", 3)
+    on_commit = MagicMock()
+    paths = list()
+    for name in ("a.txt", "b.txt"):
+        temp_path, path = write_download(tmp_path, name)
+        committer.commit(temp_path, path, on_commit)
+        paths.append(path)
+
+    # Nothing is visible before the batch is committed.
+    on_commit.assert_not_called()
+    assert not any((tmp_path / name).exists() for name in ("a.txt", "b.txt"))
+
+    assert committer.flush() == 2
+
+    assert on_commit.call_count == 2
+    assert all(open(path, "rb").read() == b"hello" for path in paths)
+    # Two files, but their data is synced at once and their folder once.
+    mock_sync.assert_called_once_with()
+    assert [call.args[0] for call in mock_fsync_path.call_args_list] == [str(tmp_path)]
+    assert committer.flush() == 0
+
+
+@patch("app.src.services.download_committer.os.sync")
+@patch("app.src.services.download_committer.fsync_path")
+def test_commit_batch_syncs_file_data_once_per_batch(
+    mock_fsync_path, mock_sync, tmp_path
+):
+    committer = DownloadCommitter("batch", 4)
+    before = DOWNLOAD_COMMIT_FSYNCS.value(kind="file")
+
+    for name in ("a.txt", "b.txt", "c.txt", "d.txt", "e.txt", "f.txt"):
+        committer.commit(*write_download(tmp_path, name), MagicMock())
+    committer.flush()
+
+    # Two batches, of four and two files, one sync each.
+    assert DOWNLOAD_COMMIT_FSYNCS.value(kind="file") == before + 2
+    assert mock_sync.call_count == 2
+
+
+@patch("app.src.services.download_committer.os.sync")
+@patch("app.src.services.download_committer.fsync_path")
+def test_commit_batch_is_flushed_when_full(mock_fsync_path, mock_sync, tmp_path):
+    committer = DownloadCommitter("batch", 2)
+    on_commit = MagicMock()
+    for name in ("a.txt", "b.txt"):
+        committer.commit(*write_download(tmp_path, name), on_commit)
+
+    assert on_commit.call_count == 2
+    assert (tmp_path / "b.txt").exists()
+
+
+@patch("app.src.services.download_committer.fsync_path")
+def test_commit_of_appended_file_only_syncs_it(mock_fsync_path, tmp_path):
+    committer = DownloadCommitter("file", 10)
+    path = tmp_path / "app.log"
+    path.write_bytes(b"hello")
+    on_commit = MagicMock()
+
+    committer.commit(None, str(path), on_commit)
+
+    on_commit.assert_called_once_with(True)
+    assert mock_fsync_path.call_args_list[0].args[0] == str(path)
+
+
+def test_failed_commit_is_reported(tmp_path):
+    committer = DownloadCommitter("batch", 10)
+    on_commit, on_missing_commit = MagicMock(), MagicMock()
+    committer.commit(*write_download(tmp_path, "a.txt"), on_commit)
+    committer.commit(
+        str(tmp_path / "missing.part"), str(tmp_path / "missing"), on_missing_commit
+    )
+
+    committer.flush()
+
+    on_commit.assert_called_once_with(True)
+    on_missing_commit.assert_called_once_with(False)
+
+
+def test_discarded_batch_keeps_temp_files(tmp_path):
+    committer = DownloadCommitter("batch", 10)
+    on_commit = MagicMock()
+    temp_path, path = write_download(tmp_path, "a.txt")
+    committer.commit(temp_path, path, on_commit)
+
+    committer.discard()
+
+    assert committer.flush() == 0
+    on_commit.assert_not_called()
+    assert open(temp_path, "rb").read() == b"hello"
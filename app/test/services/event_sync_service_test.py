@@ -0,0 +1,165 @@
+import json
+from unittest.mock import MagicMock, patch
+import pytest
+from app.src.services.event_sync_service import (
+    EventSyncService,
+    is_older_sequencer,
+    parse_s3_events,
+)
+
+
+def record(event_name, key, size=0, sequencer="0A", bucket="test-bucket"):
+    return {
+        "eventName": event_name,
+        "s3": {
+            "bucket": {"name": bucket},
+            "object": {"key": key, "size": size, "sequencer": sequencer},
+        },
+    }
+
+
+@pytest.fixture
+def mock_sync_job_scheduler_service():
+    service = MagicMock()
+    service.get_job.return_value = {
+        "connector_config": {"bucket_name": "test-bucket", "prefix": "data/"}
+    }
+    return service
+
+
+@pytest.fixture
+def mock_scheduler():
+    return MagicMock()
+
+
+@pytest.fixture
+def event_sync_service(mock_sync_job_scheduler_service, mock_scheduler):
+    return EventSyncService(mock_sync_job_scheduler_service, mock_scheduler)
+
+
+def test_parse_s3_events():
+    payload = {
+        "Records": [
+            record("ObjectCreated:Put", "data/a+b%2B.txt", 10, "0055aed6dcd90281e5"),
+            record("ObjectRemoved:Delete", "data/c.txt"),
+            record("ObjectRestore:Completed", "data/d.txt"),
+        ]
+    }
+
+    events = parse_s3_events(payload)
+
+    assert [(e["key"], e["type"], e["size"]) for e in events] == [
+        ("data/a b+.txt", "created", 10),
+        ("data/c.txt", "removed", 0),
+    ]
+    assert events[0]["sequencer"] == "0055AED6DCD90281E5"
+
+
+def test_parse_s3_events_from_sns_message():
+    payload = {
+        "Type": "Notification",
+        "Message": json.dumps({"Records": [record("ObjectCreated:Put", "data/a")]}),
+    }
+
+    assert [e["key"] for e in parse_s3_events(payload)] == ["data/a"]
+
+
+def test_enqueue_events_schedules_one_sync(event_sync_service, mock_scheduler):
+    accepted, err = event_sync_service.enqueue_events(
+        "job_id",
+        {
+            "Records": [
+                record("ObjectCreated:Put", "data/a", 10),
+                record("ObjectCreated:Put", "other/b", 10),
+                record("ObjectCreated:Put", "data/c", 10, bucket="other-bucket"),
+            ]
+        },
+    )
+    event_sync_service.enqueue_events(
+        "job_id", {"Records": [record("ObjectCreated:Put", "data/d", 10)]}
+    )
+
+    assert (accepted, err) == (1, None)
+    mock_scheduler.run_once.assert_called_once_with(
+        event_sync_service.sync_pending_events, "events job_id", "job_id"
+    )
+
+
+def test_enqueue_events_unknown_job(
+    event_sync_service, mock_sync_job_scheduler_service
+):
+    mock_sync_job_scheduler_service.get_job.return_value = None
+
+    assert event_sync_service.enqueue_events("job_id", {"Records": []}) == (
+        None,
+        "Job not found",
+    )
+
+
+def test_sync_pending_events_keeps_latest_event_per_key(
+    event_sync_service, mock_sync_job_scheduler_service
+):
+    event_sync_service.enqueue_events(
+        "job_id",
+        {
+            "Records": [
+                record("ObjectRemoved:Delete", "data/a", 0, "0B"),
+                record("ObjectCreated:Put", "data/a", 10, "0A"),
+                record("ObjectCreated:Put", "data/b", 20, "01"),
+                record("ObjectCreated:Put", "data/b", 30, "02"),
+            ]
+        },
+    )
+
+    event_sync_service.sync_pending_events("job_id")
+
+    sync_job = mock_sync_job_scheduler_service.get_sync_job.return_value
+    sync_job.sync_objects.assert_called_once_with({"data/b": 30}, ["data/a"])
+    event_sync_service.sync_pending_events("job_id")
+    sync_job.sync_objects.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "sequencer, other, expected",
+    [
+        ("0A", "0B", True),
+        ("0B", "0A", False),
+        ("0A", "0A", False),
+        # A shorter, later sequencer orders after a longer, earlier one once padded.
+        ("0056", "0055AED6DCD90281E5", False),
+        ("0055AED6DCD90281E5", "0056", True),
+        ("0055AED6", "0055AED600", False),
+    ],
+)
+def test_is_older_sequencer(sequencer, other, expected):
+    assert is_older_sequencer(sequencer, other) is expected
+
+
+def test_sync_pending_events_orders_sequencers_of_different_lengths(
+    event_sync_service, mock_sync_job_scheduler_service
+):
+    event_sync_service.enqueue_events(
+        "job_id",
+        {
+            "Records": [
+                record("ObjectCreated:Put", "data/a", 10, "0056"),
+                record("ObjectRemoved:Delete", "data/a", 0, "0055AED6DCD90281E5"),
+            ]
+        },
+    )
+
+    event_sync_service.sync_pending_events("job_id")
+
+    sync_job = mock_sync_job_scheduler_service.get_sync_job.return_value
+    sync_job.sync_objects.assert_called_once_with({"data/a": 10}, [])
+
+
+@patch("app.src.services.event_sync_service.listing_cache")
+def test_enqueue_events_invalidates_cached_listings(
+    mock_listing_cache, event_sync_service
+):
+    event_sync_service.enqueue_events(
+        "job_id", {"Records": [record("ObjectCreated:Put", "data/a", 10)]}
+    )
+
+    mock_listing_cache.invalidate.assert_called_once_with("test-bucket", "data/a")
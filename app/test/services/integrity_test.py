@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.src.services.integrity import ChecksumCalculator, StreamingChecksum
+
+
+DATA = bytes(range(256)) * 41
+
+
+def calculate(algorithm, chunk_size, part_size=None):
+    calculator = ChecksumCalculator(algorithm, part_size)
+    for start in range(0, len(DATA), chunk_size):
+        calculator.update(DATA[start : start + chunk_size])
+    return calculator.value()
+
+
+def multipart_etag(data, part_size):
+    parts = [
+        data[start : start + part_size] for start in range(0, len(data), part_size)
+    ]
+    digests = b"".join(hashlib.md5(part).digest() for part in parts)
+    return f"{hashlib.md5(digests).hexdigest()}-{len(parts)}"
+
+
+@pytest.mark.parametrize("chunk_size", [1000, 4096, len(DATA)])
+def test_checksums_match_reference(chunk_size):
+    assert calculate("md5", chunk_size) == hashlib.md5(DATA).hexdigest()
+    assert (
+        calculate("sha256", chunk_size)
+        == base64.b64encode(hashlib.sha256(DATA).digest()).decode()
+    )
+    assert (
+        calculate("crc32", chunk_size)
+        == base64.b64encode(zlib.crc32(DATA).to_bytes(4, "big")).decode()
+    )
+    # Chunks that do not line up with the parts are split between them.
+    assert calculate("md5-multipart", chunk_size, 2048) == multipart_etag(DATA, 2048)
+
+
+def test_multipart_checksum_of_exact_parts():
+    assert calculate("md5-multipart", 1024, 1024) == multipart_etag(DATA, 1024)
+
+
+def test_unsupported_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        ChecksumCalculator("crc32c")
+    with pytest.raises(ValueError):
+        ChecksumCalculator("md5-multipart")
+
+
+def test_streaming_checksum_includes_synced_bytes(tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(DATA[:5000] + b"not synced")
+    expected = {"algorithm": "md5-multipart", "value": multipart_etag(DATA, 4096)}
+    expected["part_size"] = 4096
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        checksum = StreamingChecksum(expected, executor)
+        checksum.update_from_file(str(path), 5000)
+        for start in range(5000, len(DATA), 700):
+            checksum.update(DATA[start : start + 700])
+        is_valid, value = checksum.verify()
+
+    assert is_valid
+    assert value == f"md5-multipart:{expected['value']}"
+
+
+def test_streaming_checksum_mismatch():
+    expected = {"algorithm": "md5", "value": hashlib.md5(DATA).hexdigest()}
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        checksum = StreamingChecksum(expected, executor)
+        checksum.update(DATA[:-1] + b"x")
+        is_valid, value = checksum.verify()
+
+    assert not is_valid
+    assert value.startswith("md5:")
@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+import pytest
+from app.src.services.job_runs_service import JobRunsService, percentile
+
+
+@pytest.fixture
+def job_runs_service():
+    return JobRunsService()
+
+
+def make_run(duration, bytes_transferred, status="COMPLETED"):
+    run = MagicMock()
+    run.status = status
+    run.duration_seconds = duration
+    run.bytes_per_second = bytes_transferred / duration
+    run.objects_transferred = 1
+    run.bytes_transferred = bytes_transferred
+    run.list_requests = 1
+    run.get_requests = 2
+    run.retry_requests = 0
+    run.failed_objects = 0
+    return run
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([5], 99) == 5
+    assert percentile([4, 1, 3, 2], 50) == 2.5
+    assert percentile(list(range(1, 101)), 90) == pytest.approx(90.1)
+
+
+@patch("app.src.services.job_runs_service.JobRun")
+def test_get_runs(mock_job_run, job_runs_service):
+    run = MagicMock()
+    run.__json__ = MagicMock(return_value={"id": 1})
+    query = mock_job_run.query.filter_by.return_value
+    query.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
+        run
+    ]
+    query.count.return_value = 1
+
+    result = job_runs_service.get_runs("job_id", 10, 0)
+
+    assert result == {"total_runs": 1, "limit": 10, "offset": 0, "runs": [{"id": 1}]}
+
+
+@patch("app.src.services.job_runs_service.JobRun")
+def test_get_summary(mock_job_run, job_runs_service):
+    runs = [make_run(10, 1000), make_run(20, 1000), make_run(30, 3000, "FAILED")]
+    query = mock_job_run.query.filter_by.return_value.filter.return_value
+    query.order_by.return_value.limit.return_value.all.return_value = runs
+
+    result = job_runs_service.get_summary("job_id", 100)
+
+    assert result["runs"] == 3
+    assert result["failed_runs"] == 1
+    assert result["summary"]["duration_seconds"]["p50"] == 20
+    assert result["summary"]["duration_seconds"]["max"] == 30
+    assert result["summary"]["bytes_per_second"]["min"] == 50
+    assert result["summary"]["get_requests"]["p99"] == 2
@@ -0,0 +1,120 @@
+from unittest.mock import MagicMock, patch
+import pytest
+from app.src.services.listing_cache import ListingCache
+
+
+CONFIG = {"bucket_name": "test-bucket", "prefix": "data/"}
+
+
+@pytest.fixture
+def mock_time():
+    with patch("app.src.services.listing_cache.time") as mock_time:
+        mock_time.monotonic.return_value = 0
+        yield mock_time
+
+
+@pytest.fixture
+def connector():
+    connector = MagicMock()
+    connector.listing_cache_key.side_effect = lambda config: (
+        config["bucket_name"],
+        config["prefix"],
+    )
+    connector.iter_object_pages.side_effect = lambda config: iter(
+        [{"data/a": 1}, {"data/b": 2}]
+    )
+    return connector
+
+
+def test_listing_is_reused_within_ttl(mock_time, connector):
+    listing_cache = ListingCache(60, 100)
+
+    first = list(listing_cache.iter_pages(connector, CONFIG))
+    mock_time.monotonic.return_value = 30
+    second = list(listing_cache.iter_pages(connector, CONFIG))
+
+    assert first == second == [{"data/a": 1}, {"data/b": 2}]
+    connector.iter_object_pages.assert_called_once()
+
+
+def test_listing_expires_after_ttl(mock_time, connector):
+    listing_cache = ListingCache(60, 100)
+
+    list(listing_cache.iter_pages(connector, CONFIG))
+    mock_time.monotonic.return_value = 61
+    list(listing_cache.iter_pages(connector, CONFIG))
+
+    assert connector.iter_object_pages.call_count == 2
+
+
+def test_listings_of_other_prefixes_are_not_shared(mock_time, connector):
+    listing_cache = ListingCache(60, 100)
+
+    list(listing_cache.iter_pages(connector, CONFIG))
+    list(listing_cache.iter_pages(connector, {**CONFIG, "prefix": "logs/"}))
+
+    assert connector.iter_object_pages.call_count == 2
+
+
+def test_incomplete_listing_is_not_cached(mock_time, connector):
+    listing_cache = ListingCache(60, 100)
+
+    pages = listing_cache.iter_pages(connector, CONFIG)
+    next(pages)
+    pages.close()
+    list(listing_cache.iter_pages(connector, CONFIG))
+
+    assert connector.iter_object_pages.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "bucket_name, object_key, invalidated",
+    [
+        ("test-bucket", "data/c", True),
+        ("test-bucket", "logs/c", False),
+        ("other-bucket", "data/c", False),
+        ("test-bucket", None, True),
+    ],
+)
+def test_invalidate(mock_time, connector, bucket_name, object_key, invalidated):
+    listing_cache = ListingCache(60, 100)
+    list(listing_cache.iter_pages(connector, CONFIG))
+
+    listing_cache.invalidate(bucket_name, object_key)
+    list(listing_cache.iter_pages(connector, CONFIG))
+
+    assert connector.iter_object_pages.call_count == (2 if invalidated else 1)
+
+
+def test_listing_invalidated_while_listing_is_not_cached(mock_time, connector):
+    listing_cache = ListingCache(60, 100)
+
+    pages = listing_cache.iter_pages(connector, CONFIG)
+    next(pages)
+    listing_cache.invalidate("test-bucket", "data/c")
+    list(pages)
+    list(listing_cache.iter_pages(connector, CONFIG))
+
+    assert connector.iter_object_pages.call_count == 2
+
+
+def test_oldest_listings_are_evicted(mock_time, connector):
+    listing_cache = ListingCache(60, 3)
+
+    list(listing_cache.iter_pages(connector, CONFIG))
+    list(listing_cache.iter_pages(connector, {**CONFIG, "prefix": "logs/"}))
+    list(listing_cache.iter_pages(connector, {**CONFIG, "prefix": "logs/"}))
+    list(listing_cache.iter_pages(connector, CONFIG))
+
+    assert connector.iter_object_pages.call_count == 3
+
+
+def test_connectors_without_cache_key_are_not_cached(mock_time, connector):
+    listing_cache = ListingCache(60, 100)
+    connector.listing_cache_key.side_effect = None
+    connector.listing_cache_key.return_value = None
+
+    list(listing_cache.iter_pages(connector, CONFIG))
+    list(listing_cache.iter_pages(connector, CONFIG))
+
+    assert connector.iter_object_pages.call_count == 2
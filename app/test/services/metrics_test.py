@@ -0,0 +1,72 @@
+import pytest
+from app.src.services.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_counter_inc(registry):
+    counter = registry.counter("test_total", "Test counter.", ("connector",))
+    counter.inc(connector="s3")
+    counter.inc(4, connector="s3")
+
+    assert counter.value(connector="s3") == 5
+    assert counter.value(connector="other") == 0
+
+
+def test_counter_registration_is_idempotent(registry):
+    counter = registry.counter("test_total", "Test counter.")
+    assert registry.counter("test_total", "Test counter.") is counter
+
+
+def test_register_conflicting_type(registry):
+    registry.counter("test_metric", "Test counter.")
+    with pytest.raises(ValueError):
+        registry.histogram("test_metric", "Test histogram.")
+
+
+def test_histogram_observe(registry):
+    histogram = registry.histogram("test_seconds", "Test histogram.", buckets=(1, 5))
+    histogram.observe(0.5)
+    histogram.observe(3)
+    histogram.observe(10)
+
+    rendered = registry.render()
+
+    assert histogram.count() == 3
+    assert 'test_seconds_bucket{le="1"} 1' in rendered
+    assert 'test_seconds_bucket{le="5"} 2' in rendered
+    assert 'test_seconds_bucket{le="+Inf"} 3' in rendered
+    assert "test_seconds_sum 13.5" in rendered
+    assert "test_seconds_count 3" in rendered
+
+
+def test_histogram_time(registry):
+    histogram = registry.histogram("test_seconds", "Test histogram.", ("site",))
+    with histogram.time(site="commit"):
+        pass
+
+    assert histogram.count(site="commit") == 1
+
+
+def test_render(registry):
+    counter = registry.counter("test_total", "Test counter.", ("bucket",))
+    counter.inc(2, bucket='a"b')
+
+    rendered = registry.render()
+
+    assert "# HELP test_total Test counter." in rendered
+    assert "# TYPE test_total counter" in rendered
+    assert 'test_total{bucket="a\\"b"} 2' in rendered
+
+
+def test_gauge_set(registry):
+    gauge = registry.gauge("test_limit", "Test gauge.", ("target",))
+    gauge.set(8, target="bucket/")
+    gauge.set(4, target="bucket/")
+
+    assert gauge.value(target="bucket/") == 4
+    assert "# TYPE test_limit gauge" in registry.render()
+    assert 'test_limit{target="bucket/"} 4' in registry.render()
@@ -0,0 +1,89 @@
+import time
+from unittest import mock
+import pytest
+from app.src.services.profiler import (
+    ALLOCATIONS_FILE_NAME,
+    STACKS_FILE_NAME,
+    SUMMARY_FILE_NAME,
+    RunProfiler,
+)
+
+
+@pytest.fixture
+def mock_config(tmp_path):
+    with mock.patch("app.src.services.profiler.Config") as mock_config:
+        mock_config.JSON_ROOT_FOLDER = str(tmp_path)
+        mock_config.PROFILE_SAMPLE_INTERVAL = "0.001"
+        mock_config.PROFILE_TRACEMALLOC = "true"
+        mock_config.PROFILE_TRACEMALLOC_FRAMES = "5"
+        mock_config.PROFILE_TOP_ALLOCATIONS = "5"
+        yield mock_config
+
+
+@pytest.fixture
+def run_profiler():
+    return RunProfiler()
+
+
+def test_consume_without_request(run_profiler):
+    assert run_profiler.consume("job_id") is False
+
+
+def test_consume_clears_request(run_profiler):
+    run_profiler.request_profile("job_id")
+
+    assert run_profiler.is_requested("job_id") is True
+    assert run_profiler.consume("job_id") is True
+    assert run_profiler.consume("job_id") is False
+
+
+def test_profile_stores_results(mock_config, run_profiler):
+    def busy_run():
+        data = [bytes(1024) for _ in range(100)]
+        time.sleep(0.05)
+        return len(data)
+
+    result = run_profiler.profile("job_id", busy_run)
+    profiles = run_profiler.list_profiles("job_id")
+
+    assert result == 100
+    assert len(profiles) == 1
+    assert profiles[0]["job_id"] == "job_id"
+    assert profiles[0]["stack_samples"] > 0
+    assert sorted(profiles[0]["files"]) == sorted(
+        [STACKS_FILE_NAME, ALLOCATIONS_FILE_NAME, SUMMARY_FILE_NAME]
+    )
+
+    stacks_path = run_profiler.get_profile_file(
+        "job_id", profiles[0]["profile_id"], STACKS_FILE_NAME
+    )
+    with open(stacks_path) as f:
+        assert "busy_run" in f.read()
+
+
+def test_profile_stores_results_on_failure(mock_config, run_profiler):
+    def failing_run():
+        raise ValueError("sync failed")
+
+    with pytest.raises(ValueError):
+        run_profiler.profile("job_id", failing_run)
+
+    assert len(run_profiler.list_profiles("job_id")) == 1
+
+
+def test_profile_without_tracemalloc(mock_config, run_profiler):
+    mock_config.PROFILE_TRACEMALLOC = "false"
+
+    with mock.patch("app.src.services.profiler.tracemalloc") as mock_tracemalloc:
+        run_profiler.profile("job_id", lambda: time.sleep(0.01))
+    profiles = run_profiler.list_profiles("job_id")
+
+    mock_tracemalloc.start.assert_not_called()
+    assert sorted(profiles[0]["files"]) == sorted([STACKS_FILE_NAME, SUMMARY_FILE_NAME])
+    assert profiles[0]["peak_traced_memory_bytes"] is None
+
+
+def test_get_profile_file_rejects_unknown_files(mock_config, run_profiler):
+    assert run_profiler.get_profile_file("job_id", "123", "../secret") is None
+    assert run_profiler.get_profile_file("job_id", "..", STACKS_FILE_NAME) is None
+    assert run_profiler.get_profile_file("job_id", "123", STACKS_FILE_NAME) is None
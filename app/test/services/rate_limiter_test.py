@@ -0,0 +1,103 @@
+from unittest.mock import patch
+import pytest
+from app.src.services.rate_limiter import (
+    RateLimiters,
+    TokenBucket,
+    validate_rate_limits,
+)
+
+
+@pytest.fixture
+def mock_time():
+    with patch("app.src.services.rate_limiter.time") as mock_time:
+        mock_time.monotonic.return_value = 0
+        yield mock_time
+
+
+def test_bucket_without_rate_does_not_wait(mock_time):
+    bucket = TokenBucket(0)
+
+    assert bucket.acquire(10**9) == 0
+    mock_time.sleep.assert_not_called()
+
+
+def test_bucket_allows_burst_of_one_second(mock_time):
+    bucket = TokenBucket(100)
+
+    assert bucket.acquire(100) == 0
+    assert bucket.acquire(50) == 0.5
+    mock_time.sleep.assert_called_once_with(0.5)
+
+
+def test_bucket_refills_over_time(mock_time):
+    bucket = TokenBucket(100)
+    bucket.acquire(100)
+
+    mock_time.monotonic.return_value = 0.5
+    assert bucket.acquire(50) == 0
+
+
+def test_bucket_admits_amounts_larger_than_rate(mock_time):
+    bucket = TokenBucket(100)
+
+    assert bucket.acquire(300) == 2
+    mock_time.monotonic.return_value = 2
+    assert bucket.acquire(100) == 1
+
+
+def test_set_rate_applies_to_next_acquisitions(mock_time):
+    bucket = TokenBucket(100)
+    bucket.acquire(100)
+
+    bucket.set_rate(10)
+    assert bucket.acquire(10) == 1
+
+    bucket.set_rate(None)
+    assert bucket.acquire(10**9) == 0
+
+
+@patch("app.src.services.rate_limiter.Config")
+def test_job_and_global_limits_both_apply(mock_config, mock_time):
+    mock_config.MAX_BYTES_PER_SECOND = "100"
+    mock_config.MAX_REQUESTS_PER_SECOND = "0"
+    rate_limiters = RateLimiters()
+    rate_limiters.configure_job(
+        "job_id", {"max_bytes_per_second": 50, "max_requests_per_second": 1}
+    )
+
+    rate_limiters.acquire("job_id", 50)
+    mock_time.sleep.assert_not_called()
+
+    rate_limiters.acquire("job_id", 50)
+    # One second for the second request, one second for the job's bytes.
+    assert [call.args[0] for call in mock_time.sleep.call_args_list] == [1, 1]
+
+
+@patch("app.src.services.rate_limiter.Config")
+def test_removed_job_is_only_globally_limited(mock_config, mock_time):
+    mock_config.MAX_BYTES_PER_SECOND = "0"
+    mock_config.MAX_REQUESTS_PER_SECOND = "0"
+    rate_limiters = RateLimiters()
+    rate_limiters.configure_job("job_id", {"max_bytes_per_second": 1})
+    rate_limiters.remove_job("job_id")
+
+    rate_limiters.acquire("job_id", 100)
+
+    assert rate_limiters.get_job_limiter("job_id") is None
+    mock_time.sleep.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "limits, is_valid",
+    [
+        ({"max_bytes_per_second": 1024, "max_requests_per_second": 2.5}, True),
+        ({"max_bytes_per_second": None}, True),
+        ({"max_bytes_per_second": -1}, False),
+        ({"max_requests_per_second": True}, False),
+        ({"max_connections": 1}, False),
+        ({}, False),
+        (None, False),
+    ],
+)
+def test_validate_rate_limits(limits, is_valid):
+    assert validate_rate_limits(limits)[0] is is_valid
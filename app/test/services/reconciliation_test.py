@@ -0,0 +1,119 @@
+import hashlib
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.src.services.connector import ObjectPage
+from app.src.services.reconciliation import LocalReconciler, scan_files
+
+
+@pytest.fixture
+def mock_db_helpers():
+    with (
+        patch(
+            "app.src.services.reconciliation.get_existing_object_keys",
+            return_value=set(),
+        ) as mock_get_existing_object_keys,
+        patch("app.src.services.reconciliation.insert_objects") as mock_insert_objects,
+    ):
+        yield mock_get_existing_object_keys, mock_insert_objects
+
+
+def write_file(path, data, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_scan_files_walks_tree_and_skips_temp_files(tmp_path):
+    write_file(tmp_path / "a.txt", b"a")
+    write_file(tmp_path / "x" / "y" / "b.txt", b"bb")
+    write_file(tmp_path / "x" / "c.txt.part", b"c")
+
+    files = scan_files(str(tmp_path), 4)
+
+    assert {path: size for path, (size, _) in files.items()} == {
+        str(tmp_path / "a.txt"): 1,
+        str(tmp_path / "x" / "y" / "b.txt"): 2,
+    }
+    assert scan_files(str(tmp_path / "missing"), 4) == {}
+
+
+def test_reconcile_page_matches_size_and_mtime(tmp_path, mock_db_helpers):
+    mock_get_existing_object_keys, mock_insert_objects = mock_db_helpers
+    mock_get_existing_object_keys.return_value = {"known.txt"}
+    write_file(tmp_path / "data" / "a.txt", b"hello", mtime=2000)
+    write_file(tmp_path / "b.txt", b"hello", mtime=2000)
+    write_file(tmp_path / "stale.txt", b"hello", mtime=1000)
+    write_file(tmp_path / "known.txt", b"hello")
+    page = ObjectPage()
+    page.add("data/a.txt", 5, '"etag-a"', 1500)
+    page.add("b.txt", 6)
+    page.add("stale.txt", 5, None, 1500)
+    page.add("known.txt", 5)
+    page.add("missing.txt", 5)
+    reconciler = LocalReconciler(
+        "job_id", str(tmp_path), str(tmp_path), MagicMock(), dict()
+    )
+    reconciler.scan()
+
+    assert reconciler.reconcile_page(page) == 1
+
+    (rows,) = mock_insert_objects.call_args.args
+    assert rows == [
+        {
+            "object_key": "data/a.txt",
+            "object_size": 5,
+            "last_position": "5",
+            "status": "PROCESSED",
+            "job_id": "job_id",
+            "local_full_path": str(tmp_path / "data" / "a.txt"),
+            "etag": "etag-a",
+            "checksum": None,
+        }
+    ]
+
+
+def test_reconcile_page_links_files_of_other_folder(tmp_path, mock_db_helpers):
+    _, mock_insert_objects = mock_db_helpers
+    source = write_file(tmp_path / "old" / "a.txt", b"hello")
+    page = ObjectPage({"a.txt": 5})
+    reconciler = LocalReconciler(
+        "job_id", str(tmp_path / "new"), str(tmp_path / "old"), MagicMock(), dict()
+    )
+    reconciler.scan()
+
+    assert reconciler.reconcile_page(page) == 1
+
+    assert os.path.samefile(source, tmp_path / "new" / "a.txt")
+    (rows,) = mock_insert_objects.call_args.args
+    assert rows[0]["local_full_path"] == str(tmp_path / "new" / "a.txt")
+
+
+def test_reconcile_page_verifies_checksums(tmp_path, mock_db_helpers):
+    _, mock_insert_objects = mock_db_helpers
+    write_file(tmp_path / "a.txt", b"hello")
+    write_file(tmp_path / "b.txt", b"HELLO")
+    mock_connector = MagicMock()
+    mock_connector.get_object_checksum.return_value = {
+        "algorithm": "md5",
+        "value": hashlib.md5(b"hello").hexdigest(),
+    }
+    reconciler = LocalReconciler(
+        "job_id",
+        str(tmp_path),
+        str(tmp_path),
+        mock_connector,
+        dict(),
+        verify_checksums=True,
+    )
+    reconciler.scan()
+
+    assert reconciler.reconcile_page(ObjectPage({"a.txt": 5, "b.txt": 5})) == 1
+
+    (rows,) = mock_insert_objects.call_args.args
+    assert rows[0]["object_key"] == "a.txt"
+    assert rows[0]["checksum"] == f"md5:{hashlib.md5(b'hello').hexdigest()}"
@@ -0,0 +1,55 @@
+import threading
+from collections import namedtuple
+from unittest.mock import patch
+import pytest
+from app.src.services.resource_governor import ResourceGovernor
+
+
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free"])
+
+
+@pytest.fixture
+def resource_governor():
+    return ResourceGovernor(max_in_flight_bytes=100, disk_reserve_bytes=10)
+
+
+def test_buffer_blocks_until_budget_is_available(resource_governor):
+    entered = threading.Event()
+
+    def reserve():
+        with resource_governor.buffer(60):
+            entered.set()
+
+    with resource_governor.buffer(60):
+        thread = threading.Thread(target=reserve)
+        thread.start()
+        assert not entered.wait(0.1)
+        assert resource_governor.in_flight_bytes == 60
+
+    assert entered.wait(1)
+    thread.join()
+    assert resource_governor.in_flight_bytes == 0
+
+
+def test_buffer_admits_oversized_reservation_when_idle(resource_governor):
+    with resource_governor.buffer(500):
+        assert resource_governor.in_flight_bytes == 500
+
+    assert resource_governor.in_flight_bytes == 0
+
+
+@patch("app.src.services.resource_governor.shutil.disk_usage")
+def test_disk_space_accounts_for_pending_downloads(
+    mock_disk_usage, resource_governor, tmp_path
+):
+    mock_disk_usage.return_value = DiskUsage(1000, 900, 100)
+    path = str(tmp_path / "not" / "created" / "yet.bin")
+
+    with resource_governor.disk_space(path, 60):
+        with pytest.raises(Exception, match="Insufficient disk space"):
+            with resource_governor.disk_space(path, 60):
+                pass
+
+    with resource_governor.disk_space(path, 90):
+        pass
+    mock_disk_usage.assert_called_with(str(tmp_path))
@@ -0,0 +1,25 @@
+from app.src.services.run_stats import RunStats, current_run_stats, record_run_stat
+
+
+def test_record_run_stat_without_run():
+    record_run_stat("get_requests")
+
+
+def test_record_run_stat():
+    run_stats = RunStats()
+    token = current_run_stats.set(run_stats)
+    try:
+        record_run_stat("get_requests")
+        record_run_stat("bytes_transferred", 100)
+    finally:
+        current_run_stats.reset(token)
+    record_run_stat("get_requests")
+
+    assert run_stats.as_dict() == {
+        "objects_transferred": 0,
+        "bytes_transferred": 100,
+        "list_requests": 0,
+        "get_requests": 1,
+        "retry_requests": 0,
+        "failed_objects": 0,
+    }
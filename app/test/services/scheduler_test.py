@@ -1,5 +1,11 @@
+import threading
+import time
+from datetime import datetime, timedelta
 import pytest
+import pytz
+from apscheduler.events import EVENT_JOB_SUBMITTED, JobSubmissionEvent
 from unittest.mock import MagicMock
+from app.src.services.metrics import SCHEDULER_QUEUE_WAIT
 from app.src.services.scheduler import Scheduler
 
 
@@ -47,3 +53,59 @@ def test_scheduler_remove_job(scheduler):
     scheduler.remove_job(job_id)
 
     scheduler.scheduler.remove_job.assert_called_once_with(job_id)
+
+
+def test_scheduler_add_job_records_queue_wait(scheduler):
+    job = MagicMock(return_value="done")
+    before = SCHEDULER_QUEUE_WAIT.count()
+
+    scheduled_job, _ = scheduler.add_job(job, "test_job", "daily", "queue_wait_job")
+    run_time = datetime.now(pytz.utc) - timedelta(seconds=3)
+    scheduler._Scheduler__on_job_submitted(
+        JobSubmissionEvent(EVENT_JOB_SUBMITTED, "queue_wait_job", "default", [run_time])
+    )
+    result = scheduled_job.func()
+
+    assert result == "done"
+    job.assert_called_once_with()
+    assert SCHEDULER_QUEUE_WAIT.count() == before + 1
+
+
+def test_scheduler_records_queue_wait_of_job_started_before_submission_event(
+    scheduler,
+):
+    scheduled_job, _ = scheduler.add_job(MagicMock(), "test_job", "daily", "early_job")
+    before = SCHEDULER_QUEUE_WAIT.count()
+
+    scheduled_job.func()
+    assert SCHEDULER_QUEUE_WAIT.count() == before
+    scheduler._Scheduler__on_job_submitted(
+        JobSubmissionEvent(
+            EVENT_JOB_SUBMITTED, "early_job", "default", [datetime.now(pytz.utc)]
+        )
+    )
+
+    assert SCHEDULER_QUEUE_WAIT.count() == before + 1
+
+
+def test_scheduler_run_once_records_queue_wait(scheduler):
+    done = threading.Event()
+    before = SCHEDULER_QUEUE_WAIT.count()
+
+    scheduler.run_once(done.set, "events job_id")
+
+    assert done.wait(5)
+    for _ in range(100):
+        if SCHEDULER_QUEUE_WAIT.count() == before + 1:
+            break
+        time.sleep(0.01)
+    assert SCHEDULER_QUEUE_WAIT.count() == before + 1
+
+
+def test_scheduler_run_once(scheduler):
+    job = MagicMock()
+
+    scheduled_job = scheduler.run_once(job, "events job_id", "job_id")
+
+    assert scheduled_job.name == "events job_id"
+    assert scheduled_job.args == ("job_id",)
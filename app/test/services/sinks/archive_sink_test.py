@@ -0,0 +1,116 @@
+import io
+import os
+import tarfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.src.services.sinks.archive_sink import ArchiveSink
+
+
+def blob_object(object_key, data):
+    object = MagicMock()
+    object.object_key = object_key
+    object.object_size = str(len(data))
+    return object
+
+
+def write_object(sink, object_key, data, on_commit):
+    writer = sink.open(blob_object(object_key, data), 0)
+    with writer:
+        for offset in range(0, len(data), 4):
+            writer.write(data[offset : offset + 4])
+    sink.commit(writer, on_commit)
+    return writer
+
+
+def read_segments(folder, mode="r:"):
+    members = dict()
+    for name in sorted(os.listdir(folder)):
+        with tarfile.open(os.path.join(folder, name), mode) as tar:
+            for member in tar:
+                members[member.name] = tar.extractfile(member).read()
+    return members
+
+
+def test_objects_are_packed_into_a_segment(tmp_path):
+    sink = ArchiveSink(str(tmp_path), 1024 * 1024, 8)
+    on_commit = MagicMock()
+
+    writer = write_object(sink, "data/a.txt", b"hello world", on_commit)
+    write_object(sink, "data/b.txt", b"", on_commit)
+    # Objects are only committed once their segment is sealed.
+    on_commit.assert_not_called()
+    assert os.listdir(tmp_path) == [os.path.basename(writer.location) + ".part"]
+
+    sink.close()
+
+    assert on_commit.call_count == 2
+    on_commit.assert_called_with(True)
+    assert writer.location.endswith(".tar")
+    assert os.listdir(tmp_path) == [os.path.basename(writer.location)]
+    assert read_segments(tmp_path) == {"data/a.txt": b"hello world", "data/b.txt": b""}
+
+
+def test_segments_are_sealed_at_the_segment_size(tmp_path):
+    sink = ArchiveSink(str(tmp_path), 1024, 8)
+    on_commit = MagicMock()
+
+    locations = {
+        write_object(sink, f"{i}.bin", bytes([i]) * 700, on_commit).location
+        for i in range(3)
+    }
+    sink.close()
+
+    assert len(locations) == 3
+    assert on_commit.call_count == 3
+    assert read_segments(tmp_path) == {f"{i}.bin": bytes([i]) * 700 for i in range(3)}
+
+
+def test_incomplete_and_discarded_members_are_cut_off(tmp_path):
+    sink = ArchiveSink(str(tmp_path), 1024 * 1024, 8)
+    on_commit = MagicMock()
+    write_object(sink, "a.txt", b"hello", on_commit)
+
+    with pytest.raises(ConnectionError):
+        with sink.open(blob_object("b.txt", b"world"), 0) as writer:
+            writer.write(b"wor")
+            raise ConnectionError("connection reset")
+    writer = sink.open(blob_object("c.txt", b"!"), 0)
+    with writer:
+        writer.write(b"!")
+    # E.g. after a checksum mismatch.
+    writer.discard()
+    sink.close()
+
+    on_commit.assert_called_once_with(True)
+    assert read_segments(tmp_path) == {"a.txt": b"hello"}
+
+
+def test_discard_removes_the_open_segment(tmp_path):
+    sink = ArchiveSink(str(tmp_path), 1024 * 1024, 8)
+    on_commit = MagicMock()
+    write_object(sink, "a.txt", b"hello", on_commit)
+
+    sink.discard()
+    sink.close()
+
+    on_commit.assert_not_called()
+    assert os.listdir(tmp_path) == []
+
+
+def test_zstd_members_are_compressed_as_frames(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    sink = ArchiveSink(str(tmp_path), 1024 * 1024, 8, compression="zstd")
+    on_commit = MagicMock()
+
+    writer = write_object(sink, "a.txt", b"hello world" * 100, on_commit)
+    write_object(sink, "b.txt", b"hello", on_commit)
+    sink.close()
+
+    assert writer.location.endswith(".tar.zst")
+    with open(writer.location, "rb") as f:
+        data = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        with tarfile.open(fileobj=io.BytesIO(data.read()), mode="r:") as tar:
+            members = {m.name: tar.extractfile(m).read() for m in tar}
+    assert members == {"a.txt": b"hello world" * 100, "b.txt": b"hello"}
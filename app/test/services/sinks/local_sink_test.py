@@ -0,0 +1,134 @@
+import gzip
+import os
+import zlib
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.src.services.download_committer import DownloadCommitter
+from app.src.services.sinks.local_sink import LocalSink
+
+
+@pytest.fixture
+def mock_get_zstd_compressor():
+    # zlib streams the same way as zstd, without depending on zstandard.
+    with mock.patch(
+        "app.src.services.sinks.local_sink.get_zstd_compressor", autospec=True
+    ) as get_zstd_compressor:
+        get_zstd_compressor.return_value.compressobj.side_effect = lambda size: (
+            zlib.compressobj()
+        )
+        yield get_zstd_compressor
+
+
+def local_sink(tmp_path, compression="zstd"):
+    return LocalSink(
+        str(tmp_path),
+        DownloadCommitter("none", 1),
+        MagicMock(),
+        dict(),
+        8,
+        compression=compression,
+    )
+
+
+def blob_object(object_key, data, local_full_path=None, compression=None):
+    object = MagicMock()
+    object.object_key = object_key
+    object.object_size = str(len(data))
+    object.local_full_path = local_full_path
+    object.compression = compression
+    return object
+
+
+def write_object(sink, object, data, on_commit):
+    writer = sink.open(object, 0)
+    with writer:
+        for offset in range(0, len(data), 4):
+            writer.write(data[offset : offset + 4])
+    sink.commit(writer, on_commit)
+    return writer
+
+
+def test_objects_are_compressed_as_they_are_written(tmp_path, mock_get_zstd_compressor):
+    sink = local_sink(tmp_path)
+    on_commit = MagicMock()
+    data = b"hello world " * 100
+
+    writer = write_object(sink, blob_object("logs/a.log", data), data, on_commit)
+
+    on_commit.assert_called_once_with(True)
+    mock_get_zstd_compressor.assert_called_once_with(3)
+    assert writer.location == os.path.join(tmp_path, "logs/a.log.zst")
+    assert writer.compression == "zstd"
+    assert os.listdir(tmp_path / "logs") == ["a.log.zst"]
+    with open(writer.location, "rb") as f:
+        stored = f.read()
+    assert zlib.decompress(stored) == data
+    assert writer.stored_size == len(stored) < len(data)
+
+
+def test_compressed_content_is_stored_as_it_is(tmp_path, mock_get_zstd_compressor):
+    sink = local_sink(tmp_path)
+    on_commit = MagicMock()
+    # By its name, and by its first bytes.
+    data = gzip.compress(b"hello world " * 100)
+
+    by_name = write_object(sink, blob_object("a.gz", data), data, on_commit)
+    by_content = write_object(sink, blob_object("b.bin", data), data, on_commit)
+
+    for writer in (by_name, by_content):
+        assert writer.compression is None
+        assert not writer.location.endswith(".zst")
+        assert writer.stored_size == len(data)
+        with open(writer.location, "rb") as f:
+            assert f.read() == data
+
+
+def test_switching_compression_replaces_the_stored_file(
+    tmp_path, mock_get_zstd_compressor
+):
+    data = b"hello world " * 100
+    path = os.path.join(tmp_path, "a.txt")
+    with open(path, "wb") as f:
+        f.write(data)
+    on_commit = MagicMock()
+
+    compressed = write_object(
+        local_sink(tmp_path), blob_object("a.txt", data, path), data, on_commit
+    )
+    assert os.listdir(tmp_path) == ["a.txt.zst"]
+
+    uncompressed = write_object(
+        local_sink(tmp_path, "none"),
+        blob_object("a.txt", data, compressed.location, "zstd"),
+        data,
+        on_commit,
+    )
+    assert uncompressed.location == path
+    assert os.listdir(tmp_path) == ["a.txt"]
+
+
+def test_interrupted_compressed_transfer_is_dropped(tmp_path, mock_get_zstd_compressor):
+    sink = local_sink(tmp_path)
+
+    with pytest.raises(ConnectionError):
+        with sink.open(blob_object("a.txt", b"hello world"), 0) as writer:
+            writer.write(b"hello")
+            raise ConnectionError("connection reset")
+
+    assert writer.path is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_zstd_round_trip(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    data = b"hello world " * 100
+
+    writer = write_object(
+        local_sink(tmp_path), blob_object("a.txt", data), data, MagicMock()
+    )
+
+    with open(writer.location, "rb") as f:
+        assert zstandard.ZstdDecompressor().decompress(f.read()) == data
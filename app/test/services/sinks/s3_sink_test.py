@@ -0,0 +1,119 @@
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.src.services.sinks.s3_sink import (
+    MAX_PARTS,
+    MIN_PART_SIZE,
+    S3Sink,
+    S3SinkWriter,
+)
+
+
+@pytest.fixture(autouse=True)
+def mock_config():
+    with mock.patch("app.src.services.sinks.s3_sink.Config", autospec=True) as config:
+        config.RETRY_COUNT = "1"
+        config.RETRY_DELAY = "0"
+        config.RETRY_BACKOFF = "1"
+        config.SINK_PART_SIZE = "8 * 1024 * 1024"
+        yield config
+
+
+@pytest.fixture
+def s3_client():
+    s3_client = MagicMock()
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    s3_client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+    return s3_client
+
+
+def write_object(writer, data, chunk_size):
+    with writer:
+        for offset in range(0, len(data), chunk_size):
+            writer.write(data[offset : offset + chunk_size])
+
+
+def test_write_uploads_parts_as_they_fill(s3_client):
+    data = bytes(range(256)) * (MIN_PART_SIZE // 100)
+    writer = S3SinkWriter(s3_client, "target", "data/a.bin", len(data), MIN_PART_SIZE)
+
+    write_object(writer, data, 1024 * 1024)
+    writer.commit()
+
+    parts = [call.kwargs for call in s3_client.upload_part.call_args_list]
+    assert [part["PartNumber"] for part in parts] == [1, 2, 3]
+    assert [len(part["Body"]) for part in parts] == [
+        MIN_PART_SIZE,
+        MIN_PART_SIZE,
+        len(data) - 2 * MIN_PART_SIZE,
+    ]
+    assert b"".join(part["Body"] for part in parts) == data
+    s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="target",
+        Key="data/a.bin",
+        UploadId="upload-1",
+        MultipartUpload={
+            "Parts": [
+                {"ETag": "etag-1", "PartNumber": 1},
+                {"ETag": "etag-2", "PartNumber": 2},
+                {"ETag": "etag-3", "PartNumber": 3},
+            ]
+        },
+    )
+    s3_client.put_object.assert_not_called()
+    assert writer.location == "s3://target/data/a.bin"
+
+
+def test_small_object_is_put_at_once(s3_client):
+    writer = S3SinkWriter(s3_client, "target", "a.txt", 11, MIN_PART_SIZE)
+
+    write_object(writer, b"hello world", 4)
+    s3_client.put_object.assert_not_called()
+    writer.commit()
+
+    s3_client.put_object.assert_called_once_with(
+        Bucket="target", Key="a.txt", Body=b"hello world"
+    )
+    s3_client.create_multipart_upload.assert_not_called()
+
+
+def test_incomplete_upload_is_aborted(s3_client):
+    data = b"x" * (MIN_PART_SIZE + 10)
+    writer = S3SinkWriter(s3_client, "target", "a.bin", len(data) + 10, MIN_PART_SIZE)
+
+    with pytest.raises(ConnectionError):
+        with writer:
+            writer.write(data)
+            raise ConnectionError("connection reset")
+
+    s3_client.abort_multipart_upload.assert_called_once_with(
+        Bucket="target", Key="a.bin", UploadId="upload-1"
+    )
+    s3_client.complete_multipart_upload.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "object_size, expected_part_size",
+    [
+        (1024, 8 * 1024 * 1024),
+        (MAX_PARTS * 8 * 1024 * 1024, 8 * 1024 * 1024),
+        # 100 GiB would need more than MAX_PARTS parts of 8 MiB.
+        (100 * 1024**3, 10737419),
+    ],
+)
+@mock.patch("app.src.services.sinks.s3_sink.boto3", autospec=True)
+def test_open_fits_large_objects_in_max_parts(
+    mock_boto3, object_size, expected_part_size
+):
+    sink = S3Sink({"bucket_name": "target"})
+    object = MagicMock(object_key="data/a.bin", object_size=str(object_size))
+
+    writer = sink.open(object, 0)
+
+    assert writer.part_size == expected_part_size
+    assert writer.part_size * MAX_PARTS >= object_size
+    assert sink.get_buffer_size(object) == min(expected_part_size, object_size)
@@ -0,0 +1,69 @@
+import os
+import pytest
+from app.src.services.snapshots import SnapshotManager
+from app.src.utils.file_util import detach_shared_file
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    return SnapshotManager(str(tmp_path / "snapshots" / "job_id"))
+
+
+def download(tmp_path, object_key, data):
+    path = tmp_path / "download" / object_key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return object_key, str(path)
+
+
+def test_snapshot_links_downloaded_files(snapshots, tmp_path):
+    objects = [
+        download(tmp_path, "a/1.txt", b"one"),
+        download(tmp_path, "b/2.txt", b"two"),
+    ]
+
+    assert snapshots.create("1", objects) == 2
+
+    snapshot_path = os.path.join(snapshots.root, "1")
+    for object_key, local_full_path in objects:
+        assert os.path.samefile(
+            os.path.join(snapshot_path, object_key), local_full_path
+        )
+    assert snapshots.list_snapshots() == ["1"]
+
+
+def test_changed_objects_do_not_change_earlier_snapshots(snapshots, tmp_path):
+    unchanged = download(tmp_path, "a.txt", b"unchanged")
+    changed = download(tmp_path, "b.txt", b"old")
+    snapshots.create("1", [unchanged, changed])
+
+    detach_shared_file(changed[1])
+    with open(changed[1], "wb") as f:
+        f.write(b"new")
+    snapshots.create("2", [unchanged, changed])
+
+    first, second = (os.path.join(snapshots.root, name) for name in ("1", "2"))
+    assert os.path.samefile(f"{first}/a.txt", f"{second}/a.txt")
+    assert open(f"{first}/b.txt", "rb").read() == b"old"
+    assert open(f"{second}/b.txt", "rb").read() == b"new"
+
+
+def test_snapshot_skips_missing_files(snapshots, tmp_path):
+    objects = [
+        download(tmp_path, "a.txt", b"one"),
+        ("b.txt", str(tmp_path / "download" / "b.txt")),
+    ]
+
+    assert snapshots.create("1", objects) == 1
+
+
+def test_prune_keeps_most_recent_snapshots(snapshots, tmp_path):
+    objects = [download(tmp_path, "a.txt", b"one")]
+    for snapshot_id in ("8", "9", "10"):
+        snapshots.create(snapshot_id, objects)
+    os.makedirs(os.path.join(snapshots.root, "11.tmp"))
+
+    assert snapshots.prune(2) == 1
+
+    assert sorted(os.listdir(snapshots.root)) == ["10", "9"]
+    assert os.path.exists(objects[0][1])
@@ -72,7 +72,7 @@ def test_schedule_sync_job_success(
     mockdb.session.commit.return_value = None
 
     job_id, error = sync_job_scheduler_service.schedule_sync_job(
-        "job_name", "connector_type", "schedule", "connector_config"
+        "job_name", "connector_type", "schedule", {"bucket_name": "test-bucket"}
     )
 
     assert isinstance(job_id, str) and uuid.UUID(job_id, version=4)
@@ -87,7 +87,7 @@ def test_schedule_sync_job_scheduler_error(
     mock_scheduler.add_job.return_value = (None, "Scheduler error")
 
     job_id, error = sync_job_scheduler_service.schedule_sync_job(
-        "job_name", "connector_type", "schedule", "connector_config"
+        "job_name", "connector_type", "schedule", {"bucket_name": "test-bucket"}
     )
 
     assert job_id is None
@@ -211,3 +211,47 @@ def test_delete_job_non_existing_job(
     assert result is False
     mockdb.session.delete.assert_not_called()
     mockdb.session.commit.assert_not_called()
+
+
+@patch("app.src.services.sync_job_scheduler_service.Job")
+@patch("app.src.services.sync_job_scheduler_service.db")
+def test_update_rate_limits(
+    mockdb,
+    mock_job_class,
+    sync_job_scheduler_service,
+    mock_connector_factory,
+    mock_scheduler,
+):
+    mock_connector_factory.get_connector.return_value = (MagicMock(), None)
+    mock_scheduler.add_job.return_value = (Job(), None)
+    job_id, _ = sync_job_scheduler_service.schedule_sync_job(
+        "job_name", "connector_type", "schedule", {"bucket_name": "test-bucket"}
+    )
+    mock_job = MagicMock(connector_config={"bucket_name": "test-bucket"})
+    mock_job_class.query.filter_by.return_value.first.return_value = mock_job
+
+    limits, error = sync_job_scheduler_service.update_rate_limits(
+        job_id, {"max_bytes_per_second": 1024}
+    )
+
+    assert error is None
+    assert limits == {"max_bytes_per_second": 1024, "max_requests_per_second": 0}
+    assert mock_job.connector_config == {
+        "bucket_name": "test-bucket",
+        "max_bytes_per_second": 1024,
+    }
+    mockdb.session.commit.assert_called()
+
+
+@patch("app.src.services.sync_job_scheduler_service.Job")
+def test_update_rate_limits_non_existing_job(
+    mock_job_class, sync_job_scheduler_service
+):
+    mock_job_class.query.filter_by.return_value.first.return_value = None
+
+    limits, error = sync_job_scheduler_service.update_rate_limits(
+        "job_id", {"max_bytes_per_second": 1024}
+    )
+
+    assert limits is None
+    assert error == "Job not found"
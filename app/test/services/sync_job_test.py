@@ -1,8 +1,12 @@
+import os
+import tarfile
+import threading
 import uuid
 from flask import Flask
 import pytest
 from unittest.mock import MagicMock, patch
 
+from app.src.services.listing_cache import ListingCache
 from app.src.services.sync_job import SyncJob
 
 
@@ -14,6 +18,7 @@ class BlobObject:
         self.status = "status_1"
         self.job_id = "job_id_1"
         self.local_full_path = "local_full_path_1"
+        self.compression = None
         self.created_at = None
         self.updated_at = None
 
@@ -37,7 +42,43 @@ def app():
 
 @pytest.fixture
 def mock_connector():
-    return MagicMock()
+    connector = MagicMock()
+    # Objects are fetched from a remote store.
+    connector.get_local_path.return_value = None
+    connector.get_fetch_concurrency.return_value = 1
+    return connector
+
+
+@pytest.fixture(autouse=True)
+def mock_job_run():
+    with (
+        patch("app.src.services.sync_job.start_job_run") as mock_start_job_run,
+        patch("app.src.services.sync_job.finish_job_run") as mock_finish_job_run,
+    ):
+        yield mock_start_job_run, mock_finish_job_run
+
+
+@pytest.fixture(autouse=True)
+def disable_listing_cache():
+    with patch("app.src.services.sync_job.listing_cache", ListingCache(0, 0)):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def mock_generation():
+    with (
+        patch("app.src.services.sync_job.stamp_generation") as mock_stamp_generation,
+        patch("app.src.services.sync_job.sweep_unseen_objects") as mock_sweep,
+    ):
+        mock_sweep.return_value = 0
+        yield mock_stamp_generation, mock_sweep
+
+
+@pytest.fixture(autouse=True)
+def mock_has_objects():
+    # Jobs with recorded objects are not reconciled with the local files.
+    with patch("app.src.services.sync_job.has_objects", return_value=True) as mock:
+        yield mock
 
 
 @pytest.fixture
@@ -54,11 +95,643 @@ def sync_job(mock_connector):
 def test_sync_job_run(
     mock_processed_objects, mock_write_local_json, sync_job, mock_connector
 ):
-    mock_connector.list_objects.return_value = (
-        {"object_key1": 1000, "object_key2": 500},
-        None,
+    mock_connector.iter_object_pages.return_value = [
+        {"object_key1": 1000, "object_key2": 500}
+    ]
+    mock_processed_objects.return_value = [BlobObject()]
+    sync_job.run()
+
+
+@patch("app.src.services.sync_job.run_profiler")
+def test_sync_job_run_profiled(mock_run_profiler, sync_job, mock_connector):
+    mock_run_profiler.consume.return_value = True
+
+    sync_job.run()
+
+    mock_run_profiler.profile.assert_called_once()
+    mock_connector.iter_object_pages.assert_not_called()
+
+
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_records_job_run(
+    mock_write_local_json,
+    mock_processed_objects,
+    sync_job,
+    mock_connector,
+    mock_job_run,
+):
+    mock_start_job_run, mock_finish_job_run = mock_job_run
+    mock_connector.iter_object_pages.return_value = [{}]
+    mock_processed_objects.return_value = []
+
+    sync_job.run()
+
+    mock_start_job_run.assert_called_once()
+    job_run, run_stats, status = mock_finish_job_run.call_args[0]
+    assert job_run is mock_start_job_run.return_value
+    assert run_stats.as_dict()["objects_transferred"] == 0
+    assert status == "COMPLETED"
+
+
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+def test_sync_job_run_records_failed_job_run(
+    mock_processed_objects, sync_job, mock_connector, mock_job_run
+):
+    _, mock_finish_job_run = mock_job_run
+    mock_connector.iter_object_pages.side_effect = Exception("listing failed")
+
+    with pytest.raises(Exception):
+        sync_job.run()
+
+    assert mock_finish_job_run.call_args[0][2] == "FAILED"
+
+
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_processes_every_page(
+    mock_write_local_json, mock_processed_objects, sync_job, mock_connector
+):
+    mock_connector.iter_object_pages.return_value = iter(
+        [{"a/1.txt": 10}, {"b/2.txt": 20}]
     )
+    mock_processed_objects.return_value = []
 
-    mock_connector.list_objects = MagicMock(return_value=({}, None))
-    mock_processed_objects.return_value = [BlobObject()]
     sync_job.run()
+
+    assert [call.args[0] for call in mock_processed_objects.call_args_list] == [
+        {"a/1.txt": 10},
+        {"b/2.txt": 20},
+    ]
+
+
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.remove_objects")
+@patch("app.src.services.sync_job.get_changed_objects_to_be_processed")
+def test_sync_objects(
+    mock_changed_objects,
+    mock_remove_objects,
+    mock_commit_session,
+    sync_job,
+    mock_connector,
+):
+    mock_changed_objects.return_value = []
+
+    sync_job.sync_objects({"a/1.txt": 10}, ["b/2.txt"])
+
+    mock_changed_objects.assert_called_once()
+    assert mock_changed_objects.call_args[0][0] == {"a/1.txt": 10}
+    # Deletions are only mirrored when enabled in the connector config.
+    mock_remove_objects.assert_not_called()
+    mock_connector.iter_object_pages.assert_not_called()
+
+
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.remove_objects")
+@patch("app.src.services.sync_job.get_changed_objects_to_be_processed")
+def test_sync_objects_mirrors_deletes(
+    mock_changed_objects, mock_remove_objects, mock_commit_session, mock_connector
+):
+    job_id = str(uuid.uuid4())
+    sync_job = SyncJob(
+        Flask(__name__),
+        mock_connector,
+        {"bucket_name": "test-bucket", "mirror_deletes": True},
+        job_id,
+    )
+    mock_changed_objects.return_value = []
+    mock_remove_objects.return_value = 1
+
+    sync_job.sync_objects({}, ["b/2.txt"])
+
+    mock_remove_objects.assert_called_once_with(["b/2.txt"], job_id)
+
+
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_sweeps_after_complete_listing(
+    mock_write_local_json,
+    mock_processed_objects,
+    sync_job,
+    mock_connector,
+    mock_job_run,
+    mock_generation,
+):
+    mock_start_job_run, _ = mock_job_run
+    mock_start_job_run.return_value.id = 7
+    mock_stamp_generation, mock_sweep = mock_generation
+    mock_connector.iter_object_pages.return_value = iter([{"a": 1}, {"b": 2}])
+    mock_processed_objects.return_value = []
+
+    sync_job.run()
+
+    assert [list(call.args[0]) for call in mock_stamp_generation.call_args_list] == [
+        ["a"],
+        ["b"],
+    ]
+    assert mock_stamp_generation.call_args[0][2] == 7
+    mock_sweep.assert_called_once_with(sync_job._SyncJob__job_id, 7, False)
+
+
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+def test_sync_job_run_does_not_sweep_incomplete_listing(
+    mock_processed_objects, sync_job, mock_connector, mock_generation
+):
+    _, mock_sweep = mock_generation
+
+    def pages():
+        yield {"a": 1}
+        raise Exception("listing failed")
+
+    mock_connector.iter_object_pages.return_value = pages()
+    mock_processed_objects.return_value = []
+
+    with pytest.raises(Exception):
+        sync_job.run()
+
+    mock_sweep.assert_not_called()
+
+
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+def test_sync_job_run_does_not_sweep_inventory_listing(
+    mock_processed_objects, mock_connector, mock_generation
+):
+    _, mock_sweep = mock_generation
+    mock_connector.iter_object_pages.return_value = iter([{"a": 1}])
+    mock_processed_objects.return_value = []
+    sync_job = SyncJob(
+        Flask(__name__),
+        mock_connector,
+        {
+            "bucket_name": "test-bucket",
+            "inventory_manifest": "s3://inventory/manifest.json",
+        },
+        str(uuid.uuid4()),
+    )
+
+    sync_job.run()
+
+    mock_sweep.assert_not_called()
+
+
+def fake_fetch(data):
+    def fetch_object_in_chunks(config, object_key, start_position, object_size):
+        end_position = min(start_position + 4, object_size)
+        return data[start_position:end_position], end_position
+
+    return fetch_object_in_chunks
+
+
+def grown_object(tmp_path, synced_data, object_size):
+    object = BlobObject()
+    object.local_full_path = str(tmp_path / "app.log")
+    object.object_key = "app.log"
+    object.last_position = str(len(synced_data))
+    object.object_size = str(object_size)
+    (tmp_path / "app.log").write_bytes(synced_data)
+    return object
+
+
+@pytest.mark.parametrize(
+    "synced_data, expected_start_positions",
+    [
+        # Synced bytes still match: the tail is verified, then only the delta fetched.
+        (b"hello ", [2, 6, 10]),
+        # Synced bytes changed: the object is downloaded again from the start.
+        (b"HELLO ", [2, 0, 4, 8]),
+    ],
+)
+@patch("app.src.services.sync_job.Config")
+@patch("app.src.services.sync_job.db")
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_append_mode(
+    mock_write_local_json,
+    mock_processed_objects,
+    mock_commit_session,
+    mock_db,
+    mock_config,
+    synced_data,
+    expected_start_positions,
+    mock_connector,
+    tmp_path,
+):
+    mock_config.JSON_ROOT_FOLDER = str(tmp_path)
+    mock_config.DOWNLOAD_ROOT_FOLDER = str(tmp_path)
+    mock_config.LOG_PROGRESS_INTERVAL = "30"
+    mock_config.DOWNLOAD_DURABILITY = "batch"
+    mock_config.DOWNLOAD_COMMIT_BATCH_SIZE = "256"
+    mock_config.DOWNLOAD_WRITE_BUFFER_SIZE = "8"
+    mock_config.DOWNLOAD_DROP_CACHE = "false"
+    mock_config.APPEND_VERIFY_BYTES = "4"
+    mock_config.S3_CHUNK_SIZE = "4"
+    data = b"hello world!"
+    mock_write_local_json.side_effect = lambda json_data, *args, **kwargs: []
+    mock_connector.iter_object_pages.return_value = [{"app.log": len(data)}]
+    mock_connector.fetch_object_in_chunks.side_effect = fake_fetch(data)
+    object = grown_object(tmp_path, synced_data, len(data))
+    mock_processed_objects.return_value = [object]
+    sync_job = SyncJob(
+        Flask(__name__),
+        mock_connector,
+        {"bucket_name": "test-bucket", "append_mode": True},
+        str(uuid.uuid4()),
+    )
+
+    sync_job.run()
+
+    assert mock_processed_objects.call_args.kwargs["append_mode"] is True
+    start_positions = [
+        call.args[2] for call in mock_connector.fetch_object_in_chunks.call_args_list
+    ]
+    assert start_positions == expected_start_positions
+    assert (tmp_path / "app.log").read_bytes() == data
+    assert object.status == "PROCESSED"
+
+
+@patch("app.src.services.sync_job.Config")
+@patch("app.src.services.sync_job.db")
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_content_addressed(
+    mock_write_local_json,
+    mock_processed_objects,
+    mock_commit_session,
+    mock_db,
+    mock_config,
+    mock_connector,
+    tmp_path,
+):
+    mock_config.JSON_ROOT_FOLDER = str(tmp_path / "json")
+    mock_config.DOWNLOAD_ROOT_FOLDER = str(tmp_path / "download")
+    mock_config.CONTENT_STORE_FOLDER = None
+    mock_config.LOG_PROGRESS_INTERVAL = "30"
+    mock_config.DOWNLOAD_DURABILITY = "batch"
+    mock_config.DOWNLOAD_COMMIT_BATCH_SIZE = "256"
+    mock_config.DOWNLOAD_WRITE_BUFFER_SIZE = "8"
+    mock_config.DOWNLOAD_DROP_CACHE = "false"
+    mock_config.S3_CHUNK_SIZE = "4"
+    data = b"hello world!"
+    mock_write_local_json.side_effect = lambda json_data, *args, **kwargs: []
+    mock_connector.iter_object_pages.side_effect = lambda config: [
+        {"data/a.txt": len(data)}
+    ]
+    mock_connector.fetch_object_in_chunks.side_effect = fake_fetch(data)
+
+    download_paths = list()
+    for job_id in (str(uuid.uuid4()), str(uuid.uuid4())):
+        object = BlobObject()
+        object.object_key = "data/a.txt"
+        object.object_size = str(len(data))
+        object.last_position = "0"
+        object.local_full_path = ""
+        object.etag = "abc"
+        mock_processed_objects.return_value = [object]
+        sync_job = SyncJob(
+            Flask(__name__),
+            mock_connector,
+            {"bucket_name": "test-bucket", "content_addressed": True},
+            job_id,
+        )
+
+        sync_job.run()
+
+        assert object.status == "PROCESSED"
+        download_paths.append(object.local_full_path)
+
+    # The second job links the object stored by the first instead of fetching it.
+    assert mock_connector.fetch_object_in_chunks.call_count == 3
+    assert os.path.samefile(*download_paths)
+    assert open(download_paths[1], "rb").read() == data
+
+
+@patch("app.src.services.sync_job.SnapshotManager")
+@patch("app.src.services.sync_job.iter_processed_objects")
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+def test_sync_job_run_creates_snapshot(
+    mock_processed_objects,
+    mock_iter_processed_objects,
+    mock_snapshot_manager,
+    mock_connector,
+    mock_job_run,
+):
+    mock_start_job_run, _ = mock_job_run
+    mock_start_job_run.return_value.id = 7
+    mock_connector.iter_object_pages.return_value = iter([{"a": 1}])
+    mock_processed_objects.return_value = []
+    mock_iter_processed_objects.return_value = iter(
+        [("a", "/download/a", None), ("b", "/download/b.zst", "zstd")]
+    )
+    job_id = str(uuid.uuid4())
+    sync_job = SyncJob(
+        Flask(__name__),
+        mock_connector,
+        {"bucket_name": "test-bucket", "snapshots": True, "snapshot_retention": 3},
+        job_id,
+    )
+
+    sync_job.run()
+
+    snapshots = mock_snapshot_manager.return_value
+    snapshot_id, objects = snapshots.create.call_args.args
+    assert snapshot_id == "7"
+    assert list(objects) == [("a", "/download/a"), ("b.zst", "/download/b.zst")]
+    mock_iter_processed_objects.assert_called_once_with(job_id)
+    snapshots.prune.assert_called_once_with(3)
+
+
+@patch("app.src.services.sync_job.Config")
+@patch("app.src.services.sync_job.db")
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_resumes_from_temp_file(
+    mock_write_local_json,
+    mock_processed_objects,
+    mock_commit_session,
+    mock_db,
+    mock_config,
+    mock_connector,
+    tmp_path,
+):
+    mock_config.JSON_ROOT_FOLDER = str(tmp_path)
+    mock_config.DOWNLOAD_ROOT_FOLDER = str(tmp_path)
+    mock_config.LOG_PROGRESS_INTERVAL = "30"
+    mock_config.DOWNLOAD_DURABILITY = "batch"
+    mock_config.DOWNLOAD_COMMIT_BATCH_SIZE = "256"
+    mock_config.DOWNLOAD_WRITE_BUFFER_SIZE = "8"
+    mock_config.DOWNLOAD_DROP_CACHE = "false"
+    mock_config.S3_CHUNK_SIZE = "4"
+    data = b"hello world!"
+    fetch = fake_fetch(data)
+    mock_write_local_json.side_effect = lambda json_data, *args, **kwargs: []
+    mock_connector.iter_object_pages.side_effect = lambda config: [
+        {"app.log": len(data)}
+    ]
+    object = grown_object(tmp_path, b"old", len(data))
+    object.last_position = "0"
+    mock_processed_objects.return_value = [object]
+    sync_job = SyncJob(
+        Flask(__name__), mock_connector, {"bucket_name": "test-bucket"}, "job_id"
+    )
+
+    def fail_after_first_chunk(config, object_key, start_position, object_size):
+        if start_position > 0:
+            raise ConnectionError("connection reset")
+        return fetch(config, object_key, start_position, object_size)
+
+    mock_connector.fetch_object_in_chunks.side_effect = fail_after_first_chunk
+    sync_job.run()
+
+    # The synced file is untouched until the download completes.
+    assert object.status == "FAILED"
+    assert object.last_position == "4"
+    assert (tmp_path / "app.log").read_bytes() == b"old"
+    # Bytes written after the last recorded position are dropped on resume.
+    with open(tmp_path / "app.log.part", "ab") as f:
+        f.write(b"garbage")
+
+    mock_connector.fetch_object_in_chunks.side_effect = fetch
+    sync_job.run()
+
+    start_positions = [
+        call.args[2] for call in mock_connector.fetch_object_in_chunks.call_args_list
+    ]
+    assert start_positions == [0, 4, 4, 8]
+    assert object.status == "PROCESSED"
+    assert (tmp_path / "app.log").read_bytes() == data
+    assert not (tmp_path / "app.log.part").exists()
+
+
+@patch("app.src.services.sync_job.Config")
+@patch("app.src.services.sync_job.db")
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_copies_local_files(
+    mock_write_local_json,
+    mock_processed_objects,
+    mock_commit_session,
+    mock_db,
+    mock_config,
+    mock_connector,
+    tmp_path,
+):
+    mock_config.JSON_ROOT_FOLDER = str(tmp_path / "json")
+    mock_config.DOWNLOAD_ROOT_FOLDER = str(tmp_path / "download")
+    mock_config.LOG_PROGRESS_INTERVAL = "30"
+    mock_config.DOWNLOAD_DURABILITY = "none"
+    mock_config.DOWNLOAD_COMMIT_BATCH_SIZE = "256"
+    mock_config.DOWNLOAD_WRITE_BUFFER_SIZE = "8"
+    mock_config.DOWNLOAD_DROP_CACHE = "false"
+    mock_config.VERIFY_INTEGRITY = "false"
+    mock_config.S3_CHUNK_SIZE = "4"
+    data = b"hello world!"
+    (tmp_path / "source.log").write_bytes(data)
+    mock_write_local_json.side_effect = lambda json_data, *args, **kwargs: json_data
+    mock_connector.iter_object_pages.side_effect = lambda config: [
+        {"app.log": len(data)}
+    ]
+    mock_connector.get_local_path.return_value = str(tmp_path / "source.log")
+    object = BlobObject()
+    object.local_full_path = None
+    object.object_key = "app.log"
+    object.last_position = "0"
+    object.object_size = str(len(data))
+    mock_processed_objects.return_value = [object]
+    sync_job = SyncJob(
+        Flask(__name__), mock_connector, {"root_path": str(tmp_path)}, "job_id"
+    )
+
+    sync_job.run()
+
+    mock_connector.fetch_object_in_chunks.assert_not_called()
+    assert object.status == "PROCESSED"
+    assert object.last_position == str(len(data))
+    assert (tmp_path / "download" / "job_id" / "app.log").read_bytes() == data
+
+
+@pytest.mark.parametrize(
+    "corrupted_fetches, expected_status",
+    [
+        # A corrupted download is fetched again and verified.
+        (1, "PROCESSED"),
+        # Downloads that keep failing the check are failed, to be retried later.
+        (2, "FAILED"),
+    ],
+)
+@patch("app.src.services.sync_job.Config")
+@patch("app.src.services.sync_job.db")
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_verifies_integrity(
+    mock_write_local_json,
+    mock_processed_objects,
+    mock_commit_session,
+    mock_db,
+    mock_config,
+    corrupted_fetches,
+    expected_status,
+    mock_connector,
+    tmp_path,
+):
+    mock_config.JSON_ROOT_FOLDER = str(tmp_path)
+    mock_config.DOWNLOAD_ROOT_FOLDER = str(tmp_path)
+    mock_config.LOG_PROGRESS_INTERVAL = "30"
+    mock_config.DOWNLOAD_DURABILITY = "none"
+    mock_config.DOWNLOAD_COMMIT_BATCH_SIZE = "256"
+    mock_config.DOWNLOAD_WRITE_BUFFER_SIZE = "8"
+    mock_config.DOWNLOAD_DROP_CACHE = "false"
+    mock_config.VERIFY_INTEGRITY = "true"
+    mock_config.INTEGRITY_RETRIES = "1"
+    mock_config.S3_CHUNK_SIZE = "4"
+    data = b"hello world!"
+    fetch = fake_fetch(data)
+    fetches = {"corrupted": 0}
+
+    def fetch_corrupted(config, object_key, start_position, object_size):
+        chunk_data, end_position = fetch(
+            config, object_key, start_position, object_size
+        )
+        if end_position == object_size and fetches["corrupted"] < corrupted_fetches:
+            fetches["corrupted"] += 1
+            chunk_data = chunk_data.upper()
+        return chunk_data, end_position
+
+    mock_write_local_json.side_effect = lambda json_data, *args, **kwargs: []
+    mock_connector.iter_object_pages.return_value = [{"app.log": len(data)}]
+    mock_connector.fetch_object_in_chunks.side_effect = fetch_corrupted
+    mock_connector.get_object_checksum.return_value = {
+        "algorithm": "md5",
+        "value": "fc3ff98e8c6a0d3087d515c0473f8677",
+    }
+    object = grown_object(tmp_path, b"", len(data))
+    mock_processed_objects.return_value = [object]
+    sync_job = SyncJob(
+        Flask(__name__), mock_connector, {"bucket_name": "test-bucket"}, "job_id"
+    )
+
+    sync_job.run()
+
+    assert object.status == expected_status
+    assert mock_connector.fetch_object_in_chunks.call_count == 6
+    assert not (tmp_path / "app.log.part").exists()
+    if expected_status == "PROCESSED":
+        assert object.checksum == "md5:fc3ff98e8c6a0d3087d515c0473f8677"
+        assert (tmp_path / "app.log").read_bytes() == data
+    else:
+        assert object.checksum is None
+        assert object.last_position == 0
+
+
+@patch("app.src.factories.sink_factory.Config")
+@patch("app.src.services.sync_job.Config")
+@patch("app.src.services.sync_job.db")
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_streams_into_sink(
+    mock_write_local_json,
+    mock_processed_objects,
+    mock_commit_session,
+    mock_db,
+    mock_config,
+    mock_sink_config,
+    mock_connector,
+    tmp_path,
+):
+    for config in (mock_config, mock_sink_config):
+        config.JSON_ROOT_FOLDER = str(tmp_path / "json")
+        config.DOWNLOAD_ROOT_FOLDER = str(tmp_path / "download")
+        config.LOG_PROGRESS_INTERVAL = "30"
+        config.DOWNLOAD_DURABILITY = "batch"
+        config.DOWNLOAD_COMMIT_BATCH_SIZE = "256"
+        config.DOWNLOAD_WRITE_BUFFER_SIZE = "8"
+        config.DOWNLOAD_DROP_CACHE = "false"
+        config.ARCHIVE_SEGMENT_SIZE = "1024 * 1024"
+        config.S3_CHUNK_SIZE = "4"
+    data = b"hello world!"
+    mock_write_local_json.side_effect = lambda json_data, *args, **kwargs: []
+    mock_connector.iter_object_pages.return_value = [{"app.log": len(data)}]
+    mock_connector.fetch_object_in_chunks.side_effect = fake_fetch(data)
+    object = BlobObject()
+    object.object_key = "app.log"
+    object.object_size = str(len(data))
+    object.last_position = "0"
+    object.local_full_path = ""
+    mock_processed_objects.return_value = [object]
+    sync_job = SyncJob(
+        Flask(__name__),
+        mock_connector,
+        {"bucket_name": "test-bucket", "sink": {"type": "archive"}},
+        "job_id",
+    )
+
+    with patch("app.src.services.sync_job.resource_governor") as mock_governor:
+        sync_job.run()
+
+    # The write buffer is reserved together with the chunk, until the commit.
+    mock_governor.buffer.assert_called_once_with(8 + 4)
+    assert object.status == "PROCESSED"
+    assert object.local_full_path.endswith(".tar")
+    # The object is only written to the archive, not to the download folder.
+    assert os.listdir(tmp_path / "download" / "job_id") == [
+        os.path.basename(object.local_full_path)
+    ]
+    with tarfile.open(object.local_full_path) as tar:
+        assert tar.extractfile("app.log").read() == data
+
+
+@patch("app.src.services.sync_job.Config")
+@patch("app.src.services.sync_job.db")
+@patch("app.src.services.sync_job.commit_session")
+@patch("app.src.services.sync_job.get_objects_to_be_processed")
+@patch("app.src.services.sync_job.write_json_to_local_file")
+def test_sync_job_run_fetches_chunks_concurrently(
+    mock_write_local_json,
+    mock_processed_objects,
+    mock_commit_session,
+    mock_db,
+    mock_config,
+    mock_connector,
+    tmp_path,
+):
+    mock_config.JSON_ROOT_FOLDER = str(tmp_path)
+    mock_config.DOWNLOAD_ROOT_FOLDER = str(tmp_path)
+    mock_config.LOG_PROGRESS_INTERVAL = "30"
+    mock_config.DOWNLOAD_DURABILITY = "none"
+    mock_config.DOWNLOAD_COMMIT_BATCH_SIZE = "256"
+    mock_config.DOWNLOAD_WRITE_BUFFER_SIZE = "8"
+    mock_config.DOWNLOAD_DROP_CACHE = "false"
+    mock_config.S3_CHUNK_SIZE = "4"
+    data = b"hello world!"
+    fetch = fake_fetch(data)
+    # Every fetch waits for the other two, so the download only completes if all
+    # three chunks are in flight at once.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fetch_concurrently(config, object_key, start_position, object_size):
+        barrier.wait()
+        return fetch(config, object_key, start_position, object_size)
+
+    mock_write_local_json.side_effect = lambda json_data, *args, **kwargs: []
+    mock_connector.iter_object_pages.return_value = [{"app.log": len(data)}]
+    mock_connector.fetch_object_in_chunks.side_effect = fetch_concurrently
+    mock_connector.get_fetch_concurrency.return_value = 8
+    object = grown_object(tmp_path, b"", len(data))
+    mock_processed_objects.return_value = [object]
+    sync_job = SyncJob(
+        Flask(__name__), mock_connector, {"bucket_name": "test-bucket"}, "job_id"
+    )
+
+    with patch("app.src.services.sync_job.resource_governor") as mock_governor:
+        mock_governor.max_in_flight_bytes = 1024
+        sync_job.run()
+
+    # The window is capped by the number of chunks, which are reserved together.
+    mock_governor.buffer.assert_called_once_with(8 + 3 * 4)
+    assert object.status == "PROCESSED"
+    assert (tmp_path / "app.log").read_bytes() == data
@@ -0,0 +1,86 @@
+import json
+from unittest.mock import MagicMock, patch
+import pytest
+from app.src.services.metrics import TRACE_SPANS_DROPPED
+from app.src.services.tracing import (
+    NON_RECORDING_SPAN,
+    FileSpanExporter,
+    Span,
+    Tracer,
+)
+
+
+@pytest.fixture
+def mock_exporter():
+    return MagicMock()
+
+
+def test_span_parent_child(mock_exporter):
+    tracer = Tracer(1.0, mock_exporter)
+
+    with tracer.span("sync_job", job_id="job_id") as root:
+        with tracer.span("fetch", key="file.txt") as child:
+            child.set_attribute("bytes", 10)
+
+    exported = [call.args[0] for call in mock_exporter.export.call_args_list]
+    assert exported == [child, root]
+    assert child.trace_id == root.trace_id
+    assert child.parent_span_id == root.span_id
+    assert root.parent_span_id is None
+    assert child.attributes == {"key": "file.txt", "bytes": 10}
+    assert tracer.current_span() is None
+
+
+def test_span_not_sampled(mock_exporter):
+    tracer = Tracer(0, mock_exporter)
+
+    with tracer.span("sync_job") as root:
+        with tracer.span("fetch") as child:
+            child.set_attribute("bytes", 10)
+
+    assert root is NON_RECORDING_SPAN
+    assert child is NON_RECORDING_SPAN
+    mock_exporter.export.assert_not_called()
+
+
+def test_span_records_error(mock_exporter):
+    tracer = Tracer(1.0, mock_exporter)
+
+    with pytest.raises(ValueError):
+        with tracer.span("fetch"):
+            raise ValueError("range failed")
+
+    span = mock_exporter.export.call_args.args[0]
+    assert span.status == "ERROR"
+    assert span.attributes["error"] == "range failed"
+
+
+def test_file_span_exporter(tmp_path):
+    file_path = tmp_path / "traces" / "traces.jsonl"
+    exporter = FileSpanExporter(str(file_path), 10)
+    span = Span("trace", "span", None, "fetch", {"range": "bytes=0-9"})
+    span.end()
+
+    exporter.export(span)
+    exporter.shutdown()
+
+    lines = file_path.read_text().splitlines()
+    assert len(lines) == 1
+    exported = json.loads(lines[0])
+    assert exported["name"] == "fetch"
+    assert exported["attributes"] == {"range": "bytes=0-9"}
+    assert exported["duration_ms"] >= 0
+
+
+def test_file_span_exporter_drops_spans_when_full(tmp_path):
+    exporter = FileSpanExporter(str(tmp_path / "traces.jsonl"), 1)
+    span = Span("trace", "span", None, "fetch", {})
+    span.end()
+    before = TRACE_SPANS_DROPPED.value()
+
+    # Keeps the writer thread from draining the queue.
+    with patch.object(exporter, "_FileSpanExporter__start"):
+        exporter.export(span)
+        exporter.export(span)
+
+    assert TRACE_SPANS_DROPPED.value() == before + 1
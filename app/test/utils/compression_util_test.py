@@ -0,0 +1,76 @@
+from unittest import mock
+
+import pytest
+
+from app.src.utils.compression_util import (
+    is_compressed_data,
+    is_compressed_name,
+    validate_compression,
+)
+
+
+@pytest.mark.parametrize(
+    "object_key, expected",
+    [
+        ("logs/app.log", False),
+        ("data/table.csv", False),
+        ("data/table.CSV.GZ", True),
+        ("data/table.parquet", True),
+        ("images/photo.jpg", True),
+        ("images/scan.bmp", False),
+        ("videos/clip.mp4", True),
+        ("backup.tar.zst", True),
+        ("README", False),
+    ],
+)
+def test_is_compressed_name(object_key, expected):
+    assert is_compressed_name(object_key) is expected
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (b"\x1f\x8b\x08\x00", True),
+        (b"\x28\xb5\x2f\xfd\x00", True),
+        (b"PK\x03\x04rest", True),
+        (b"\x89PNG\r\n\x1a\n", True),
+        (b"hello world", False),
+        (b"", False),
+    ],
+)
+def test_is_compressed_data(data, expected):
+    assert is_compressed_data(data) is expected
+
+
+@mock.patch("app.src.utils.compression_util.get_zstd_compressor", autospec=True)
+@pytest.mark.parametrize(
+    "compression, level, expected_error",
+    [
+        ("none", None, None),
+        ("zstd", 3, None),
+        ("zstd", "19", None),
+        ("gzip", 3, "compression must be one of"),
+        ("zstd", 0, "compression_level must be between 1 and 22"),
+        ("zstd", "high", "compression_level must be between 1 and 22"),
+    ],
+)
+def test_validate_compression(
+    mock_get_zstd_compressor, compression, level, expected_error
+):
+    is_valid, error = validate_compression(compression, level)
+
+    assert is_valid is (expected_error is None)
+    if expected_error:
+        assert expected_error in error
+
+
+@mock.patch("app.src.utils.compression_util.get_zstd_compressor", autospec=True)
+def test_validate_compression_without_zstandard(mock_get_zstd_compressor):
+    mock_get_zstd_compressor.side_effect = ImportError(
+        "zstandard is required for zstd compression"
+    )
+
+    assert validate_compression("zstd", 3) == (
+        False,
+        "zstandard is required for zstd compression",
+    )
@@ -0,0 +1,93 @@
+import errno
+import os
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import pytest
+
+from app.src.utils.download_writer import DownloadWriter
+
+
+def test_writes_are_aligned_to_buffer_size(tmp_path):
+    path = tmp_path / "a.bin"
+    with DownloadWriter(str(path), 0, 10, 4) as writer:
+        writer.write(b"abc")
+        assert path.read_bytes() == b""
+        writer.write(b"def")
+        assert path.read_bytes() == b"abcd"
+        writer.write(b"ghij")
+        assert path.read_bytes() == b"abcdefgh"
+        assert writer.position == 10
+
+    assert path.read_bytes() == b"abcdefghij"
+
+
+def test_resume_drops_bytes_after_start_position(tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"abcdGARBAGE")
+
+    with DownloadWriter(str(path), 4, 8, 4, preallocate=True) as writer:
+        writer.write(b"efgh")
+
+    assert path.read_bytes() == b"abcdefgh"
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fallocate"), reason="no posix_fallocate")
+def test_preallocated_file_is_truncated_if_incomplete(tmp_path):
+    path = tmp_path / "a.bin"
+
+    with pytest.raises(ConnectionError):
+        with DownloadWriter(str(path), 0, 1024, 4, preallocate=True) as writer:
+            assert os.path.getsize(path) == 1024
+            writer.write(b"abcdef")
+            raise ConnectionError("connection reset")
+
+    assert path.read_bytes() == b"abcdef"
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="no posix_fadvise")
+@patch("app.src.utils.download_writer.os.posix_fadvise")
+def test_drop_cache_advises_written_ranges(mock_posix_fadvise, tmp_path):
+    path = tmp_path / "a.bin"
+
+    with DownloadWriter(str(path), 0, 12, 4, drop_cache=True) as writer:
+        for chunk in (b"abcd", b"efgh", b"ijkl"):
+            writer.write(chunk)
+
+    # Each write advises on the range written before it, the close on the file.
+    advised_ranges = [call.args[1:3] for call in mock_posix_fadvise.call_args_list]
+    assert advised_ranges == [(0, 4), (4, 4), (0, 0)]
+    assert path.read_bytes() == b"abcdefghijkl"
+
+
+@pytest.mark.parametrize(
+    "unsupported",
+    [
+        [],
+        ["copy_file_range"],
+        ["copy_file_range", "sendfile"],
+    ],
+)
+def test_copy_from_falls_back_where_unsupported(tmp_path, unsupported):
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"0123456789")
+    path = tmp_path / "a.bin"
+
+    def raise_unsupported(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    with ExitStack() as stack:
+        for name in unsupported:
+            stack.enter_context(patch.object(os, name, raise_unsupported))
+        f = stack.enter_context(open(source, "rb"))
+        writer = stack.enter_context(
+            DownloadWriter(str(path), 0, 12, 4, preallocate=True)
+        )
+        writer.write(b"ab")
+        assert writer.copy_from(f.fileno(), 2, 6) == 6
+        writer.write(b"x")
+        # The source ends before the range.
+        assert writer.copy_from(f.fileno(), 8, 4) == 2
+        assert writer.position == 11
+
+    assert path.read_bytes() == b"ab234567x89"
@@ -0,0 +1,74 @@
+import os
+from app.src.utils.file_util import (
+    copy_file,
+    detach_shared_file,
+    get_local_path,
+    get_relative_path,
+    get_temp_download_path,
+    remove_file,
+)
+
+
+def test_detach_shared_file_keeps_other_links(tmp_path):
+    shared = tmp_path / "shared.txt"
+    shared.write_bytes(b"hello")
+    first, second = tmp_path / "first.txt", tmp_path / "second.txt"
+    os.link(shared, first)
+    os.link(shared, second)
+
+    assert detach_shared_file(str(first), keep_content=True)
+    with open(first, "ab") as f:
+        f.write(b" world")
+    assert detach_shared_file(str(second))
+
+    assert first.read_bytes() == b"hello world"
+    assert not second.exists()
+    assert shared.read_bytes() == b"hello"
+
+
+def test_detach_unshared_file_is_noop(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"hello")
+
+    assert not detach_shared_file(str(path))
+    assert not detach_shared_file(str(tmp_path / "missing.txt"))
+    assert path.read_bytes() == b"hello"
+
+
+def test_copy_file_replaces_destination(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"new")
+    (tmp_path / "b.txt").write_bytes(b"old")
+
+    copy_file(str(tmp_path / "a.txt"), str(tmp_path / "b.txt"))
+
+    assert (tmp_path / "b.txt").read_bytes() == b"new"
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]
+
+
+def test_remove_file(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"hello")
+
+    assert remove_file(str(path))
+    assert not remove_file(str(path))
+    assert not path.exists()
+
+
+def test_get_temp_download_path_is_stable():
+    assert get_temp_download_path("/data/a.txt") == "/data/a.txt.part"
+
+
+def test_get_relative_path_mirror():
+    assert get_relative_path("a/b/c.csv") == "a/b/c.csv"
+    assert get_local_path("/download/job", "a/b/c.csv") == "/download/job/a/b/c.csv"
+
+
+def test_get_relative_path_hashed():
+    path = get_relative_path("logs/2024/app.log", "hashed")
+    folder, subfolder, name = path.split("/")
+    assert len(folder) == len(subfolder) == 2
+    assert name.startswith(folder + subfolder) and name.endswith(".log")
+    # Keys sharing a prefix are spread over folders, extensions are kept if sane.
+    assert get_relative_path("logs/2024/other.log", "hashed")[:5] != path[:5]
+    assert "." not in get_relative_path("logs/no extension", "hashed")
+    assert get_relative_path("a.b/c", "hashed").count(".") == 0
@@ -0,0 +1,89 @@
+import atexit
+import logging
+import queue
+from unittest.mock import MagicMock, patch
+import pytest
+from app.src.services.metrics import LOG_RECORDS_DROPPED
+from app.src.utils.logging_util import (
+    NonBlockingQueueHandler,
+    ProgressReporter,
+    SampledLogger,
+    configure_logging,
+)
+
+
+@pytest.fixture
+def restore_root_logger():
+    root_logger = logging.getLogger()
+    handlers, level = list(root_logger.handlers), root_logger.level
+    yield root_logger
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    for handler in handlers:
+        root_logger.addHandler(handler)
+    root_logger.setLevel(level)
+
+
+def test_non_blocking_queue_handler_drops_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = LOG_RECORDS_DROPPED.value()
+    record = logging.LogRecord(
+        "test", logging.INFO, __file__, 1, "msg %s", ("a",), None
+    )
+
+    handler.emit(record)
+    handler.emit(record)
+
+    assert handler.dropped_records == 1
+    assert LOG_RECORDS_DROPPED.value() == before + 1
+    assert handler.queue.get_nowait() is record
+
+
+def test_configure_logging(restore_root_logger):
+    listener = configure_logging(level=logging.INFO)
+    try:
+        assert len(restore_root_logger.handlers) == 1
+        assert isinstance(restore_root_logger.handlers[0], NonBlockingQueueHandler)
+    finally:
+        atexit.unregister(listener.stop)
+        listener.stop()
+
+
+def test_sampled_logger():
+    logger = MagicMock()
+    sampled_logger = SampledLogger(logger, 3)
+
+    for i in range(7):
+        sampled_logger.info("processing object: %s", i)
+
+    assert logger.info.call_count == 3
+    assert logger.info.call_args_list[1].args == (
+        "processing object: %s (sampled 1/3)",
+        3,
+    )
+
+
+@patch("app.src.utils.logging_util.logging")
+def test_progress_reporter(mock_logging):
+    progress = ProgressReporter("Sync job", interval=3600)
+
+    progress.add(listed=10)
+    progress.add(processed=1, bytes=100)
+    progress.add(processed=1, bytes=50)
+
+    mock_logging.info.assert_not_called()
+    assert progress.counters() == {"listed": 10, "processed": 2, "bytes": 150}
+
+    progress.finish()
+    mock_logging.info.assert_called_once()
+    assert "finished" in mock_logging.info.call_args.args
+
+
+@patch("app.src.utils.logging_util.logging")
+def test_progress_reporter_logs_periodically(mock_logging):
+    progress = ProgressReporter("Sync job", interval=0)
+
+    progress.add(processed=1)
+    progress.add(processed=1)
+
+    assert mock_logging.info.call_count == 2
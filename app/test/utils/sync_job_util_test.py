@@ -0,0 +1,48 @@
+import json
+from unittest.mock import patch
+from app.src.services.connector import ObjectPage
+from app.src.utils.sync_job_util import (
+    ManifestBuffer,
+    get_etag,
+    write_json_to_local_file,
+)
+
+
+def test_manifest_buffer_tracks_json_size():
+    json_data = ManifestBuffer()
+    assert json_data.json_size == len(json.dumps(json_data))
+
+    for i in range(3):
+        json_data.append({"object_key": f"key_{i}", "fetch_data": "b'\\x00'"})
+        assert json_data.json_size == len(json.dumps(json_data))
+
+
+@patch("app.src.utils.sync_job_util.Constants")
+@patch("app.src.utils.sync_job_util.Config")
+def test_write_json_to_local_file_when_size_exceeded(
+    mock_config, mock_constants, tmp_path
+):
+    mock_config.JSON_ROOT_FOLDER = str(tmp_path)
+    mock_constants.MAX_JSON_SIZE = "60"
+    (tmp_path / "job_id").mkdir()
+    json_data = ManifestBuffer()
+
+    json_data.append({"object_key": "key_1", "fetch_data": "b'0123'"})
+    json_data = write_json_to_local_file(json_data, "job_id")
+    assert len(json_data) == 1
+
+    json_data.append({"object_key": "key_2", "fetch_data": "b'4567'"})
+    json_data = write_json_to_local_file(json_data, "job_id")
+    assert json_data == [] and isinstance(json_data, ManifestBuffer)
+    (manifest_file,) = (tmp_path / "job_id").iterdir()
+    assert len(json.loads(manifest_file.read_text())) == 2
+
+
+def test_get_etag():
+    page = ObjectPage()
+    page.add("a.txt", 5, '"abc"')
+    page.add("b.txt", 5)
+
+    assert get_etag(page, "a.txt") == "abc"
+    assert get_etag(page, "b.txt") is None
+    assert get_etag({"a.txt": 5}, "a.txt") is None
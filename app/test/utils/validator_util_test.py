@@ -1,4 +1,7 @@
+from unittest import mock
+import pytest
 from app.src.utils.validator_util import (
+    validate_connector_config,
     validate_job_id,
     validate_scheduler_creation_api_request,
 )
@@ -77,3 +80,52 @@ def test_invalid_job_id():
     result, error = validate_job_id(data)
     assert result is False
     assert error == "Invalid job ID"
+
+
+@pytest.mark.parametrize(
+    "connector_config, expected_error",
+    [
+        ({"bucket_name": "test_bucket"}, None),
+        ({"durability": "none", "layout": "hashed", "max_bytes_per_second": 10}, None),
+        ({"durability": "always"}, "durability must be one of"),
+        ({"layout": "sharded"}, "layout must be one of"),
+        (
+            {"max_bytes_per_second": -1},
+            "max_bytes_per_second must be a non-negative number",
+        ),
+        ({"sink": {"type": "ftp"}}, "sink type must be one of"),
+        ({"compression": "gzip"}, "compression must be one of"),
+        (
+            {"compression": "zstd", "content_addressed": True},
+            "compression is not supported with content_addressed",
+        ),
+    ],
+)
+def test_validate_connector_config(connector_config, expected_error):
+    with mock.patch(
+        "app.src.utils.compression_util.get_zstd_compressor", autospec=True
+    ):
+        result, error = validate_connector_config(connector_config)
+
+    assert result is (expected_error is None)
+    if expected_error:
+        assert expected_error in error
+    else:
+        assert error is None
+
+
+def test_validate_connector_config_validates_filesystem_root_path():
+    with mock.patch(
+        "app.src.utils.validator_util.validate_root_path",
+        autospec=True,
+        return_value=(False, "root_path / is not within the FILESYSTEM_ALLOWED_ROOTS"),
+    ) as validate_root_path:
+        assert validate_connector_config({"bucket_name": "test_bucket"}, "S3") == (
+            True,
+            None,
+        )
+        result, error = validate_connector_config({"root_path": "/"}, "filesystem")
+
+    assert result is False
+    assert "FILESYSTEM_ALLOWED_ROOTS" in error
+    validate_root_path.assert_called_once_with("/")
@@ -1,11 +1,10 @@
 import logging
 
 from app.src import create_app
+from app.src.utils.logging_util import configure_logging
 
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+configure_logging(level=logging.INFO)
 
 if __name__ == "__main__":
     app = create_app()